@@ -28,6 +28,10 @@ import (
 	"k8s.io/client-go/util/retry"
 )
 
+// sessionPodGracePeriodSeconds allows time for state-sync git backup + final sync.
+// The runner also reads it to bound its own graceful shutdown.
+const sessionPodGracePeriodSeconds = 60
+
 // Track which pods are currently being monitored to prevent duplicate goroutines
 var (
 	monitoredPods   = make(map[string]bool)
@@ -746,7 +750,7 @@ func handleAgenticSessionEvent(obj *unstructured.Unstructured) error {
 	// Create the Pod directly (no Job wrapper for faster startup)
 	podSpec := corev1.PodSpec{
 		RestartPolicy:                 corev1.RestartPolicyNever,
-		TerminationGracePeriodSeconds: int64Ptr(60), // Allow time for state-sync git backup + final sync
+		TerminationGracePeriodSeconds: int64Ptr(sessionPodGracePeriodSeconds),
 		// Explicitly set service account for pod creation permissions
 		AutomountServiceAccountToken: boolPtr(false),
 		Volumes: []corev1.Volume{
@@ -916,6 +920,7 @@ func handleAgenticSessionEvent(obj *unstructured.Unstructured) error {
 						corev1.EnvVar{Name: "LLM_MAX_TOKENS", Value: fmt.Sprintf("%d", maxTokens)},
 						corev1.EnvVar{Name: "USE_AGUI", Value: "true"},
 						corev1.EnvVar{Name: "TIMEOUT", Value: fmt.Sprintf("%d", timeout)},
+						corev1.EnvVar{Name: "TERMINATION_GRACE_PERIOD_SECONDS", Value: fmt.Sprintf("%d", sessionPodGracePeriodSeconds)},
 						corev1.EnvVar{Name: "BACKEND_API_URL", Value: fmt.Sprintf("http://backend-service.%s.svc.cluster.local:8080/api", appConfig.BackendNamespace)},
 						// LEGACY: WEBSOCKET_URL removed - runner now uses AG-UI server pattern (FastAPI)
 						// Backend proxies to runner's HTTP endpoint instead of WebSocket
@@ -35,14 +35,20 @@ from .config import (
     ALLOWED_FORWARDED_PROPS,
     STATE_MANAGEMENT_TOOL_NAME,
     AG_UI_MCP_SERVER_NAME,
+    MESSAGES_DELTA_EVENT_NAME,
+    USER_MESSAGE_INJECTED_EVENT_NAME,
 )
+from .types import InjectedUserMessage
 
 __version__ = "0.1.0"
 __all__ = [
     "ClaudeAgentAdapter",
+    "InjectedUserMessage",
     # Configuration constants
     "ALLOWED_FORWARDED_PROPS",
     "STATE_MANAGEMENT_TOOL_NAME",
     "AG_UI_MCP_SERVER_NAME",
+    "MESSAGES_DELTA_EVENT_NAME",
+    "USER_MESSAGE_INJECTED_EVENT_NAME",
 ]
 
@@ -0,0 +1,104 @@
+"""
+Run message accumulator for MESSAGES_SNAPSHOT construction.
+
+Collects the AG-UI messages created during one run in order, keyed by
+message ID so a later, richer version of a message (e.g. the streamed
+assistant message replacing the fallback built from the complete SDK
+message) replaces the earlier one in place.
+
+Tool result messages are tagged with their tool's display name as soon as
+both are known — whichever arrives first — so no enrichment pass is needed
+before the snapshot is emitted.
+"""
+
+from typing import Any, Dict, Iterator, List, Optional
+
+
+class _MessageEntry:
+    """One accumulated message and the tool call it answers (if any)."""
+
+    __slots__ = ("message", "tool_call_id")
+
+    def __init__(self, message: Any, tool_call_id: Optional[str]) -> None:
+        self.message = message
+        self.tool_call_id = tool_call_id
+
+
+def _message_attr(msg: Any, name: str) -> Any:
+    if isinstance(msg, dict):
+        return msg.get(name)
+    return getattr(msg, name, None)
+
+
+def _with_tool_name(msg: Any, name: str) -> Any:
+    """Return *msg* carrying ``name`` (an extra field on AG-UI ToolMessage)."""
+    if hasattr(msg, "model_copy"):
+        return msg.model_copy(update={"name": name})
+    if isinstance(msg, dict):
+        return {**msg, "name": name}
+    return {
+        "id": getattr(msg, "id", ""),
+        "role": "tool",
+        "content": getattr(msg, "content", ""),
+        "tool_call_id": getattr(msg, "tool_call_id", None),
+        "name": name,
+    }
+
+
+class RunMessageAccumulator:
+    """Ordered, ID-indexed store of the messages produced in one run.
+
+    ``upsert`` and ``set_tool_name`` are O(1); iteration yields messages in
+    first-insertion order with replacements applied.
+    """
+
+    __slots__ = ("_entries", "_by_id", "_tool_entries", "_tool_names")
+
+    def __init__(self) -> None:
+        self._entries: List[_MessageEntry] = []
+        self._by_id: Dict[str, _MessageEntry] = {}
+        self._tool_entries: Dict[
+            str, _MessageEntry
+        ] = {}  # tool_call_id -> tool message
+        self._tool_names: Dict[str, str] = {}  # tool_call_id -> display name
+
+    def upsert(self, msg: Any) -> None:
+        """Replace the message with the same ID, or append *msg*."""
+        tool_call_id = None
+        if _message_attr(msg, "role") == "tool":
+            tool_call_id = _message_attr(msg, "tool_call_id")
+            name = self._tool_names.get(tool_call_id) if tool_call_id else None
+            if name:
+                msg = _with_tool_name(msg, name)
+
+        msg_id = _message_attr(msg, "id")
+        entry = self._by_id.get(msg_id) if msg_id is not None else None
+        if entry is not None:
+            entry.message = msg
+            entry.tool_call_id = tool_call_id
+        else:
+            entry = _MessageEntry(msg, tool_call_id)
+            self._entries.append(entry)
+            if msg_id is not None:
+                self._by_id[msg_id] = entry
+        if tool_call_id:
+            self._tool_entries[tool_call_id] = entry
+
+    def set_tool_name(self, tool_call_id: str, name: str) -> None:
+        """Record *tool_call_id*'s display name and tag its result message."""
+        self._tool_names[tool_call_id] = name
+        entry = self._tool_entries.get(tool_call_id)
+        if entry is not None and entry.tool_call_id == tool_call_id:
+            entry.message = _with_tool_name(entry.message, name)
+
+    def tool_name(self, tool_call_id: str) -> Optional[str]:
+        return self._tool_names.get(tool_call_id)
+
+    def messages(self) -> List[Any]:
+        return [entry.message for entry in self._entries]
+
+    def __iter__(self) -> Iterator[Any]:
+        return (entry.message for entry in self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -7,34 +7,23 @@ enabling Claude-powered agents to work with any AG-UI compatible frontend.
 
 import os
 import logging
-import json
 import uuid
-from typing import AsyncIterator, Optional, List, Dict, Any, Union, TYPE_CHECKING
+from types import MappingProxyType
+from typing import AsyncIterator, Optional, List, Dict, Any, Mapping, Union, TYPE_CHECKING
+
+from pydantic import TypeAdapter
 
 # AG-UI Protocol Events
 from ag_ui.core import (
     EventType,
     RunAgentInput,
     BaseEvent,
-    AssistantMessage as AguiAssistantMessage,
-    ToolCall as AguiToolCall,
-    FunctionCall as AguiFunctionCall,
+    CustomEvent,
+    Message as AguiMessage,
     RunStartedEvent,
     RunFinishedEvent,
     RunErrorEvent,
-    TextMessageStartEvent,
-    TextMessageContentEvent,
-    TextMessageEndEvent,
-    ToolCallStartEvent,
-    ToolCallArgsEvent,
-    ToolCallEndEvent,
-    StateSnapshotEvent,
     MessagesSnapshotEvent,
-    ThinkingTextMessageStartEvent,
-    ThinkingTextMessageContentEvent,
-    ThinkingTextMessageEndEvent,
-    ThinkingStartEvent,
-    ThinkingEndEvent,
 )
 
 # Type checking imports for Claude SDK types
@@ -45,25 +34,22 @@ if TYPE_CHECKING:
 from .utils import (
     process_messages,
     build_state_context_addendum,
-    convert_agui_tool_to_claude_sdk,
-    create_state_management_tool,
     apply_forwarded_props,
     extract_tool_names,
-    strip_mcp_prefix,
-    build_agui_assistant_message,
-    build_agui_tool_message,
 )
 from .config import (
     ALLOWED_FORWARDED_PROPS,
-    STATE_MANAGEMENT_TOOL_NAME,
     STATE_MANAGEMENT_TOOL_FULL_NAME,
     AG_UI_MCP_SERVER_NAME,
+    MESSAGES_DELTA_EVENT_NAME,
+    MESSAGES_SNAPSHOT_DELTA,
+    MESSAGES_SNAPSHOT_FULL,
+    MESSAGES_SNAPSHOT_MODES,
+    DEFAULT_STATE_SNAPSHOT_INTERVAL,
 )
-from .handlers import (
-    handle_tool_use_block,
-    handle_tool_result_block,
-    emit_system_message_events,
-)
+from .state import StateEngine
+from .tool_cache import ToolServerCache
+from .translator import StreamTranslator
 
 logger = logging.getLogger(__name__)
 
@@ -76,6 +62,30 @@ if not logger.handlers:
     log_level = os.getenv("LOGLEVEL", "INFO").upper()
     logger.setLevel(getattr(logging, log_level, logging.INFO))
 
+# Validates run messages (models or dicts) into AG-UI message models
+_MESSAGE_LIST = TypeAdapter(List[AguiMessage])
+
+
+def _get_msg_id(msg):
+    """Extract message ID from either a dict or an object."""
+    if isinstance(msg, dict):
+        return msg.get("id")
+    return getattr(msg, "id", None)
+
+
+class _RunState:
+    """Mutable state owned by a single ``run()`` invocation.
+
+    Kept off the adapter instance, which is shared by every thread the
+    bridge serves, so concurrent runs cannot clobber each other.
+    """
+
+    __slots__ = ("state", "result_data")
+
+    def __init__(self, state: Optional[Any]) -> None:
+        self.state = state  # shared state, updated by ag_ui_update_state
+        self.result_data: Optional[Dict[str, Any]] = None  # from ResultMessage
+
 
 class ClaudeAgentAdapter:
     """
@@ -97,6 +107,11 @@ class ClaudeAgentAdapter:
         
         For production deployment with persistent sessions, mount the .claude/ directory
         as a persistent volume. See: https://platform.claude.com/docs/en/agent-sdk/hosting
+
+    Concurrency:
+        One adapter may serve concurrent runs on different threads.  State and
+        result data are scoped to each ``run()`` call; callers must serialise
+        runs on the *same* thread (one SDK session cannot interleave turns).
     
     RunAgentInput Field Handling:
         - thread_id: Mapped to Claude SDK session_id for conversation continuity
@@ -106,7 +121,8 @@ class ClaudeAgentAdapter:
         - context: Appended to system_prompt for agent awareness
         - state: Appended to system_prompt + ag_ui_update_state tool created for bidirectional sync
         - parent_run_id: Passed through to RUN_STARTED for branching/lineage tracking
-        - forwarded_props: Per-run option overrides (see ALLOWED_FORWARDED_PROPS for whitelist)
+        - forwarded_props: Per-run option overrides (see ALLOWED_FORWARDED_PROPS for whitelist),
+          plus ``messages_snapshot`` ("full" | "delta") to pick the snapshot mode for this run
     
     Frontend Tool Execution (Human-in-the-Loop Pattern):
         When Claude calls a frontend tool (tool name matches input.tools):
@@ -138,11 +154,29 @@ class ClaudeAgentAdapter:
         1. Initial state emitted as STATE_SNAPSHOT event
         2. State appended to system_prompt so Claude can see current values
         3. ag_ui_update_state tool created dynamically
-        4. When Claude calls ag_ui_update_state, we emit STATE_SNAPSHOT with new values
-        5. Client receives STATE_SNAPSHOT and updates UI accordingly
+        4. When Claude calls ag_ui_update_state, we emit STATE_DELTA with the
+           JSON Patch (RFC 6902) from the thread's last sent state
+        5. Client applies the patch and updates UI accordingly
+        
+        Every ``state_snapshot_interval``-th update is a full STATE_SNAPSHOT
+        instead, so a client that missed a patch resyncs.
         
         This enables bidirectional state sync similar to LangGraph/CopilotKit patterns.
     
+    Messages Snapshot:
+        By default every run ends with a MESSAGES_SNAPSHOT of the whole thread
+        (input messages + messages created in this run).  In "delta" mode the
+        adapter instead emits only this run's messages as a CUSTOM
+        ``ambient:messages_delta`` event:
+        
+            {"anchorMessageId": <id of the last input message>, "messages": [...]}
+        
+        The client keeps its history up to and including the anchor and
+        appends (or replaces by ID) the delta messages.  A full snapshot is
+        still sent when requested via forwarded_props, when there is no
+        anchor, or when the input no longer contains the last message this
+        adapter sent for the thread (client history diverged).
+    
     Example:
         # Using dict (convenient for examples)
         adapter = ClaudeAgentAdapter(
@@ -177,6 +211,9 @@ class ClaudeAgentAdapter:
         name: str,
         options: Union["ClaudeAgentOptions", dict, None] = None,
         description: str = "",
+        messages_snapshot_mode: str = MESSAGES_SNAPSHOT_FULL,
+        state_snapshot_interval: int = DEFAULT_STATE_SNAPSHOT_INTERVAL,
+        tool_cache: Optional[ToolServerCache] = None,
     ):
         """
         Initialize the Claude Agent adapter.
@@ -205,19 +242,40 @@ class ClaudeAgentAdapter:
                      https://platform.claude.com/docs/en/agent-sdk/python
                     
             description: Optional description of the agent.
+            messages_snapshot_mode: Default MESSAGES_SNAPSHOT mode, "full" or
+                    "delta" (see class docstring).  Overridable per run via
+                    ``forwarded_props["messages_snapshot"]``.
+            state_snapshot_interval: Send every Nth state update as a full
+                    STATE_SNAPSHOT rather than a STATE_DELTA (1 = always,
+                    0 = never).
+            tool_cache: Cache of built ag_ui MCP servers (frontend tools +
+                    state tool), reused by runs sending the same tools.  Pass
+                    one to share it beyond this adapter's lifetime.
         """
+        if messages_snapshot_mode not in MESSAGES_SNAPSHOT_MODES:
+            raise ValueError(
+                f"Unknown messages_snapshot_mode {messages_snapshot_mode!r}; "
+                f"expected one of {MESSAGES_SNAPSHOT_MODES}"
+            )
         # Agent metadata
         self.name = name
         self.description = description
         
-        # Store the options (ClaudeAgentOptions object OR dict)
+        # Store the options (ClaudeAgentOptions object OR dict); merged with
+        # the defaults once, on first use (see _base_options)
         self._options = options
+        self._base_kwargs: Optional[Mapping[str, Any]] = None
         
-        # Result data from last run (for RunFinished event)
-        self._last_result_data: Optional[Dict[str, Any]] = None
+        # Messages snapshot mode and, per thread, the ID of the last message
+        # sent to the client (used to detect diverged history in delta mode)
+        self._messages_snapshot_mode = messages_snapshot_mode
+        self._last_sent_message_id: Dict[str, str] = {}
 
-        # Current state tracking per run (for state management)
-        self._current_state: Optional[Any] = None
+        # Per thread, the state last sent to the client (diffed into STATE_DELTA)
+        self._state_engine = StateEngine(state_snapshot_interval)
+
+        # Frontend tool stubs and ag_ui MCP servers, reused across runs
+        self._tool_cache = tool_cache if tool_cache is not None else ToolServerCache()
 
     async def run(
         self,
@@ -244,11 +302,8 @@ class ClaudeAgentAdapter:
         thread_id = input_data.thread_id or str(uuid.uuid4())
         run_id = input_data.run_id or str(uuid.uuid4())
         
-        # Clear result data from any previous run
-        self._last_result_data = None
-        
-        # Initialize state tracking for this run
-        self._current_state = input_data.state
+        # State and result data live on the run, not the shared adapter
+        run_state = _RunState(input_data.state)
         
         try:
             # Log parent_run_id if provided (for branching/time travel tracking)
@@ -320,17 +375,15 @@ class ClaudeAgentAdapter:
                 )
                 return
             
-            # Emit initial state snapshot if provided
-            if input_data.state:
-                yield StateSnapshotEvent(
-                    type=EventType.STATE_SNAPSHOT,
-                    snapshot=input_data.state
-                )
+            # The client's state is canonical at run start; echo it if provided
+            initial_state = self._state_engine.reset(thread_id, input_data.state)
+            if initial_state is not None:
+                yield initial_state
             
             # Run Claude SDK and yield events
             async for event in self._stream_claude_sdk(
                 user_message, thread_id, run_id, input_data, frontend_tool_names,
-                message_stream,
+                message_stream, run_state,
             ):
                 yield event
             
@@ -339,7 +392,7 @@ class ClaudeAgentAdapter:
                 type=EventType.RUN_FINISHED,
                 thread_id=thread_id,
                 run_id=run_id,
-                result=self._last_result_data,
+                result=run_state.result_data,
             )
             
         except Exception as e:
@@ -356,6 +409,8 @@ class ClaudeAgentAdapter:
         Build ClaudeAgentOptions from stored options (object/dict/None) plus dynamic tools.
         
         Follows LangGraph pattern: handles ClaudeAgentOptions | dict | None.
+        The stored options are merged once (``_base_options``); each call
+        only overlays the run's own layers.
         
         Args:
             input_data: Optional RunAgentInput for extracting dynamic tools
@@ -364,48 +419,24 @@ class ClaudeAgentAdapter:
         Returns:
             Configured ClaudeAgentOptions instance
         """
-        from claude_agent_sdk import ClaudeAgentOptions, create_sdk_mcp_server
+        from claude_agent_sdk import ClaudeAgentOptions
         
-        # Start with sensible defaults
-        merged_kwargs: Dict[str, Any] = {
-            "include_partial_messages": True,
-        }
+        base_kwargs = self._base_options()
+        if not input_data:
+            return ClaudeAgentOptions(**base_kwargs)
         
-        # Merge in provided options
-        if self._options is not None:
-            if isinstance(self._options, dict):
-                # Dict format - merge directly
-                for key, value in self._options.items():
-                    if value is not None:
-                        merged_kwargs[key] = value
-                           
-            else:
-                # ClaudeAgentOptions object - extract attributes
-                # Try Pydantic v2 style first
-                if hasattr(self._options, "model_dump"):
-                    base_dict = self._options.model_dump(exclude_none=True)
-                    merged_kwargs.update(base_dict)
-                # Fall back to Pydantic v1 style
-                elif hasattr(self._options, "dict"):
-                    base_dict = self._options.dict(exclude_none=True)
-                    merged_kwargs.update(base_dict)
-                # Fall back to __dict__ for plain dataclasses/objects
-                elif hasattr(self._options, "__dict__"):
-                    for key, value in self._options.__dict__.items():
-                        if not key.startswith("_") and value is not None:
-                            merged_kwargs[key] = value
-        logger.debug(f"Merged kwargs: {merged_kwargs}")
+        # Per-run layers go on a shallow copy; the base stays untouched
+        merged_kwargs: Dict[str, Any] = dict(base_kwargs)
         
         # Append state and context to the system prompt (not the user message).
-        if input_data:
-            addendum = build_state_context_addendum(input_data)
-            if addendum:
-                base = merged_kwargs.get("system_prompt", "") or ""
-                merged_kwargs["system_prompt"] = f"{base}\n\n{addendum}" if base else addendum
-                logger.debug(f"Appended state/context ({len(addendum)} chars) to system_prompt")
+        addendum = build_state_context_addendum(input_data)
+        if addendum:
+            base = merged_kwargs.get("system_prompt", "") or ""
+            merged_kwargs["system_prompt"] = f"{base}\n\n{addendum}" if base else addendum
+            logger.debug(f"Appended state/context ({len(addendum)} chars) to system_prompt")
         
         # Ensure ag_ui tools are always allowed (frontend tools + state management)
-        if input_data and (input_data.state or input_data.tools):
+        if input_data.state or input_data.tools:
             allowed_tools = merged_kwargs.get("allowed_tools", [])
             tools_to_add = []
             
@@ -424,12 +455,8 @@ class ClaudeAgentAdapter:
                 merged_kwargs["allowed_tools"] = [*allowed_tools, *tools_to_add]
                 logger.debug(f"Auto-granted permission to ag_ui tools: {tools_to_add}")
         
-        # Remove api_key from options kwargs (handled via environment variable)
-        merged_kwargs.pop("api_key", None)
-        logger.debug(f"Merged kwargs after pop: {merged_kwargs}")
-        
         # Apply forwarded_props as per-run overrides (before adding dynamic tools)
-        if input_data and input_data.forwarded_props:
+        if input_data.forwarded_props:
             merged_kwargs = apply_forwarded_props(
                 input_data.forwarded_props, 
                 merged_kwargs, 
@@ -437,63 +464,98 @@ class ClaudeAgentAdapter:
             )
         
         # Add dynamic tools from input.tools and state management
-        if input_data:
-            # Get existing MCP servers
-            existing_servers = merged_kwargs.get("mcp_servers", {})
-            ag_ui_tools = []
+        # Get existing MCP servers
+        existing_servers = merged_kwargs.get("mcp_servers", {})
+        
+        # Frontend tools from input.tools plus the state management tool
+        # if state is provided, served by the (cached) ag_ui MCP server
+        tool_server = None
+        if input_data.tools or input_data.state:
+            tool_server = self._tool_cache.get(input_data.tools or [], bool(input_data.state))
+        
+        if tool_server is not None:
+            ag_ui_tools, ag_ui_server = tool_server
             
-            # Add frontend tools from input.tools
-            if input_data.tools:
-                logger.debug(f"Building dynamic MCP server with {len(input_data.tools)} frontend tools")
-                
-                for tool_def in input_data.tools:
-                    try:
-                        claude_tool = convert_agui_tool_to_claude_sdk(tool_def)
-                        ag_ui_tools.append(claude_tool)
-                    except Exception as e:
-                        logger.warning(f"Failed to convert tool: {e}")
+            # Merge with existing servers
+            merged_kwargs["mcp_servers"] = {
+                **existing_servers,
+                AG_UI_MCP_SERVER_NAME: ag_ui_server
+            }
             
-            # Add state management tool if state is provided
-            if input_data.state:
-                logger.debug("Adding ag_ui_update_state tool for state management")
-                state_tool = create_state_management_tool()
-                ag_ui_tools.append(state_tool)
+            # Get tool names safely (SdkMcpTool objects don't have __name__)
+            tool_names = []
+            for t in ag_ui_tools:
+                if hasattr(t, '__name__'):
+                    tool_names.append(t.__name__)
+                elif hasattr(t, 'name'):
+                    tool_names.append(t.name)
+                else:
+                    tool_names.append(str(type(t).__name__))
             
-            # Create ag_ui MCP server if we have any tools
-            if ag_ui_tools:
-                ag_ui_server = create_sdk_mcp_server(
-                    AG_UI_MCP_SERVER_NAME,
-                    "1.0.0",
-                    tools=ag_ui_tools
-                )
-                
-                # Merge with existing servers
-                merged_kwargs["mcp_servers"] = {
-                    **existing_servers,
-                    AG_UI_MCP_SERVER_NAME: ag_ui_server
-                }
-                
-                # Get tool names safely (SdkMcpTool objects don't have __name__)
-                tool_names = []
-                for t in ag_ui_tools:
-                    if hasattr(t, '__name__'):
-                        tool_names.append(t.__name__)
-                    elif hasattr(t, 'name'):
-                        tool_names.append(t.name)
-                    else:
-                        tool_names.append(str(type(t).__name__))
-                
-                logger.debug(
-                    f"Created ag_ui MCP server with {len(ag_ui_tools)} tools: {tool_names}"
-                )
+            logger.debug(
+                f"Using ag_ui MCP server with {len(ag_ui_tools)} tools: {tool_names}"
+            )
         
         # NOTE: Session resumption (--resume) is the platform's responsibility.
         # The platform can pass resume=<session_id> via the options dict.
         
-        # Create the options object
-        logger.debug(f"Creating ClaudeAgentOptions with merged kwargs: {merged_kwargs}")
+        # Create the options object (the kwargs are large: format only if logged)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Creating ClaudeAgentOptions with merged kwargs: {merged_kwargs}")
         return ClaudeAgentOptions(**merged_kwargs)
 
+    def _base_options(self) -> Mapping[str, Any]:
+        """
+        Defaults merged with the stored options: the run-independent part of
+        ``build_options``.
+        
+        Computed on first use and frozen, so runs only pay for their own
+        layers (state/context addendum, allowed ag_ui tools, forwarded_props,
+        dynamic tools).  The values are shared with the stored options and
+        every run's kwargs: per-run layers replace them, never mutate them.
+        """
+        if self._base_kwargs is not None:
+            return self._base_kwargs
+        
+        # Start with sensible defaults
+        merged_kwargs: Dict[str, Any] = {
+            "include_partial_messages": True,
+        }
+        
+        # Merge in provided options
+        if self._options is not None:
+            if isinstance(self._options, dict):
+                # Dict format - merge directly
+                for key, value in self._options.items():
+                    if value is not None:
+                        merged_kwargs[key] = value
+                           
+            else:
+                # ClaudeAgentOptions object - extract attributes
+                # Try Pydantic v2 style first
+                if hasattr(self._options, "model_dump"):
+                    base_dict = self._options.model_dump(exclude_none=True)
+                    merged_kwargs.update(base_dict)
+                # Fall back to Pydantic v1 style
+                elif hasattr(self._options, "dict"):
+                    base_dict = self._options.dict(exclude_none=True)
+                    merged_kwargs.update(base_dict)
+                # Fall back to __dict__ for plain dataclasses/objects
+                elif hasattr(self._options, "__dict__"):
+                    for key, value in self._options.__dict__.items():
+                        if not key.startswith("_") and value is not None:
+                            merged_kwargs[key] = value
+        
+        # Remove api_key from options kwargs (handled via environment variable)
+        merged_kwargs.pop("api_key", None)
+        
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Merged base kwargs: {merged_kwargs}")
+        self._base_kwargs = MappingProxyType(merged_kwargs)
+        return self._base_kwargs
+        
+
+
     async def _stream_claude_sdk(
         self,
         prompt: str,
@@ -502,6 +564,7 @@ class ClaudeAgentAdapter:
         input_data: RunAgentInput,
         frontend_tool_names: set[str],
         message_stream: Any,
+        run_state: _RunState,
     ) -> AsyncIterator[BaseEvent]:
         """
         Process Claude SDK messages and yield AG-UI events.
@@ -516,87 +579,16 @@ class ClaudeAgentAdapter:
             input_data: Full RunAgentInput for context
             frontend_tool_names: Set of frontend tool names for halt detection
             message_stream: Async iterator of SDK Messages from the caller.
+            run_state: State and result data for this run.
         """
-        # Per-run state (local to this invocation)
-        current_message_id: Optional[str] = None
-        in_thinking_block: bool = False  # Track if we're inside a thinking content block
-        has_streamed_text: bool = False  # Track if we've streamed any text content
-        
-        # Tool call streaming state
-        current_tool_call_id: Optional[str] = None
-        current_tool_call_name: Optional[str] = None
-        current_tool_display_name: Optional[str] = None  # Unprefixed name for frontend matching
-        accumulated_tool_json: str = ""  # Accumulate partial JSON for tool arguments
-        
-        # Track which tools we've already emitted START for (to avoid duplicates)
-        processed_tool_ids: set = set()
-
-        # Map tool_call_id → display name for snapshot enrichment.
-        # Populated when we see ToolUseBlock / content_block_start so that
-        # the ToolMessage entries in MESSAGES_SNAPSHOT carry proper tool names.
-        tool_name_by_id: Dict[str, str] = {}
-        
-        # Frontend tool halt flag (like Strands pattern)
-        halt_event_stream: bool = False  # Set to True when frontend tool completes
-        
-        # ── MESSAGES_SNAPSHOT accumulation ──
-        # All message types go here. At the end we emit:
-        #   MESSAGES_SNAPSHOT = [...input_data.messages, ...run_messages]
-        run_messages: List[Any] = []
-        pending_msg: Optional[Dict[str, Any]] = None
-        accumulated_thinking_text = ""
-
-        def _get_msg_id(msg):
-            """Extract message ID from either a dict or an object."""
-            if isinstance(msg, dict):
-                return msg.get("id")
-            return getattr(msg, "id", None)
-
-        def upsert_message(msg):
-            """Upsert a message: replace if same ID exists, otherwise append."""
-            msg_id = _get_msg_id(msg)
-            if msg_id is not None:
-                for i, m in enumerate(run_messages):
-                    if _get_msg_id(m) == msg_id:
-                        run_messages[i] = msg
-                        return
-            run_messages.append(msg)
-
-        def flush_pending_msg():
-            """Flush pendingMsg → run_messages (upsert so streaming version wins over fallback)."""
-            nonlocal pending_msg
-            if pending_msg is None:
-                return
-            # Use explicit `is not None` checks — empty string "" is falsy but
-            # a message with empty content and non-empty tool_calls is valid.
-            has_content = pending_msg.get("content") is not None and pending_msg["content"] != ""
-            has_tools = bool(pending_msg.get("tool_calls"))
-            if has_content or has_tools:
-                upsert_message(
-                    AguiAssistantMessage(
-                        id=pending_msg["id"],
-                        role="assistant",
-                        content=pending_msg["content"] if has_content else None,
-                        tool_calls=pending_msg["tool_calls"] if has_tools else None,
-                    )
-                )
-            pending_msg = None
-        
-        # Import Claude SDK types for isinstance checks
-        from claude_agent_sdk import (
-            AssistantMessage,
-            UserMessage,
-            SystemMessage,
-            ResultMessage,
-            TextBlock,
-            ThinkingBlock,
-            ToolUseBlock,
-            ToolResultBlock,
+        translator = StreamTranslator(
+            thread_id, run_id, run_state, self._state_engine, frontend_tool_names
         )
-        from claude_agent_sdk.types import StreamEvent
-        
+        handler_for = translator.handler_for
+        debug = logger.isEnabledFor(logging.DEBUG)
+
         logger.info(f"[AGUI] processing message stream (thread={thread_id}, prompt_len={len(prompt)})")
-        
+
         # Process response stream
         message_count = 0
         stream_error: Optional[Exception] = None
@@ -606,311 +598,20 @@ class ClaudeAgentAdapter:
                 message_count += 1
 
                 # If we've halted due to frontend tool, break out of loop (interrupt already called)
-                if halt_event_stream:
+                if translator.halted:
                     logger.debug(f"[ClaudeSDKClient Message #{message_count}]: Halted - breaking stream loop")
                     break  # Stop consuming, interrupt() already stopped generation
-                
-                logger.debug(f"[ClaudeSDKClient Message #{message_count}]: {message}")
-                
-                # Handle StreamEvent for real-time streaming chunks
-                if isinstance(message, StreamEvent):
-                    event_data = message.event
-                    event_type = event_data.get('type')
-                    
-                    if event_type == 'message_start':
-                        current_message_id = str(uuid.uuid4())
-                        has_streamed_text = False
-                        pending_msg = {"id": current_message_id, "content": "", "tool_calls": []}
-                    
-                    elif event_type == 'content_block_delta':
-                        delta_data = event_data.get('delta', {})
-                        delta_type = delta_data.get('type', '')
-                        
-                        if delta_type == 'text_delta':
-                            text_chunk = delta_data.get('text', '')
-                            if text_chunk and current_message_id:
-                                if not has_streamed_text:
-                                    yield TextMessageStartEvent(
-                                        type=EventType.TEXT_MESSAGE_START,
-                                        thread_id=thread_id,
-                                        run_id=run_id,
-                                        message_id=current_message_id,
-                                        role="assistant",
-                                    )
-                                has_streamed_text = True
-                                if pending_msg is not None:
-                                    pending_msg["content"] += text_chunk
-                                
-                                yield TextMessageContentEvent(
-                                    type=EventType.TEXT_MESSAGE_CONTENT,
-                                    thread_id=thread_id,
-                                    run_id=run_id,
-                                    message_id=current_message_id,
-                                    delta=text_chunk,
-                                )
-                        elif delta_type == 'thinking_delta':
-                            thinking_chunk = delta_data.get('thinking', '')
-                            if thinking_chunk:
-                                accumulated_thinking_text += thinking_chunk
-                                yield ThinkingTextMessageContentEvent(
-                                    type=EventType.THINKING_TEXT_MESSAGE_CONTENT,
-                                    delta=thinking_chunk,
-                                )
-                        elif delta_type == 'input_json_delta':
-                            # Handle streaming tool arguments
-                            partial_json = delta_data.get('partial_json', '')
-                            if partial_json and current_tool_call_id:
-                                # Accumulate JSON for potential parsing
-                                accumulated_tool_json += partial_json
-                                
-                                # Emit TOOL_CALL_ARGS with the delta
-                                yield ToolCallArgsEvent(
-                                    type=EventType.TOOL_CALL_ARGS,
-                                    thread_id=thread_id,
-                                    run_id=run_id,
-                                    tool_call_id=current_tool_call_id,
-                                    delta=partial_json,
-                                )
-                    
-                    elif event_type == 'content_block_start':
-                        block_data = event_data.get('content_block', {})
-                        block_type = block_data.get('type', '')
-                        
-                        if block_type == 'thinking':
-                            in_thinking_block = True
-                            yield ThinkingStartEvent(type=EventType.THINKING_START)
-                            yield ThinkingTextMessageStartEvent(type=EventType.THINKING_TEXT_MESSAGE_START)
-                        elif block_type == 'tool_use':
-                            # Tool call starting - emit TOOL_CALL_START
-                            current_tool_call_id = block_data.get('id')
-                            current_tool_call_name = block_data.get('name', 'unknown')
-                            accumulated_tool_json = ""
-                            
-                            if current_tool_call_id:
-                                current_tool_display_name = strip_mcp_prefix(current_tool_call_name)
-                                processed_tool_ids.add(current_tool_call_id)
-                                tool_name_by_id[current_tool_call_id] = current_tool_display_name
-
-                                yield ToolCallStartEvent(
-                                    type=EventType.TOOL_CALL_START,
-                                    thread_id=thread_id,
-                                    run_id=run_id,
-                                    tool_call_id=current_tool_call_id,
-                                    tool_call_name=current_tool_display_name,  # Use unprefixed name for frontend matching!
-                                    parent_message_id=current_message_id,  # Link to parent message
-                                )
-                    
-                    elif event_type == 'content_block_stop':
-                        if in_thinking_block:
-                            in_thinking_block = False
-                            yield ThinkingTextMessageEndEvent(type=EventType.THINKING_TEXT_MESSAGE_END)
-                            yield ThinkingEndEvent(type=EventType.THINKING_END)
-
-                            # Persist thinking content
-                            if accumulated_thinking_text:
-                                from ag_ui.core import DeveloperMessage
-                                upsert_message(DeveloperMessage(
-                                    id=str(uuid.uuid4()),
-                                    role="developer",
-                                    content=accumulated_thinking_text,
-                                ))
-                                accumulated_thinking_text = ""
-                        
-                        # Close tool call if we were streaming one
-                        if current_tool_call_id:
-                            # Check if this is the state management tool
-                            if current_tool_call_name in (STATE_MANAGEMENT_TOOL_NAME, STATE_MANAGEMENT_TOOL_FULL_NAME):
-                                # Parse accumulated JSON and emit STATE_SNAPSHOT
-                                try:
-                                    state_updates = json.loads(accumulated_tool_json)
-                                    
-                                    # Extract state_updates from the parsed args
-                                    if isinstance(state_updates, dict):
-                                        updates = state_updates.get("state_updates", state_updates)
-                                        
-                                        # Parse nested JSON string if needed
-                                        if isinstance(updates, str):
-                                            updates = json.loads(updates)
-                                        
-                                        # Update current state
-                                        if isinstance(self._current_state, dict) and isinstance(updates, dict):
-                                            self._current_state = {**self._current_state, **updates}
-                                        else:
-                                            self._current_state = updates
-                                        
-                                        yield StateSnapshotEvent(
-                                            type=EventType.STATE_SNAPSHOT,
-                                            snapshot=self._current_state
-                                        )
-                                except (json.JSONDecodeError, ValueError) as e:
-                                    logger.warning(f"Failed to parse tool JSON for state update: {e}")
-                            
-                            # Push tool call onto in-flight message (skip state management)
-                            if (
-                                pending_msg is not None
-                                and current_tool_call_id
-                                and current_tool_display_name
-                                and current_tool_call_name not in (STATE_MANAGEMENT_TOOL_NAME, STATE_MANAGEMENT_TOOL_FULL_NAME)
-                            ):
-                                pending_msg["tool_calls"].append(
-                                    AguiToolCall(
-                                        id=current_tool_call_id,
-                                        type="function",
-                                        function=AguiFunctionCall(
-                                            name=current_tool_display_name,
-                                            arguments=accumulated_tool_json,
-                                        ),
-                                    )
-                                )
-
-                            # Check if this is a frontend tool (using unprefixed name for comparison)
-                            # Frontend tools should halt the stream so client can execute handler
-                            is_frontend_tool = current_tool_display_name in frontend_tool_names
-                            
-                            if is_frontend_tool:
-                                # Flush before halt (message_stop won't fire after interrupt)
-                                flush_pending_msg()
-
-                                # Emit TOOL_CALL_END for frontend tool (client needs this to know call is complete)
-                                yield ToolCallEndEvent(
-                                    type=EventType.TOOL_CALL_END,
-                                    thread_id=thread_id,
-                                    run_id=run_id,
-                                    tool_call_id=current_tool_call_id,
-                                )
-                                
-                                if current_message_id and has_streamed_text:
-                                    yield TextMessageEndEvent(
-                                        type=EventType.TEXT_MESSAGE_END,
-                                        thread_id=thread_id,
-                                        run_id=run_id,
-                                        message_id=current_message_id,
-                                    )
-                                    current_message_id = None
-
-                                logger.debug(f"Frontend tool halt: {current_tool_display_name}")
-
-                                # NOTE: interrupt is the caller's responsibility
-                                # (e.g. worker.interrupt() from the platform layer)
-                                
-                                halt_event_stream = True
-                                # Continue consuming remaining events for cleanup
-                                continue
-                            
-                            # For regular backend tools, DON'T emit TOOL_CALL_END here
-                            # Backend tools will have ToolResultBlock which emits END + RESULT
-                            
-                            # Reset tool streaming state
-                            current_tool_call_id = None
-                            current_tool_call_name = None
-                            current_tool_display_name = None
-                            accumulated_tool_json = ""
-                    
-                    elif event_type == 'message_stop':
-                        flush_pending_msg()
-
-                        if current_message_id and has_streamed_text:
-                            yield TextMessageEndEvent(
-                                type=EventType.TEXT_MESSAGE_END,
-                                thread_id=thread_id,
-                                run_id=run_id,
-                                message_id=current_message_id,
-                            )
-                        current_message_id = None
-                    
-                    elif event_type == 'message_delta':
-                        # Handle message-level delta (e.g., stop_reason, usage)
-                        delta_data = event_data.get('delta', {})
-                        stop_reason = delta_data.get('stop_reason')
-                        if stop_reason:
-                            logger.debug(f"Message stop_reason: {stop_reason}")
-                    
-                    continue
-                
-                # Handle complete messages
-                if isinstance(message, (AssistantMessage, UserMessage)):
-                    # Accumulate from complete SDK message (fallback path).
-                    # Uses the streaming ID so flush_pending_msg() can replace it
-                    # with the richer streaming version (which has tool_calls).
-                    if isinstance(message, AssistantMessage):
-                        msg_id = current_message_id or str(uuid.uuid4())
-                        agui_msg = build_agui_assistant_message(message, msg_id)
-                        if agui_msg:
-                            upsert_message(agui_msg)
-
-                    # Process non-streamed blocks (fallback for tools not seen via stream events)
-                    for block in getattr(message, 'content', []) or []:
-                        if isinstance(block, ToolUseBlock):
-                            tool_id = getattr(block, 'id', None)
-                            if tool_id and tool_id in processed_tool_ids:
-                                continue
-                            # Track tool name for snapshot enrichment
-                            raw_name = getattr(block, 'name', '') or 'unknown'
-                            if tool_id:
-                                tool_name_by_id[tool_id] = strip_mcp_prefix(raw_name)
-                            updated_state, tool_events = await handle_tool_use_block(
-                                block, message, thread_id, run_id, self._current_state
-                            )
-                            if tool_id:
-                                processed_tool_ids.add(tool_id)
-                            if updated_state is not None:
-                                self._current_state = updated_state
-                            async for event in tool_events:
-                                yield event
-                        
-                        elif isinstance(block, ToolResultBlock):
-                            tool_use_id = getattr(block, 'tool_use_id', None)
-                            block_content = getattr(block, 'content', None)
-                            if tool_use_id:
-                                upsert_message(build_agui_tool_message(tool_use_id, block_content))
-                            parent_id = getattr(message, 'parent_tool_use_id', None)
-                            async for event in handle_tool_result_block(block, thread_id, run_id, parent_id):
-                                yield event
-                
-                elif isinstance(message, SystemMessage):
-                    subtype = getattr(message, 'subtype', '')
-                    data = getattr(message, 'data', {}) or {}
-                    
-                    msg_text = (data.get('message') or data.get('text') or '') if data else ''
-                    
-                    if msg_text:
-                        sys_msg_id = str(uuid.uuid4())
-                        for evt in emit_system_message_events(thread_id, run_id, msg_text):
-                            yield evt
-                        
-                        from ag_ui.core import SystemMessage as AguiSystemMessage
-                        upsert_message(AguiSystemMessage(
-                            id=sys_msg_id,
-                            role="system",
-                            content=msg_text,
-                        ))
-                
-                elif isinstance(message, ResultMessage):
-                    is_error = getattr(message, 'is_error', None)
-                    result_text = getattr(message, 'result', None)
-                    
-                    # Capture metadata for RunFinished event
-                    self._last_result_data = {
-                        "is_error": is_error,
-                        "duration_ms": getattr(message, 'duration_ms', None),
-                        "duration_api_ms": getattr(message, 'duration_api_ms', None),
-                        "num_turns": getattr(message, 'num_turns', None),
-                        "total_cost_usd": getattr(message, 'total_cost_usd', None),
-                        "usage": getattr(message, 'usage', None),
-                        "structured_output": getattr(message, 'structured_output', None),
-                    }
-                    
-                    if not has_streamed_text and result_text:
-                        result_msg_id = str(uuid.uuid4())
-                        yield TextMessageStartEvent(type=EventType.TEXT_MESSAGE_START, thread_id=thread_id, run_id=run_id, message_id=result_msg_id, role="assistant")
-                        yield TextMessageContentEvent(type=EventType.TEXT_MESSAGE_CONTENT, thread_id=thread_id, run_id=run_id, message_id=result_msg_id, delta=result_text)
-                        yield TextMessageEndEvent(type=EventType.TEXT_MESSAGE_END, thread_id=thread_id, run_id=run_id, message_id=result_msg_id)
-
-                        upsert_message(AguiAssistantMessage(
-                            id=result_msg_id,
-                            role="assistant",
-                            content=result_text,
-                        ))
+
+                if debug:
+                    logger.debug(f"[ClaudeSDKClient Message #{message_count}]: {message}")
+
+                handler, is_async = handler_for(message)
+                if is_async:
+                    async for event in handler(translator, message):
+                        yield event
+                else:
+                    for event in handler(translator, message):
+                        yield event
 
         except Exception as e:
             # Capture for re-raise after cleanup
@@ -918,73 +619,73 @@ class ClaudeAgentAdapter:
             logger.error(f"Fatal error in message stream: {e}")
 
         finally:
-            # ── AG-UI event cleanup ──
             # Close any hanging events so the frontend doesn't get stuck
             # waiting for END events that will never arrive.
-            # Order matters: close innermost (tool/thinking) before text message.
-
-            if current_tool_call_id:
-                logger.debug(f"Cleanup: closing hanging TOOL_CALL_START for {current_tool_call_id}")
-                yield ToolCallEndEvent(
-                    type=EventType.TOOL_CALL_END,
-                    thread_id=thread_id,
-                    run_id=run_id,
-                    tool_call_id=current_tool_call_id,
-                )
-                current_tool_call_id = None
-
-            if in_thinking_block:
-                logger.debug("Cleanup: closing hanging thinking block")
-                yield ThinkingTextMessageEndEvent(type=EventType.THINKING_TEXT_MESSAGE_END)
-                yield ThinkingEndEvent(type=EventType.THINKING_END)
-                in_thinking_block = False
-
-            if has_streamed_text and current_message_id:
-                logger.debug(f"Cleanup: closing hanging TEXT_MESSAGE_START for {current_message_id}")
-                yield TextMessageEndEvent(
-                    type=EventType.TEXT_MESSAGE_END,
-                    thread_id=thread_id,
-                    run_id=run_id,
-                    message_id=current_message_id,
-                )
-
-            # Flush any pending message so MESSAGES_SNAPSHOT includes it
-            flush_pending_msg()
+            for event in translator.close():
+                yield event
 
         # Emit MESSAGES_SNAPSHOT with input messages + new messages from this run.
-        # Enrich tool result messages with tool names so the frontend can
-        # reconstruct parent-child hierarchy with proper display names.
+        run_messages = translator.run_messages
         if run_messages:
-            enriched: List[Any] = []
-            for msg in run_messages:
-                # Check if this is a tool result message that needs a name
-                msg_role = getattr(msg, 'role', None)
-                msg_tcid = getattr(msg, 'tool_call_id', None)
-                if msg_role == 'tool' and msg_tcid and msg_tcid in tool_name_by_id:
-                    # Convert to dict so we can add the name field
-                    if hasattr(msg, 'model_dump'):
-                        d = msg.model_dump(exclude_none=True)
-                    elif hasattr(msg, 'dict'):
-                        d = msg.dict(exclude_none=True)
-                    else:
-                        d = {"id": getattr(msg, 'id', ''), "role": msg_role,
-                             "content": getattr(msg, 'content', ''),
-                             "tool_call_id": msg_tcid}
-                    d["name"] = tool_name_by_id[msg_tcid]
-                    enriched.append(d)
-                else:
-                    enriched.append(msg)
+            new_messages = run_messages.messages()
+            input_messages = list(input_data.messages or [])
+            if self._should_send_delta(thread_id, input_data, new_messages):
+                anchor_id = _get_msg_id(input_messages[-1])
+                logger.debug(
+                    f"MESSAGES_DELTA: {len(new_messages)} msgs after {anchor_id} "
+                    f"({message_count} SDK messages processed)"
+                )
+                yield CustomEvent(
+                    type=EventType.CUSTOM,
+                    name=MESSAGES_DELTA_EVENT_NAME,
+                    value={
+                        "anchorMessageId": anchor_id,
+                        "messages": _MESSAGE_LIST.validate_python(new_messages),
+                    },
+                )
+            else:
+                all_messages = input_messages + new_messages
+                logger.debug(
+                    f"MESSAGES_SNAPSHOT: {len(all_messages)} msgs ({message_count} SDK messages processed)"
+                )
+                yield MessagesSnapshotEvent(
+                    type=EventType.MESSAGES_SNAPSHOT,
+                    messages=all_messages,
+                )
 
-            all_messages = list(input_data.messages or []) + enriched
-            logger.debug(
-                f"MESSAGES_SNAPSHOT: {len(all_messages)} msgs ({message_count} SDK messages processed)"
-            )
-            yield MessagesSnapshotEvent(
-                type=EventType.MESSAGES_SNAPSHOT,
-                messages=all_messages,
-            )
+            last_id = _get_msg_id(new_messages[-1])
+            if last_id:
+                self._last_sent_message_id[thread_id] = last_id
 
         # Re-raise to let run() emit RunErrorEvent
         if stream_error is not None:
             raise stream_error
 
+    def _should_send_delta(
+        self,
+        thread_id: str,
+        input_data: RunAgentInput,
+        run_messages: List[Any],
+    ) -> bool:
+        """Decide between an incremental messages delta and a full snapshot."""
+        forwarded = input_data.forwarded_props if isinstance(input_data.forwarded_props, dict) else {}
+        mode = forwarded.get("messages_snapshot") or self._messages_snapshot_mode
+        if mode != MESSAGES_SNAPSHOT_DELTA:
+            return False
+
+        input_messages = input_data.messages or []
+        if not input_messages:
+            return False  # no anchor — the full snapshot is this run anyway
+
+        input_ids = {_get_msg_id(m) for m in input_messages}
+        last_sent = self._last_sent_message_id.get(thread_id)
+        if last_sent is not None and last_sent not in input_ids:
+            logger.debug(
+                f"Client history diverged for thread {thread_id} "
+                f"(missing {last_sent}) — sending full MESSAGES_SNAPSHOT"
+            )
+            return False
+
+        # A run message rewriting an input message can't be expressed as an
+        # append after the anchor.
+        return not any(_get_msg_id(m) in input_ids for m in run_messages)
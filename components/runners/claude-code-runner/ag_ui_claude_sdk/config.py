@@ -31,6 +31,35 @@ ALLOWED_FORWARDED_PROPS = {
     "betas",                     # Beta feature flags
 }
 
+# forwarded_props keys consumed by the adapter itself (not Claude SDK options)
+ADAPTER_FORWARDED_PROPS = {
+    "messages_snapshot",        # "full" | "delta" — per-run MESSAGES_SNAPSHOT mode
+}
+
+# MESSAGES_SNAPSHOT modes:
+#   full  — MESSAGES_SNAPSHOT with the whole thread (input + this run)
+#   delta — only this run's messages, as a MESSAGES_DELTA_EVENT_NAME custom
+#           event anchored to the last input message; falls back to full
+#           when the client's history diverges from what was last sent
+MESSAGES_SNAPSHOT_FULL = "full"
+MESSAGES_SNAPSHOT_DELTA = "delta"
+MESSAGES_SNAPSHOT_MODES = (MESSAGES_SNAPSHOT_FULL, MESSAGES_SNAPSHOT_DELTA)
+
+# State updates go out as STATE_DELTA (RFC 6902) against the thread's last
+# sent state; every Nth update is a full STATE_SNAPSHOT instead so clients
+# resync (1 = always snapshot, 0 = never apart from the run's initial state)
+DEFAULT_STATE_SNAPSHOT_INTERVAL = 20
+
+# Converted frontend tools and ag_ui MCP servers kept for reuse across runs,
+# keyed by the tool definitions (0 disables caching)
+DEFAULT_TOOL_CACHE_SIZE = 32
+
+# CustomEvent name for incremental message snapshots
+MESSAGES_DELTA_EVENT_NAME = "ambient:messages_delta"
+
+# CustomEvent name announcing a user message injected into the running turn
+USER_MESSAGE_INJECTED_EVENT_NAME = "ambient:user_message_injected"
+
 # Special tool name for state management
 STATE_MANAGEMENT_TOOL_NAME = "ag_ui_update_state"
 # Full prefixed name as it appears from Claude SDK
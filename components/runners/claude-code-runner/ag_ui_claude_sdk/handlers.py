@@ -7,7 +7,7 @@ Breaks down stream processing into focused handler functions.
 import json
 import logging
 import uuid
-from typing import AsyncIterator, Any, Dict, Optional
+from typing import AsyncIterator, Any, Dict, Optional, TYPE_CHECKING
 
 from ag_ui.core import (
     EventType,
@@ -31,6 +31,9 @@ from ag_ui.core import (
 from .config import STATE_MANAGEMENT_TOOL_NAME, STATE_MANAGEMENT_TOOL_FULL_NAME
 from .utils import strip_mcp_prefix
 
+if TYPE_CHECKING:
+    from .state import StateEngine
+
 logger = logging.getLogger(__name__)
 
 
@@ -40,11 +43,14 @@ async def handle_tool_use_block(
     thread_id: str,
     run_id: str,
     current_state: Optional[Any],
+    state_engine: Optional["StateEngine"] = None,
 ) -> tuple[Optional[Any], AsyncIterator[BaseEvent]]:
     """
     Handle ToolUseBlock from Claude SDK.
     
-    Intercepts state management tool calls and emits STATE_SNAPSHOT.
+    Intercepts state management tool calls and emits the state change
+    (STATE_DELTA or STATE_SNAPSHOT as decided by *state_engine*; a
+    STATE_SNAPSHOT without one).
     For regular tools, emits TOOL_CALL_START/ARGS events.
     
     Args:
@@ -53,6 +59,7 @@ async def handle_tool_use_block(
         thread_id: Thread identifier
         run_id: Run identifier
         current_state: Current state for state management tools
+        state_engine: Thread's canonical state, diffed against the update
         
     Returns:
         Tuple of (updated_state, event_generator)
@@ -94,13 +101,17 @@ async def handle_tool_use_block(
             else:
                 current_state = state_updates
             
-            # Emit STATE_SNAPSHOT with updated state
-            yield StateSnapshotEvent(
-                type=EventType.STATE_SNAPSHOT,
-                snapshot=current_state
-            )
-            
-            logger.debug(f"Emitted STATE_SNAPSHOT with updated state")
+            if state_engine is not None:
+                event = state_engine.update(thread_id, current_state)
+                if event is not None:
+                    yield event
+                    logger.debug(f"Emitted {event.type} with updated state")
+            else:
+                yield StateSnapshotEvent(
+                    type=EventType.STATE_SNAPSHOT,
+                    snapshot=current_state
+                )
+                logger.debug(f"Emitted STATE_SNAPSHOT with updated state")
             return  # Skip normal tool call events
         
         # Regular tool handling for non-state tools
@@ -0,0 +1,232 @@
+"""
+Incremental (push-style) JSON parser for streamed tool arguments.
+
+Tool arguments arrive as ``input_json_delta`` fragments that split tokens
+anywhere.  ``JsonStreamParser`` consumes the fragments as they come and
+reports every value the moment it is complete, together with its path, so
+the adapter can act on e.g. each key of a state update while the rest is
+still streaming instead of parsing the whole document at the end.
+
+Values are built as they are parsed; only an incomplete token (a string,
+number or literal cut by the fragment boundary) is kept as text.
+
+Example::
+
+    parser = JsonStreamParser(max_depth=2)
+    parser.feed('{"state_updates": {"title": "Dr')   # -> []
+    parser.feed('aft", "n": 3')                       # -> [(("state_updates", "title"), "Draft")]
+    parser.feed('}}')   # -> [(("state_updates", "n"), 3), (("state_updates",), {...}), ((), {...})]
+"""
+
+import json
+import re
+from typing import Any, List, Optional, Tuple, Union
+
+Path = Tuple[Union[str, int], ...]
+
+_WHITESPACE = " \t\n\r"
+_DELIMITERS = _WHITESPACE + ",]}"
+_SCALAR = re.compile(r"-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][+-]?\d+)?|true|false|null")
+_LITERALS = {"true": True, "false": False, "null": None}
+
+# What the parser expects next inside a container.
+_VALUE = "value"  # a value (array element, object member value, or the root)
+_KEY = "key"  # an object key or ``}``
+_COLON = "colon"
+_COMMA = "comma"  # ``,`` or the container's closing bracket
+
+
+class JsonStreamError(ValueError):
+    """The streamed text is not valid JSON."""
+
+
+class _Frame:
+    __slots__ = ("container", "key")
+
+    def __init__(self, container: Union[dict, list]) -> None:
+        self.container = container
+        self.key: Optional[str] = None  # pending member key (objects)
+
+
+class JsonStreamParser:
+    """Push parser for one JSON document.
+
+    :meth:`feed` returns ``(path, value)`` for each value completed by the
+    fragment, innermost first, limited to paths of at most *max_depth*
+    components (``None``: all).  The root is reported with path ``()``.
+    """
+
+    def __init__(self, max_depth: Optional[int] = None) -> None:
+        self._max_depth = max_depth
+        self._buf = ""
+        self._scan = 0  # offset into an unterminated string already scanned
+        self._stack: List[_Frame] = []
+        self._expect = _VALUE
+        self._done = False
+        self._root: Any = None
+
+    @property
+    def done(self) -> bool:
+        """Whether the root value is complete."""
+        return self._done
+
+    @property
+    def value(self) -> Any:
+        """The complete root value; raises if the document is unfinished."""
+        if not self._done:
+            raise JsonStreamError("JSON document is incomplete")
+        return self._root
+
+    def feed(self, chunk: str) -> List[Tuple[Path, Any]]:
+        """Consume *chunk*; return the values it completed."""
+        completed: List[Tuple[Path, Any]] = []
+        buf = self._buf + chunk
+        i, n = 0, len(buf)
+
+        while i < n:
+            ch = buf[i]
+            if ch in _WHITESPACE:
+                i += 1
+                continue
+            if self._done:
+                raise JsonStreamError(f"Unexpected {ch!r} after the JSON document")
+            expect = self._expect
+
+            if expect == _COLON:
+                if ch != ":":
+                    raise JsonStreamError(f"Expected ':' but found {ch!r}")
+                self._expect = _VALUE
+                i += 1
+            elif expect == _COMMA:
+                container = self._stack[-1].container
+                if ch == ",":
+                    self._expect = _KEY if isinstance(container, dict) else _VALUE
+                elif ch == ("}" if isinstance(container, dict) else "]"):
+                    self._close(completed)
+                else:
+                    raise JsonStreamError(
+                        f"Expected ',' or a closing bracket but found {ch!r}"
+                    )
+                i += 1
+            elif ch == '"':
+                end = self._string_end(buf, i)
+                if end < 0:
+                    break
+                text = json.loads(buf[i : end + 1])
+                i = end + 1
+                if expect == _KEY:
+                    self._stack[-1].key = text
+                    self._expect = _COLON
+                else:
+                    self._add(text, completed)
+            elif expect == _KEY:
+                # Only an empty object may close where a key is expected.
+                if ch != "}" or self._stack[-1].container:
+                    raise JsonStreamError(f"Expected an object key but found {ch!r}")
+                self._close(completed)
+                i += 1
+            elif ch == "{" or ch == "[":
+                self._open({} if ch == "{" else [])
+                i += 1
+            elif ch == "]" and self._in_empty_array():
+                self._close(completed)
+                i += 1
+            else:
+                match = _SCALAR.match(buf, i)
+                # A token not followed by a delimiter may still be cut by
+                # the fragment boundary (``-1.`` before ``5``).
+                if (
+                    match is None
+                    or match.end() == n
+                    or buf[match.end()] not in _DELIMITERS
+                ):
+                    if not _could_start_scalar(buf[i:]):
+                        raise JsonStreamError(f"Unexpected {ch!r}")
+                    break
+                token = match.group()
+                i = match.end()
+                self._add(
+                    _LITERALS[token] if token in _LITERALS else json.loads(token),
+                    completed,
+                )
+
+        self._buf = buf[i:]
+        return completed
+
+    def close(self) -> Any:
+        """End of input: complete a trailing root scalar and return the root."""
+        rest = self._buf.strip()
+        if rest and not self._stack and self._expect == _VALUE:
+            if _SCALAR.fullmatch(rest) is None:
+                raise JsonStreamError(f"Invalid JSON value {rest!r}")
+            self._buf = ""
+            self._add(_LITERALS[rest] if rest in _LITERALS else json.loads(rest), [])
+        return self.value
+
+    # ── internals ──
+
+    def _string_end(self, buf: str, start: int) -> int:
+        """Index of the quote closing the string at *start*, or -1."""
+        j = start + max(self._scan, 1)
+        while True:
+            j = buf.find('"', j)
+            if j < 0:
+                # Resume after what was scanned once more text arrives.
+                self._scan = len(buf) - start
+                return -1
+            k = j - 1
+            while buf[k] == "\\":
+                k -= 1
+            if (j - 1 - k) % 2 == 0:
+                self._scan = 0
+                return j
+            j += 1
+
+    def _in_empty_array(self) -> bool:
+        return bool(self._stack) and self._stack[-1].container == []
+
+    def _attach(self, value: Any) -> None:
+        if not self._stack:
+            self._root = value
+            return
+        frame = self._stack[-1]
+        if isinstance(frame.container, dict):
+            frame.container[frame.key] = value
+        else:
+            frame.container.append(value)
+
+    def _open(self, container: Union[dict, list]) -> None:
+        # Attached now so paths of values inside it are known while it streams.
+        self._attach(container)
+        self._stack.append(_Frame(container))
+        self._expect = _KEY if isinstance(container, dict) else _VALUE
+
+    def _add(self, value: Any, completed: List[Tuple[Path, Any]]) -> None:
+        self._attach(value)
+        self._finish(value, completed)
+
+    def _close(self, completed: List[Tuple[Path, Any]]) -> None:
+        frame = self._stack.pop()
+        self._finish(frame.container, completed)
+
+    def _finish(self, value: Any, completed: List[Tuple[Path, Any]]) -> None:
+        """Report a completed value and expect what follows it."""
+        if self._stack:
+            self._expect = _COMMA
+        else:
+            self._done = True
+        if self._max_depth is None or len(self._stack) <= self._max_depth:
+            completed.append((self._path(), value))
+
+    def _path(self) -> Path:
+        return tuple(
+            frame.key if isinstance(frame.container, dict) else len(frame.container) - 1
+            for frame in self._stack
+        )
+
+
+def _could_start_scalar(text: str) -> bool:
+    """Whether *text* (cut at the fragment end) may still become a scalar."""
+    if any(lit.startswith(text) for lit in _LITERALS):
+        return True
+    return bool(re.fullmatch(r"-?\d*\.?\d*(?:[eE][+-]?\d*)?", text))
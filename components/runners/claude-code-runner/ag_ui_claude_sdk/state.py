@@ -0,0 +1,138 @@
+"""
+Shared-state engine: per-thread canonical state and RFC 6902 diffs.
+
+Every ``ag_ui_update_state`` call used to re-send the whole state as a
+STATE_SNAPSHOT, which for large shared documents means the full document on
+every small change.  ``StateEngine`` remembers, per thread, the state the
+client was last sent and turns each new version into a STATE_DELTA holding
+only the JSON Patch operations between the two.  Every *snapshot_interval*-th
+update is sent as a full STATE_SNAPSHOT instead, so a client that missed or
+misapplied a patch converges again.
+
+States are treated as immutable values: updates build a new top-level object
+(``{**state, **updates}``) and share the unchanged members, which lets
+:func:`diff_state` skip them by identity instead of comparing them.
+"""
+
+import logging
+from typing import Any, Dict, List, Optional
+
+from ag_ui.core import BaseEvent, EventType, StateDeltaEvent, StateSnapshotEvent
+
+from .config import DEFAULT_STATE_SNAPSHOT_INTERVAL
+
+logger = logging.getLogger(__name__)
+
+
+def json_pointer(key: Any) -> str:
+    """RFC 6901 reference token for *key*, with its leading ``/``."""
+    return "/" + str(key).replace("~", "~0").replace("/", "~1")
+
+
+def diff_state(old: Any, new: Any) -> List[Dict[str, Any]]:
+    """RFC 6902 operations turning *old* into *new*.
+
+    Objects are diffed member by member and arrays index by index (trailing
+    elements added or removed); any other change replaces the value.
+    """
+    ops: List[Dict[str, Any]] = []
+    _diff(old, new, "", ops)
+    return ops
+
+
+def _diff(old: Any, new: Any, path: str, ops: List[Dict[str, Any]]) -> None:
+    if old is new:
+        return
+    if isinstance(old, dict) and isinstance(new, dict):
+        for key in old:
+            if key not in new:
+                ops.append({"op": "remove", "path": path + json_pointer(key)})
+        for key, value in new.items():
+            member = path + json_pointer(key)
+            if key in old:
+                _diff(old[key], value, member, ops)
+            else:
+                ops.append({"op": "add", "path": member, "value": value})
+    elif isinstance(old, list) and isinstance(new, list):
+        common = min(len(old), len(new))
+        for i in range(common):
+            _diff(old[i], new[i], f"{path}/{i}", ops)
+        for i in range(common, len(new)):
+            ops.append({"op": "add", "path": f"{path}/{i}", "value": new[i]})
+        # Highest index first so earlier removals don't shift later ones.
+        for i in range(len(old) - 1, common - 1, -1):
+            ops.append({"op": "remove", "path": f"{path}/{i}"})
+    # ``True == 1`` in Python but not in JSON.
+    elif type(old) is not type(new) or old != new:
+        ops.append({"op": "replace", "path": path, "value": new})
+
+
+class _ThreadState:
+    __slots__ = ("state", "deltas")
+
+    def __init__(self, state: Any) -> None:
+        self.state = state
+        self.deltas = 0  # updates sent as STATE_DELTA since the last snapshot
+
+
+class StateEngine:
+    """Canonical per-thread state and the events that keep clients in sync.
+
+    *snapshot_interval*: send every Nth update as a full STATE_SNAPSHOT
+    (``1`` = always, ``0`` = never).
+    """
+
+    def __init__(
+        self, snapshot_interval: int = DEFAULT_STATE_SNAPSHOT_INTERVAL
+    ) -> None:
+        if snapshot_interval < 0:
+            raise ValueError(f"snapshot_interval must be >= 0, got {snapshot_interval}")
+        self._snapshot_interval = snapshot_interval
+        self._threads: Dict[str, _ThreadState] = {}
+
+    def reset(self, thread_id: str, state: Any) -> Optional[BaseEvent]:
+        """Adopt *state* (the client's, at run start) as the thread's canonical state.
+
+        Returns the STATE_SNAPSHOT echoing it, or ``None`` if there is none.
+        """
+        self._threads[thread_id] = _ThreadState(state)
+        if not state:
+            return None
+        return StateSnapshotEvent(type=EventType.STATE_SNAPSHOT, snapshot=state)
+
+    def update(self, thread_id: str, state: Any) -> Optional[BaseEvent]:
+        """Make *state* canonical; return the event bringing the client there.
+
+        ``None`` when nothing changed.
+        """
+        entry = self._threads.get(thread_id)
+        if entry is None:
+            self._threads[thread_id] = _ThreadState(state)
+            return StateSnapshotEvent(type=EventType.STATE_SNAPSHOT, snapshot=state)
+        delta = diff_state(entry.state, state)
+        if not delta:
+            entry.state = state
+            return None
+        return self._emit(entry, state, delta)
+
+    def applied(
+        self, thread_id: str, state: Any, delta: List[Dict[str, Any]]
+    ) -> BaseEvent:
+        """Record *state*, reached by the caller's own *delta*; return its event."""
+        entry = self._threads.get(thread_id)
+        if entry is None:
+            self._threads[thread_id] = _ThreadState(state)
+            return StateSnapshotEvent(type=EventType.STATE_SNAPSHOT, snapshot=state)
+        return self._emit(entry, state, delta)
+
+    def _emit(
+        self, entry: _ThreadState, state: Any, delta: List[Dict[str, Any]]
+    ) -> BaseEvent:
+        entry.state = state
+        interval = self._snapshot_interval
+        if interval and entry.deltas + 1 >= interval:
+            entry.deltas = 0
+            logger.debug("Periodic STATE_SNAPSHOT for resync")
+            return StateSnapshotEvent(type=EventType.STATE_SNAPSHOT, snapshot=state)
+        entry.deltas += 1
+        return StateDeltaEvent(type=EventType.STATE_DELTA, delta=delta)
@@ -0,0 +1,121 @@
+"""
+Reuse of the ag_ui MCP server (frontend tool stubs + state tool) across runs.
+
+Every run used to convert each ``input_data.tools`` entry into a stub tool,
+recreate the state management tool and build a fresh in-process
+``ag_ui`` MCP server, although the frontend sends the same tool set run
+after run.  ``ToolServerCache`` keys the built server by a canonical hash of
+the tool definitions and hands the same tools and server object to later
+runs, evicting the least recently used entry beyond *maxsize*.
+
+Sharing a server between runs (and threads) is safe: the stubs hold no
+state, and the real execution of frontend tools happens on the client.
+"""
+
+import hashlib
+import json
+import logging
+from collections import OrderedDict
+from typing import Any, List, NamedTuple, Optional, Sequence
+
+from .config import AG_UI_MCP_SERVER_NAME, DEFAULT_TOOL_CACHE_SIZE
+from .utils import convert_agui_tool_to_claude_sdk, create_state_management_tool
+
+logger = logging.getLogger(__name__)
+
+
+class ToolServer(NamedTuple):
+    """The converted tools and the ``ag_ui`` MCP server config holding them."""
+
+    tools: List[Any]
+    server: Any
+
+
+def tools_key(tool_defs: Sequence[Any], state_tool: bool) -> str:
+    """Canonical hash of *tool_defs* (dicts or Tool objects) plus the state tool flag.
+
+    Independent of tool order, dict key order and the definitions' type.
+    """
+    entries = []
+    for tool_def in tool_defs:
+        if isinstance(tool_def, dict):
+            fields = [tool_def.get(f) for f in ("name", "description", "parameters")]
+        else:
+            fields = [
+                getattr(tool_def, f, None)
+                for f in ("name", "description", "parameters")
+            ]
+        entries.append(
+            json.dumps(fields, sort_keys=True, separators=(",", ":"), default=str)
+        )
+    encoded = json.dumps([sorted(entries), state_tool], separators=(",", ":"))
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+def build_tool_server(
+    tool_defs: Sequence[Any], state_tool: bool
+) -> Optional[ToolServer]:
+    """Convert *tool_defs* and build the ``ag_ui`` MCP server (``None``: no tools)."""
+    from claude_agent_sdk import create_sdk_mcp_server
+
+    tools: List[Any] = []
+    for tool_def in tool_defs:
+        try:
+            tools.append(convert_agui_tool_to_claude_sdk(tool_def))
+        except Exception as e:
+            logger.warning(f"Failed to convert tool: {e}")
+    if state_tool:
+        logger.debug("Adding ag_ui_update_state tool for state management")
+        tools.append(create_state_management_tool())
+    if not tools:
+        return None
+    server = create_sdk_mcp_server(AG_UI_MCP_SERVER_NAME, "1.0.0", tools=tools)
+    return ToolServer(tools, server)
+
+
+class ToolServerCache:
+    """Bounded LRU of built ``ag_ui`` MCP servers, with hit/miss counts.
+
+    *maxsize* ``0`` disables caching: every lookup builds a new server.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_TOOL_CACHE_SIZE) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Optional[ToolServer]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, tool_defs: Sequence[Any], state_tool: bool) -> Optional[ToolServer]:
+        """Return the server for *tool_defs*, building it on a miss."""
+        if self.maxsize <= 0:
+            self.misses += 1
+            return build_tool_server(tool_defs, state_tool)
+
+        key = tools_key(tool_defs, state_tool)
+        if key in self._entries:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+        self.misses += 1
+        entry = build_tool_server(tool_defs, state_tool)
+        self._entries[key] = entry
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return entry
+
+    def hit_ratio(self) -> Optional[float]:
+        lookups = self.hits + self.misses
+        return round(self.hits / lookups, 3) if lookups else None
+
+    def as_dict(self) -> dict:
+        return {
+            "size": len(self._entries),
+            "maxSize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hitRatio": self.hit_ratio(),
+        }
@@ -0,0 +1,716 @@
+"""
+Claude SDK message → AG-UI event translation for one run.
+
+``StreamTranslator`` is the explicit state of a run's stream loop (the open
+text message, thinking block and tool call, the in-flight assistant message
+for MESSAGES_SNAPSHOT, ...) plus handlers that translate one SDK message at
+a time.  Handlers are found through dispatch tables — SDK message class,
+stream event ``type``, content delta ``type`` — so a streamed token costs a
+few dict lookups instead of a walk down an ``isinstance`` / string
+comparison chain.
+
+Synchronous handlers return the events to emit as a sequence.  Complete
+assistant/user messages are handled asynchronously, through the tool block
+handlers in :mod:`.handlers`.
+"""
+
+import json
+import logging
+import uuid
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Sequence, Tuple
+
+from ag_ui.core import (
+    AssistantMessage as AguiAssistantMessage,
+    BaseEvent,
+    CustomEvent,
+    DeveloperMessage as AguiDeveloperMessage,
+    EventType,
+    FunctionCall as AguiFunctionCall,
+    SystemMessage as AguiSystemMessage,
+    TextMessageContentEvent,
+    TextMessageEndEvent,
+    TextMessageStartEvent,
+    ThinkingEndEvent,
+    ThinkingStartEvent,
+    ThinkingTextMessageContentEvent,
+    ThinkingTextMessageEndEvent,
+    ThinkingTextMessageStartEvent,
+    ToolCall as AguiToolCall,
+    ToolCallArgsEvent,
+    ToolCallEndEvent,
+    ToolCallStartEvent,
+    UserMessage as AguiUserMessage,
+)
+
+from .accumulator import RunMessageAccumulator
+from .config import (
+    STATE_MANAGEMENT_TOOL_FULL_NAME,
+    STATE_MANAGEMENT_TOOL_NAME,
+    USER_MESSAGE_INJECTED_EVENT_NAME,
+)
+from .handlers import (
+    emit_system_message_events,
+    handle_tool_result_block,
+    handle_tool_use_block,
+)
+from .json_stream import JsonStreamError, JsonStreamParser
+from .state import StateEngine, json_pointer
+from .types import InjectedUserMessage
+from .utils import (
+    build_agui_assistant_message,
+    build_agui_tool_message,
+    strip_mcp_prefix,
+)
+
+logger = logging.getLogger(__name__)
+
+_NO_EVENTS: Tuple[BaseEvent, ...] = ()
+_STATE_TOOL_NAMES = (STATE_MANAGEMENT_TOOL_NAME, STATE_MANAGEMENT_TOOL_FULL_NAME)
+
+
+def _streamed_state_members(completed):
+    """Yield ``(key, value)`` for each state key a tool-args fragment completed.
+
+    Arguments are ``{"state_updates": {...}}`` or, as the final parse also
+    accepts, the bare update object.
+    """
+    for path, value in completed:
+        if len(path) == 2 and path[0] == "state_updates":
+            yield path[1], value
+        elif len(path) == 1 and isinstance(path[0], str) and path[0] != "state_updates":
+            yield path[0], value
+
+
+def _streamed_in_full(state_stream: Optional[JsonStreamParser]) -> bool:
+    """Whether a state update's arguments were fully applied while streaming.
+
+    ``state_updates`` sent as a JSON-encoded string can only be applied once
+    complete, by the final parse.
+    """
+    if state_stream is None or not state_stream.done:
+        return False
+    args = state_stream.value
+    return isinstance(args, dict) and not isinstance(args.get("state_updates"), str)
+
+
+class StreamTranslator:
+    """State of one run's SDK message stream, and the handlers advancing it.
+
+    *run_state* carries the shared state and result data back to ``run()``;
+    ``run_messages`` collects the run's messages for MESSAGES_SNAPSHOT.
+    ``halted`` is set once a frontend tool call completed: the caller stops
+    consuming the stream.
+    """
+
+    __slots__ = (
+        "thread_id",
+        "run_id",
+        "run_state",
+        "state_engine",
+        "frontend_tool_names",
+        "run_messages",
+        "halted",
+        # Assistant message being streamed
+        "current_message_id",
+        "has_streamed_text",
+        "pending_msg",
+        # Thinking block being streamed
+        "in_thinking_block",
+        "accumulated_thinking_text",
+        # Tool call being streamed
+        "current_tool_call_id",
+        "current_tool_call_name",
+        "current_tool_display_name",
+        "accumulated_tool_json",
+        "state_stream",
+        "processed_tool_ids",
+        # User messages injected mid-turn, recorded before the next assistant message
+        "injected_msgs",
+    )
+
+    def __init__(
+        self,
+        thread_id: str,
+        run_id: str,
+        run_state: Any,
+        state_engine: StateEngine,
+        frontend_tool_names: set,
+    ) -> None:
+        self.thread_id = thread_id
+        self.run_id = run_id
+        self.run_state = run_state
+        self.state_engine = state_engine
+        self.frontend_tool_names = frontend_tool_names
+        # All message types go here; tool names are attached to the matching
+        # ToolMessage entries as they become known
+        self.run_messages = RunMessageAccumulator()
+        self.halted = False
+
+        self.current_message_id: Optional[str] = None
+        self.has_streamed_text = False
+        self.pending_msg: Optional[Dict[str, Any]] = None
+
+        self.in_thinking_block = False
+        self.accumulated_thinking_text = ""
+
+        self.current_tool_call_id: Optional[str] = None
+        self.current_tool_call_name: Optional[str] = None
+        self.current_tool_display_name: Optional[str] = (
+            None  # unprefixed, for frontend matching
+        )
+        self.accumulated_tool_json = ""
+        # ag_ui_update_state arguments, parsed as they stream so each state
+        # key is applied (STATE_DELTA) as soon as its value is complete
+        self.state_stream: Optional[JsonStreamParser] = None
+        self.processed_tool_ids: set = set()  # tools already STARTed (avoid duplicates)
+
+        self.injected_msgs: List[AguiUserMessage] = []
+
+    def handler_for(self, message: Any) -> Tuple[Callable, bool]:
+        """Return ``(handler, is_async)`` for *message*'s class."""
+        cls = type(message)
+        entry = _MESSAGE_HANDLERS.get(cls)
+        if entry is None:
+            entry = _resolve_message_handler(cls)
+        return entry
+
+    # ── message bookkeeping ──
+
+    def flush_pending_msg(self) -> None:
+        """Flush pending_msg → run_messages (upsert so streaming version wins over fallback)."""
+        pending_msg = self.pending_msg
+        if pending_msg is None:
+            return
+        # Use explicit `is not None` checks — empty string "" is falsy but
+        # a message with empty content and non-empty tool_calls is valid.
+        has_content = (
+            pending_msg.get("content") is not None and pending_msg["content"] != ""
+        )
+        has_tools = bool(pending_msg.get("tool_calls"))
+        if has_content or has_tools:
+            self.run_messages.upsert(
+                AguiAssistantMessage(
+                    id=pending_msg["id"],
+                    role="assistant",
+                    content=pending_msg["content"] if has_content else None,
+                    tool_calls=pending_msg["tool_calls"] if has_tools else None,
+                )
+            )
+        self.pending_msg = None
+
+    def flush_injected_msgs(self) -> None:
+        for injected in self.injected_msgs:
+            self.run_messages.upsert(injected)
+        self.injected_msgs.clear()
+
+    def close(self) -> List[BaseEvent]:
+        """End of stream: close hanging events and flush pending messages.
+
+        Innermost first (tool/thinking before text) so the frontend doesn't
+        get stuck waiting for END events that will never arrive.
+        """
+        events: List[BaseEvent] = []
+        if self.current_tool_call_id:
+            logger.debug(
+                f"Cleanup: closing hanging TOOL_CALL_START for {self.current_tool_call_id}"
+            )
+            events.append(
+                ToolCallEndEvent(
+                    type=EventType.TOOL_CALL_END,
+                    thread_id=self.thread_id,
+                    run_id=self.run_id,
+                    tool_call_id=self.current_tool_call_id,
+                )
+            )
+            self.current_tool_call_id = None
+
+        if self.in_thinking_block:
+            logger.debug("Cleanup: closing hanging thinking block")
+            events.append(
+                ThinkingTextMessageEndEvent(type=EventType.THINKING_TEXT_MESSAGE_END)
+            )
+            events.append(ThinkingEndEvent(type=EventType.THINKING_END))
+            self.in_thinking_block = False
+
+        if self.has_streamed_text and self.current_message_id:
+            logger.debug(
+                f"Cleanup: closing hanging TEXT_MESSAGE_START for {self.current_message_id}"
+            )
+            events.append(
+                TextMessageEndEvent(
+                    type=EventType.TEXT_MESSAGE_END,
+                    thread_id=self.thread_id,
+                    run_id=self.run_id,
+                    message_id=self.current_message_id,
+                )
+            )
+
+        # Flush any pending message so MESSAGES_SNAPSHOT includes it
+        self.flush_pending_msg()
+        self.flush_injected_msgs()
+        return events
+
+    # ── SDK message handlers ──
+
+    def on_injected_message(self, message: InjectedUserMessage) -> Sequence[BaseEvent]:
+        """User message steered into this turn by the caller."""
+        self.injected_msgs.append(
+            AguiUserMessage(id=message.id, role="user", content=message.content)
+        )
+        return (
+            CustomEvent(
+                type=EventType.CUSTOM,
+                name=USER_MESSAGE_INJECTED_EVENT_NAME,
+                value={"messageId": message.id, "content": message.content},
+            ),
+        )
+
+    def on_stream_event(self, message: Any) -> Sequence[BaseEvent]:
+        """Real-time streaming chunk: dispatch on the event type."""
+        event = message.event
+        handler = _STREAM_EVENT_HANDLERS.get(event.get("type"))
+        if handler is None:
+            return _NO_EVENTS
+        return handler(self, event)
+
+    async def on_complete_message(self, message: Any) -> AsyncIterator[BaseEvent]:
+        """Complete AssistantMessage / UserMessage (fallback for non-streamed blocks)."""
+        from claude_agent_sdk import AssistantMessage, ToolResultBlock, ToolUseBlock
+
+        # Uses the streaming ID so flush_pending_msg() can replace it with the
+        # richer streaming version (which has tool_calls).
+        if isinstance(message, AssistantMessage):
+            msg_id = self.current_message_id or str(uuid.uuid4())
+            agui_msg = build_agui_assistant_message(message, msg_id)
+            if agui_msg:
+                self.run_messages.upsert(agui_msg)
+
+        for block in getattr(message, "content", []) or []:
+            if isinstance(block, ToolUseBlock):
+                tool_id = getattr(block, "id", None)
+                if tool_id and tool_id in self.processed_tool_ids:
+                    continue
+                # Track tool name for snapshot enrichment
+                raw_name = getattr(block, "name", "") or "unknown"
+                if tool_id:
+                    self.run_messages.set_tool_name(tool_id, strip_mcp_prefix(raw_name))
+                updated_state, tool_events = await handle_tool_use_block(
+                    block,
+                    message,
+                    self.thread_id,
+                    self.run_id,
+                    self.run_state.state,
+                    state_engine=self.state_engine,
+                )
+                if tool_id:
+                    self.processed_tool_ids.add(tool_id)
+                if updated_state is not None:
+                    self.run_state.state = updated_state
+                async for event in tool_events:
+                    yield event
+
+            elif isinstance(block, ToolResultBlock):
+                tool_use_id = getattr(block, "tool_use_id", None)
+                block_content = getattr(block, "content", None)
+                if tool_use_id:
+                    self.run_messages.upsert(
+                        build_agui_tool_message(tool_use_id, block_content)
+                    )
+                parent_id = getattr(message, "parent_tool_use_id", None)
+                async for event in handle_tool_result_block(
+                    block, self.thread_id, self.run_id, parent_id
+                ):
+                    yield event
+
+    def on_system_message(self, message: Any) -> Sequence[BaseEvent]:
+        data = getattr(message, "data", {}) or {}
+        msg_text = (data.get("message") or data.get("text") or "") if data else ""
+        if not msg_text:
+            return _NO_EVENTS
+
+        sys_msg_id = str(uuid.uuid4())
+        events = emit_system_message_events(self.thread_id, self.run_id, msg_text)
+        self.run_messages.upsert(
+            AguiSystemMessage(id=sys_msg_id, role="system", content=msg_text)
+        )
+        return events
+
+    def on_result_message(self, message: Any) -> Sequence[BaseEvent]:
+        result_text = getattr(message, "result", None)
+
+        # Capture metadata for RunFinished event
+        self.run_state.result_data = {
+            "is_error": getattr(message, "is_error", None),
+            "duration_ms": getattr(message, "duration_ms", None),
+            "duration_api_ms": getattr(message, "duration_api_ms", None),
+            "num_turns": getattr(message, "num_turns", None),
+            "total_cost_usd": getattr(message, "total_cost_usd", None),
+            "usage": getattr(message, "usage", None),
+            "structured_output": getattr(message, "structured_output", None),
+        }
+
+        if self.has_streamed_text or not result_text:
+            return _NO_EVENTS
+
+        result_msg_id = str(uuid.uuid4())
+        ids = {
+            "thread_id": self.thread_id,
+            "run_id": self.run_id,
+            "message_id": result_msg_id,
+        }
+        self.run_messages.upsert(
+            AguiAssistantMessage(
+                id=result_msg_id, role="assistant", content=result_text
+            )
+        )
+        return (
+            TextMessageStartEvent(
+                type=EventType.TEXT_MESSAGE_START, role="assistant", **ids
+            ),
+            TextMessageContentEvent(
+                type=EventType.TEXT_MESSAGE_CONTENT, delta=result_text, **ids
+            ),
+            TextMessageEndEvent(type=EventType.TEXT_MESSAGE_END, **ids),
+        )
+
+    def on_ignored(self, message: Any) -> Sequence[BaseEvent]:
+        return _NO_EVENTS
+
+    # ── stream event handlers ──
+
+    def on_message_start(self, event: dict) -> Sequence[BaseEvent]:
+        self.flush_injected_msgs()
+        self.current_message_id = str(uuid.uuid4())
+        self.has_streamed_text = False
+        self.pending_msg = {
+            "id": self.current_message_id,
+            "content": "",
+            "tool_calls": [],
+        }
+        return _NO_EVENTS
+
+    def on_content_block_delta(self, event: dict) -> Sequence[BaseEvent]:
+        delta = event.get("delta", {})
+        handler = _DELTA_HANDLERS.get(delta.get("type", ""))
+        if handler is None:
+            return _NO_EVENTS
+        return handler(self, delta)
+
+    def on_content_block_start(self, event: dict) -> Sequence[BaseEvent]:
+        block_data = event.get("content_block", {})
+        block_type = block_data.get("type", "")
+
+        if block_type == "thinking":
+            self.in_thinking_block = True
+            return (
+                ThinkingStartEvent(type=EventType.THINKING_START),
+                ThinkingTextMessageStartEvent(
+                    type=EventType.THINKING_TEXT_MESSAGE_START
+                ),
+            )
+        if block_type != "tool_use":
+            return _NO_EVENTS
+
+        # Tool call starting - emit TOOL_CALL_START
+        tool_call_id = self.current_tool_call_id = block_data.get("id")
+        tool_call_name = self.current_tool_call_name = block_data.get("name", "unknown")
+        self.accumulated_tool_json = ""
+        self.state_stream = (
+            JsonStreamParser(max_depth=2)
+            if tool_call_name in _STATE_TOOL_NAMES
+            and isinstance(self.run_state.state, dict)
+            else None
+        )
+        if not tool_call_id:
+            return _NO_EVENTS
+
+        display_name = self.current_tool_display_name = strip_mcp_prefix(tool_call_name)
+        self.processed_tool_ids.add(tool_call_id)
+        self.run_messages.set_tool_name(tool_call_id, display_name)
+        return (
+            ToolCallStartEvent(
+                type=EventType.TOOL_CALL_START,
+                thread_id=self.thread_id,
+                run_id=self.run_id,
+                tool_call_id=tool_call_id,
+                tool_call_name=display_name,  # Use unprefixed name for frontend matching!
+                parent_message_id=self.current_message_id,  # Link to parent message
+            ),
+        )
+
+    def on_content_block_stop(self, event: dict) -> Sequence[BaseEvent]:
+        events: List[BaseEvent] = []
+        if self.in_thinking_block:
+            self.in_thinking_block = False
+            events.append(
+                ThinkingTextMessageEndEvent(type=EventType.THINKING_TEXT_MESSAGE_END)
+            )
+            events.append(ThinkingEndEvent(type=EventType.THINKING_END))
+
+            # Persist thinking content
+            if self.accumulated_thinking_text:
+                self.run_messages.upsert(
+                    AguiDeveloperMessage(
+                        id=str(uuid.uuid4()),
+                        role="developer",
+                        content=self.accumulated_thinking_text,
+                    )
+                )
+                self.accumulated_thinking_text = ""
+
+        # Close tool call if we were streaming one
+        tool_call_id = self.current_tool_call_id
+        if not tool_call_id:
+            return events
+
+        tool_call_name = self.current_tool_call_name
+        display_name = self.current_tool_display_name
+        is_state_tool = tool_call_name in _STATE_TOOL_NAMES
+        if is_state_tool and not _streamed_in_full(self.state_stream):
+            # Not every key was applied (STATE_DELTA) as it streamed:
+            # parse the accumulated JSON and emit the state change
+            state_event = self._apply_state_arguments()
+            if state_event is not None:
+                events.append(state_event)
+
+        # Push tool call onto in-flight message (skip state management)
+        if self.pending_msg is not None and display_name and not is_state_tool:
+            self.pending_msg["tool_calls"].append(
+                AguiToolCall(
+                    id=tool_call_id,
+                    type="function",
+                    function=AguiFunctionCall(
+                        name=display_name, arguments=self.accumulated_tool_json
+                    ),
+                )
+            )
+
+        # Frontend tools halt the stream so the client can execute the handler
+        if display_name in self.frontend_tool_names:
+            # Flush before halt (message_stop won't fire after interrupt)
+            self.flush_pending_msg()
+
+            # TOOL_CALL_END tells the client the call is complete
+            events.append(
+                ToolCallEndEvent(
+                    type=EventType.TOOL_CALL_END,
+                    thread_id=self.thread_id,
+                    run_id=self.run_id,
+                    tool_call_id=tool_call_id,
+                )
+            )
+            if self.current_message_id and self.has_streamed_text:
+                events.append(
+                    TextMessageEndEvent(
+                        type=EventType.TEXT_MESSAGE_END,
+                        thread_id=self.thread_id,
+                        run_id=self.run_id,
+                        message_id=self.current_message_id,
+                    )
+                )
+                self.current_message_id = None
+
+            logger.debug(f"Frontend tool halt: {display_name}")
+            # NOTE: interrupt is the caller's responsibility
+            # (e.g. worker.interrupt() from the platform layer)
+            self.halted = True
+            return events
+
+        # Backend tools get END + RESULT from their ToolResultBlock; reset
+        # tool streaming state
+        self.current_tool_call_id = None
+        self.current_tool_call_name = None
+        self.current_tool_display_name = None
+        self.accumulated_tool_json = ""
+        self.state_stream = None
+        return events
+
+    def on_message_stop(self, event: dict) -> Sequence[BaseEvent]:
+        self.flush_pending_msg()
+        message_id = self.current_message_id
+        self.current_message_id = None
+        if message_id and self.has_streamed_text:
+            return (
+                TextMessageEndEvent(
+                    type=EventType.TEXT_MESSAGE_END,
+                    thread_id=self.thread_id,
+                    run_id=self.run_id,
+                    message_id=message_id,
+                ),
+            )
+        return _NO_EVENTS
+
+    def on_message_delta(self, event: dict) -> Sequence[BaseEvent]:
+        # Message-level delta (e.g., stop_reason, usage)
+        stop_reason = event.get("delta", {}).get("stop_reason")
+        if stop_reason:
+            logger.debug(f"Message stop_reason: {stop_reason}")
+        return _NO_EVENTS
+
+    # ── content delta handlers ──
+
+    def on_text_delta(self, delta: dict) -> Sequence[BaseEvent]:
+        text_chunk = delta.get("text", "")
+        message_id = self.current_message_id
+        if not (text_chunk and message_id):
+            return _NO_EVENTS
+
+        if self.pending_msg is not None:
+            self.pending_msg["content"] += text_chunk
+        content = TextMessageContentEvent(
+            type=EventType.TEXT_MESSAGE_CONTENT,
+            thread_id=self.thread_id,
+            run_id=self.run_id,
+            message_id=message_id,
+            delta=text_chunk,
+        )
+        if self.has_streamed_text:
+            return (content,)
+
+        self.has_streamed_text = True
+        return (
+            TextMessageStartEvent(
+                type=EventType.TEXT_MESSAGE_START,
+                thread_id=self.thread_id,
+                run_id=self.run_id,
+                message_id=message_id,
+                role="assistant",
+            ),
+            content,
+        )
+
+    def on_thinking_delta(self, delta: dict) -> Sequence[BaseEvent]:
+        thinking_chunk = delta.get("thinking", "")
+        if not thinking_chunk:
+            return _NO_EVENTS
+        self.accumulated_thinking_text += thinking_chunk
+        return (
+            ThinkingTextMessageContentEvent(
+                type=EventType.THINKING_TEXT_MESSAGE_CONTENT, delta=thinking_chunk
+            ),
+        )
+
+    def on_input_json_delta(self, delta: dict) -> Sequence[BaseEvent]:
+        # Streaming tool arguments
+        partial_json = delta.get("partial_json", "")
+        tool_call_id = self.current_tool_call_id
+        if not (partial_json and tool_call_id):
+            return _NO_EVENTS
+
+        # Accumulate JSON for potential parsing
+        self.accumulated_tool_json += partial_json
+        args = ToolCallArgsEvent(
+            type=EventType.TOOL_CALL_ARGS,
+            thread_id=self.thread_id,
+            run_id=self.run_id,
+            tool_call_id=tool_call_id,
+            delta=partial_json,
+        )
+        if self.state_stream is None:
+            return (args,)
+
+        try:
+            members = dict(
+                _streamed_state_members(self.state_stream.feed(partial_json))
+            )
+        except JsonStreamError as e:
+            logger.warning(
+                f"Streamed state update is not valid JSON ({e}); parsing it whole"
+            )
+            self.state_stream = None
+            members = {}
+        if not members:
+            return (args,)
+
+        run_state = self.run_state
+        run_state.state = {**run_state.state, **members}
+        return (
+            args,
+            self.state_engine.applied(
+                self.thread_id,
+                run_state.state,
+                [
+                    {"op": "add", "path": json_pointer(key), "value": value}
+                    for key, value in members.items()
+                ],
+            ),
+        )
+
+    def _apply_state_arguments(self) -> Optional[BaseEvent]:
+        """Apply the complete ag_ui_update_state arguments to the run's state."""
+        run_state = self.run_state
+        try:
+            state_updates = json.loads(self.accumulated_tool_json)
+
+            # Extract state_updates from the parsed args
+            if not isinstance(state_updates, dict):
+                return None
+            updates = state_updates.get("state_updates", state_updates)
+
+            # Parse nested JSON string if needed
+            if isinstance(updates, str):
+                updates = json.loads(updates)
+
+            if isinstance(run_state.state, dict) and isinstance(updates, dict):
+                run_state.state = {**run_state.state, **updates}
+            else:
+                run_state.state = updates
+            return self.state_engine.update(self.thread_id, run_state.state)
+        except (json.JSONDecodeError, ValueError) as e:
+            logger.warning(f"Failed to parse tool JSON for state update: {e}")
+            return None
+
+
+# Stream event ``type`` → handler
+_STREAM_EVENT_HANDLERS: Dict[
+    str, Callable[[StreamTranslator, dict], Sequence[BaseEvent]]
+] = {
+    "message_start": StreamTranslator.on_message_start,
+    "content_block_delta": StreamTranslator.on_content_block_delta,
+    "content_block_start": StreamTranslator.on_content_block_start,
+    "content_block_stop": StreamTranslator.on_content_block_stop,
+    "message_stop": StreamTranslator.on_message_stop,
+    "message_delta": StreamTranslator.on_message_delta,
+}
+
+# Content delta ``type`` → handler
+_DELTA_HANDLERS: Dict[str, Callable[[StreamTranslator, dict], Sequence[BaseEvent]]] = {
+    "text_delta": StreamTranslator.on_text_delta,
+    "thinking_delta": StreamTranslator.on_thinking_delta,
+    "input_json_delta": StreamTranslator.on_input_json_delta,
+}
+
+# SDK message class → (handler, is_async); filled on first use so the Claude
+# SDK is only imported once a stream is translated
+_MESSAGE_HANDLERS: Dict[type, Tuple[Callable, bool]] = {}
+
+
+def _resolve_message_handler(cls: type) -> Tuple[Callable, bool]:
+    """Find (and cache) the handler for *cls* or the nearest base class."""
+    if not _MESSAGE_HANDLERS:
+        from claude_agent_sdk import (
+            AssistantMessage,
+            ResultMessage,
+            SystemMessage,
+            UserMessage,
+        )
+        from claude_agent_sdk.types import StreamEvent
+
+        _MESSAGE_HANDLERS.update(
+            {
+                InjectedUserMessage: (StreamTranslator.on_injected_message, False),
+                StreamEvent: (StreamTranslator.on_stream_event, False),
+                AssistantMessage: (StreamTranslator.on_complete_message, True),
+                UserMessage: (StreamTranslator.on_complete_message, True),
+                SystemMessage: (StreamTranslator.on_system_message, False),
+                ResultMessage: (StreamTranslator.on_result_message, False),
+            }
+        )
+    for base in cls.__mro__:
+        entry = _MESSAGE_HANDLERS.get(base)
+        if entry is not None:
+            break
+    else:
+        entry = (StreamTranslator.on_ignored, False)
+    _MESSAGE_HANDLERS[cls] = entry
+    return entry
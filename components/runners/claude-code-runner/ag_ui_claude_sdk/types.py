@@ -1,6 +1,22 @@
 """
 Type definitions for AG-UI Claude SDK integration.
 
-All types are provided by ag_ui.core or Claude SDK directly.
-This module is reserved for future custom type definitions.
+Most types are provided by ag_ui.core or Claude SDK directly; this module
+holds the few the adapter adds on top.
 """
+
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class InjectedUserMessage:
+    """A user message pushed into a turn that was already running.
+
+    Message streams yield it at the point the message was written to the
+    CLI's input; the adapter announces it with a
+    ``USER_MESSAGE_INJECTED_EVENT_NAME`` custom event and records it in the
+    run's messages before the next assistant message.
+    """
+
+    id: str
+    content: str
@@ -9,7 +9,11 @@ import logging
 from typing import Any, Dict, List, Optional, Tuple
 from ag_ui.core import RunAgentInput, AssistantMessage, ToolCall, FunctionCall, ToolMessage
 
-from .config import STATE_MANAGEMENT_TOOL_NAME, STATE_MANAGEMENT_TOOL_FULL_NAME
+from .config import (
+    ADAPTER_FORWARDED_PROPS,
+    STATE_MANAGEMENT_TOOL_NAME,
+    STATE_MANAGEMENT_TOOL_FULL_NAME,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -236,7 +240,8 @@ def create_state_management_tool() -> Any:
     Create ag_ui_update_state tool for bidirectional state sync.
     
     This tool allows Claude to update the shared application state,
-    which is then emitted to the client via STATE_SNAPSHOT events.
+    which is then emitted to the client as STATE_DELTA patches (per key
+    while the arguments stream), with a periodic full STATE_SNAPSHOT.
     
     Returns:
         Claude SDK tool definition for state updates
@@ -252,7 +257,7 @@ def create_state_management_tool() -> Any:
     async def update_state_tool(args: dict) -> dict:
         """
         Stub implementation - actual state emission happens in stream processing.
-        When Claude calls this, we intercept and emit STATE_SNAPSHOT events.
+        When Claude calls this, we intercept and emit STATE_DELTA/STATE_SNAPSHOT events.
         """
         return {
             "content": [{"type": "text", "text": "State updated successfully"}]
@@ -291,6 +296,9 @@ def apply_forwarded_props(
             merged_kwargs[key] = value
             applied_count += 1
             logger.debug(f"Applied forwarded_prop: {key} = {value}")
+        elif key in ADAPTER_FORWARDED_PROPS:
+            # Consumed by the adapter itself, not an SDK option
+            continue
         elif key not in allowed_keys:
             logger.warning(
                 f"Ignoring non-whitelisted forwarded_prop: {key}. "
@@ -25,7 +25,7 @@ import asyncio
 import logging
 import os
 import uuid
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
 from pathlib import Path
 from typing import Optional
 from urllib.parse import urlparse
@@ -41,6 +41,19 @@ from ambient_runner.platform.utils import parse_owner_repo
 logger = logging.getLogger(__name__)
 
 
+def _log_warmup_failure(task: asyncio.Task) -> None:
+    """Callback for the warm-up task — warm-up failures are not fatal."""
+    if task.cancelled():
+        return
+    exc = task.exception()
+    if exc is not None:
+        logger.warning(
+            "Bridge warm-up failed (first run will set up instead): %s: %s",
+            type(exc).__name__,
+            exc,
+        )
+
+
 def _log_auto_exec_failure(task: asyncio.Task) -> None:
     """Callback for the auto-execution task — logs unhandled exceptions."""
     if task.cancelled():
@@ -77,10 +90,13 @@ def create_ambient_app(
     Handles the full platform lifecycle:
 
     1. **Startup** — creates ``RunnerContext`` from env vars, sets it on the
-       bridge, and fires the auto-prompt if INITIAL_PROMPT is set.
+       bridge, starts ``bridge.warmup()`` in the background (unless
+       ``RUNNER_WARMUP=false``), and fires the auto-prompt if INITIAL_PROMPT
+       is set.
     2. **Request handling** — all Ambient endpoints are registered and
        delegate to the bridge.
-    3. **Shutdown** — calls ``bridge.shutdown()`` for graceful cleanup.
+    3. **Shutdown** — cancels in-flight detached runs, then calls
+       ``bridge.shutdown()`` for graceful cleanup.
 
     Args:
         bridge: A ``PlatformBridge`` implementation (e.g. ``ClaudeBridge``).
@@ -105,6 +121,13 @@ def create_ambient_app(
         )
         bridge.set_context(context)
 
+        # Warm the bridge in the background so the first run does not pay
+        # for platform setup and client connection.
+        warmup_task: Optional[asyncio.Task] = None
+        if os.getenv("RUNNER_WARMUP", "true").strip().lower() != "false":
+            warmup_task = asyncio.create_task(bridge.warmup())
+            warmup_task.add_done_callback(_log_warmup_failure)
+
         # Resume detection
         is_resume = os.getenv("IS_RESUME", "").strip().lower() == "true"
         if is_resume:
@@ -141,6 +164,16 @@ def create_ambient_app(
 
         yield
 
+        if warmup_task is not None and not warmup_task.done():
+            warmup_task.cancel()
+            with suppress(asyncio.CancelledError, Exception):
+                await warmup_task
+
+        # Detached runs outlive their requests — stop them before the
+        # bridge tears down the sessions they are reading from.
+        from ambient_runner.endpoints.run import get_run_registry
+
+        await get_run_registry(app).shutdown()
         await bridge.shutdown()
         logger.info("AG-UI server shut down")
 
@@ -193,9 +226,11 @@ def add_ambient_endpoints(
     from ambient_runner.endpoints.health import router as health_router
     from ambient_runner.endpoints.interrupt import router as interrupt_router
     from ambient_runner.endpoints.run import router as run_router
+    from ambient_runner.endpoints.steer import router as steer_router
 
     app.include_router(run_router)
     app.include_router(interrupt_router)
+    app.include_router(steer_router)
     app.include_router(health_router)
 
     # Optional platform endpoints
@@ -62,6 +62,7 @@ class PlatformBridge(ABC):
     - ``set_context()`` — receives the ``RunnerContext`` at startup
     - ``shutdown()`` — called on server shutdown for cleanup
     - ``mark_dirty()`` — called when repos/workflows change at runtime
+    - ``steer()`` — delivers a user message into the run in flight
     - ``get_mcp_status()`` — returns MCP server diagnostics
     - ``get_error_context()`` — returns extra error info for failed runs
     """
@@ -112,6 +113,19 @@ class PlatformBridge(ABC):
         """
         pass
 
+    async def warmup(self) -> None:
+        """Prepare the framework before the first request (best-effort).
+
+        Started in the background by the platform lifespan after
+        ``set_context()``, so first-run work (auth, client connection,
+        subprocess spawn) overlaps pod startup instead of delaying the
+        first token.  ``run()`` must still work if warm-up is still in
+        progress, failed, or was disabled.
+
+        Default: no-op.
+        """
+        pass
+
     async def shutdown(self) -> None:
         """Graceful shutdown — release resources, persist state.
 
@@ -127,6 +141,19 @@ class PlatformBridge(ABC):
         """
         pass
 
+    async def steer(
+        self, thread_id: Optional[str], message: str, message_id: Optional[str] = None
+    ) -> bool:
+        """Deliver a user message into the thread's run in flight.
+
+        Lets a user correct the agent mid-turn instead of waiting for the
+        turn to finish or interrupting it.  Returns ``False`` when there is
+        no run to steer; the caller then starts a normal run instead.
+
+        Default: ``False`` (steering unsupported).
+        """
+        return False
+
     async def get_mcp_status(self) -> dict:
         """Return MCP server connection diagnostics.
 
@@ -134,6 +161,16 @@ class PlatformBridge(ABC):
         """
         return {"servers": [], "totalCount": 0}
 
+    def get_diagnostics(self) -> dict:
+        """Return runtime diagnostics (queue depths, timings, counters).
+
+        Surfaced under ``diagnostics`` by ``GET /health``.  Must be cheap —
+        it is called on every health probe.
+
+        Default: empty dict.
+        """
+        return {}
+
     def get_error_context(self) -> str:
         """Return extra context for error reporting (e.g. stderr output).
 
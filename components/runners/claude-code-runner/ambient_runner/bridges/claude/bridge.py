@@ -10,18 +10,32 @@ Owns the entire Claude session lifecycle:
 """
 
 import asyncio
+import dataclasses
 import logging
 import os
+import time
+from contextlib import asynccontextmanager
 from typing import Any, AsyncIterator, Optional
 
-from ag_ui.core import BaseEvent, RunAgentInput
+from ag_ui.core import BaseEvent, EventType, RunAgentInput
 from ag_ui_claude_sdk import ClaudeAgentAdapter
+from ag_ui_claude_sdk.config import DEFAULT_STATE_SNAPSHOT_INTERVAL, DEFAULT_TOOL_CACHE_SIZE
+from ag_ui_claude_sdk.tool_cache import ToolServerCache
 
 from ambient_runner.bridge import (
     FrameworkCapabilities,
     PlatformBridge,
 )
-from ambient_runner.bridges.claude.session import SessionManager
+from ambient_runner.bridges.claude.session import (
+    DEFAULT_IDLE_TTL_SECONDS,
+    DEFAULT_MAX_WORKERS,
+    DEFAULT_QUEUE_MAXSIZE,
+    OVERFLOW_BLOCK,
+    SessionManager,
+    current_thread_id,
+    options_fingerprint,
+)
+from ambient_runner.bridges.claude.session_index import SessionIndex, default_index_path
 from ambient_runner.platform.context import RunnerContext
 
 logger = logging.getLogger(__name__)
@@ -29,6 +43,105 @@ logger = logging.getLogger(__name__)
 # Maximum stderr lines kept in ring buffer for error reporting
 _MAX_STDERR_LINES = 50
 
+# Pod termination grace period, and how much of it to leave for the rest of
+# shutdown (run cancellation, tracing flush) after stopping workers.
+_DEFAULT_GRACE_PERIOD_SECONDS = 60.0
+_SHUTDOWN_MARGIN_SECONDS = 15.0
+
+# Events that count as the first token for time-to-first-token
+_FIRST_TOKEN_EVENTS = frozenset(
+    {
+        EventType.TEXT_MESSAGE_CONTENT,
+        EventType.THINKING_TEXT_MESSAGE_CONTENT,
+        EventType.TOOL_CALL_START,
+    }
+)
+
+
+class LatencyStats:
+    """Warm-up outcome and time-to-first-token, split by worker warmth.
+
+    A run is *warm* when its thread's worker was already connected when the
+    run started — e.g. the first run after a successful warm-up — and
+    *cold* when it had to set up the platform or connect a new client.
+    """
+
+    __slots__ = (
+        "warmup",
+        "warmup_ms",
+        "first_run_ttft_ms",
+        "first_run_warm",
+        "last_ttft_ms",
+        "_totals",
+    )
+
+    def __init__(self) -> None:
+        self.warmup = "pending"  # pending | running | done | failed
+        self.warmup_ms: Optional[float] = None
+        self.first_run_ttft_ms: Optional[float] = None
+        self.first_run_warm: Optional[bool] = None
+        self.last_ttft_ms: Optional[float] = None
+        self._totals = {True: [0, 0.0], False: [0, 0.0]}  # warm -> [count, sum]
+
+    def record_ttft(self, ms: float, warm: bool) -> None:
+        if self.first_run_ttft_ms is None:
+            self.first_run_ttft_ms = ms
+            self.first_run_warm = warm
+        self.last_ttft_ms = ms
+        totals = self._totals[warm]
+        totals[0] += 1
+        totals[1] += ms
+
+    def as_dict(self) -> dict:
+        def avg(warm: bool) -> Optional[float]:
+            count, total = self._totals[warm]
+            return round(total / count, 1) if count else None
+
+        return {
+            "warmup": self.warmup,
+            "warmupMs": self.warmup_ms,
+            "firstRunTtftMs": self.first_run_ttft_ms,
+            "firstRunWarm": self.first_run_warm,
+            "lastTtftMs": self.last_ttft_ms,
+            "warmRuns": self._totals[True][0],
+            "warmTtftAvgMs": avg(True),
+            "coldRuns": self._totals[False][0],
+            "coldTtftAvgMs": avg(False),
+        }
+
+
+class ReconfigureStats:
+    """Incremental reconfiguration outcomes after repo/workflow changes.
+
+    *Saved* time is the initial full platform setup minus the time the
+    incremental reconfiguration took.
+    """
+
+    __slots__ = ("setup_ms", "count", "last_ms", "last_changed", "saved_ms")
+
+    def __init__(self) -> None:
+        self.setup_ms: Optional[float] = None
+        self.count = 0
+        self.last_ms: Optional[float] = None
+        self.last_changed: list[str] = []
+        self.saved_ms = 0.0
+
+    def record(self, ms: float, changed: list[str]) -> None:
+        self.count += 1
+        self.last_ms = ms
+        self.last_changed = changed
+        if self.setup_ms is not None:
+            self.saved_ms += max(self.setup_ms - ms, 0.0)
+
+    def as_dict(self) -> dict:
+        return {
+            "setupMs": self.setup_ms,
+            "count": self.count,
+            "lastMs": self.last_ms,
+            "lastChanged": self.last_changed,
+            "savedMs": round(self.saved_ms, 1),
+        }
+
 
 class ClaudeBridge(PlatformBridge):
     """Bridge between the Ambient platform and the Claude Agent SDK.
@@ -37,6 +150,10 @@ class ClaudeBridge(PlatformBridge):
     and caches the ``ClaudeAgentAdapter``, manages persistent
     ``SessionWorker`` instances, and wraps the event stream with
     Langfuse tracing.
+
+    Concurrency: runs on the same thread are serialised by the thread's
+    lock; runs on different threads stream in parallel on their own
+    workers, at most ``MAX_CONCURRENT_RUNS`` at a time (``0`` = unbounded).
     """
 
     def __init__(self) -> None:
@@ -54,8 +171,79 @@ class ClaudeBridge(PlatformBridge):
         self._mcp_servers: dict = {}
         self._allowed_tools: list[str] = []
         self._system_prompt: dict = {}
+        self._mcp_key: str = ""  # fingerprint of the inputs behind _mcp_servers
         self._stderr_lines: list[str] = []
 
+        # Delta coalescing between adapter and encoder (0 disables)
+        self._coalesce_window_ms = float(os.getenv("AGUI_COALESCE_WINDOW_MS", "0"))
+        self._coalesce_max_bytes = int(os.getenv("AGUI_COALESCE_MAX_BYTES", "4096"))
+
+        # MESSAGES_SNAPSHOT mode: "full" (default) or incremental "delta"
+        self._messages_snapshot_mode = os.getenv("AGUI_MESSAGES_SNAPSHOT_MODE", "full")
+
+        # Every Nth state update is a full STATE_SNAPSHOT, the rest STATE_DELTA
+        self._state_snapshot_interval = int(
+            os.getenv("AGUI_STATE_SNAPSHOT_INTERVAL", str(DEFAULT_STATE_SNAPSHOT_INTERVAL))
+        )
+
+        # ag_ui MCP servers by frontend tool set; outlives adapter rebuilds
+        self._tool_cache = ToolServerCache(
+            int(os.getenv("AGUI_TOOL_CACHE_SIZE", str(DEFAULT_TOOL_CACHE_SIZE)))
+        )
+
+        # Bounded worker output queues ("block" or "coalesce" when full)
+        self._queue_maxsize = int(
+            os.getenv("SESSION_QUEUE_MAXSIZE", str(DEFAULT_QUEUE_MAXSIZE))
+        )
+        self._queue_overflow = os.getenv("SESSION_QUEUE_OVERFLOW", OVERFLOW_BLOCK)
+
+        # Live worker bounds: LRU capacity and idle TTL (0 disables each)
+        self._max_workers = int(
+            os.getenv("SESSION_MAX_WORKERS", str(DEFAULT_MAX_WORKERS))
+        )
+        self._idle_ttl = float(
+            os.getenv("SESSION_IDLE_TTL_SECONDS", str(DEFAULT_IDLE_TTL_SECONDS))
+        )
+
+        # Deadline for stopping all workers on shutdown, inside the pod's
+        # termination grace period unless set explicitly
+        grace_period = float(
+            os.getenv("TERMINATION_GRACE_PERIOD_SECONDS", str(_DEFAULT_GRACE_PERIOD_SECONDS))
+        )
+        self._shutdown_timeout = float(
+            os.getenv(
+                "SESSION_SHUTDOWN_TIMEOUT_SECONDS",
+                str(max(grace_period - _SHUTDOWN_MARGIN_SECONDS, 1.0)),
+            )
+        )
+
+        # Durable thread -> CLI session index ("" disables); optionally
+        # pre-warm every indexed thread's worker during warm-up
+        self._session_index_path = os.getenv("SESSION_INDEX_PATH")
+        self._prewarm_indexed = (
+            os.getenv("SESSION_INDEX_PREWARM", "false").strip().lower() == "true"
+        )
+
+        # Global cap on concurrently streaming runs across all threads
+        self._max_concurrent_runs = int(os.getenv("MAX_CONCURRENT_RUNS", "8"))
+        self._run_slots: asyncio.Semaphore | None = (
+            asyncio.Semaphore(self._max_concurrent_runs)
+            if self._max_concurrent_runs > 0
+            else None
+        )
+        self._active_runs: int = 0
+        self._waiting_runs: int = 0
+        self._setup_lock = asyncio.Lock()
+
+        # Threads whose agent called restart_session during the current
+        # run; each is warm-swapped once its run completes
+        self._restart_requests: set[str] = set()
+        self._restart_tasks: set[asyncio.Task] = set()
+
+        # Warm-up and time-to-first-token (reported in diagnostics)
+        self._latency = LatencyStats()
+        self._reconfigure = ReconfigureStats()
+
     # ------------------------------------------------------------------
     # PlatformBridge interface
     # ------------------------------------------------------------------
@@ -83,43 +271,73 @@ class ClaudeBridge(PlatformBridge):
 
     async def run(self, input_data: RunAgentInput) -> AsyncIterator[BaseEvent]:
         """Full run lifecycle: lazy setup → adapter → session worker → tracing."""
-        # 1. Lazy platform setup
+        started = time.monotonic()
+
+        # 1. Lazy platform setup (already done if warm-up finished)
         await self._ensure_ready()
 
-        # 2. Ensure adapter exists
+        # 2. Ensure adapter exists.  Hold local references: mark_dirty() may
+        # reset the bridge while this run is still streaming.
         self._ensure_adapter()
+        adapter = self._adapter
+        manager = self._session_manager
 
         # 3. Extract user message for worker and observability
         from ag_ui_claude_sdk.utils import process_messages
 
         user_msg, _ = process_messages(input_data)
 
-        # 4. Get or create session worker for this thread
+        # 4. Wait out a crash backoff, serialise on this thread, then take a
+        # global run slot
         thread_id = input_data.thread_id or self._context.session_id
-        api_key = os.getenv("ANTHROPIC_API_KEY", "")
-        sdk_options = self._adapter.build_options(input_data, thread_id=thread_id)
-        worker = await self._session_manager.get_or_create(
-            thread_id, sdk_options, api_key
-        )
+        await manager.wait_respawn(thread_id)
+        async with manager.get_lock(thread_id), self._run_slot():
+            # 5. Get or create session worker for this thread
+            existing = manager.get_existing(thread_id)
+            warm = existing is not None and existing.connected
+            api_key = os.getenv("ANTHROPIC_API_KEY", "")
+            sdk_options = adapter.build_options(input_data, thread_id=thread_id)
+            fingerprint = self._fingerprint(sdk_options, input_data)
+            worker = await manager.get_or_create(
+                thread_id, sdk_options, api_key, fingerprint=fingerprint
+            )
 
-        # 5. Run adapter with message stream, wrapped in tracing
-        session_label = self._session_manager.get_session_id(thread_id) or thread_id
-        async with self._session_manager.get_lock(thread_id):
+            # 6. Run adapter with message stream, coalesced and wrapped in tracing
+            session_label = manager.get_session_id(thread_id) or thread_id
             message_stream = worker.query(user_msg, session_id=session_label)
 
-            from ambient_runner.middleware import tracing_middleware
+            from ambient_runner.middleware import (
+                coalescing_middleware,
+                tracing_middleware,
+            )
 
             wrapped_stream = tracing_middleware(
-                self._adapter.run(input_data, message_stream=message_stream),
+                coalescing_middleware(
+                    adapter.run(input_data, message_stream=message_stream),
+                    window_ms=self._coalesce_window_ms,
+                    max_bytes=self._coalesce_max_bytes,
+                ),
                 obs=self._obs,
                 model=self._configured_model,
                 prompt=user_msg,
             )
 
+            first_token = True
             async for event in wrapped_stream:
+                if first_token and event.type in _FIRST_TOKEN_EVENTS:
+                    first_token = False
+                    ttft_ms = round((time.monotonic() - started) * 1000, 1)
+                    self._latency.record_ttft(ttft_ms, warm)
+                    logger.info(
+                        f"Time to first token: {ttft_ms}ms "
+                        f"({'warm' if warm else 'cold'} worker, thread={thread_id})"
+                    )
                 yield event
 
         self._first_run = False
+        if thread_id in self._restart_requests:
+            self._restart_requests.discard(thread_id)
+            self._schedule_restart(manager, thread_id, sdk_options, api_key, fingerprint)
 
     async def interrupt(self, thread_id: Optional[str] = None) -> None:
         """Interrupt the running session for a given thread."""
@@ -137,6 +355,23 @@ class ClaudeBridge(PlatformBridge):
         logger.info(f"Interrupt request for thread={tid}")
         await worker.interrupt()
 
+    async def steer(
+        self, thread_id: Optional[str], message: str, message_id: Optional[str] = None
+    ) -> bool:
+        """Write *message* into the thread's turn in flight (see ``SessionWorker.inject``)."""
+        if not self._session_manager:
+            return False
+        tid = thread_id or (self._context.session_id if self._context else None)
+        worker = self._session_manager.get_existing(tid) if tid else None
+        if worker is None:
+            return False
+        delivered = await worker.inject(message, message_id)
+        logger.info(
+            f"Steering message for thread={tid} "
+            f"{'delivered' if delivered else 'rejected: no turn in flight'}"
+        )
+        return delivered
+
     # ------------------------------------------------------------------
     # Lifecycle methods
     # ------------------------------------------------------------------
@@ -145,46 +380,141 @@ class ClaudeBridge(PlatformBridge):
         """Store the runner context (called from lifespan)."""
         self._context = context
 
+    async def warmup(self) -> None:
+        """Set up the platform and connect the default thread's worker.
+
+        The default thread is the session ID, which ``run()`` falls back to
+        when the input carries no ``thread_id``.  A run arriving mid-warm-up
+        waits on the setup lock and then queues its prompt on the same
+        worker, which serves it as soon as the client is connected.
+        """
+        started = time.monotonic()
+        self._latency.warmup = "running"
+        try:
+            await self._ensure_ready()
+            self._ensure_adapter()
+            adapter = self._adapter
+            manager = self._session_manager
+            thread_id = self._context.session_id
+            async with manager.get_lock(thread_id):
+                sdk_options = adapter.build_options(thread_id=thread_id)
+                worker = await manager.get_or_create(
+                    thread_id,
+                    sdk_options,
+                    os.getenv("ANTHROPIC_API_KEY", ""),
+                    fingerprint=self._fingerprint(sdk_options),
+                )
+            if not await worker.wait_connected():
+                raise RuntimeError(f"Session worker for thread={thread_id} exited before connecting")
+            if self._prewarm_indexed:
+                await self._prewarm_known_threads(exclude=thread_id)
+        except BaseException:
+            self._latency.warmup = "failed"
+            raise
+        self._latency.warmup = "done"
+        self._latency.warmup_ms = round((time.monotonic() - started) * 1000, 1)
+        logger.info(f"ClaudeBridge: warm-up complete in {self._latency.warmup_ms}ms")
+
+    async def _prewarm_known_threads(self, exclude: str) -> None:
+        """Start resumed workers for threads in the session index.
+
+        Bounded by ``SESSION_MAX_WORKERS`` so warm-up never evicts the
+        default thread.  Failures are logged; the run path retries.
+        """
+        manager = self._session_manager
+        adapter = self._adapter
+        thread_ids = [tid for tid in manager.known_threads() if tid != exclude]
+        if self._max_workers > 0:
+            thread_ids = thread_ids[: max(self._max_workers - 1, 0)]
+
+        async def _warm(tid: str) -> None:
+            try:
+                async with manager.get_lock(tid):
+                    sdk_options = adapter.build_options(thread_id=tid)
+                    worker = await manager.get_or_create(
+                        tid,
+                        sdk_options,
+                        os.getenv("ANTHROPIC_API_KEY", ""),
+                        fingerprint=self._fingerprint(sdk_options),
+                    )
+                await worker.wait_connected()
+            except Exception as e:
+                logger.warning(f"Pre-warm failed for thread={tid}: {e}")
+
+        if thread_ids:
+            logger.info(f"Pre-warming {len(thread_ids)} indexed thread(s)")
+            await asyncio.gather(*(_warm(tid) for tid in thread_ids))
+
     async def shutdown(self) -> None:
         """Graceful shutdown: persist sessions, finalise tracing."""
+        for task in list(self._restart_tasks):
+            task.cancel()
         if self._session_manager:
             await self._session_manager.shutdown()
         if self._obs:
             await self._obs.finalize()
         logger.info("ClaudeBridge: shutdown complete")
 
+    def _request_restart(self) -> None:
+        """``restart_session`` callback: flag the calling thread for a restart."""
+        thread_id = current_thread_id()
+        if thread_id is None:
+            logger.warning("restart_session called outside a session worker; ignoring")
+            return
+        self._restart_requests.add(thread_id)
+
+    def _schedule_restart(
+        self,
+        manager: SessionManager,
+        thread_id: str,
+        sdk_options: Any,
+        api_key: str,
+        fingerprint: str,
+    ) -> None:
+        """Warm-swap *thread_id*'s worker in the background."""
+
+        async def _restart() -> None:
+            try:
+                await manager.restart(thread_id, sdk_options, api_key, fingerprint=fingerprint)
+            except Exception as e:
+                logger.warning(f"Session restart failed for thread={thread_id}: {e}")
+
+        task = asyncio.create_task(_restart(), name=f"session-restart-{thread_id}")
+        self._restart_tasks.add(task)
+        task.add_done_callback(self._restart_tasks.discard)
+
     def mark_dirty(self) -> None:
         """Signal adapter rebuild on next run (repo/workflow change).
 
-        Destroys existing session workers so the new MCP server
-        configuration (e.g. updated correction tool targets) is applied
-        to the CLI process on the next run.  Conversation state is
-        preserved via the CLI's ``--resume`` mechanism.
+        The next run recomputes only the workspace-dependent configuration
+        (paths, MCP servers, system prompt); auth, credentials and
+        observability are kept.  Session workers are kept too: on each
+        thread's next run the rebuilt options are fingerprinted, and only a
+        worker whose options actually changed is restarted, resuming its
+        conversation via the CLI's ``--resume`` mechanism.
         """
         self._ready = False
         self._first_run = True
         self._adapter = None
-        if self._session_manager:
-            manager = self._session_manager
-            self._session_manager = None
-            try:
-                loop = asyncio.get_running_loop()
-                future = asyncio.ensure_future(manager.shutdown())
-                future.add_done_callback(
-                    lambda f: logger.warning(
-                        "mark_dirty: session_manager shutdown error: %s", f.exception()
-                    )
-                    if f.exception()
-                    else None
-                )
-            except RuntimeError:
-                # No running loop — safe to block
-                try:
-                    asyncio.run(manager.shutdown())
-                except Exception as e:
-                    logger.warning("mark_dirty: session_manager shutdown error: %s", e)
         logger.info("ClaudeBridge: marked dirty — will reinitialise on next run")
 
+    def get_diagnostics(self) -> dict:
+        """Return run concurrency, latency, reconfiguration, tool cache, worker pool and queue stats."""
+        if not self._session_manager:
+            return {}
+        return {
+            "runs": {
+                "active": self._active_runs,
+                "waiting": self._waiting_runs,
+                "maxConcurrent": self._max_concurrent_runs,
+            },
+            "latency": self._latency.as_dict(),
+            "reconfigure": self._reconfigure.as_dict(),
+            "toolCache": self._tool_cache.as_dict(),
+            "workers": self._session_manager.get_pool_stats(),
+            "queues": self._session_manager.get_queue_stats(),
+        }
+
     def get_error_context(self) -> str:
         """Return recent Claude CLI stderr lines for error reporting."""
         if self._stderr_lines:
@@ -296,28 +626,76 @@ class ClaudeBridge(PlatformBridge):
     # ------------------------------------------------------------------
 
     async def _ensure_ready(self) -> None:
-        """Run one-time platform setup if not already done."""
+        """Run platform setup if not already done.
+
+        The first call runs the full setup; after ``mark_dirty()`` only the
+        workspace-dependent configuration is recomputed.  Concurrent first
+        runs (one per thread) share a single setup pass.
+        """
         if self._ready:
             return
         if not self._context:
             raise RuntimeError("Context not set — call set_context() first")
-        await self._setup_platform()
-        self._ready = True
+        async with self._setup_lock:
+            if self._ready:
+                return
+            started = time.monotonic()
+            if self._reconfigure.setup_ms is None:
+                await self._setup_platform()
+                self._reconfigure.setup_ms = round((time.monotonic() - started) * 1000, 1)
+            else:
+                changed = self._configure_workspace()
+                ms = round((time.monotonic() - started) * 1000, 1)
+                self._reconfigure.record(ms, changed)
+                logger.info(
+                    f"Reconfigured in {ms}ms (changed: {', '.join(changed) or 'nothing'})"
+                )
+            self._ready = True
         logger.info(
             f"Platform ready — model: {self._configured_model}, "
             f"cwd: {self._cwd_path}"
         )
 
+    @asynccontextmanager
+    async def _run_slot(self) -> AsyncIterator[None]:
+        """Hold one of the ``MAX_CONCURRENT_RUNS`` global run slots."""
+        if self._run_slots is None:
+            self._active_runs += 1
+            try:
+                yield
+            finally:
+                self._active_runs -= 1
+            return
+
+        self._waiting_runs += 1
+        try:
+            await self._run_slots.acquire()
+        finally:
+            self._waiting_runs -= 1
+        self._active_runs += 1
+        try:
+            yield
+        finally:
+            self._active_runs -= 1
+            self._run_slots.release()
+
     async def _setup_platform(self) -> None:
         """Full platform setup: auth, workspace, MCP, observability."""
         # Session manager
         if self._session_manager is None:
-            self._session_manager = SessionManager()
+            self._session_manager = SessionManager(
+                queue_maxsize=self._queue_maxsize,
+                overflow=self._queue_overflow,
+                max_workers=self._max_workers,
+                idle_ttl=self._idle_ttl,
+                shutdown_timeout=self._shutdown_timeout,
+                session_index=self._open_session_index(),
+            )
 
         # Claude-specific auth
         from ambient_runner.bridges.claude.auth import setup_sdk_authentication
         from ambient_runner.platform.auth import populate_runtime_credentials
-        from ambient_runner.platform.workspace import resolve_workspace_paths, validate_prerequisites
+        from ambient_runner.platform.workspace import validate_prerequisites
 
         await validate_prerequisites(self._context)
         _api_key, _use_vertex, configured_model = await setup_sdk_authentication(
@@ -325,37 +703,80 @@ class ClaudeBridge(PlatformBridge):
         )
         await populate_runtime_credentials(self._context)
 
-        # Workspace paths
-        cwd_path, add_dirs = resolve_workspace_paths(self._context)
-
         # Observability (before MCP so rubric tool can access it)
         await self._setup_observability(configured_model)
+        self._configured_model = configured_model
+
+        self._configure_workspace()
 
-        # MCP servers
+    def _configure_workspace(self) -> list[str]:
+        """(Re)compute paths, MCP servers and system prompt from the workspace.
+
+        MCP servers are rebuilt only when their inputs (the runner MCP
+        config and the workflow rubric) changed.  Returns the names of the
+        settings that changed.
+        """
         from ambient_runner.bridges.claude.mcp import (
             build_allowed_tools,
             build_mcp_servers,
             log_auth_status,
         )
-
-        mcp_servers = build_mcp_servers(self._context, cwd_path, self._obs)
-        log_auth_status(mcp_servers)
-        allowed_tools = build_allowed_tools(mcp_servers)
-
-        # System prompt
         from ambient_runner.bridges.claude.prompts import build_sdk_system_prompt
+        from ambient_runner.bridges.claude.tools import load_rubric_content
+        from ambient_runner.platform.config import load_mcp_config
+        from ambient_runner.platform.workspace import resolve_workspace_paths
+
+        changed: list[str] = []
 
-        system_prompt = build_sdk_system_prompt(
-            self._context.workspace_path, cwd_path
+        cwd_path, add_dirs = resolve_workspace_paths(self._context)
+        if cwd_path != self._cwd_path:
+            changed.append("cwd")
+        if add_dirs != self._add_dirs:
+            changed.append("add_dirs")
+
+        mcp_key = options_fingerprint(
+            None,
+            config=load_mcp_config(self._context, cwd_path),
+            rubric=load_rubric_content(cwd_path),
         )
+        if mcp_key != self._mcp_key:
+            mcp_servers = build_mcp_servers(
+                self._context, cwd_path, self._obs, on_restart=self._request_restart
+            )
+            log_auth_status(mcp_servers)
+            self._mcp_servers = mcp_servers
+            self._allowed_tools = build_allowed_tools(mcp_servers)
+            self._mcp_key = mcp_key
+            changed.append("mcp_servers")
+
+        system_prompt = build_sdk_system_prompt(self._context.workspace_path, cwd_path)
+        if system_prompt != self._system_prompt:
+            changed.append("system_prompt")
 
-        # Store results
-        self._configured_model = configured_model
         self._cwd_path = cwd_path
         self._add_dirs = add_dirs
-        self._mcp_servers = mcp_servers
-        self._allowed_tools = allowed_tools
         self._system_prompt = system_prompt
+        return changed
+
+    def _fingerprint(self, options: Any, input_data: Optional[RunAgentInput] = None) -> str:
+        """Fingerprint the restart-relevant parts of *options*.
+
+        The system prompt is taken before the per-run state/context addendum,
+        which changes with every state update and needs no restart.
+        In-process MCP servers (frontend tools, rubric, corrections) are live
+        objects, so their definitions are fingerprinted instead.
+        """
+        if dataclasses.is_dataclass(options) and hasattr(options, "system_prompt"):
+            options = dataclasses.replace(options, system_prompt=self._system_prompt)
+        tools = input_data.tools if input_data is not None else None
+        return options_fingerprint(options, tools=tools or None, mcp=self._mcp_key)
+
+    def _open_session_index(self) -> Optional[SessionIndex]:
+        """Return the durable session index, or ``None`` when disabled."""
+        path = self._session_index_path
+        if path is None:
+            path = default_index_path()
+        return SessionIndex(path) if path else None
 
     async def _setup_observability(self, configured_model: str) -> None:
         """Initialise Langfuse observability (best-effort)."""
@@ -422,6 +843,9 @@ class ClaudeBridge(PlatformBridge):
             name="claude_code_runner",
             description="Ambient Code Platform Claude session",
             options=options,
+            messages_snapshot_mode=self._messages_snapshot_mode,
+            state_snapshot_interval=self._state_snapshot_interval,
+            tool_cache=self._tool_cache,
         )
         # Attach stderr buffer so error handler can read it
         adapter._stderr_lines = self._stderr_lines  # type: ignore[attr-defined]
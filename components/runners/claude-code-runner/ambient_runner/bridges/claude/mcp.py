@@ -11,7 +11,7 @@ import logging
 import os
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Callable, Dict, Optional
 
 from ambient_runner.platform.context import RunnerContext
 
@@ -24,13 +24,19 @@ DEFAULT_ALLOWED_TOOLS = [
 ]
 
 
-def build_mcp_servers(context: RunnerContext, cwd_path: str, obs: Any = None) -> dict:
+def build_mcp_servers(
+    context: RunnerContext,
+    cwd_path: str,
+    obs: Any = None,
+    on_restart: Optional[Callable[[], None]] = None,
+) -> dict:
     """Build the full MCP server config dict including platform tools.
 
     Args:
         context: Runner context.
         cwd_path: Working directory (used to find rubric files).
         obs: Optional ObservabilityManager (passed to rubric tool).
+        on_restart: Called when Claude invokes ``restart_session``.
 
     Returns:
         Dict of MCP server name -> server config.
@@ -49,7 +55,7 @@ def build_mcp_servers(context: RunnerContext, cwd_path: str, obs: Any = None) ->
     mcp_servers = load_mcp_config(context, cwd_path) or {}
 
     # Session control tool
-    restart_tool = create_restart_session_tool(None, sdk_tool)
+    restart_tool = create_restart_session_tool(on_restart, sdk_tool)
     session_server = create_sdk_mcp_server(
         name="session", version="1.0.0", tools=[restart_tool]
     )
@@ -12,6 +12,46 @@ handlers (see SDK issues #454 and #378).
 Graceful shutdown closes stdin and waits for the CLI to persist the session
 to ``.claude/`` so that ``--resume`` works on pod restart.
 
+Each turn's output goes through a bounded :class:`TurnQueue` so a slow
+consumer cannot make the worker buffer a whole tool-heavy turn in memory.
+When the queue is full the worker either waits (``"block"`` — the SDK
+reader stops pulling from the CLI) or, with ``"coalesce"``, merges the new
+streaming delta into the pending one.  Structural messages are never
+merged or dropped; they always wait for space.
+
+Live workers are bounded: ``SessionManager`` evicts the least recently used
+idle worker when ``max_workers`` is reached, and a background reaper evicts
+workers idle for longer than ``idle_ttl``.  Eviction is a graceful stop
+that records the CLI session ID; the next request for that thread gets a
+new worker started with ``resume=<session_id>``, so it continues the same
+conversation.  Workers in the middle of a turn are never evicted.
+
+Workers are also supervised.  When a worker's task exits unexpectedly or
+its CLI process dies, its in-flight and queued turns fail immediately with
+:class:`WorkerDeadError` instead of hanging, the worker is dropped, and the
+thread's next request respawns it with ``resume=<session_id>`` after an
+exponential backoff (reset once a worker has stayed up for a while).
+Callers wait the backoff out with :meth:`SessionManager.wait_respawn`
+before taking the thread lock; a request that gets the lock early fails
+with :class:`WorkerRespawningError` rather than sleeping while holding it.
+
+The manager remembers the fingerprint of the options each worker was
+started with (see :func:`options_fingerprint`).  When a request for its thread brings
+options with a different fingerprint — a per-run model override, a new
+frontend tool set, a rebuilt MCP configuration — the worker is stopped and
+recreated with ``resume=<session_id>``; threads whose options did not
+change keep their warm worker.
+
+:meth:`SessionManager.restart` replaces a worker without downtime: the
+replacement connects with ``resume=<session_id>`` while the old worker
+keeps serving, is swapped in under the thread lock, and the old worker is
+retired in the background.
+
+A turn in flight can be steered: :meth:`SessionWorker.inject` writes a new
+user message into the CLI's streaming input while the turn runs, without
+waiting for the thread lock, and marks the spot in the turn's output with
+an ``InjectedUserMessage``.
+
 Usage::
 
     manager = SessionManager()
@@ -26,16 +66,71 @@ Usage::
 """
 
 import asyncio
+import dataclasses
+import hashlib
+import json
 import logging
 import os
+import time
+import uuid
+from collections import deque
 from contextlib import suppress
-from typing import Any, AsyncIterator, Optional
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Callable, Optional
+
+from ambient_runner.bridges.claude.session_index import SessionIndex
 
 logger = logging.getLogger(__name__)
 
 # Sentinel that tells the worker loop to shut down.
 _SHUTDOWN = object()
 
+# Output queue overflow policies.
+OVERFLOW_BLOCK = "block"
+OVERFLOW_COALESCE = "coalesce"
+OVERFLOW_POLICIES = (OVERFLOW_BLOCK, OVERFLOW_COALESCE)
+
+DEFAULT_QUEUE_MAXSIZE = 1000
+
+# Worker pool bounds (0 disables the respective limit).
+DEFAULT_MAX_WORKERS = 16
+DEFAULT_IDLE_TTL_SECONDS = 1800.0
+
+# Crash supervision: health-check interval and respawn backoff.
+SUPERVISE_INTERVAL_SECONDS = 2.0
+RESTART_BACKOFF_SECONDS = 1.0
+RESTART_BACKOFF_MAX_SECONDS = 60.0
+# A worker that stayed up this long resets its thread's backoff.
+RESTART_HEALTHY_AFTER_SECONDS = 60.0
+
+# Budget for stopping every worker on shutdown; stragglers are killed.
+DEFAULT_SHUTDOWN_TIMEOUT_SECONDS = 45.0
+# Time allowed for killed workers to unwind after the deadline.
+_KILL_GRACE_SECONDS = 2.0
+
+# Warm-swap attempts before a restart falls back to stop-then-start.
+_SWAP_ATTEMPTS = 2
+
+# Thread served by the worker task this code runs in (None outside one).
+# In-process MCP tools run inside the worker task's context and read it to
+# find out which thread called them.
+_current_thread: ContextVar[Optional[str]] = ContextVar(
+    "session_worker_thread", default=None
+)
+
+
+def current_thread_id() -> Optional[str]:
+    """Return the thread ID of the session worker running the caller, if any."""
+    return _current_thread.get()
+
+
+# Stream delta type -> the field holding its text.
+_DELTA_TEXT_FIELDS = {
+    "text_delta": "text",
+    "thinking_delta": "thinking",
+    "input_json_delta": "partial_json",
+}
+
 
 class WorkerError:
     """Wrapper for exceptions forwarded through the output queue.
@@ -52,6 +147,244 @@ class WorkerError:
         self.exception = exception
 
 
+class WorkerDeadError(RuntimeError):
+    """The session worker's task or CLI process died mid-session."""
+
+
+class WorkerRespawningError(WorkerDeadError):
+    """The thread's worker crashed and its respawn backoff has not elapsed."""
+
+    def __init__(self, thread_id: str, retry_after: float) -> None:
+        super().__init__(
+            f"Session worker for thread={thread_id} is respawning in {retry_after:.1f}s"
+        )
+        self.retry_after = retry_after
+
+
+class QueueStats:
+    """Output queue depth counters for one worker, across all its turns."""
+
+    __slots__ = (
+        "maxsize",
+        "overflow",
+        "depth",
+        "high_water_mark",
+        "merged",
+        "blocked",
+        "blocked_seconds",
+    )
+
+    def __init__(self, maxsize: int, overflow: str) -> None:
+        self.maxsize = maxsize
+        self.overflow = overflow
+        self.depth = 0
+        self.high_water_mark = 0
+        self.merged = 0
+        self.blocked = 0
+        self.blocked_seconds = 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "maxsize": self.maxsize,
+            "overflow": self.overflow,
+            "depth": self.depth,
+            "highWaterMark": self.high_water_mark,
+            "merged": self.merged,
+            "blocked": self.blocked,
+            "blockedSeconds": round(self.blocked_seconds, 3),
+        }
+
+
+class PoolStats:
+    """Worker pool counters: live workers, evictions and resumes."""
+
+    __slots__ = (
+        "max_workers",
+        "idle_ttl",
+        "evicted_capacity",
+        "evicted_idle",
+        "resumed",
+        "resume_seconds",
+        "last_resume_seconds",
+        "crashes",
+        "reconfigured",
+        "swapped",
+        "swap_fallbacks",
+        "last_swap_seconds",
+    )
+
+    def __init__(self, max_workers: int, idle_ttl: float) -> None:
+        self.max_workers = max_workers
+        self.idle_ttl = idle_ttl
+        self.evicted_capacity = 0
+        self.evicted_idle = 0
+        self.resumed = 0
+        self.resume_seconds = 0.0
+        self.last_resume_seconds: Optional[float] = None
+        self.crashes = 0
+        self.reconfigured = 0
+        self.swapped = 0
+        self.swap_fallbacks = 0
+        self.last_swap_seconds: Optional[float] = None
+
+    def record_resume(self, seconds: float) -> None:
+        self.resumed += 1
+        self.resume_seconds += seconds
+        self.last_resume_seconds = seconds
+
+    def as_dict(self, live: int) -> dict:
+        avg = self.resume_seconds / self.resumed if self.resumed else None
+        return {
+            "live": live,
+            "maxWorkers": self.max_workers,
+            "idleTtlSeconds": self.idle_ttl,
+            "evicted": self.evicted_capacity + self.evicted_idle,
+            "evictedCapacity": self.evicted_capacity,
+            "evictedIdle": self.evicted_idle,
+            "resumed": self.resumed,
+            "lastResumeMs": (
+                round(self.last_resume_seconds * 1000, 1)
+                if self.last_resume_seconds is not None
+                else None
+            ),
+            "avgResumeMs": round(avg * 1000, 1) if avg is not None else None,
+            "crashes": self.crashes,
+            "reconfigured": self.reconfigured,
+            "swapped": self.swapped,
+            "swapFallbacks": self.swap_fallbacks,
+            "lastSwapMs": (
+                round(self.last_swap_seconds * 1000, 1)
+                if self.last_swap_seconds is not None
+                else None
+            ),
+        }
+
+
+class TurnQueue:
+    """Bounded single-producer / single-consumer queue for one turn.
+
+    The worker calls :meth:`put` for SDK messages and :meth:`put_control`
+    for the end-of-turn sentinel and forwarded errors, which bypass the
+    bound so a turn can always be terminated.  The consumer calls
+    :meth:`close` when it stops reading; later puts are discarded so the
+    worker can finish draining the SDK response without blocking.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = DEFAULT_QUEUE_MAXSIZE,
+        overflow: str = OVERFLOW_BLOCK,
+        stats: Optional[QueueStats] = None,
+    ) -> None:
+        if maxsize < 1:
+            raise ValueError("maxsize must be >= 1")
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(
+                f"Unknown overflow policy {overflow!r}; expected one of {OVERFLOW_POLICIES}"
+            )
+        self._items: deque = deque()
+        self._maxsize = maxsize
+        self._overflow = overflow
+        self._closed = False
+        self._not_empty = asyncio.Event()
+        self._not_full = asyncio.Event()
+        self.stats = stats or QueueStats(maxsize, overflow)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    async def put(self, item: Any) -> None:
+        """Enqueue an SDK message, applying the overflow policy when full."""
+        if self._closed:
+            return
+        if len(self._items) >= self._maxsize:
+            if self._overflow == OVERFLOW_COALESCE and self._merge_into_tail(item):
+                self.stats.merged += 1
+                return
+            self.stats.blocked += 1
+            started = time.monotonic()
+            while len(self._items) >= self._maxsize and not self._closed:
+                self._not_full.clear()
+                await self._not_full.wait()
+            self.stats.blocked_seconds += time.monotonic() - started
+            if self._closed:
+                return
+        self._append(item)
+
+    def put_control(self, item: Any) -> None:
+        """Enqueue a sentinel / error without waiting for space."""
+        if not self._closed:
+            self._append(item)
+
+    async def get(self) -> Any:
+        while not self._items:
+            self._not_empty.clear()
+            await self._not_empty.wait()
+        item = self._items.popleft()
+        self.stats.depth = len(self._items)
+        self._not_full.set()
+        return item
+
+    def close(self) -> None:
+        """Stop accepting items and release a blocked producer."""
+        self._closed = True
+        self._items.clear()
+        self.stats.depth = 0
+        self._not_full.set()
+
+    def _append(self, item: Any) -> None:
+        self._items.append(item)
+        depth = len(self._items)
+        self.stats.depth = depth
+        if depth > self.stats.high_water_mark:
+            self.stats.high_water_mark = depth
+        self._not_empty.set()
+
+    def _merge_into_tail(self, item: Any) -> bool:
+        """Merge a streaming delta into the last queued one, if compatible."""
+        if not self._items:
+            return False
+        merged = _merge_stream_deltas(self._items[-1], item)
+        if merged is None:
+            return False
+        self._items[-1] = merged
+        return True
+
+
+def _merge_stream_deltas(first: Any, second: Any) -> Any:
+    """Return one ``StreamEvent`` equivalent to *first* followed by *second*.
+
+    Only ``content_block_delta`` events of the same delta type, for the same
+    content block, session and parent tool call can be merged; anything else
+    returns ``None``.
+    """
+    a = getattr(first, "event", None)
+    b = getattr(second, "event", None)
+    if not isinstance(a, dict) or not isinstance(b, dict):
+        return None
+    if a.get("type") != "content_block_delta" or b.get("type") != "content_block_delta":
+        return None
+    if not dataclasses.is_dataclass(first) or type(first) is not type(second):
+        return None
+    if (
+        a.get("index") != b.get("index")
+        or getattr(first, "session_id", None) != getattr(second, "session_id", None)
+        or getattr(first, "parent_tool_use_id", None)
+        != getattr(second, "parent_tool_use_id", None)
+    ):
+        return None
+
+    delta_a = a.get("delta") or {}
+    delta_b = b.get("delta") or {}
+    delta_type = delta_a.get("type")
+    field = _DELTA_TEXT_FIELDS.get(delta_type)
+    if field is None or delta_b.get("type") != delta_type:
+        return None
+
+    merged_delta = {**delta_a, field: delta_a.get(field, "") + delta_b.get(field, "")}
+    return dataclasses.replace(first, event={**a, "delta": merged_delta})
+
+
 class SessionWorker:
     """Owns one ``ClaudeSDKClient`` in a long-lived background task.
 
@@ -65,41 +398,80 @@ class SessionWorker:
         thread_id: str,
         options: Any,
         api_key: str,
+        queue_maxsize: int = DEFAULT_QUEUE_MAXSIZE,
+        overflow: str = OVERFLOW_BLOCK,
+        on_connected: Optional[Callable[[float], None]] = None,
+        on_session_id: Optional[Callable[[str], None]] = None,
     ):
         self.thread_id = thread_id
         self._options = options
         self._api_key = api_key
+        self._queue_maxsize = queue_maxsize
+        self._overflow = overflow
+        self.queue_stats = QueueStats(queue_maxsize, overflow)
 
-        # Inbound: (prompt, session_id, output_queue) | _SHUTDOWN
+        # Inbound: (prompt, session_id, TurnQueue) | _SHUTDOWN
         self._input_queue: asyncio.Queue = asyncio.Queue()
         self._task: Optional[asyncio.Task] = None
         self._client: Optional[Any] = None  # ClaudeSDKClient once connected
+        self._connected = asyncio.Event()
+        self._on_connected = on_connected  # called with connect() seconds
+        self._on_session_id = on_session_id  # called when the CLI reports a new ID
 
         # Session ID returned by the CLI (for resume on restart)
         self.session_id: Optional[str] = None
 
+        # Monotonic time of the last turn start/end (for idle eviction)
+        self.last_active = time.monotonic()
+        self.started_at = time.monotonic()
+        self.turns = 0  # turns started (a warm swap checks none slipped in)
+
+        # Mid-turn steering: (prompt, message_id, delivered future) items
+        # for the turn in flight, written to the CLI by a per-turn pump
+        self._steering: Optional[asyncio.Queue] = None
+        self._turn_injected = 0
+        self.injected = 0  # steering messages delivered, across all turns
+
+        # Supervision: the turn being served, and why the worker died
+        self._turn: Optional[TurnQueue] = None
+        self._stopping = False
+        self.failure: Optional[BaseException] = None
+
     # ── lifecycle ──
 
     async def start(self) -> None:
         """Spawn the background task that owns the SDK client."""
         if self._task is not None:
             return
+        self.started_at = time.monotonic()
         self._task = asyncio.create_task(
             self._run(), name=f"session-worker-{self.thread_id}"
         )
         logger.info(f"[SessionWorker] Started worker for thread={self.thread_id}")
 
+    def add_exit_callback(self, callback: Callable[["SessionWorker"], None]) -> None:
+        """Call *callback(worker)* when the worker task finishes, for any reason."""
+        if self._task is None:
+            raise RuntimeError("Worker not started")
+        self._task.add_done_callback(lambda _task: callback(self))
+
     async def _run(self) -> None:
         """Main loop — runs entirely inside one stable async context."""
-        from claude_agent_sdk import ClaudeSDKClient, SystemMessage
+        from claude_agent_sdk import ClaudeSDKClient
 
         os.environ["ANTHROPIC_API_KEY"] = self._api_key
+        # Inherited by the SDK client's tasks, so MCP tools see the thread.
+        _current_thread.set(self.thread_id)
 
         client = ClaudeSDKClient(options=self._options)
         self._client = client
 
         try:
+            connect_started = time.monotonic()
             await client.connect()
+            self._connected.set()
+            if self._on_connected is not None:
+                self._on_connected(time.monotonic() - connect_started)
             logger.info(f"[SessionWorker] Connected for thread={self.thread_id}")
 
             while True:
@@ -112,41 +484,193 @@ class SessionWorker:
                     break
 
                 prompt, session_id, output_queue = item
+                self.turns += 1
+                self._turn = output_queue
+                steering: asyncio.Queue = asyncio.Queue()
+                self._steering = steering
+                self._turn_injected = 0
+                pump = asyncio.create_task(
+                    self._pump_steering(client, session_id, output_queue, steering),
+                    name=f"session-steer-{self.thread_id}",
+                )
 
                 try:
                     await client.query(prompt, session_id=session_id)
+                    await self._forward(client.receive_response(), output_queue)
 
-                    async for msg in client.receive_response():
-                        # Capture session_id from init message (for resume)
-                        if isinstance(msg, SystemMessage):
-                            data = getattr(msg, "data", {}) or {}
-                            if getattr(msg, "subtype", "") == "init":
-                                sid = data.get("session_id")
-                                if sid:
-                                    self.session_id = sid
-
-                        await output_queue.put(msg)
+                    # Every steering message written ends in a result of its
+                    # own; drain them all so none leaks into the next turn.
+                    answered = 0
+                    while answered < self._turn_injected:
+                        await self._forward(client.receive_response(), output_queue)
+                        answered += 1
 
                 except Exception as exc:
                     logger.error(
                         f"[SessionWorker] Error during query for "
                         f"thread={self.thread_id}: {exc}"
                     )
-                    await output_queue.put(WorkerError(exc))
+                    output_queue.put_control(WorkerError(exc))
                 finally:
                     # Sentinel: this turn is done (success or error).
-                    await output_queue.put(None)
+                    self._steering = None
+                    pump.cancel()
+                    _reject_steering(steering)
+                    self._turn = None
+                    output_queue.put_control(None)
 
         except Exception as exc:
             logger.error(f"[SessionWorker] Fatal error for thread={self.thread_id}: {exc}")
+            if self.failure is None:
+                self.failure = exc
         finally:
             self._client = None
+            self._connected.clear()
+            # Turns queued behind a dead worker would otherwise wait forever.
+            self._fail_pending()
             # Graceful shutdown: close stdin so the CLI saves the session
             # to .claude/ before being terminated.  This enables --resume
             # on pod restart.
             await self._graceful_disconnect(client)
             logger.info(f"[SessionWorker] Disconnected for thread={self.thread_id}")
 
+    async def _forward(self, response: AsyncIterator[Any], output_queue: TurnQueue) -> None:
+        """Copy one SDK response into *output_queue*."""
+        from claude_agent_sdk import SystemMessage
+
+        async for msg in response:
+            # Capture session_id from init message (for resume)
+            if isinstance(msg, SystemMessage):
+                data = getattr(msg, "data", {}) or {}
+                if getattr(msg, "subtype", "") == "init":
+                    sid = data.get("session_id")
+                    if sid and sid != self.session_id:
+                        self.session_id = sid
+                        if self._on_session_id is not None:
+                            self._on_session_id(sid)
+
+            await output_queue.put(msg)
+
+    async def _pump_steering(
+        self,
+        client: Any,
+        session_id: str,
+        output_queue: TurnQueue,
+        steering: asyncio.Queue,
+    ) -> None:
+        """Write steering messages into the CLI's input while the turn runs.
+
+        Runs as a child of the worker task, so the SDK client is still only
+        driven from the worker's own context.
+        """
+        from ag_ui_claude_sdk.types import InjectedUserMessage
+
+        while True:
+            prompt, message_id, delivered = await steering.get()
+            try:
+                await client.query(prompt, session_id=session_id)
+            except asyncio.CancelledError:
+                if not delivered.done():
+                    delivered.set_result(False)
+                raise
+            except Exception as exc:
+                logger.warning(
+                    f"[SessionWorker] Steering write failed for thread={self.thread_id}: {exc}"
+                )
+                delivered.set_result(False)
+                continue
+            self._turn_injected += 1
+            self.injected += 1
+            output_queue.put_control(InjectedUserMessage(id=message_id, content=prompt))
+            if not delivered.done():
+                delivered.set_result(True)
+
+    @property
+    def stopping(self) -> bool:
+        """Whether :meth:`stop` was requested (an exit is then expected)."""
+        return self._stopping
+
+    @property
+    def alive(self) -> bool:
+        """Whether the worker task is running and its CLI process (if known) is up."""
+        if self._task is None or self._task.done():
+            return False
+        return self.process_alive() is not False
+
+    def process_alive(self) -> Optional[bool]:
+        """Whether the CLI subprocess is running; ``None`` if not observable."""
+        transport = getattr(self._client, "_transport", None)
+        process = getattr(transport, "_process", None)
+        if process is None:
+            return None
+        return process.returncode is None
+
+    def kill(self) -> None:
+        """Force-stop: kill the CLI process and cancel the worker task.
+
+        Used when a graceful :meth:`stop` overruns the shutdown deadline;
+        the CLI gets no chance to persist the session.
+        """
+        self._stopping = True
+        transport = getattr(self._client, "_transport", None)
+        process = getattr(transport, "_process", None)
+        if process is not None and process.returncode is None:
+            with suppress(ProcessLookupError):
+                process.kill()
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+
+    def fail(self, exc: BaseException) -> None:
+        """Abort the worker: fail the in-flight turn with *exc* and cancel the task.
+
+        Called by the supervisor when the CLI process has died, so the
+        consumer gets an error now instead of waiting on a dead pipe.
+        """
+        if self.failure is None:
+            self.failure = exc
+        if self._turn is not None:
+            self._turn.put_control(WorkerError(exc))
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+
+    def _fail_pending(self) -> None:
+        """Fail every turn still queued for this worker."""
+        exc = self.failure or WorkerDeadError(
+            f"Session worker for thread={self.thread_id} exited"
+        )
+        while True:
+            try:
+                item = self._input_queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            if item is _SHUTDOWN:
+                continue
+            _prompt, _session_id, output_queue = item
+            output_queue.put_control(WorkerError(exc))
+            output_queue.put_control(None)
+
+    @property
+    def connected(self) -> bool:
+        """Whether the SDK client is connected and serving turns."""
+        return self._connected.is_set()
+
+    async def wait_connected(self) -> bool:
+        """Wait for the SDK client to connect.
+
+        Returns ``False`` if the worker exits (e.g. ``connect()`` failed)
+        before connecting.
+        """
+        if self._task is None:
+            return False
+        connected = asyncio.ensure_future(self._connected.wait())
+        try:
+            await asyncio.wait(
+                {connected, self._task}, return_when=asyncio.FIRST_COMPLETED
+            )
+        finally:
+            connected.cancel()
+        return self._connected.is_set()
+
     async def _graceful_disconnect(self, client: Any) -> None:
         """Close stdin, wait for CLI to save, then disconnect."""
         try:
@@ -177,6 +701,7 @@ class SessionWorker:
         """Signal the worker to shut down and wait for it to finish."""
         if self._task is None:
             return
+        self._stopping = True
         await self._input_queue.put(_SHUTDOWN)
         try:
             await asyncio.wait_for(self._task, timeout=15.0)
@@ -199,16 +724,41 @@ class SessionWorker:
 
         Safe to call from any async context (e.g. a FastAPI handler).
         """
-        output_queue: asyncio.Queue = asyncio.Queue()
+        if self._task is None or self._task.done():
+            raise WorkerDeadError(
+                f"Session worker for thread={self.thread_id} is not running"
+            ) from self.failure
+        output_queue = TurnQueue(self._queue_maxsize, self._overflow, self.queue_stats)
+        self.last_active = time.monotonic()
         await self._input_queue.put((prompt, session_id, output_queue))
 
-        while True:
-            item = await output_queue.get()
-            if item is None:
-                return
-            if isinstance(item, WorkerError):
-                raise item.exception
-            yield item
+        try:
+            while True:
+                item = await output_queue.get()
+                if item is None:
+                    return
+                if isinstance(item, WorkerError):
+                    raise item.exception
+                yield item
+        finally:
+            # Unblock the worker if we stopped reading mid-turn.
+            output_queue.close()
+            self.last_active = time.monotonic()
+
+    async def inject(self, prompt: str, message_id: Optional[str] = None) -> bool:
+        """Push *prompt* into the turn in flight, as if the user typed it mid-turn.
+
+        The CLI answers it with a result of its own, which the turn drains
+        before it ends; the turn's consumer sees an ``InjectedUserMessage`` where it was
+        written.  Returns ``False`` when no turn is in flight or the turn
+        ended before the message was written — send it as a new turn then.
+        """
+        steering = self._steering
+        if steering is None:
+            return False
+        delivered = asyncio.get_running_loop().create_future()
+        steering.put_nowait((prompt, message_id or str(uuid.uuid4()), delivered))
+        return await delivered
 
     async def interrupt(self) -> None:
         """Forward an interrupt signal to the underlying SDK client."""
@@ -221,6 +771,62 @@ class SessionWorker:
             logger.warning("[SessionWorker] Interrupt requested but no active client")
 
 
+def _reject_steering(steering: asyncio.Queue) -> None:
+    """Fail steering messages left unwritten when their turn ended."""
+    while True:
+        try:
+            _prompt, _message_id, delivered = steering.get_nowait()
+        except asyncio.QueueEmpty:
+            return
+        if not delivered.done():
+            delivered.set_result(False)
+
+
+def _supports_resume(options: Any) -> bool:
+    return dataclasses.is_dataclass(options) and hasattr(options, "resume")
+
+
+def options_fingerprint(options: Any, **extra: Any) -> str:
+    """Return a stable hash of the effective SDK *options*.
+
+    Keyword arguments whose value is not ``None`` are folded in, for inputs
+    the options only hold opaquely (e.g. the frontend tool definitions
+    behind an in-process MCP server).  Callables hash by qualified name and
+    other live objects by type, so rebuilding an equivalent configuration
+    yields the same fingerprint.
+    """
+    payload = [
+        _canonical(options),
+        _canonical({k: v for k, v in extra.items() if v is not None}),
+    ]
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode()).hexdigest()[:16]
+
+
+def _canonical(value: Any) -> Any:
+    """Reduce *value* to JSON-serialisable data for :func:`options_fingerprint`."""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    if isinstance(value, (set, frozenset)):
+        return sorted((_canonical(v) for v in value), key=repr)
+    if isinstance(value, os.PathLike):
+        return os.fspath(value)
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return {
+            f.name: _canonical(getattr(value, f.name))
+            for f in dataclasses.fields(value)
+        }
+    if hasattr(value, "model_dump"):
+        return _canonical(value.model_dump(mode="json"))
+    if callable(value):
+        return f"{getattr(value, '__module__', '')}.{getattr(value, '__qualname__', type(value).__qualname__)}"
+    return f"<{type(value).__module__}.{type(value).__qualname__}>"
+
+
 class SessionManager:
     """Creates, caches, and tears down :class:`SessionWorker` instances.
 
@@ -229,29 +835,170 @@ class SessionManager:
     mix messages on the single underlying SDK client).
 
     Tracks session IDs returned by the CLI so that workers can be recreated
-    with ``--resume`` after a pod restart.
+    with ``--resume`` after eviction or a pod restart.  With a
+    *session_index* the mapping is loaded at construction and written
+    whenever a worker reports a new session ID, so it survives the pod; a
+    resumed worker that exits before connecting drops its stale entry.
+
+    A worker is *idle* when its thread lock is free (no turn in flight).
+    Only idle workers are evicted: least recently active first when
+    *max_workers* is reached, and any idle longer than *idle_ttl* seconds
+    by a background reaper.  ``0`` disables either bound.
+
+    A supervisor drops workers whose task exited or whose CLI process died
+    (failing their turns) and delays the thread's respawn by an exponential
+    backoff, starting at *restart_backoff* and capped at
+    *restart_backoff_max* seconds.
+
+    A live worker whose options fingerprint differs from the one requested
+    is stopped and recreated (resuming its session) before it is returned.
+
+    :meth:`shutdown` stops all workers in parallel within
+    *shutdown_timeout* seconds and kills whatever is left.
     """
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        queue_maxsize: int = DEFAULT_QUEUE_MAXSIZE,
+        overflow: str = OVERFLOW_BLOCK,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        idle_ttl: float = DEFAULT_IDLE_TTL_SECONDS,
+        restart_backoff: float = RESTART_BACKOFF_SECONDS,
+        restart_backoff_max: float = RESTART_BACKOFF_MAX_SECONDS,
+        supervise_interval: float = SUPERVISE_INTERVAL_SECONDS,
+        shutdown_timeout: float = DEFAULT_SHUTDOWN_TIMEOUT_SECONDS,
+        session_index: Optional[SessionIndex] = None,
+    ) -> None:
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(
+                f"Unknown overflow policy {overflow!r}; expected one of {OVERFLOW_POLICIES}"
+            )
+        self._queue_maxsize = queue_maxsize
+        self._overflow = overflow
         self._workers: dict[str, SessionWorker] = {}
         self._locks: dict[str, asyncio.Lock] = {}
         self._session_ids: dict[str, str] = {}  # thread_id -> CLI session_id
+        self._fingerprints: dict[str, str] = {}  # thread_id -> options fingerprint
+        self.pool_stats = PoolStats(max_workers, idle_ttl)
+        self._reaper: Optional[asyncio.Task] = None
+        self._stopping: set[asyncio.Task] = set()  # evicted workers shutting down
+
+        # Crash supervision
+        self._restart_backoff = restart_backoff
+        self._restart_backoff_max = restart_backoff_max
+        self._supervise_interval = supervise_interval
+        self._supervisor: Optional[asyncio.Task] = None
+        self._crash_streak: dict[str, int] = {}  # thread_id -> consecutive crashes
+        self._restarts: dict[str, int] = {}  # thread_id -> total respawns
+        self._respawn_at: dict[str, float] = {}  # thread_id -> monotonic deadline
+        self._shutdown_timeout = shutdown_timeout
+
+        # Durable thread -> session mapping (resume after pod restart)
+        self._session_index = session_index
+        self._resuming: set[str] = set()  # resumed workers not yet connected
+        if session_index is not None:
+            self._session_ids.update(session_index.load())
 
     async def get_or_create(
         self,
         thread_id: str,
         options: Any,
         api_key: str,
+        fingerprint: Optional[str] = None,
     ) -> SessionWorker:
-        """Return the worker for *thread_id*, creating one if needed."""
+        """Return the worker for *thread_id*, creating one if needed.
+
+        A new worker for a thread whose session ID is known (e.g. it was
+        evicted) resumes that session unless *options* already set
+        ``resume``.  An existing worker started with a different
+        *fingerprint* (default: :func:`options_fingerprint` of *options*)
+        is replaced.  Callers should hold the thread's lock.
+
+        Raises :class:`WorkerRespawningError` if the thread's worker crashed
+        and its backoff has not elapsed; see :meth:`wait_respawn`.
+        """
+        if fingerprint is None:
+            fingerprint = options_fingerprint(options)
+
+        existing = self._workers.get(thread_id)
+        if existing is not None and not existing.alive:
+            self._on_worker_exit(existing)
+            if existing.failure is None:
+                existing.fail(WorkerDeadError("CLI process exited"))
+        elif existing is not None:
+            # A worker registered without a fingerprint adopts this one.
+            if self._fingerprints.setdefault(thread_id, fingerprint) != fingerprint:
+                await self._reconfigure(thread_id)
+
         if thread_id not in self._workers:
-            worker = SessionWorker(thread_id, options, api_key)
-            await worker.start()
+            delay = self.respawn_delay(thread_id)
+            if delay > 0:
+                raise WorkerRespawningError(thread_id, delay)
+            if self._respawn_at.pop(thread_id, None) is not None:
+                self._restarts[thread_id] = self._restarts.get(thread_id, 0) + 1
+            await self._make_room()
+            worker = await self._spawn(thread_id, options, api_key)
             self._workers[thread_id] = worker
-            self._locks[thread_id] = asyncio.Lock()
+            self._fingerprints[thread_id] = fingerprint
+            # Keep an existing lock: the caller may already hold it.
+            self._locks.setdefault(thread_id, asyncio.Lock())
+            self._ensure_reaper()
+            self._ensure_supervisor()
             logger.debug(f"[SessionManager] Created worker for thread={thread_id}")
         return self._workers[thread_id]
 
+    async def _spawn(self, thread_id: str, options: Any, api_key: str) -> SessionWorker:
+        """Start a worker for *thread_id*, resuming its known session.
+
+        The worker is not registered; the caller decides when it serves.
+        """
+        on_connected = None
+        self._resuming.discard(thread_id)
+        session_id = self._session_ids.get(thread_id)
+        if session_id and _supports_resume(options) and not options.resume:
+            options = dataclasses.replace(options, resume=session_id)
+            self._resuming.add(thread_id)
+
+            def on_connected(seconds: float, tid: str = thread_id) -> None:
+                self._resuming.discard(tid)
+                self.pool_stats.record_resume(seconds)
+
+            logger.info(
+                f"[SessionManager] Resuming session {session_id} for thread={thread_id}"
+            )
+        worker = SessionWorker(
+            thread_id,
+            options,
+            api_key,
+            queue_maxsize=self._queue_maxsize,
+            overflow=self._overflow,
+            on_connected=on_connected,
+            on_session_id=lambda sid, tid=thread_id: self._record_session_id(tid, sid),
+        )
+        await worker.start()
+        worker.add_exit_callback(self._on_worker_exit)
+        return worker
+
+    def respawn_delay(self, thread_id: str) -> float:
+        """Return the seconds left before *thread_id*'s worker may respawn."""
+        respawn_at = self._respawn_at.get(thread_id)
+        if respawn_at is None:
+            return 0.0
+        return max(0.0, respawn_at - time.monotonic())
+
+    async def wait_respawn(self, thread_id: str) -> None:
+        """Sleep until *thread_id*'s worker may respawn after a crash.
+
+        Call this *before* taking the thread's lock, so interrupts, steering
+        and queued runs are not held up by the backoff.
+        """
+        delay = self.respawn_delay(thread_id)
+        if delay > 0:
+            logger.info(
+                f"[SessionManager] Respawning thread={thread_id} in {delay:.1f}s"
+            )
+            await asyncio.sleep(delay)
+
     def get_existing(self, thread_id: str) -> Optional[SessionWorker]:
         """Return the worker for *thread_id* if it exists, else ``None``."""
         return self._workers.get(thread_id)
@@ -269,6 +1016,269 @@ class SessionManager:
             return worker.session_id
         return self._session_ids.get(thread_id)
 
+    def known_threads(self) -> list[str]:
+        """Return thread IDs with a known CLI session, live or not."""
+        return list(self._session_ids)
+
+    def _record_session_id(self, thread_id: str, session_id: str) -> None:
+        self._session_ids[thread_id] = session_id
+        if self._session_index is not None:
+            self._session_index.set(thread_id, session_id)
+
+    def get_queue_stats(self) -> dict[str, dict]:
+        """Return output queue stats keyed by ``thread_id``."""
+        return {
+            tid: worker.queue_stats.as_dict() for tid, worker in self._workers.items()
+        }
+
+    def get_pool_stats(self) -> dict:
+        """Return live worker, eviction, resume and crash/restart counters."""
+        stats = self.pool_stats.as_dict(len(self._workers))
+        stats["restarts"] = sum(self._restarts.values())
+        now = time.monotonic()
+        stats["restarting"] = {
+            tid: {
+                "restarts": self._restarts.get(tid, 0),
+                "crashStreak": self._crash_streak.get(tid, 0),
+                "respawnInSeconds": round(max(0.0, at - now), 1),
+            }
+            for tid, at in self._respawn_at.items()
+        }
+        return stats
+
+    async def _reconfigure(self, thread_id: str) -> None:
+        """Stop the thread's worker so it is recreated with new options.
+
+        The caller holds the thread's lock, so the worker is idle; the stop
+        lets the CLI persist the session before the replacement resumes it.
+        """
+        worker = self._workers.pop(thread_id)
+        if worker.session_id:
+            self._session_ids[thread_id] = worker.session_id
+        self.pool_stats.reconfigured += 1
+        logger.info(
+            f"[SessionManager] Options changed for thread={thread_id}; "
+            f"restarting worker (session={worker.session_id})"
+        )
+        await worker.stop()
+
+    async def restart(
+        self,
+        thread_id: str,
+        options: Any,
+        api_key: str,
+        fingerprint: Optional[str] = None,
+    ) -> SessionWorker:
+        """Replace the thread's worker without a gap in service.
+
+        A replacement resuming the thread's session is started and connected
+        while the current worker keeps serving; it is then swapped in under
+        the thread's lock and the old worker is stopped in the background.
+        If the old worker ran a turn meanwhile, the replacement (which would
+        miss that turn) is discarded and the swap retried; after
+        ``_SWAP_ATTEMPTS`` the thread falls back to stop-then-start.
+
+        Callers must not hold the thread's lock.
+        """
+        if fingerprint is None:
+            fingerprint = options_fingerprint(options)
+        lock = self.get_lock(thread_id)
+
+        for _ in range(_SWAP_ATTEMPTS):
+            old = self._workers.get(thread_id)
+            if old is None or not old.alive:
+                break
+            if old.session_id:
+                self._session_ids[thread_id] = old.session_id
+            turns = old.turns
+            started = time.monotonic()
+            replacement = await self._spawn(thread_id, options, api_key)
+            try:
+                connected = await replacement.wait_connected()
+            except asyncio.CancelledError:
+                self._retire(replacement)
+                raise
+            if not connected:
+                self._resuming.discard(thread_id)
+                await replacement.stop()
+                raise WorkerDeadError(
+                    f"Replacement worker for thread={thread_id} failed to connect"
+                )
+
+            async with lock:
+                if self._workers.get(thread_id) is old and old.turns == turns:
+                    self._workers[thread_id] = replacement
+                    self._fingerprints[thread_id] = fingerprint
+                    self._retire(old)
+                    elapsed = time.monotonic() - started
+                    self.pool_stats.swapped += 1
+                    self.pool_stats.last_swap_seconds = elapsed
+                    logger.info(
+                        f"[SessionManager] Swapped worker for thread={thread_id} "
+                        f"in {elapsed:.2f}s (session={replacement.session_id or old.session_id})"
+                    )
+                    return replacement
+            logger.info(
+                f"[SessionManager] Worker for thread={thread_id} changed during swap; retrying"
+            )
+            await replacement.stop()
+
+        await self.wait_respawn(thread_id)
+        async with lock:
+            if thread_id in self._workers:
+                self.pool_stats.swap_fallbacks += 1
+                await self._reconfigure(thread_id)
+            return await self.get_or_create(thread_id, options, api_key, fingerprint)
+
+    def _retire(self, worker: SessionWorker) -> None:
+        """Stop a worker that no longer serves its thread, in the background."""
+        task = asyncio.create_task(worker.stop(), name=f"session-retire-{worker.thread_id}")
+        self._stopping.add(task)
+        task.add_done_callback(self._stopping.discard)
+
+    # ── supervision ──
+
+    def _on_worker_exit(self, worker: SessionWorker) -> None:
+        """Drop a worker that exited without being asked to, and schedule its respawn."""
+        if worker.stopping or self._workers.get(worker.thread_id) is not worker:
+            return
+        tid = worker.thread_id
+        del self._workers[tid]
+        if worker.session_id:
+            self._session_ids[tid] = worker.session_id
+        elif tid in self._resuming:
+            # The session could not be resumed (e.g. .claude/ was lost);
+            # respawn fresh instead of retrying the same resume forever.
+            self._resuming.discard(tid)
+            stale = self._session_ids.pop(tid, None)
+            if self._session_index is not None:
+                self._session_index.discard(tid)
+            logger.warning(
+                f"[SessionManager] Dropping unresumable session {stale} for thread={tid}"
+            )
+
+        uptime = time.monotonic() - worker.started_at
+        streak = 1 if uptime >= RESTART_HEALTHY_AFTER_SECONDS else self._crash_streak.get(tid, 0) + 1
+        self._crash_streak[tid] = streak
+        backoff = min(self._restart_backoff * 2 ** (streak - 1), self._restart_backoff_max)
+        self._respawn_at[tid] = time.monotonic() + backoff
+        self.pool_stats.crashes += 1
+        logger.error(
+            f"[SessionManager] Worker for thread={tid} died after {uptime:.1f}s "
+            f"({worker.failure or 'exited'}); respawn with resume in {backoff:.1f}s "
+            f"(crash #{streak})"
+        )
+
+    def check_workers(self) -> int:
+        """Fail workers whose CLI process has died; return how many."""
+        dead = 0
+        for worker in list(self._workers.values()):
+            if worker.process_alive() is False:
+                dead += 1
+                worker.fail(WorkerDeadError("Claude CLI process exited"))
+        return dead
+
+    def _ensure_supervisor(self) -> None:
+        if self._supervise_interval <= 0 or (
+            self._supervisor is not None and not self._supervisor.done()
+        ):
+            return
+        self._supervisor = asyncio.create_task(self._supervise(), name="session-supervisor")
+
+    async def _supervise(self) -> None:
+        while True:
+            await asyncio.sleep(self._supervise_interval)
+            try:
+                self.check_workers()
+            except Exception as exc:
+                logger.warning(f"[SessionManager] Worker health check failed: {exc}")
+
+    # ── eviction ──
+
+    def _is_idle(self, thread_id: str) -> bool:
+        lock = self._locks.get(thread_id)
+        return lock is None or not lock.locked()
+
+    async def _make_room(self) -> None:
+        """Evict least recently active idle workers down to ``max_workers - 1``."""
+        limit = self.pool_stats.max_workers
+        if limit <= 0:
+            return
+        while len(self._workers) >= limit:
+            idle = [tid for tid in self._workers if self._is_idle(tid)]
+            if not idle:
+                logger.warning(
+                    f"[SessionManager] {len(self._workers)} workers busy, "
+                    f"exceeding max_workers={limit}"
+                )
+                return
+            lru = min(idle, key=lambda tid: self._workers[tid].last_active)
+            await self._evict(lru)
+            self.pool_stats.evicted_capacity += 1
+
+    async def evict_idle(self) -> int:
+        """Evict workers idle for longer than ``idle_ttl``; return the count."""
+        ttl = self.pool_stats.idle_ttl
+        if ttl <= 0:
+            return 0
+        cutoff = time.monotonic() - ttl
+        expired = [
+            tid
+            for tid, worker in self._workers.items()
+            if worker.last_active < cutoff and self._is_idle(tid)
+        ]
+        for tid in expired:
+            if tid in self._workers and self._is_idle(tid):
+                await self._evict(tid)
+                self.pool_stats.evicted_idle += 1
+        return len(expired)
+
+    async def _evict(self, thread_id: str) -> None:
+        """Remove an idle worker and stop it in the background.
+
+        The thread's lock is held until the worker has stopped, so a new
+        request for the thread waits for the CLI to persist the session
+        before resuming it.
+        """
+        lock = self.get_lock(thread_id)
+        await lock.acquire()
+        worker = self._workers.pop(thread_id, None)
+        if worker is None:
+            lock.release()
+            return
+        if worker.session_id:
+            self._session_ids[thread_id] = worker.session_id
+        logger.info(
+            f"[SessionManager] Evicting idle worker for thread={thread_id} "
+            f"(session={worker.session_id})"
+        )
+
+        async def _stop() -> None:
+            try:
+                await worker.stop()
+            finally:
+                lock.release()
+
+        task = asyncio.create_task(_stop(), name=f"session-evict-{thread_id}")
+        self._stopping.add(task)
+        task.add_done_callback(self._stopping.discard)
+
+    def _ensure_reaper(self) -> None:
+        ttl = self.pool_stats.idle_ttl
+        if ttl <= 0 or (self._reaper is not None and not self._reaper.done()):
+            return
+        self._reaper = asyncio.create_task(
+            self._reap(min(ttl / 4, 60.0)), name="session-reaper"
+        )
+
+    async def _reap(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.evict_idle()
+            except Exception as exc:
+                logger.warning(f"[SessionManager] Idle eviction failed: {exc}")
+
     async def destroy(self, thread_id: str) -> None:
         """Stop and remove the worker for *thread_id*.
 
@@ -281,11 +1291,82 @@ class SessionManager:
                 self._session_ids[thread_id] = worker.session_id
             await worker.stop()
         self._locks.pop(thread_id, None)
+        self._fingerprints.pop(thread_id, None)
         logger.debug(f"[SessionManager] Destroyed worker for thread={thread_id}")
 
-    async def shutdown(self) -> None:
-        """Stop all workers gracefully.  Call on server shutdown."""
-        thread_ids = list(self._workers.keys())
-        for tid in thread_ids:
-            await self.destroy(tid)
-        logger.info("[SessionManager] All workers shut down")
+    async def shutdown(self, timeout: Optional[float] = None) -> None:
+        """Stop all workers concurrently.  Call on server shutdown.
+
+        Every worker gets a graceful stop (so its CLI persists the session)
+        under one shared deadline of *timeout* seconds (default: the
+        manager's ``shutdown_timeout``).  Workers still stopping at the
+        deadline are killed.  Each worker's outcome is logged.
+        """
+        started = time.monotonic()
+        budget = self._shutdown_timeout if timeout is None else timeout
+        for task in (self._reaper, self._supervisor):
+            if task is not None:
+                task.cancel()
+                with suppress(asyncio.CancelledError):
+                    await task
+        self._reaper = self._supervisor = None
+
+        workers = list(self._workers.values())
+        self._workers.clear()
+        self._fingerprints.clear()
+        self._locks.clear()
+        for worker in workers:
+            if worker.session_id:
+                self._session_ids[worker.thread_id] = worker.session_id
+
+        stops = {
+            asyncio.create_task(worker.stop(), name=f"session-stop-{worker.thread_id}"): worker
+            for worker in workers
+        }
+        # Evictions already in flight count against the same deadline.
+        pending_evictions = set(self._stopping)
+        if stops or pending_evictions:
+            logger.info(
+                f"[SessionManager] Stopping {len(stops)} worker(s) "
+                f"within {budget:.1f}s"
+            )
+            await asyncio.wait(
+                [*stops, *pending_evictions], timeout=max(budget, 0.0)
+            )
+
+        killed = [stop for stop in stops if not stop.done()]
+        for stop in killed:
+            stops[stop].kill()
+        if killed:
+            await asyncio.wait(killed, timeout=_KILL_GRACE_SECONDS)
+            for stop in killed:
+                stop.cancel()
+
+        outcomes = {"stopped": 0, "failed": 0, "killed": len(killed)}
+        for stop, worker in stops.items():
+            if stop in killed:
+                logger.warning(
+                    f"[SessionManager] Worker for thread={worker.thread_id} "
+                    f"killed at the shutdown deadline (session={worker.session_id} "
+                    "may not be persisted)"
+                )
+            elif not stop.cancelled() and stop.exception() is not None:
+                outcomes["failed"] += 1
+                logger.warning(
+                    f"[SessionManager] Worker for thread={worker.thread_id} "
+                    f"failed to stop: {stop.exception()}"
+                )
+            else:
+                outcomes["stopped"] += 1
+                logger.info(
+                    f"[SessionManager] Worker for thread={worker.thread_id} stopped"
+                )
+        for task in pending_evictions:
+            if not task.done():
+                task.cancel()
+
+        logger.info(
+            f"[SessionManager] All workers shut down in "
+            f"{time.monotonic() - started:.1f}s ({outcomes['stopped']} stopped, "
+            f"{outcomes['failed']} failed, {outcomes['killed']} killed)"
+        )
@@ -0,0 +1,116 @@
+"""
+Durable thread → CLI session index.
+
+The Claude CLI persists conversations in its config directory
+(``$CLAUDE_CONFIG_DIR``, default ``~/.claude`` — ``/app/.claude`` in the
+runner image), which state-sync carries across a pod restart, but the mapping from AG-UI ``thread_id`` to the CLI's
+``session_id`` lives in ``SessionManager`` memory.  ``SessionIndex`` keeps
+that mapping in a small JSON file next to the CLI state so a restarted
+runner can create each thread's worker with ``resume=<session_id>``.
+
+Writes are atomic (temp file + ``os.replace``) and best-effort: a failed
+write is logged and the in-memory mapping stays authoritative.
+
+File format::
+
+    {"version": 1,
+     "threads": {"thread-1": {"sessionId": "…", "updatedAt": 1760000000.0}}}
+"""
+
+import json
+import logging
+import os
+import tempfile
+import time
+from contextlib import suppress
+from pathlib import Path
+from typing import Union
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 1
+
+# Default file name, inside the CLI's config directory (see default_index_path).
+DEFAULT_INDEX_FILENAME = "ambient-session-index.json"
+
+
+def default_index_path() -> Path:
+    """Return the index location next to the CLI's own session state."""
+    config_dir = os.getenv("CLAUDE_CONFIG_DIR") or os.path.join(
+        os.path.expanduser("~"), ".claude"
+    )
+    return Path(config_dir) / DEFAULT_INDEX_FILENAME
+
+
+class SessionIndex:
+    """Thread-to-session mapping persisted as an atomically written JSON file."""
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        self.path = Path(path)
+        self._entries: dict[str, dict] = {}
+        self.writes = 0
+
+    def load(self) -> dict[str, str]:
+        """Read the index from disk; return ``{thread_id: session_id}``.
+
+        A missing, unreadable or incompatible file yields an empty index.
+        """
+        try:
+            data = json.loads(self.path.read_text())
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as exc:
+            logger.warning(
+                f"[SessionIndex] Ignoring unreadable index {self.path}: {exc}"
+            )
+            return {}
+        if not isinstance(data, dict) or data.get("version") != INDEX_VERSION:
+            logger.warning(
+                f"[SessionIndex] Ignoring index {self.path} with unknown format"
+            )
+            return {}
+
+        threads = data.get("threads")
+        if isinstance(threads, dict):
+            self._entries = {
+                tid: entry
+                for tid, entry in threads.items()
+                if isinstance(entry, dict) and isinstance(entry.get("sessionId"), str)
+            }
+        logger.info(
+            f"[SessionIndex] Loaded {len(self._entries)} session(s) from {self.path}"
+        )
+        return {tid: entry["sessionId"] for tid, entry in self._entries.items()}
+
+    def set(self, thread_id: str, session_id: str) -> None:
+        """Record *session_id* for *thread_id*; writes only when it changed."""
+        entry = self._entries.get(thread_id)
+        if entry is not None and entry.get("sessionId") == session_id:
+            return
+        self._entries[thread_id] = {"sessionId": session_id, "updatedAt": time.time()}
+        self._write()
+
+    def discard(self, thread_id: str) -> None:
+        """Forget *thread_id* (e.g. its session could not be resumed)."""
+        if self._entries.pop(thread_id, None) is not None:
+            self._write()
+
+    def _write(self) -> None:
+        payload = json.dumps({"version": INDEX_VERSION, "threads": self._entries})
+        tmp_path = None
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile(
+                "w", dir=self.path.parent, prefix=f".{self.path.name}.", delete=False
+            ) as tmp:
+                tmp_path = tmp.name
+                tmp.write(payload)
+                tmp.flush()
+                os.fsync(tmp.fileno())
+            os.replace(tmp_path, self.path)
+            self.writes += 1
+        except OSError as exc:
+            logger.warning(f"[SessionIndex] Failed to write {self.path}: {exc}")
+            if tmp_path is not None:
+                with suppress(OSError):
+                    os.unlink(tmp_path)
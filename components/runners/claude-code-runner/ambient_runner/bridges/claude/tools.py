@@ -24,12 +24,12 @@ logger = logging.getLogger(__name__)
 # ------------------------------------------------------------------
 
 
-def create_restart_session_tool(adapter_ref, sdk_tool_decorator):
+def create_restart_session_tool(on_restart, sdk_tool_decorator):
     """Create the restart_session MCP tool.
 
     Args:
-        adapter_ref: Reference to the ClaudeCodeAdapter instance
-            (used to set _restart_requested flag).
+        on_restart: Callable invoked when Claude requests a restart, or
+            ``None`` to only log the request.
         sdk_tool_decorator: The ``tool`` decorator from ``claude_agent_sdk``.
 
     Returns:
@@ -43,8 +43,9 @@ def create_restart_session_tool(adapter_ref, sdk_tool_decorator):
     )
     async def restart_session_tool(args: dict) -> dict:
         """Tool that allows Claude to request a session restart."""
-        adapter_ref._restart_requested = True
         logger.info("Session restart requested by Claude via MCP tool")
+        if on_restart is not None:
+            on_restart()
         return {
             "content": [
                 {
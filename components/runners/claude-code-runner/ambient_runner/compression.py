@@ -0,0 +1,130 @@
+"""
+Flush-aware streaming compression for long-lived event streams.
+
+Generic HTTP compression buffers output until it has a worthwhile block,
+which stalls a token stream.  Here every chunk (one encoded event) is
+compressed and then *flushed* — ``Z_SYNC_FLUSH`` for gzip, a block flush
+for zstd — so the client can decode each event as soon as it arrives,
+while the compressor keeps its window across events and still exploits
+the heavy repetition between AG-UI frames.
+
+Compression is opt-in: the server lists the encodings it is willing to use
+(``AGUI_STREAM_COMPRESSION=zstd,gzip``) and each client picks via
+``Accept-Encoding``.  zstd needs the optional ``zstandard`` package.
+
+Usage::
+
+    encoding = negotiate_encoding(request.headers.get("accept-encoding"))
+    if encoding:
+        body = compress_stream(frames, encoding)
+        headers["Content-Encoding"] = encoding
+"""
+
+import os
+import zlib
+from typing import AsyncIterator, Optional, Sequence, Union
+
+try:
+    import zstandard
+except ImportError:  # optional: zstd is skipped during negotiation
+    zstandard = None
+
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 3
+
+# Server preference order when the client accepts several at equal q.
+_PREFERENCE = ("zstd", "gzip")
+
+
+def available_encodings() -> tuple[str, ...]:
+    """Encodings this process can produce."""
+    return tuple(e for e in _PREFERENCE if e != "zstd" or zstandard is not None)
+
+
+def enabled_encodings() -> tuple[str, ...]:
+    """Encodings enabled via ``AGUI_STREAM_COMPRESSION`` (empty = off)."""
+    configured = {
+        e.strip().lower()
+        for e in os.getenv("AGUI_STREAM_COMPRESSION", "").split(",")
+        if e.strip()
+    }
+    return tuple(e for e in available_encodings() if e in configured)
+
+
+def negotiate_encoding(
+    accept_encoding: Optional[str],
+    enabled: Optional[Sequence[str]] = None,
+) -> Optional[str]:
+    """Pick the best enabled encoding the client accepts, or ``None``.
+
+    Honours q-values (``q=0`` refuses an encoding); ``*`` matches any
+    enabled encoding not listed explicitly.
+    """
+    enabled = enabled_encodings() if enabled is None else tuple(enabled)
+    if not enabled or not accept_encoding:
+        return None
+
+    weights: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key.strip() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[name] = q
+
+    best, best_q = None, 0.0
+    for encoding in enabled:
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+class _GzipFlusher:
+    def __init__(self) -> None:
+        self._z = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def chunk(self, data: bytes) -> bytes:
+        return self._z.compress(data) + self._z.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._z.flush(zlib.Z_FINISH)
+
+
+class _ZstdFlusher:
+    def __init__(self) -> None:
+        self._z = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compressobj()
+
+    def chunk(self, data: bytes) -> bytes:
+        return self._z.compress(data) + self._z.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._z.flush(zstandard.COMPRESSOBJ_FLUSH_FINISH)
+
+
+async def compress_stream(
+    chunks: AsyncIterator[Union[str, bytes]],
+    encoding: str,
+) -> AsyncIterator[bytes]:
+    """Compress *chunks* with *encoding*, flushing after every chunk."""
+    if encoding == "gzip":
+        flusher = _GzipFlusher()
+    elif encoding == "zstd" and zstandard is not None:
+        flusher = _ZstdFlusher()
+    else:
+        raise ValueError(f"Unsupported stream encoding: {encoding!r}")
+
+    async for chunk in chunks:
+        data = chunk.encode() if isinstance(chunk, str) else chunk
+        out = flusher.chunk(data)
+        if out:
+            yield out
+    yield flusher.finish()
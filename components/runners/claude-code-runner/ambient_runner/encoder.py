@@ -0,0 +1,214 @@
+"""
+AG-UI event encoders for the run endpoint.
+
+Two transports are offered, negotiated per subscriber from ``Accept``:
+
+- ``text/event-stream`` (default, browsers) — :class:`FastEventEncoder`;
+- ``application/vnd.ag-ui.event+msgpack`` (backend relays) —
+  :class:`MsgpackEventEncoder`, length-prefixed binary frames.
+
+SSE
+---
+
+``ag_ui.encoder.EventEncoder`` serialises every event with
+``model_dump_json(by_alias=True, exclude_none=True)``.  For the events that
+dominate a run — one per token or JSON fragment — that generic Pydantic
+walk is most of the per-event cost.  ``FastEventEncoder`` is a drop-in
+subclass that formats these events directly:
+
+- ``TEXT_MESSAGE_CONTENT``, ``THINKING_TEXT_MESSAGE_CONTENT``,
+  ``TOOL_CALL_ARGS`` and ``STATE_SNAPSHOT`` are written from pre-built JSON
+  prefixes, with only the variable values passed through
+  ``pydantic_core.to_json`` (the same serialiser Pydantic uses, so string
+  escaping is identical);
+- everything else, and any hot event carrying ``timestamp`` or
+  ``raw_event``, falls back to the generic path.
+
+The output is byte-for-byte identical to ``EventEncoder.encode``, including
+extra fields such as ``thread_id`` / ``run_id`` (emitted after the declared
+fields, un-aliased, with ``None`` values dropped).
+
+Usage::
+
+    from ambient_runner.encoder import FastEventEncoder
+
+    encoder = FastEventEncoder(accept=request.headers.get("accept"))
+    async for event in bridge.run(input_data):
+        yield encoder.encode(event)
+
+Binary framing
+--------------
+
+Every frame is a 4-byte big-endian length followed by a msgpack array
+``[seq, payload]``.  The first frame has ``seq == 0`` and a header payload
+``{"threadId": ..., "runId": ...}``; every later frame carries an event
+(camelCase keys, ``None`` dropped, as in the JSON encoding) with its
+replay sequence number.  ``thread_id`` / ``run_id`` extras equal to the
+header values are omitted from events — the reader restores them from the
+header.  Requires the optional ``msgpack`` package (``[binary]`` extra);
+without it negotiation falls back to SSE.
+"""
+
+import struct
+from typing import Any, Callable, Optional
+
+from ag_ui.core import (
+    BaseEvent,
+    StateSnapshotEvent,
+    TextMessageContentEvent,
+    ThinkingTextMessageContentEvent,
+    ToolCallArgsEvent,
+)
+from ag_ui.encoder import EventEncoder
+from pydantic_core import to_json
+
+try:
+    import msgpack
+except ImportError:  # optional: binary transport falls back to SSE
+    msgpack = None
+
+MSGPACK_MEDIA_TYPE = "application/vnd.ag-ui.event+msgpack"
+
+_LENGTH_PREFIX = struct.Struct(">I")
+
+
+def _dumps(value: Any) -> str:
+    # inf_nan_mode matches model_dump_json: non-finite floats become null.
+    return to_json(
+        value, by_alias=True, exclude_none=True, inf_nan_mode="null"
+    ).decode()
+
+
+def _str(value: str) -> str:
+    # Strings don't depend on the serialisation flags; skip passing them.
+    return to_json(value).decode()
+
+
+# Extras are almost always the same ``thread_id`` / ``run_id`` pair for the
+# whole run, so their serialised suffix is cached.  Only all-string extras
+# are cached: ``1``, ``1.0`` and ``True`` hash alike but serialise differently.
+_EXTRAS_CACHE: dict[tuple, str] = {}
+_EXTRAS_CACHE_MAX = 256
+
+
+def _extras(event: BaseEvent) -> str:
+    """Serialise extra (undeclared) fields the way ``model_dump_json`` does."""
+    extra = event.__pydantic_extra__
+    if not extra:
+        return ""
+    try:
+        key = tuple(extra.items())
+        return _EXTRAS_CACHE[key]
+    except TypeError:
+        # Unhashable values (dicts, lists) — serialise every time.
+        return _format_extras(extra)
+    except KeyError:
+        suffix = _format_extras(extra)
+        if all(value is None or type(value) is str for value in extra.values()):
+            if len(_EXTRAS_CACHE) >= _EXTRAS_CACHE_MAX:
+                _EXTRAS_CACHE.clear()
+            _EXTRAS_CACHE[key] = suffix
+        return suffix
+
+
+def _format_extras(extra: dict) -> str:
+    return "".join(
+        f",{_str(key)}:{_dumps(value)}"
+        for key, value in extra.items()
+        if value is not None
+    )
+
+
+def _text_content(event: TextMessageContentEvent) -> str:
+    return (
+        'data: {"type":"TEXT_MESSAGE_CONTENT","messageId":'
+        f'{_str(event.message_id)},"delta":{_str(event.delta)}{_extras(event)}}}\n\n'
+    )
+
+
+def _thinking_content(event: ThinkingTextMessageContentEvent) -> str:
+    return (
+        'data: {"type":"THINKING_TEXT_MESSAGE_CONTENT","delta":'
+        f"{_str(event.delta)}{_extras(event)}}}\n\n"
+    )
+
+
+def _tool_call_args(event: ToolCallArgsEvent) -> str:
+    return (
+        'data: {"type":"TOOL_CALL_ARGS","toolCallId":'
+        f'{_str(event.tool_call_id)},"delta":{_str(event.delta)}{_extras(event)}}}\n\n'
+    )
+
+
+def _state_snapshot(event: StateSnapshotEvent) -> Optional[str]:
+    if event.snapshot is None:
+        # exclude_none drops the field entirely; leave it to the generic path.
+        return None
+    return (
+        'data: {"type":"STATE_SNAPSHOT","snapshot":'
+        f"{_dumps(event.snapshot)}{_extras(event)}}}\n\n"
+    )
+
+
+# Exact event class -> fast formatter.  Subclasses deliberately miss the
+# lookup so they keep their own serialisation.
+_FAST_PATHS: dict[type, Callable[[Any], Optional[str]]] = {
+    TextMessageContentEvent: _text_content,
+    ThinkingTextMessageContentEvent: _thinking_content,
+    ToolCallArgsEvent: _tool_call_args,
+    StateSnapshotEvent: _state_snapshot,
+}
+
+
+class FastEventEncoder(EventEncoder):
+    """``EventEncoder`` with pre-formatted SSE frames for hot event types."""
+
+    def encode(self, event: BaseEvent) -> str:
+        fast = _FAST_PATHS.get(type(event))
+        if fast is not None and event.timestamp is None and event.raw_event is None:
+            frame = fast(event)
+            if frame is not None:
+                return frame
+        return super().encode(event)
+
+
+class MsgpackEventEncoder:
+    """Length-prefixed msgpack frames for one run's event stream."""
+
+    def __init__(self, thread_id: str, run_id: str) -> None:
+        if msgpack is None:
+            raise RuntimeError(
+                "Binary transport requires msgpack. "
+                "Install it: pip install 'claude-code-runner[binary]'"
+            )
+        self._ids = {"thread_id": thread_id, "run_id": run_id}
+        self._packer = msgpack.Packer()
+
+    def get_content_type(self) -> str:
+        return MSGPACK_MEDIA_TYPE
+
+    def encode_header(self) -> bytes:
+        """The ``seq == 0`` frame that opens every binary stream."""
+        header = {"threadId": self._ids["thread_id"], "runId": self._ids["run_id"]}
+        return self._frame(0, header)
+
+    def encode(self, event: BaseEvent, seq: int) -> bytes:
+        payload = event.model_dump(mode="json", by_alias=True, exclude_none=True)
+        for key, value in self._ids.items():
+            if payload.get(key) == value:
+                del payload[key]
+        return self._frame(seq, payload)
+
+    def _frame(self, seq: int, payload: dict) -> bytes:
+        body = self._packer.pack([seq, payload])
+        return _LENGTH_PREFIX.pack(len(body)) + body
+
+
+def accepts_msgpack(accept: Optional[str]) -> bool:
+    """Return whether *accept* asks for the binary transport and it is available."""
+    if msgpack is None or not accept:
+        return False
+    return any(
+        part.split(";", 1)[0].strip().lower() == MSGPACK_MEDIA_TYPE
+        for part in accept.split(",")
+    )
@@ -10,7 +10,14 @@ async def health(request: Request):
     """Health check."""
     bridge = request.app.state.bridge
     context = bridge.context
-    return {
+    result = {
         "status": "healthy",
         "session_id": context.session_id if context else None,
     }
+    diagnostics = bridge.get_diagnostics()
+    run_queue = getattr(request.app.state, "run_queue", None)
+    if run_queue is not None:
+        diagnostics = {**diagnostics, "runQueue": run_queue.stats()}
+    if diagnostics:
+        result["diagnostics"] = diagnostics
+    return result
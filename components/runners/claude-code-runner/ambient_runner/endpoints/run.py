@@ -1,19 +1,68 @@
-"""POST / — AG-UI run endpoint (delegates to bridge)."""
+"""POST / — AG-UI run endpoint (delegates to bridge).
+
+GET /runs, GET /runs/{run_id}/events, GET /threads/{thread_id}/events —
+inspect and subscribe to detached runs.
+
+Each run executes as a background task owned by the ``RunRegistry`` rather
+than by the HTTP response, so a client disconnect neither tears the run
+down mid-turn nor loses the events emitted while it was gone.  Any number
+of subscribers (the original caller, a second UI tab, the backend) attach
+to the same run with their own cursor.  Every SSE frame carries an ``id:``
+sequence number; reconnecting with ``Last-Event-ID`` replays the missed
+frames from memory and then tails the live run.
+
+The buffer holds events rather than encoded frames, so each subscriber
+negotiates its own transport from ``Accept``: SSE for browsers, or
+length-prefixed msgpack frames (``application/vnd.ag-ui.event+msgpack``)
+for the backend relay.  Binary frames carry the same sequence numbers.
+When ``AGUI_STREAM_COMPRESSION`` enables it, either transport is compressed
+per ``Accept-Encoding`` and flushed after every event.
+
+Runs on the same thread are admitted through a per-thread ``RunQueue``:
+a run that has to wait is told its position (``X-Run-Queue-Position``
+header and an ``ambient:run_queued`` custom event, sent before the run
+starts), and a request arriving when ``RUN_QUEUE_MAX_DEPTH`` runs are
+already waiting gets ``429``.
+"""
 
 import logging
+import os
 import uuid
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, AsyncIterator, Dict, List, Optional, Union
 
-from ag_ui.core import EventType, RunAgentInput, RunErrorEvent
-from ag_ui.encoder import EventEncoder
-from fastapi import APIRouter, HTTPException, Request
+from ag_ui.core import BaseEvent, CustomEvent, EventType, RunAgentInput, RunErrorEvent
+from fastapi import APIRouter, FastAPI, HTTPException, Request
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
+from ambient_runner.compression import compress_stream, negotiate_encoding
+from ambient_runner.encoder import (
+    FastEventEncoder,
+    MsgpackEventEncoder,
+    accepts_msgpack,
+)
+from ambient_runner.platform.event_buffer import DEFAULT_CAPACITY, ReplayGapError
+from ambient_runner.platform.run_queue import (
+    DEFAULT_MAX_DEPTH,
+    RunQueue,
+    RunQueueFullError,
+    RunTicket,
+)
+from ambient_runner.platform.runs import RunHandle, RunRegistry
+
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+_STREAM_HEADERS = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no",
+    "Vary": "Accept, Accept-Encoding",
+}
+
+# Custom event telling a waiting client its place in the thread's run queue.
+RUN_QUEUED_EVENT_NAME = "ambient:run_queued"
+
 
 class RunnerInput(BaseModel):
     """Input model with optional AG-UI fields."""
@@ -52,41 +101,232 @@ class RunnerInput(BaseModel):
 
 @router.post("/")
 async def run_agent(input_data: RunnerInput, request: Request):
-    """AG-UI run endpoint — delegates to the bridge."""
+    """AG-UI run endpoint — starts a detached run and streams it.
+
+    Re-posting a ``runId`` that is still retained attaches to the existing
+    run instead of starting a duplicate agent turn.
+    """
     bridge = request.app.state.bridge
+    registry = get_run_registry(request.app)
 
     run_agent_input = input_data.to_run_agent_input()
-    accept_header = request.headers.get("accept", "text/event-stream")
-    encoder = EventEncoder(accept=accept_header)
+
+    existing = registry.get(run_agent_input.run_id)
+    if existing is not None:
+        logger.info(
+            f"Run {run_agent_input.run_id} already registered — attaching instead of re-running"
+        )
+        return _stream_response(existing, _last_event_id(request), request)
 
     logger.info(
         f"Run: thread_id={run_agent_input.thread_id}, run_id={run_agent_input.run_id}"
     )
 
-    async def event_stream():
-        try:
-            async for event in bridge.run(run_agent_input):
-                yield encoder.encode(event)
-        except Exception as e:
-            logger.error(f"Error in event stream: {e}", exc_info=True)
-
-            # Build descriptive error message, enriched by bridge-specific context
-            error_msg = str(e)
-            extra = bridge.get_error_context()
-            if extra:
-                error_msg = f"{error_msg}\n\n{extra}"
-
-            yield encoder.encode(
-                RunErrorEvent(
-                    type=EventType.RUN_ERROR,
-                    thread_id=run_agent_input.thread_id or "",
-                    run_id=run_agent_input.run_id or "unknown",
-                    message=error_msg,
-                )
+    # Runs without a thread ID fall back to the session's default thread.
+    context = getattr(bridge, "context", None)
+    queue_key = run_agent_input.thread_id or (context.session_id if context else "")
+    run_queue = get_run_queue(request.app)
+    try:
+        ticket = run_queue.admit(queue_key)
+    except RunQueueFullError as e:
+        logger.warning(f"Rejecting run {run_agent_input.run_id}: {e}")
+        raise HTTPException(status_code=429, detail=str(e))
+
+    handle = registry.start(
+        run_agent_input.run_id,
+        run_agent_input.thread_id or "",
+        _queued_agent_events(bridge, run_agent_input, run_queue, ticket),
+    )
+    response = _stream_response(handle, 0, request)
+    response.headers["X-Run-Queue-Position"] = str(ticket.position)
+    return response
+
+
+@router.get("/runs")
+async def list_runs(request: Request):
+    """List in-flight and recently finished runs."""
+    return {"runs": get_run_registry(request.app).list_runs()}
+
+
+@router.get("/runs/{run_id}/events")
+async def subscribe_run(run_id: str, request: Request):
+    """Replay a run's events after ``Last-Event-ID``, then tail it live."""
+    handle = get_run_registry(request.app).get(run_id)
+    if handle is None:
+        raise HTTPException(status_code=404, detail=f"Unknown run: {run_id}")
+    return _subscribe(handle, request)
+
+
+@router.get("/threads/{thread_id}/events")
+async def subscribe_thread(thread_id: str, request: Request):
+    """Attach to the most recent run on *thread_id* (live or retained)."""
+    handle = get_run_registry(request.app).latest_for_thread(thread_id)
+    if handle is None:
+        raise HTTPException(status_code=404, detail=f"No runs for thread: {thread_id}")
+    return _subscribe(handle, request)
+
+
+def get_run_queue(app: FastAPI) -> RunQueue:
+    """Return the app's per-thread ``RunQueue``, creating it on first use."""
+    run_queue = getattr(app.state, "run_queue", None)
+    if run_queue is None:
+        run_queue = RunQueue(max_depth=_queue_max_depth())
+        app.state.run_queue = run_queue
+    return run_queue
+
+
+def get_run_registry(app: FastAPI) -> RunRegistry:
+    """Return the app's ``RunRegistry``, creating it on first use."""
+    registry = getattr(app.state, "run_registry", None)
+    if registry is None:
+        registry = RunRegistry(buffer_capacity=_buffer_capacity())
+        app.state.run_registry = registry
+    return registry
+
+
+# ------------------------------------------------------------------
+# Helpers
+# ------------------------------------------------------------------
+
+
+async def _queued_agent_events(
+    bridge: Any,
+    run_agent_input: RunAgentInput,
+    run_queue: RunQueue,
+    ticket: RunTicket,
+) -> AsyncIterator[BaseEvent]:
+    """Wait for *ticket*'s turn on its thread, then yield the run's events."""
+    try:
+        if ticket.position > 0:
+            yield CustomEvent(
+                type=EventType.CUSTOM,
+                name=RUN_QUEUED_EVENT_NAME,
+                value={
+                    "position": ticket.position,
+                    "estimatedWaitMs": (
+                        round(ticket.estimated_wait * 1000)
+                        if ticket.estimated_wait is not None
+                        else None
+                    ),
+                },
             )
+        async with run_queue.hold(ticket) as waited:
+            if ticket.position > 0:
+                logger.info(
+                    f"Run {run_agent_input.run_id} waited {waited * 1000:.0f}ms "
+                    f"in the queue for thread {ticket.thread_id}"
+                )
+            async for event in _agent_events(bridge, run_agent_input):
+                yield event
+    finally:
+        # Also covers a run cancelled before it reached the queue's hold.
+        run_queue.release(ticket)
+
+
+async def _agent_events(
+    bridge: Any,
+    run_agent_input: RunAgentInput,
+) -> AsyncIterator[BaseEvent]:
+    """Yield ``bridge.run()`` events, converting failures into ``RUN_ERROR``."""
+    try:
+        async for event in bridge.run(run_agent_input):
+            yield event
+    except Exception as e:
+        logger.error(f"Error in event stream: {e}", exc_info=True)
+
+        # Build descriptive error message, enriched by bridge-specific context
+        error_msg = str(e)
+        extra = bridge.get_error_context()
+        if extra:
+            error_msg = f"{error_msg}\n\n{extra}"
+
+        yield RunErrorEvent(
+            type=EventType.RUN_ERROR,
+            thread_id=run_agent_input.thread_id or "",
+            run_id=run_agent_input.run_id or "unknown",
+            message=error_msg,
+        )
+
+
+def _subscribe(handle: RunHandle, request: Request) -> StreamingResponse:
+    after = _last_event_id(request)
+    if not handle.buffer.can_resume_from(after):
+        raise HTTPException(
+            status_code=410,
+            detail=(
+                f"Events after {after} are no longer buffered "
+                f"(oldest retained: {handle.buffer.first_seq})"
+            ),
+        )
+
+    logger.info(f"Subscribing to run {handle.run_id} after event {after}")
+    return _stream_response(handle, after, request)
+
+
+def _stream_response(
+    handle: RunHandle, after: int, request: Request
+) -> StreamingResponse:
+    accept_header = request.headers.get("accept", "text/event-stream")
+    if accepts_msgpack(accept_header):
+        encoder = MsgpackEventEncoder(handle.thread_id, handle.run_id)
+        frames = _binary_frames(handle, after, encoder)
+    else:
+        encoder = FastEventEncoder(accept=accept_header)
+        frames = _sse_frames(handle, after, encoder)
+
+    headers = {**_STREAM_HEADERS, "X-Run-Id": handle.run_id}
+    encoding = negotiate_encoding(request.headers.get("accept-encoding"))
+    if encoding:
+        frames = compress_stream(frames, encoding)
+        headers["Content-Encoding"] = encoding
 
     return StreamingResponse(
-        event_stream(),
+        frames,
         media_type=encoder.get_content_type(),
-        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        headers=headers,
     )
+
+
+async def _sse_frames(
+    handle: RunHandle, after: int, encoder: FastEventEncoder
+) -> AsyncIterator[str]:
+    try:
+        async for seq, event in handle.subscribe(after):
+            yield f"id: {seq}\n{encoder.encode(event)}"
+    except ReplayGapError as e:
+        # Subscriber fell out of the retained window; the client
+        # reconnects and is told to resync via 410.
+        logger.warning(f"Subscriber to run {handle.run_id} dropped: {e}")
+
+
+async def _binary_frames(
+    handle: RunHandle, after: int, encoder: MsgpackEventEncoder
+) -> AsyncIterator[bytes]:
+    yield encoder.encode_header()
+    try:
+        async for seq, event in handle.subscribe(after):
+            yield encoder.encode(event, seq)
+    except ReplayGapError as e:
+        logger.warning(f"Subscriber to run {handle.run_id} dropped: {e}")
+
+
+def _queue_max_depth() -> int:
+    try:
+        return max(int(os.getenv("RUN_QUEUE_MAX_DEPTH", "")), 0)
+    except ValueError:
+        return DEFAULT_MAX_DEPTH
+
+
+def _buffer_capacity() -> int:
+    try:
+        return max(int(os.getenv("AGUI_REPLAY_BUFFER_SIZE", "")), 1)
+    except ValueError:
+        return DEFAULT_CAPACITY
+
+
+def _last_event_id(request: Request) -> int:
+    raw = request.headers.get("last-event-id", "").strip()
+    try:
+        return max(int(raw), 0) if raw else 0
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid Last-Event-ID: {raw!r}")
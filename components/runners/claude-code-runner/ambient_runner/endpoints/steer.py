@@ -0,0 +1,57 @@
+"""POST /steer — deliver a user message into the run in flight.
+
+A user correcting the agent mid-turn would otherwise wait for the turn to
+finish behind the thread's run queue, or interrupt it and lose the work in
+progress.  The message is written into the running session; the run's own
+event stream announces it (``ambient:user_message_injected``) and records it
+in the run's messages.  ``409`` means there was no run to steer: send the
+message as a normal run instead.
+"""
+
+import logging
+import uuid
+from typing import Any, Dict, Optional
+
+from fastapi import APIRouter, HTTPException, Request
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+
+class SteerInput(BaseModel):
+    """A user message (AG-UI shape) for the thread's run in flight."""
+
+    threadId: Optional[str] = None
+    thread_id: Optional[str] = None
+    message: Dict[str, Any]
+
+
+@router.post("/steer")
+async def steer_run(input_data: SteerInput, request: Request):
+    """Write a user message into the thread's turn in flight."""
+    bridge = request.app.state.bridge
+    thread_id = input_data.threadId or input_data.thread_id
+
+    content = input_data.message.get("content")
+    if not isinstance(content, str) or not content.strip():
+        raise HTTPException(
+            status_code=400, detail="message.content must be a non-empty string"
+        )
+    message_id = input_data.message.get("id") or str(uuid.uuid4())
+
+    logger.info(
+        f"Steer request received (thread_id={thread_id}, message_id={message_id})"
+    )
+    try:
+        delivered = await bridge.steer(thread_id, content, message_id)
+    except Exception as e:
+        logger.error(f"Steer failed: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+    if not delivered:
+        raise HTTPException(status_code=409, detail="No run in flight to steer")
+    return {
+        "message": "Message delivered to the run in flight",
+        "messageId": message_id,
+    }
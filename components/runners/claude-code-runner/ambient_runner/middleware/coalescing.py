@@ -0,0 +1,157 @@
+"""
+AG-UI Delta Coalescing Middleware — merge adjacent streaming deltas.
+
+The Claude adapter yields one ``TEXT_MESSAGE_CONTENT`` per ``text_delta``
+and one ``TOOL_CALL_ARGS`` per ``input_json_delta``.  Downstream, each
+event costs a tracing call, a Pydantic serialisation, an SSE frame and a
+socket write.  This middleware merges adjacent deltas for the same
+message / tool call (and adjacent thinking deltas) into a single event:
+
+- a merged event is released once ``window_ms`` has passed since its first
+  delta, or once it reaches ``max_bytes`` characters of delta text;
+- any other event (START/END, tool results, snapshots, …) flushes the
+  pending delta first and is passed through immediately, so event order
+  and structure are preserved.
+
+Usage::
+
+    from ambient_runner.middleware import coalescing_middleware
+
+    async for event in coalescing_middleware(adapter.run(input), window_ms=25):
+        yield encoder.encode(event)
+
+With ``window_ms <= 0`` the middleware is a zero-overhead pass-through.
+"""
+
+import asyncio
+import logging
+from contextlib import suppress
+from typing import AsyncIterator, Optional
+
+from ag_ui.core import BaseEvent, EventType
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 4096
+
+# Event type -> attribute identifying the stream a delta belongs to
+# (``None`` for thinking deltas, which carry no ID).
+_MERGEABLE = {
+    EventType.TEXT_MESSAGE_CONTENT: "message_id",
+    EventType.TOOL_CALL_ARGS: "tool_call_id",
+    EventType.THINKING_TEXT_MESSAGE_CONTENT: None,
+}
+
+
+class _PendingDelta:
+    """Deltas accumulated for one message / tool call."""
+
+    __slots__ = ("event", "key", "parts", "size", "deadline")
+
+    def __init__(self, event: BaseEvent, key: tuple, deadline: float) -> None:
+        self.event = event
+        self.key = key
+        self.parts = [event.delta]
+        self.size = len(event.delta)
+        self.deadline = deadline
+
+    def add(self, delta: str) -> None:
+        self.parts.append(delta)
+        self.size += len(delta)
+
+    def build(self) -> BaseEvent:
+        if len(self.parts) == 1:
+            return self.event
+        return self.event.model_copy(update={"delta": "".join(self.parts)})
+
+
+def _merge_key(event: BaseEvent) -> Optional[tuple]:
+    event_type = getattr(event, "type", None)
+    if event_type not in _MERGEABLE:
+        return None
+    id_attr = _MERGEABLE[event_type]
+    return (event_type, getattr(event, id_attr, None) if id_attr else None)
+
+
+async def coalescing_middleware(
+    event_stream: AsyncIterator[BaseEvent],
+    *,
+    window_ms: float = 0,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+) -> AsyncIterator[BaseEvent]:
+    """Merge adjacent delta events from *event_stream*.
+
+    Args:
+        event_stream: The upstream adapter's event stream.
+        window_ms: Maximum time a delta may be held back waiting for more.
+            ``0`` (or less) disables coalescing.
+        max_bytes: Release a merged delta once it reaches this many
+            characters (equal to bytes for ASCII text).
+
+    Yields:
+        The upstream events, with runs of adjacent deltas merged.
+    """
+    # Fast path: disabled — just pass through
+    if window_ms <= 0:
+        async for event in event_stream:
+            yield event
+        return
+
+    loop = asyncio.get_running_loop()
+    window = window_ms / 1000.0
+    iterator = event_stream.__aiter__()
+    pending: Optional[_PendingDelta] = None
+    next_item: Optional[asyncio.Future] = None
+
+    try:
+        while True:
+            if pending is None:
+                # Nothing held back — no timer needed.
+                event = (
+                    await iterator.__anext__() if next_item is None else await next_item
+                )
+                next_item = None
+            else:
+                if next_item is None:
+                    next_item = asyncio.ensure_future(iterator.__anext__())
+                timeout = pending.deadline - loop.time()
+                if timeout > 0:
+                    await asyncio.wait((next_item,), timeout=timeout)
+                if not next_item.done():
+                    # Window elapsed with no new upstream event: release.
+                    yield pending.build()
+                    pending = None
+                    continue
+                event = next_item.result()
+                next_item = None
+
+            key = _merge_key(event)
+            if pending is not None and key == pending.key:
+                pending.add(event.delta)
+                if pending.size >= max_bytes:
+                    yield pending.build()
+                    pending = None
+                continue
+
+            if pending is not None:
+                yield pending.build()
+                pending = None
+
+            if key is not None:
+                pending = _PendingDelta(event, key, loop.time() + window)
+            else:
+                yield event
+
+    except StopAsyncIteration:
+        if pending is not None:
+            yield pending.build()
+    except Exception:
+        # Don't swallow held-back content when the upstream fails.
+        if pending is not None:
+            yield pending.build()
+        raise
+    finally:
+        if next_item is not None and not next_item.done():
+            next_item.cancel()
+            with suppress(asyncio.CancelledError, StopAsyncIteration):
+                await next_item
@@ -0,0 +1,126 @@
+"""
+Bounded, sequence-numbered replay buffer for AG-UI event streams.
+
+Each run keeps its events in an ``EventReplayBuffer`` so a client whose
+connection drops mid-run can reconnect with ``Last-Event-ID`` and receive
+everything it missed straight from memory before tailing the live
+stream.  Sequence numbers start at 1 and are emitted as the SSE ``id:``
+field, so ``Last-Event-ID: 0`` (or no header) means "from the beginning".
+
+Usage::
+
+    buffer = EventReplayBuffer(capacity=10_000)
+
+    # Producer (one per run):
+    buffer.append(event)
+    ...
+    buffer.close()
+
+    # Any number of readers, each with its own cursor:
+    async for seq, event in buffer.replay(after=last_event_id):
+        ...
+"""
+
+import asyncio
+from collections import deque
+from typing import Any, AsyncIterator
+
+# Default number of events retained per run.
+DEFAULT_CAPACITY = 10_000
+
+
+class ReplayGapError(Exception):
+    """Raised when a reader's cursor has been evicted from the buffer.
+
+    The events between the cursor and the oldest retained event are gone,
+    so the reader cannot be resumed losslessly and must resync (e.g. from
+    the next ``MESSAGES_SNAPSHOT``).
+    """
+
+
+class EventReplayBuffer:
+    """Ring buffer of ``(seq, item)`` pairs with live tailing.
+
+    Items are opaque to the buffer (typically AG-UI events).  Once
+    ``capacity`` is reached the oldest items are evicted.  Readers call
+    :meth:`replay` to receive retained items after a given sequence number
+    and then wait for new ones until the producer calls :meth:`close`.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be >= 1")
+        self._items: deque[tuple[int, Any]] = deque(maxlen=capacity)
+        self._next_seq = 1
+        self._closed = False
+        self._changed = asyncio.Event()
+
+    # ── producer side ──
+
+    def append(self, item: Any) -> int:
+        """Append *item* and wake waiting readers.  Returns its sequence number."""
+        if self._closed:
+            raise RuntimeError("Cannot append to a closed replay buffer")
+        seq = self._next_seq
+        self._next_seq += 1
+        self._items.append((seq, item))
+        self._notify()
+        return seq
+
+    def close(self) -> None:
+        """Mark the stream complete; readers drain and then stop."""
+        if not self._closed:
+            self._closed = True
+            self._notify()
+
+    def _notify(self) -> None:
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    # ── reader side ──
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    @property
+    def first_seq(self) -> int:
+        """Sequence number of the oldest retained item (``last_seq + 1`` if empty)."""
+        return self._items[0][0] if self._items else self._next_seq
+
+    @property
+    def last_seq(self) -> int:
+        """Sequence number of the newest item (``0`` before the first append)."""
+        return self._next_seq - 1
+
+    def can_resume_from(self, after: int) -> bool:
+        """Return whether every item with ``seq > after`` is still retained."""
+        return self.first_seq - 1 <= after
+
+    async def replay(self, after: int = 0) -> AsyncIterator[tuple[int, Any]]:
+        """Yield every item with ``seq > after``, then tail until closed.
+
+        Raises:
+            ReplayGapError: if items after *after* have already been evicted,
+                either up front or because this reader fell more than
+                ``capacity`` items behind the producer while tailing.
+        """
+        cursor = max(after, 0)
+        while True:
+            # Capture the wake-up event before checking state so an append
+            # between the check and the wait cannot be missed.
+            changed = self._changed
+
+            while cursor < self.last_seq:
+                if not self.can_resume_from(cursor):
+                    raise ReplayGapError(
+                        f"events {cursor + 1}..{self.first_seq - 1} were evicted"
+                    )
+                seq, item = self._items[cursor + 1 - self.first_seq]
+                cursor = seq
+                yield seq, item
+
+            if self._closed:
+                return
+            if changed is self._changed:
+                await changed.wait()
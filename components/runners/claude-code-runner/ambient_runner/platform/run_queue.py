@@ -0,0 +1,187 @@
+"""
+Per-thread run admission queue.
+
+Runs on the same thread are served one at a time, in arrival order.  A
+run is *admitted* synchronously when its request arrives: it gets a
+:class:`RunTicket` holding its queue position (runs ahead of it, counting
+the active one) and an estimated wait, or :class:`RunQueueFullError` when
+``max_depth`` runs are already waiting — so the endpoint can answer with
+a fast ``429`` instead of leaving the client on a silent socket.
+
+Usage::
+
+    queue = RunQueue(max_depth=4)
+    ticket = queue.admit("thread-1")      # may raise RunQueueFullError
+
+    async with queue.hold(ticket):        # waits for the runs ahead
+        ...                               # run the agent
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+logger = logging.getLogger(__name__)
+
+# Runs allowed to wait behind the active run on one thread (0 = unbounded).
+DEFAULT_MAX_DEPTH = 4
+
+# Smoothing factor for the run-duration average behind wait estimates.
+_DURATION_ALPHA = 0.3
+
+
+class RunQueueFullError(Exception):
+    """Raised when a thread already has ``max_depth`` runs waiting."""
+
+    def __init__(self, thread_id: str, depth: int) -> None:
+        super().__init__(f"Run queue for thread {thread_id} is full ({depth} waiting)")
+        self.thread_id = thread_id
+        self.depth = depth
+
+
+class RunTicket:
+    """A run's place in its thread's queue."""
+
+    __slots__ = (
+        "thread_id",
+        "position",
+        "estimated_wait",
+        "enqueued_at",
+        "started_at",
+        "_ready",
+        "_released",
+    )
+
+    def __init__(
+        self, thread_id: str, position: int, estimated_wait: Optional[float]
+    ) -> None:
+        self.thread_id = thread_id
+        self.position = position  # runs ahead at admission (0 = runs now)
+        self.estimated_wait = estimated_wait  # seconds; None until a run finished
+        self.enqueued_at = time.monotonic()
+        self.started_at: Optional[float] = None
+        self._ready = asyncio.Event()
+        self._released = False
+
+
+class RunQueue:
+    """FIFO run admission per thread with bounded depth.
+
+    Tracks how long admitted runs waited and how long runs held the
+    thread; the smoothed run duration drives the wait estimate handed to
+    newly queued runs.
+    """
+
+    def __init__(self, max_depth: int = DEFAULT_MAX_DEPTH) -> None:
+        self._max_depth = max_depth
+        self._queues: dict[str, deque[RunTicket]] = {}
+        self._avg_run_seconds: Optional[float] = None
+        self.rejected = 0
+        self.queued = 0  # admitted runs that had to wait
+        self.wait_seconds = 0.0
+        self.last_wait_seconds: Optional[float] = None
+        self.max_wait_seconds = 0.0
+
+    def admit(self, thread_id: str) -> RunTicket:
+        """Enqueue a run for *thread_id* and return its ticket."""
+        queue = self._queues.setdefault(thread_id, deque())
+        waiting = max(len(queue) - 1, 0)
+        if queue and self._max_depth > 0 and waiting >= self._max_depth:
+            self.rejected += 1
+            raise RunQueueFullError(thread_id, waiting)
+
+        ticket = RunTicket(thread_id, len(queue), self._estimate(queue))
+        queue.append(ticket)
+        if ticket.position == 0:
+            ticket._ready.set()
+        else:
+            self.queued += 1
+            logger.info(
+                f"[RunQueue] Run queued on thread={thread_id} at position {ticket.position}"
+            )
+        return ticket
+
+    @asynccontextmanager
+    async def hold(self, ticket: RunTicket) -> AsyncIterator[float]:
+        """Wait for *ticket*'s turn, yield the seconds waited, then release it."""
+        try:
+            await ticket._ready.wait()
+            ticket.started_at = time.monotonic()
+            waited = ticket.started_at - ticket.enqueued_at
+            if ticket.position > 0:
+                self._record_wait(waited)
+            yield waited
+        finally:
+            self.release(ticket)
+
+    def release(self, ticket: RunTicket) -> None:
+        """Remove *ticket* from its queue and wake the next run.  Idempotent."""
+        if ticket._released:
+            return
+        ticket._released = True
+        queue = self._queues.get(ticket.thread_id)
+        if queue is None:
+            return
+        was_head = bool(queue) and queue[0] is ticket
+        try:
+            queue.remove(ticket)
+        except ValueError:
+            return
+        if was_head and ticket.started_at is not None:
+            self._record_duration(time.monotonic() - ticket.started_at)
+        if not queue:
+            del self._queues[ticket.thread_id]
+        elif was_head:
+            queue[0]._ready.set()
+
+    def depth(self, thread_id: str) -> int:
+        """Return the number of runs waiting (not running) on *thread_id*."""
+        return max(len(self._queues.get(thread_id, ())) - 1, 0)
+
+    def stats(self) -> dict:
+        avg_wait = self.wait_seconds / self.queued if self.queued else None
+        return {
+            "maxDepth": self._max_depth,
+            "waiting": sum(max(len(q) - 1, 0) for q in self._queues.values()),
+            "queued": self.queued,
+            "rejected": self.rejected,
+            "lastWaitMs": (
+                round(self.last_wait_seconds * 1000, 1)
+                if self.last_wait_seconds is not None
+                else None
+            ),
+            "avgWaitMs": round(avg_wait * 1000, 1) if avg_wait is not None else None,
+            "maxWaitMs": round(self.max_wait_seconds * 1000, 1),
+            "avgRunMs": (
+                round(self._avg_run_seconds * 1000, 1)
+                if self._avg_run_seconds is not None
+                else None
+            ),
+        }
+
+    def _estimate(self, queue: deque[RunTicket]) -> Optional[float]:
+        """Estimated seconds until a run appended to *queue* starts."""
+        if not queue:
+            return 0.0
+        if self._avg_run_seconds is None:
+            return None
+        head = queue[0]
+        elapsed = time.monotonic() - head.started_at if head.started_at else 0.0
+        return (
+            max(self._avg_run_seconds - elapsed, 0.0)
+            + (len(queue) - 1) * self._avg_run_seconds
+        )
+
+    def _record_wait(self, seconds: float) -> None:
+        self.wait_seconds += seconds
+        self.last_wait_seconds = seconds
+        self.max_wait_seconds = max(self.max_wait_seconds, seconds)
+
+    def _record_duration(self, seconds: float) -> None:
+        if self._avg_run_seconds is None:
+            self._avg_run_seconds = seconds
+        else:
+            self._avg_run_seconds += _DURATION_ALPHA * (seconds - self._avg_run_seconds)
@@ -0,0 +1,167 @@
+"""
+Run registry — agent runs detached from the HTTP requests that start them.
+
+Each run executes as a background ``asyncio.Task`` that drains the bridge's
+event stream into an :class:`EventReplayBuffer`.  The buffer doubles as a
+broadcast channel: any number of subscribers attach with their own cursor
+(a sequence number into the ring) and read at their own pace.  The
+producer never awaits a subscriber, so a slow reader can neither stall the
+others nor the SDK read loop; a reader that falls out of the retained
+window gets a :class:`ReplayGapError` and must resync.
+
+Usage::
+
+    registry = RunRegistry()
+    handle = registry.start("run-1", "thread-1", bridge_events())
+
+    # From any request handler — the original caller, a second UI tab,
+    # or the backend relaying the stream:
+    async for seq, event in handle.subscribe(after=last_event_id):
+        ...
+
+    # On server shutdown:
+    await registry.shutdown()
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from contextlib import suppress
+from typing import Any, AsyncIterator, Optional
+
+from ambient_runner.platform.event_buffer import DEFAULT_CAPACITY, EventReplayBuffer
+
+logger = logging.getLogger(__name__)
+
+# Number of recent runs whose buffers are kept for late subscribers.
+DEFAULT_MAX_RETAINED_RUNS = 32
+
+
+class RunHandle:
+    """A single detached run: its task, replay buffer and subscribers."""
+
+    def __init__(self, run_id: str, thread_id: str, capacity: int) -> None:
+        self.run_id = run_id
+        self.thread_id = thread_id
+        self.buffer = EventReplayBuffer(capacity=capacity)
+        self.started_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.status = "running"
+        self.subscriber_count = 0
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def done(self) -> bool:
+        return self.status != "running"
+
+    async def subscribe(self, after: int = 0) -> AsyncIterator[tuple[int, Any]]:
+        """Yield ``(seq, item)`` after *after*, then tail until the run ends."""
+        self.subscriber_count += 1
+        try:
+            async for entry in self.buffer.replay(after):
+                yield entry
+        finally:
+            self.subscriber_count -= 1
+
+    async def cancel(self) -> None:
+        """Cancel the run task and wait for it to unwind."""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+
+    def info(self) -> dict:
+        return {
+            "runId": self.run_id,
+            "threadId": self.thread_id,
+            "status": self.status,
+            "lastEventId": self.buffer.last_seq,
+            "subscribers": self.subscriber_count,
+            "startedAt": self.started_at,
+            "finishedAt": self.finished_at,
+        }
+
+
+class RunRegistry:
+    """Starts, tracks and retains detached runs.
+
+    Runs are keyed by ``run_id``; the most recent run per ``thread_id`` is
+    also indexed so subscribers can attach to a thread without knowing the
+    run ID.  Finished runs are retained (oldest evicted first) so clients
+    can still replay them after the fact.
+    """
+
+    def __init__(
+        self,
+        *,
+        buffer_capacity: int = DEFAULT_CAPACITY,
+        max_retained_runs: int = DEFAULT_MAX_RETAINED_RUNS,
+    ) -> None:
+        self._buffer_capacity = buffer_capacity
+        self._max_retained_runs = max_retained_runs
+        self._runs: OrderedDict[str, RunHandle] = OrderedDict()
+        self._latest_by_thread: dict[str, str] = {}
+
+    def start(
+        self, run_id: str, thread_id: str, source: AsyncIterator[Any]
+    ) -> RunHandle:
+        """Start draining *source* into a new run's buffer in the background."""
+        if run_id in self._runs:
+            raise ValueError(f"Run {run_id} already exists")
+
+        handle = RunHandle(run_id, thread_id, self._buffer_capacity)
+        handle._task = asyncio.create_task(
+            self._pump(handle, source), name=f"run-{run_id}"
+        )
+        self._runs[run_id] = handle
+        self._latest_by_thread[thread_id] = run_id
+        self._evict()
+        logger.debug(f"[RunRegistry] Started run={run_id} thread={thread_id}")
+        return handle
+
+    def get(self, run_id: str) -> Optional[RunHandle]:
+        return self._runs.get(run_id)
+
+    def latest_for_thread(self, thread_id: str) -> Optional[RunHandle]:
+        """Return the most recently started run for *thread_id*, if retained."""
+        run_id = self._latest_by_thread.get(thread_id)
+        return self._runs.get(run_id) if run_id else None
+
+    def list_runs(self) -> list[dict]:
+        return [handle.info() for handle in self._runs.values()]
+
+    async def shutdown(self) -> None:
+        """Cancel all in-flight runs.  Call on server shutdown."""
+        running = [h for h in self._runs.values() if not h.done]
+        if running:
+            logger.info(f"[RunRegistry] Cancelling {len(running)} in-flight run(s)")
+        await asyncio.gather(*(h.cancel() for h in running), return_exceptions=True)
+
+    async def _pump(self, handle: RunHandle, source: AsyncIterator[Any]) -> None:
+        try:
+            async for item in source:
+                handle.buffer.append(item)
+            handle.status = "finished"
+        except asyncio.CancelledError:
+            handle.status = "cancelled"
+            raise
+        except Exception as e:
+            handle.status = "failed"
+            logger.error(
+                f"[RunRegistry] Run {handle.run_id} failed: {e}", exc_info=True
+            )
+        finally:
+            handle.finished_at = time.time()
+            handle.buffer.close()
+            self._evict()
+
+    def _evict(self) -> None:
+        """Drop the oldest finished runs beyond the retention limit."""
+        excess = len(self._runs) - self._max_retained_runs
+        if excess <= 0:
+            return
+        for run_id in [rid for rid, h in self._runs.items() if h.done][:excess]:
+            handle = self._runs.pop(run_id)
+            if self._latest_by_thread.get(handle.thread_id) == run_id:
+                del self._latest_by_thread[handle.thread_id]
@@ -0,0 +1,6 @@
+"""Micro-benchmarks for the runner's event hot path.
+
+Run from the runner directory, e.g.::
+
+    python -m benchmarks.bench_encoder
+"""
@@ -0,0 +1,128 @@
+"""
+Compare run-message accumulation: linear-scan upsert vs RunMessageAccumulator.
+
+Usage::
+
+    python -m benchmarks.bench_accumulator [--tool-calls 2000] [--repeat 5]
+
+Drives a synthetic turn with N tool calls through both strategies, in the
+order the adapter produces them: the tool name from ``content_block_start``,
+the streamed assistant message, the fallback assistant message built from
+the complete SDK message (same ID, replaces the first), and the tool result.
+The baseline reproduces the adapter's previous list scan and end-of-run
+``model_dump`` enrichment pass.
+"""
+
+import argparse
+import time
+from typing import Any, Callable
+
+from ag_ui.core import AssistantMessage, FunctionCall, ToolCall
+
+from ag_ui_claude_sdk.accumulator import RunMessageAccumulator
+from ag_ui_claude_sdk.utils import build_agui_tool_message
+
+
+def _turn(tool_calls: int) -> list[tuple[str, Any]]:
+    ops: list[tuple[str, Any]] = []
+    for i in range(tool_calls):
+        tool_id = f"toolu_{i:05d}"
+        call = ToolCall(
+            id=tool_id,
+            type="function",
+            function=FunctionCall(
+                name="Read", arguments=f'{{"file_path": "/workspace/f{i}.py"}}'
+            ),
+        )
+        ops.append(("name", (tool_id, "Read")))
+        for _ in range(2):  # streamed version, then fallback with the same ID
+            ops.append(
+                (
+                    "upsert",
+                    AssistantMessage(
+                        id=f"msg_{i}", role="assistant", tool_calls=[call]
+                    ),
+                )
+            )
+        ops.append(
+            (
+                "upsert",
+                build_agui_tool_message(tool_id, [{"type": "text", "text": "x" * 200}]),
+            )
+        )
+    return ops
+
+
+def _linear(ops) -> list:
+    run_messages: list = []
+    tool_name_by_id: dict = {}
+
+    def msg_id(m):
+        return m.get("id") if isinstance(m, dict) else getattr(m, "id", None)
+
+    for op, arg in ops:
+        if op == "name":
+            tool_name_by_id[arg[0]] = arg[1]
+            continue
+        mid = msg_id(arg)
+        for i, m in enumerate(run_messages):
+            if msg_id(m) == mid:
+                run_messages[i] = arg
+                break
+        else:
+            run_messages.append(arg)
+
+    enriched = []
+    for msg in run_messages:
+        tcid = getattr(msg, "tool_call_id", None)
+        if getattr(msg, "role", None) == "tool" and tcid in tool_name_by_id:
+            d = msg.model_dump(exclude_none=True)
+            d["name"] = tool_name_by_id[tcid]
+            enriched.append(d)
+        else:
+            enriched.append(msg)
+    return enriched
+
+
+def _indexed(ops) -> list:
+    acc = RunMessageAccumulator()
+    for op, arg in ops:
+        if op == "name":
+            acc.set_tool_name(*arg)
+        else:
+            acc.upsert(arg)
+    return acc.messages()
+
+
+def _best(fn: Callable, ops, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(ops)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--tool-calls", type=int, default=2000)
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="timed passes; best is reported"
+    )
+    args = parser.parse_args()
+
+    ops = _turn(args.tool_calls)
+    if len(_linear(ops)) != len(_indexed(ops)):
+        raise SystemExit("strategies disagree on message count")
+
+    linear = _best(_linear, ops, args.repeat)
+    indexed = _best(_indexed, ops, args.repeat)
+    print(f"{args.tool_calls} tool calls, {len(ops)} accumulator operations")
+    print(f"linear scan           {linear * 1000:>10.1f} ms")
+    print(
+        f"RunMessageAccumulator {indexed * 1000:>10.1f} ms  ({linear / indexed:.1f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Compare ``build_options`` with and without the memoized base option merge.
+
+Usage::
+
+    python -m benchmarks.bench_build_options [--calls 2000] [--repeat 5]
+
+Builds a run's options the way the Claude bridge does — a large system
+prompt, several MCP servers, frontend tools, state and forwarded props —
+from an adapter given a ``ClaudeAgentOptions`` object and from one given a
+dict.  The baseline reproduces the previous per-call work: merging the
+stored options again and formatting the merged kwargs for its three debug
+log lines, which ran even with debug logging off (as here).
+"""
+
+import argparse
+import logging
+import time
+from typing import Any, Callable
+
+from ag_ui.core import RunAgentInput
+from claude_agent_sdk import ClaudeAgentOptions
+
+from ag_ui_claude_sdk import ClaudeAgentAdapter
+from ag_ui_claude_sdk.tool_cache import ToolServerCache
+
+
+class _Unmemoized(ClaudeAgentAdapter):
+    """Merges the stored options and formats them for the log on every call."""
+
+    def _base_options(self):
+        self._base_kwargs = None
+        kwargs = super()._base_options()
+        for _ in range(3):
+            f"{dict(kwargs)}"
+        return kwargs
+
+
+def _stored_options() -> dict:
+    return {
+        "cwd": "/workspace/repos/app",
+        "permission_mode": "acceptEdits",
+        "allowed_tools": [
+            f"mcp__server{i}__tool{j}" for i in range(6) for j in range(8)
+        ],
+        "mcp_servers": {
+            f"server{i}": {
+                "command": "npx",
+                "args": ["-y", f"@example/mcp-{i}"],
+                "env": {"TOKEN": "x" * 40},
+            }
+            for i in range(6)
+        },
+        "setting_sources": ["project"],
+        "system_prompt": {
+            "type": "preset",
+            "preset": "claude_code",
+            "append": "Workspace context. " * 1500,
+        },
+        "include_partial_messages": True,
+        "add_dirs": [f"/workspace/repos/lib{i}" for i in range(4)],
+        "model": "claude-sonnet-4-5",
+    }
+
+
+def _input() -> RunAgentInput:
+    tools = [
+        {
+            "name": f"frontend_tool_{i}",
+            "description": "Frontend action",
+            "parameters": {
+                "type": "object",
+                "properties": {"value": {"type": "string"}},
+            },
+        }
+        for i in range(5)
+    ]
+    return RunAgentInput(
+        thread_id="t-1",
+        run_id="r-1",
+        messages=[{"id": "u-1", "role": "user", "content": "hi"}],
+        state={f"key{i}": i for i in range(50)},
+        tools=tools,
+        context=[],
+        forwarded_props={"max_turns": 20},
+    )
+
+
+def _best(fn: Callable[[], Any], calls: int, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(calls):
+            fn()
+        best = min(best, time.perf_counter() - start)
+    return best / calls
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="timed passes; best is reported"
+    )
+    args = parser.parse_args()
+    logging.getLogger("ag_ui_claude_sdk").setLevel(logging.INFO)
+
+    input_data = _input()
+    cache = ToolServerCache()
+    for label, stored in (
+        ("dict", _stored_options()),
+        ("object", ClaudeAgentOptions(**_stored_options())),
+    ):
+        baseline = _Unmemoized(name="bench", options=stored, tool_cache=cache)
+        memoized = ClaudeAgentAdapter(name="bench", options=stored, tool_cache=cache)
+        if baseline.build_options(input_data) != memoized.build_options(input_data):
+            raise SystemExit(f"{label} options: strategies build different options")
+
+        before = _best(
+            lambda: baseline.build_options(input_data), args.calls, args.repeat
+        )
+        after = _best(
+            lambda: memoized.build_options(input_data), args.calls, args.repeat
+        )
+        print(f"{label:<6} per-call merge   {before * 1e6:>8.1f} us")
+        print(
+            f"{label:<6} memoized base    {after * 1e6:>8.1f} us  ({before / after:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Compare ``EventEncoder`` and ``FastEventEncoder`` throughput.
+
+Usage::
+
+    python -m benchmarks.bench_encoder [--recording run.jsonl] [--repeat 20]
+
+Checks that both encoders produce identical output for every event in the
+recording, then reports events/sec for each.
+"""
+
+import argparse
+import time
+from collections import Counter
+from pathlib import Path
+
+from ag_ui.encoder import EventEncoder
+
+from ambient_runner.encoder import FastEventEncoder
+from benchmarks.recorded_stream import get_recording
+
+
+def _events_per_sec(encoder, events, repeat: int) -> float:
+    encode = encoder.encode
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for event in events:
+            encode(event)
+        best = min(best, time.perf_counter() - start)
+    return len(events) / best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--recording", type=Path, help="JSONL recording (default: synthetic)"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=20, help="timed passes; best is reported"
+    )
+    args = parser.parse_args()
+
+    events = get_recording(args.recording)
+    baseline, fast = EventEncoder(), FastEventEncoder()
+
+    mismatches = [e for e in events if baseline.encode(e) != fast.encode(e)]
+    if mismatches:
+        raise SystemExit(
+            f"{len(mismatches)} event(s) encode differently, e.g. {mismatches[0]!r}"
+        )
+
+    mix = Counter(e.type.value for e in events)
+    print(
+        f"{len(events)} events: " + ", ".join(f"{k}={v}" for k, v in mix.most_common(5))
+    )
+
+    base_rate = _events_per_sec(baseline, events, args.repeat)
+    fast_rate = _events_per_sec(fast, events, args.repeat)
+    print(f"EventEncoder      {base_rate:>12,.0f} events/s")
+    print(
+        f"FastEventEncoder  {fast_rate:>12,.0f} events/s  ({fast_rate / base_rate:.2f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+"""
+Compare the adapter's dispatch-table stream translation with the previous loop.
+
+Usage::
+
+    python -m benchmarks.bench_translator [--recording turn.jsonl] [--repeat 5]
+        [--baseline-ref REF] [--min-speedup 1.2]
+
+Feeds the same SDK message stream (synthetic, or a recorded ``stream-json``
+turn) to ``_stream_claude_sdk`` of the current adapter and of the adapter at
+``--baseline-ref`` (default: the last revision with the ``if``/``elif``
+translation loop), after checking that both produce the same AG-UI events.
+The baseline is checked out into a temporary ``git worktree`` and timed in
+a subprocess that imports ``ag_ui_claude_sdk`` from there.  With
+``--min-speedup``, exits non-zero when the current translation is not at
+least that much faster (for CI).
+"""
+
+import argparse
+import asyncio
+import itertools
+import logging
+import os
+import pickle
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Callable
+from unittest import mock
+
+from ag_ui.core import RunAgentInput
+
+from ag_ui_claude_sdk import ClaudeAgentAdapter
+from ag_ui_claude_sdk.adapter import _RunState
+
+# Last revision that translated the SDK stream with the if/elif loop.
+BASELINE_REF = "52e4ccb"
+
+RUNNER_DIR = Path(__file__).resolve().parent.parent
+
+
+def _input() -> RunAgentInput:
+    return RunAgentInput(
+        thread_id="thread-1",
+        run_id="run-1",
+        messages=[{"id": "u-1", "role": "user", "content": "hi"}],
+        state={"turn": 0, "files": [f"module_{i}.py" for i in range(5)]},
+        tools=[],
+        context=[],
+        forwarded_props={},
+    )
+
+
+async def translate(
+    adapter: ClaudeAgentAdapter,
+    messages: list[Any],
+    input_data: RunAgentInput,
+    frontend_tool_names: frozenset = frozenset(),
+) -> list:
+    """Run *messages* through *adapter*'s translation; return the AG-UI events."""
+
+    async def stream():
+        for message in messages:
+            yield message
+
+    run_state = _RunState(input_data.state)
+    adapter._state_engine.reset(input_data.thread_id, input_data.state)
+    return [
+        event
+        async for event in adapter._stream_claude_sdk(
+            "prompt",
+            input_data.thread_id,
+            input_data.run_id,
+            input_data,
+            set(frontend_tool_names),
+            stream(),
+            run_state,
+        )
+    ]
+
+
+def deterministic_uuids():
+    """Patch ``uuid.uuid4`` to a counter so two translations can be compared."""
+    counter = itertools.count()
+    return mock.patch.object(uuid, "uuid4", lambda: uuid.UUID(int=next(counter)))
+
+
+def _dump(events: list) -> list[dict]:
+    return [event.model_dump(mode="json") for event in events]
+
+
+def _best(fn: Callable[[], Any], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def measure(
+    messages: list[Any], input_data: RunAgentInput, repeat: int
+) -> tuple[list[dict], float]:
+    """Return the importable adapter's events for *messages* and its best time."""
+    adapter = ClaudeAgentAdapter(name="bench")
+    with deterministic_uuids():
+        events = _dump(asyncio.run(translate(adapter, messages, input_data)))
+    seconds = _best(
+        lambda: asyncio.run(translate(adapter, messages, input_data)), repeat
+    )
+    return events, seconds
+
+
+def measure_at(
+    ref: str, messages: list[Any], input_data: RunAgentInput, repeat: int
+) -> tuple[list[dict], float]:
+    """Run :func:`measure` against the adapter as it was at git *ref*."""
+    git = ["git", "-C", str(RUNNER_DIR)]
+    top = Path(
+        subprocess.run(
+            [*git, "rev-parse", "--show-toplevel"],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout.strip()
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        tree = Path(tmp) / "baseline"
+        subprocess.run(
+            [*git, "worktree", "add", "--detach", "--quiet", str(tree), ref], check=True
+        )
+        try:
+            job = Path(tmp) / "job.pickle"
+            job.write_bytes(pickle.dumps((messages, input_data, repeat)))
+            env = {**os.environ, "PYTHONPATH": str(tree / RUNNER_DIR.relative_to(top))}
+            subprocess.run(
+                [sys.executable, __file__, "--measure", str(job)], env=env, check=True
+            )
+            return pickle.loads(job.read_bytes())
+        finally:
+            subprocess.run(
+                [*git, "worktree", "remove", "--force", str(tree)], check=True
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--recording", type=Path, help="stream-json SDK messages, one per line"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="timed passes; best is reported"
+    )
+    parser.add_argument(
+        "--baseline-ref",
+        default=BASELINE_REF,
+        help="git ref of the adapter to compare against",
+    )
+    parser.add_argument(
+        "--min-speedup", type=float, help="fail below this speedup over the baseline"
+    )
+    # Internal: the baseline subprocess measures the job pickled at this path
+    parser.add_argument("--measure", type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    logging.getLogger("ag_ui_claude_sdk").setLevel(logging.WARNING)
+    logging.getLogger("ag_ui_claude_sdk.adapter").setLevel(logging.WARNING)
+
+    if args.measure:
+        args.measure.write_bytes(
+            pickle.dumps(measure(*pickle.loads(args.measure.read_bytes())))
+        )
+        return
+
+    from benchmarks.sdk_stream import get_sdk_stream
+
+    messages = get_sdk_stream(args.recording)
+    input_data = _input()
+    expected, before = measure_at(args.baseline_ref, messages, input_data, args.repeat)
+    actual, after = measure(messages, input_data, args.repeat)
+    if actual != expected:
+        raise SystemExit(f"translations differ from {args.baseline_ref}")
+
+    speedup = before / after
+    print(f"{len(messages)} SDK messages -> {len(actual)} AG-UI events")
+    print(f"{args.baseline_ref:<17} {len(messages) / before:>12,.0f} msg/s")
+    print(f"dispatch tables   {len(messages) / after:>12,.0f} msg/s  ({speedup:.2f}x)")
+
+    if args.min_speedup is not None and speedup < args.min_speedup:
+        raise SystemExit(
+            f"speedup {speedup:.2f}x is below --min-speedup {args.min_speedup}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+Recorded AG-UI event streams for benchmarks.
+
+A recording is a JSONL file with one AG-UI event per line, as emitted on
+the wire (camelCase, ``exclude_none``).  Capture one from a live runner
+with e.g.::
+
+    curl -sN -X POST localhost:8000/ -H 'Content-Type: application/json' \\
+        -d @input.json | sed -n 's/^data: //p' > run.jsonl
+
+When no recording is given, :func:`synthetic_recording` produces a stream
+with the shape of a typical Claude turn: thinking, streamed text, a few
+tool calls with streamed arguments and a state snapshot, with the
+``thread_id`` / ``run_id`` extras the adapter attaches to most events.
+"""
+
+import json
+import random
+import typing
+from pathlib import Path
+from typing import Optional
+
+from ag_ui.core import BaseEvent
+from ag_ui.core import events as ag_ui_events
+
+# EventType value -> event model.  Built by hand because ``ag_ui.core.Event``
+# does not include the THINKING_* events.
+_EVENT_CLASSES = {
+    typing.get_args(cls.model_fields["type"].annotation)[0].value: cls
+    for cls in vars(ag_ui_events).values()
+    if isinstance(cls, type)
+    and issubclass(cls, BaseEvent)
+    and typing.get_origin(cls.model_fields["type"].annotation) is typing.Literal
+}
+
+_WORDS = (
+    "the runner streams each token as its own event so the frontend can "
+    "render partial output while the model is still thinking about which "
+    "file to read next, über naïve café — 日本語 ✓"
+).split()
+
+
+def load_recording(path: Path) -> list[BaseEvent]:
+    """Load a JSONL recording into AG-UI event models."""
+    events = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                events.append(_parse(json.loads(line)))
+    return events
+
+
+def synthetic_recording(turns: int = 20, seed: int = 0) -> list[BaseEvent]:
+    """Build a deterministic, realistically shaped event stream."""
+    rng = random.Random(seed)
+    ids = {"thread_id": "thread-1", "run_id": "run-1"}
+    raw: list[dict] = [
+        {"type": "RUN_STARTED", "threadId": "thread-1", "runId": "run-1"}
+    ]
+
+    for turn in range(turns):
+        raw.append({"type": "THINKING_START"})
+        raw.append({"type": "THINKING_TEXT_MESSAGE_START"})
+        for _ in range(rng.randint(20, 60)):
+            raw.append({"type": "THINKING_TEXT_MESSAGE_CONTENT", "delta": _chunk(rng)})
+        raw.append({"type": "THINKING_TEXT_MESSAGE_END"})
+        raw.append({"type": "THINKING_END"})
+
+        msg_id = f"msg-{turn}"
+        raw.append(
+            {
+                "type": "TEXT_MESSAGE_START",
+                "messageId": msg_id,
+                "role": "assistant",
+                **ids,
+            }
+        )
+        for _ in range(rng.randint(50, 200)):
+            raw.append(
+                {
+                    "type": "TEXT_MESSAGE_CONTENT",
+                    "messageId": msg_id,
+                    "delta": _chunk(rng),
+                    **ids,
+                }
+            )
+        raw.append({"type": "TEXT_MESSAGE_END", "messageId": msg_id, **ids})
+
+        for call in range(rng.randint(1, 3)):
+            tool_id = f"toolu-{turn}-{call}"
+            raw.append(
+                {
+                    "type": "TOOL_CALL_START",
+                    "toolCallId": tool_id,
+                    "toolCallName": "Read",
+                    "parentMessageId": msg_id,
+                    **ids,
+                }
+            )
+            args = json.dumps(
+                {"file_path": f"/workspace/src/module_{call}.py", "limit": 200}
+            )
+            for i in range(0, len(args), 6):
+                raw.append(
+                    {
+                        "type": "TOOL_CALL_ARGS",
+                        "toolCallId": tool_id,
+                        "delta": args[i : i + 6],
+                        **ids,
+                    }
+                )
+            raw.append({"type": "TOOL_CALL_END", "toolCallId": tool_id, **ids})
+            raw.append(
+                {
+                    "type": "TOOL_CALL_RESULT",
+                    "toolCallId": tool_id,
+                    "messageId": f"{tool_id}-result",
+                    "content": "\n".join(_chunk(rng) for _ in range(40)),
+                    "role": "tool",
+                    **ids,
+                }
+            )
+
+        raw.append(
+            {
+                "type": "STATE_SNAPSHOT",
+                "snapshot": {
+                    "turn": turn,
+                    "files": [f"module_{i}.py" for i in range(5)],
+                    "done": None,
+                },
+                **ids,
+            }
+        )
+
+    raw.append({"type": "RUN_FINISHED", "threadId": "thread-1", "runId": "run-1"})
+    return [_parse(item) for item in raw]
+
+
+def get_recording(path: Optional[Path] = None) -> list[BaseEvent]:
+    return load_recording(path) if path else synthetic_recording()
+
+
+def _parse(data: dict) -> BaseEvent:
+    return _EVENT_CLASSES[data["type"]].model_validate(data)
+
+
+def _chunk(rng: random.Random) -> str:
+    return " ".join(rng.choice(_WORDS) for _ in range(rng.randint(1, 4))) + rng.choice(
+        ("", " ", "\n", '"')
+    )
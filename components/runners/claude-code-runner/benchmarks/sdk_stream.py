@@ -0,0 +1,209 @@
+"""
+Recorded Claude SDK message streams for benchmarks.
+
+A recording is the CLI's ``stream-json`` output, one SDK message per line,
+as the adapter receives it with partial messages enabled.  Capture one
+with e.g.::
+
+    claude -p "..." --output-format stream-json --verbose \\
+        --include-partial-messages > turn.jsonl
+
+When no recording is given, :func:`synthetic_sdk_stream` produces the SDK
+side of a typical Claude turn: streamed thinking, text and tool arguments,
+the complete assistant messages that follow them, tool results, a few
+``ag_ui_update_state`` calls and the final result.
+"""
+
+import json
+import random
+from pathlib import Path
+from typing import Any, Optional
+
+from claude_agent_sdk import (
+    AssistantMessage,
+    ResultMessage,
+    SystemMessage,
+    TextBlock,
+    ThinkingBlock,
+    ToolResultBlock,
+    ToolUseBlock,
+    UserMessage,
+)
+from claude_agent_sdk.types import StreamEvent
+
+STATE_TOOL = "mcp__ag_ui__ag_ui_update_state"
+
+_WORDS = (
+    "the model streams each token as its own delta while it decides which "
+    "file to read next, über naïve café — 日本語 ✓"
+).split()
+
+
+def load_sdk_recording(path: Path) -> list[Any]:
+    """Load a ``stream-json`` recording into SDK message objects."""
+    from claude_agent_sdk._internal.message_parser import parse_message
+
+    messages = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                messages.append(parse_message(json.loads(line)))
+    return messages
+
+
+def synthetic_sdk_stream(
+    turns: int = 20, seed: int = 0, frontend_tool: Optional[str] = None
+) -> list[Any]:
+    """Build a deterministic, realistically shaped SDK message stream.
+
+    With *frontend_tool*, the last turn ends in a call to that tool (the
+    adapter halts the stream there).
+    """
+    rng = random.Random(seed)
+    messages: list[Any] = [
+        SystemMessage(
+            subtype="init",
+            data={"type": "system", "subtype": "init", "model": "claude-sonnet-4-5"},
+        ),
+    ]
+
+    for turn in range(turns):
+        thinking = [_chunk(rng) for _ in range(rng.randint(20, 60))]
+        text = [_chunk(rng) for _ in range(rng.randint(50, 200))]
+        calls = [
+            (
+                f"toolu-{turn}-{call}",
+                "Read",
+                {"file_path": f"/workspace/src/module_{call}.py", "limit": 200},
+            )
+            for call in range(rng.randint(1, 3))
+        ]
+        if turn % 5 == 4:
+            calls.append(
+                (
+                    f"toolu-{turn}-state",
+                    STATE_TOOL,
+                    {"state_updates": {"turn": turn, "done": False}},
+                )
+            )
+        if frontend_tool and turn == turns - 1:
+            calls = [
+                (
+                    f"toolu-{turn}-frontend",
+                    f"mcp__ag_ui__{frontend_tool}",
+                    {"value": "x"},
+                )
+            ]
+
+        messages.append(
+            _event({"type": "message_start", "message": {"role": "assistant"}})
+        )
+        index = 0
+        messages += _block(
+            {"type": "thinking", "thinking": ""},
+            index,
+            "thinking_delta",
+            "thinking",
+            thinking,
+        )
+        index += 1
+        messages += _block(
+            {"type": "text", "text": ""}, index, "text_delta", "text", text
+        )
+        for tool_id, name, args in calls:
+            index += 1
+            encoded = json.dumps(args)
+            pieces = [encoded[i : i + 6] for i in range(0, len(encoded), 6)]
+            content_block = {
+                "type": "tool_use",
+                "id": tool_id,
+                "name": name,
+                "input": {},
+            }
+            messages += _block(
+                content_block, index, "input_json_delta", "partial_json", pieces
+            )
+        messages.append(
+            _event({"type": "message_delta", "delta": {"stop_reason": "tool_use"}})
+        )
+        messages.append(_event({"type": "message_stop"}))
+
+        messages.append(
+            AssistantMessage(
+                content=[
+                    ThinkingBlock(thinking="".join(thinking), signature="sig"),
+                    TextBlock(text="".join(text)),
+                    *(
+                        ToolUseBlock(id=tool_id, name=name, input=args)
+                        for tool_id, name, args in calls
+                    ),
+                ],
+                model="claude-sonnet-4-5",
+            )
+        )
+        messages.append(
+            UserMessage(
+                content=[
+                    ToolResultBlock(
+                        tool_use_id=tool_id,
+                        content="\n".join(_chunk(rng) for _ in range(40)),
+                    )
+                    for tool_id, _, _ in calls
+                ]
+            )
+        )
+
+    messages.append(
+        ResultMessage(
+            subtype="success",
+            duration_ms=12000,
+            duration_api_ms=11000,
+            is_error=False,
+            num_turns=turns,
+            session_id="session-1",
+            total_cost_usd=0.42,
+            usage={"input_tokens": 1200, "output_tokens": 3400},
+            result="done",
+        )
+    )
+    return messages
+
+
+def get_sdk_stream(path: Optional[Path] = None) -> list[Any]:
+    return load_sdk_recording(path) if path else synthetic_sdk_stream()
+
+
+def _event(event: dict) -> StreamEvent:
+    return StreamEvent(uuid="u", session_id="session-1", event=event)
+
+
+def _block(
+    content_block: dict, index: int, delta_type: str, field: str, pieces: list[str]
+) -> list[StreamEvent]:
+    return [
+        _event(
+            {
+                "type": "content_block_start",
+                "index": index,
+                "content_block": content_block,
+            }
+        ),
+        *(
+            _event(
+                {
+                    "type": "content_block_delta",
+                    "index": index,
+                    "delta": {"type": delta_type, field: piece},
+                }
+            )
+            for piece in pieces
+        ),
+        _event({"type": "content_block_stop", "index": index}),
+    ]
+
+
+def _chunk(rng: random.Random) -> str:
+    return " ".join(rng.choice(_WORDS) for _ in range(rng.randint(1, 4))) + rng.choice(
+        ("", " ", "\n")
+    )
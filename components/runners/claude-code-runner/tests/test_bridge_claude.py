@@ -57,6 +57,7 @@ class TestPlatformBridgeABC:
         assert bridge.configured_model == ""
         assert bridge.obs is None
         assert bridge.get_error_context() == ""
+        assert bridge.get_diagnostics() == {}
         bridge.set_context(RunnerContext(session_id="s1", workspace_path="/tmp"))
         bridge.mark_dirty()
 
@@ -0,0 +1,79 @@
+"""Unit tests for the memoized base merge in ClaudeAgentAdapter.build_options."""
+
+from ag_ui.core import RunAgentInput
+
+from ag_ui_claude_sdk import ClaudeAgentAdapter
+from ag_ui_claude_sdk.config import STATE_MANAGEMENT_TOOL_FULL_NAME
+
+
+class _StoredOptions:
+    """Pydantic-style options object counting how often it is dumped."""
+
+    def __init__(self, **fields):
+        self.fields = fields
+        self.dumps = 0
+
+    def model_dump(self, exclude_none=False):
+        self.dumps += 1
+        return {
+            k: v for k, v in self.fields.items() if v is not None or not exclude_none
+        }
+
+
+def _input(state=None, tools=None, forwarded_props=None) -> RunAgentInput:
+    return RunAgentInput(
+        thread_id="t-1",
+        run_id="r-1",
+        messages=[{"id": "u-1", "role": "user", "content": "hi"}],
+        state=state,
+        tools=tools or [],
+        context=[],
+        forwarded_props=forwarded_props or {},
+    )
+
+
+class TestMemoizedBase:
+    def test_stored_options_are_merged_once(self):
+        stored = _StoredOptions(
+            model="claude-sonnet-4-5", system_prompt="base", api_key="sk-x"
+        )
+        adapter = ClaudeAgentAdapter(name="test", options=stored)
+
+        for _ in range(3):
+            options = adapter.build_options(_input())
+        adapter.build_options()
+
+        assert stored.dumps == 1
+        assert options.model == "claude-sonnet-4-5"
+        assert options.include_partial_messages is True
+
+    def test_run_layers_do_not_leak_into_later_runs(self):
+        stored = {
+            "allowed_tools": ["Read"],
+            "system_prompt": "base",
+            "model": "claude-sonnet-4-5",
+        }
+        adapter = ClaudeAgentAdapter(name="test", options=stored)
+        tools = [{"name": "confirm", "description": "", "parameters": {}}]
+
+        first = adapter.build_options(
+            _input(
+                state={"draft_title": "x"},
+                tools=tools,
+                forwarded_props={"model": "claude-haiku-4-5"},
+            )
+        )
+        second = adapter.build_options(_input())
+
+        assert first.allowed_tools == [
+            "Read",
+            STATE_MANAGEMENT_TOOL_FULL_NAME,
+            "mcp__ag_ui__confirm",
+        ]
+        assert first.model == "claude-haiku-4-5"
+        assert "draft_title" in first.system_prompt
+        assert second.allowed_tools == ["Read"]
+        assert second.model == "claude-sonnet-4-5"
+        assert second.system_prompt == "base"
+        assert not second.mcp_servers
+        assert stored["allowed_tools"] == ["Read"]
@@ -0,0 +1,146 @@
+"""Unit tests for the delta coalescing middleware."""
+
+import asyncio
+
+import pytest
+
+from ag_ui.core import EventType, ThinkingTextMessageContentEvent
+
+from ambient_runner.middleware.coalescing import coalescing_middleware
+from tests.conftest import (
+    async_event_stream,
+    make_run_finished,
+    make_run_started,
+    make_text_content,
+    make_text_end,
+    make_text_start,
+    make_tool_args,
+    make_tool_end,
+    make_tool_start,
+)
+
+
+async def _run(events, **kwargs):
+    return [
+        e async for e in coalescing_middleware(async_event_stream(events), **kwargs)
+    ]
+
+
+def _thinking(delta: str) -> ThinkingTextMessageContentEvent:
+    return ThinkingTextMessageContentEvent(
+        type=EventType.THINKING_TEXT_MESSAGE_CONTENT, delta=delta
+    )
+
+
+@pytest.mark.asyncio
+class TestCoalescingDisabled:
+    """window_ms=0 is a pass-through."""
+
+    async def test_events_unchanged(self):
+        events_in = [make_text_content(delta="a"), make_text_content(delta="b")]
+        events_out = await _run(events_in, window_ms=0)
+        assert events_out[0] is events_in[0]
+        assert events_out[1] is events_in[1]
+
+
+@pytest.mark.asyncio
+class TestCoalescingMerges:
+    """Adjacent deltas for the same stream are merged."""
+
+    async def test_merges_text_deltas(self):
+        events = [
+            make_run_started(),
+            make_text_start(),
+            make_text_content(delta="Hel"),
+            make_text_content(delta="lo "),
+            make_text_content(delta="world"),
+            make_text_end(),
+            make_run_finished(),
+        ]
+        out = await _run(events, window_ms=1000)
+        assert [e.type for e in out] == [
+            EventType.RUN_STARTED,
+            EventType.TEXT_MESSAGE_START,
+            EventType.TEXT_MESSAGE_CONTENT,
+            EventType.TEXT_MESSAGE_END,
+            EventType.RUN_FINISHED,
+        ]
+        assert out[2].delta == "Hello world"
+        assert out[2].message_id == "m-1"
+
+    async def test_merges_tool_args(self):
+        events = [
+            make_tool_start(),
+            make_tool_args(delta='{"file":'),
+            make_tool_args(delta='"x"}'),
+            make_tool_end(),
+        ]
+        out = await _run(events, window_ms=1000)
+        assert [e.type for e in out] == [
+            EventType.TOOL_CALL_START,
+            EventType.TOOL_CALL_ARGS,
+            EventType.TOOL_CALL_END,
+        ]
+        assert out[1].delta == '{"file":"x"}'
+
+    async def test_merges_thinking_deltas(self):
+        out = await _run([_thinking("a"), _thinking("b")], window_ms=1000)
+        assert len(out) == 1
+        assert out[0].delta == "ab"
+
+    async def test_does_not_merge_across_ids(self):
+        events = [
+            make_text_content(msg_id="m-1", delta="a"),
+            make_text_content(msg_id="m-2", delta="b"),
+        ]
+        out = await _run(events, window_ms=1000)
+        assert [(e.message_id, e.delta) for e in out] == [("m-1", "a"), ("m-2", "b")]
+
+    async def test_preserves_extra_fields(self):
+        event = make_text_content(delta="a").model_copy(update={"thread_id": "t-9"})
+        out = await _run([event, make_text_content(delta="b")], window_ms=1000)
+        assert out[0].delta == "ab"
+        assert out[0].thread_id == "t-9"
+
+    async def test_flushes_at_byte_limit(self):
+        events = [make_text_content(delta="abc") for _ in range(4)]
+        out = await _run(events, window_ms=1000, max_bytes=6)
+        assert [e.delta for e in out] == ["abcabc", "abcabc"]
+
+
+@pytest.mark.asyncio
+class TestCoalescingTiming:
+    """Held-back deltas are released when the window elapses."""
+
+    async def test_releases_after_window_without_new_events(self):
+        release = asyncio.Event()
+
+        async def stream():
+            yield make_text_content(delta="a")
+            yield make_text_content(delta="b")
+            await release.wait()
+            yield make_text_content(delta="c")
+
+        received = []
+
+        async def consume():
+            async for event in coalescing_middleware(stream(), window_ms=10):
+                received.append(event.delta)
+
+        task = asyncio.create_task(consume())
+        await asyncio.sleep(0.1)
+        assert received == ["ab"]
+        release.set()
+        await asyncio.wait_for(task, 1)
+        assert received == ["ab", "c"]
+
+    async def test_flushes_pending_on_upstream_error(self):
+        async def stream():
+            yield make_text_content(delta="a")
+            raise RuntimeError("boom")
+
+        received = []
+        with pytest.raises(RuntimeError, match="boom"):
+            async for event in coalescing_middleware(stream(), window_ms=1000):
+                received.append(event.delta)
+        assert received == ["a"]
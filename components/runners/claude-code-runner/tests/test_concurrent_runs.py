@@ -0,0 +1,238 @@
+"""Unit tests for concurrent multi-thread runs (bridge slots + adapter isolation)."""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+from ag_ui.core import EventType, RunAgentInput, RunStartedEvent
+from claude_agent_sdk import ResultMessage
+
+from ag_ui_claude_sdk import ClaudeAgentAdapter
+from ambient_runner.bridges.claude import ClaudeBridge
+from ambient_runner.bridges.claude.session import QueueStats, SessionManager
+from ambient_runner.platform.context import RunnerContext
+
+
+def _input(thread_id: str, run_id: str, state=None) -> RunAgentInput:
+    return RunAgentInput(
+        thread_id=thread_id,
+        run_id=run_id,
+        messages=[{"id": f"u-{run_id}", "role": "user", "content": "hi"}],
+        state=state or {},
+        tools=[],
+        context=[],
+        forwarded_props={},
+    )
+
+
+def _result(cost: float) -> ResultMessage:
+    return ResultMessage(
+        subtype="success",
+        duration_ms=1,
+        duration_api_ms=1,
+        is_error=False,
+        num_turns=1,
+        session_id="s",
+        total_cost_usd=cost,
+        result="done",
+    )
+
+
+# ------------------------------------------------------------------
+# Adapter: run-scoped state
+# ------------------------------------------------------------------
+
+
+@pytest.mark.asyncio
+class TestAdapterRunIsolation:
+    """Interleaved runs on one adapter keep their own state and result."""
+
+    async def test_interleaved_runs_keep_own_result_data(self):
+        adapter = ClaudeAgentAdapter(name="test")
+        gate_a, gate_b = asyncio.Event(), asyncio.Event()
+
+        async def stream(gate, cost):
+            await gate.wait()
+            yield _result(cost)
+
+        async def collect(input_data, gate, cost):
+            return [
+                e
+                async for e in adapter.run(
+                    input_data, message_stream=stream(gate, cost)
+                )
+            ]
+
+        task_a = asyncio.create_task(
+            collect(_input("t-a", "r-a", {"owner": "a"}), gate_a, 1.0)
+        )
+        task_b = asyncio.create_task(
+            collect(_input("t-b", "r-b", {"owner": "b"}), gate_b, 2.0)
+        )
+        await asyncio.sleep(0)
+        gate_b.set()  # b finishes first, while a is mid-run
+        events_b = await task_b
+        gate_a.set()
+        events_a = await task_a
+
+        finished_a = [e for e in events_a if e.type == EventType.RUN_FINISHED][0]
+        finished_b = [e for e in events_b if e.type == EventType.RUN_FINISHED][0]
+        assert finished_a.result["total_cost_usd"] == 1.0
+        assert finished_b.result["total_cost_usd"] == 2.0
+
+    async def test_adapter_holds_no_run_state(self):
+        adapter = ClaudeAgentAdapter(name="test")
+        assert not hasattr(adapter, "_current_state")
+        assert not hasattr(adapter, "_last_result_data")
+
+
+# ------------------------------------------------------------------
+# Bridge: per-thread serialisation + global run slots
+# ------------------------------------------------------------------
+
+
+class _GatedAdapter:
+    """Adapter stub whose runs block until released."""
+
+    def __init__(self) -> None:
+        self.gates: dict[str, asyncio.Event] = {}
+        self.started: list[str] = []
+
+    def build_options(self, input_data=None, thread_id=None):
+        return None
+
+    async def run(self, input_data, *, message_stream):
+        self.started.append(input_data.run_id)
+        yield RunStartedEvent(
+            type=EventType.RUN_STARTED,
+            thread_id=input_data.thread_id,
+            run_id=input_data.run_id,
+        )
+        await self.gates.setdefault(input_data.run_id, asyncio.Event()).wait()
+
+    def release(self, run_id: str) -> None:
+        self.gates.setdefault(run_id, asyncio.Event()).set()
+
+
+class _StubWorker:
+    session_id = None
+    connected = True
+    alive = True
+
+    def __init__(self) -> None:
+        self.queue_stats = QueueStats(maxsize=10, overflow="block")
+
+    async def query(self, prompt, session_id=None):
+        return
+        yield
+
+
+def _bridge(
+    max_concurrent: int, threads=("t-1", "t-2", "t-3")
+) -> tuple[ClaudeBridge, _GatedAdapter]:
+    bridge = ClaudeBridge()
+    bridge.set_context(RunnerContext(session_id="s1", workspace_path="/w"))
+    bridge._ready = True
+    bridge._max_concurrent_runs = max_concurrent
+    bridge._run_slots = (
+        asyncio.Semaphore(max_concurrent) if max_concurrent > 0 else None
+    )
+    adapter = _GatedAdapter()
+    bridge._adapter = adapter
+    manager = SessionManager()
+    for tid in threads:
+        manager._workers[tid] = _StubWorker()
+    bridge._session_manager = manager
+    return bridge, adapter
+
+
+async def _consume(bridge: ClaudeBridge, input_data: RunAgentInput) -> list:
+    return [e async for e in bridge.run(input_data)]
+
+
+async def _settle() -> None:
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+class TestBridgeConcurrency:
+    """Different threads run in parallel; the same thread is serialised."""
+
+    async def test_different_threads_run_in_parallel(self):
+        bridge, adapter = _bridge(max_concurrent=0)
+        tasks = [
+            asyncio.create_task(_consume(bridge, _input("t-1", "r-1"))),
+            asyncio.create_task(_consume(bridge, _input("t-2", "r-2"))),
+        ]
+        await _settle()
+        assert sorted(adapter.started) == ["r-1", "r-2"]
+        assert bridge.get_diagnostics()["runs"]["active"] == 2
+
+        adapter.release("r-1")
+        adapter.release("r-2")
+        await asyncio.gather(*tasks)
+        assert bridge.get_diagnostics()["runs"]["active"] == 0
+
+    async def test_same_thread_is_serialised(self):
+        bridge, adapter = _bridge(max_concurrent=0)
+        first = asyncio.create_task(_consume(bridge, _input("t-1", "r-1")))
+        second = asyncio.create_task(_consume(bridge, _input("t-1", "r-2")))
+        await _settle()
+        assert adapter.started == ["r-1"]
+
+        adapter.release("r-1")
+        await first
+        await _settle()
+        assert adapter.started == ["r-1", "r-2"]
+        adapter.release("r-2")
+        await second
+
+    async def test_global_limit_queues_extra_threads(self):
+        bridge, adapter = _bridge(max_concurrent=2)
+        tasks = [
+            asyncio.create_task(_consume(bridge, _input(f"t-{i}", f"r-{i}")))
+            for i in (1, 2, 3)
+        ]
+        await _settle()
+        assert sorted(adapter.started) == ["r-1", "r-2"]
+        runs = bridge.get_diagnostics()["runs"]
+        assert runs == {"active": 2, "waiting": 1, "maxConcurrent": 2}
+
+        adapter.release("r-1")
+        await _settle()
+        assert "r-3" in adapter.started
+
+        adapter.release("r-2")
+        adapter.release("r-3")
+        await asyncio.gather(*tasks)
+
+    async def test_slot_released_when_consumer_stops_early(self):
+        bridge, adapter = _bridge(max_concurrent=1)
+        adapter.release("r-1")
+        stream = bridge.run(_input("t-1", "r-1"))
+        await stream.__anext__()
+        await stream.aclose()
+        assert bridge.get_diagnostics()["runs"]["active"] == 0
+
+        adapter.release("r-2")
+        await asyncio.wait_for(_consume(bridge, _input("t-2", "r-2")), timeout=1)
+
+    async def test_existing_thread_lock_survives_worker_creation(self):
+        manager = SessionManager()
+        lock = manager.get_lock("t-1")
+
+        class _Worker:
+            def __init__(self, *args, **kwargs):
+                pass
+
+            async def start(self):
+                pass
+
+            def add_exit_callback(self, callback):
+                pass
+
+        with patch("ambient_runner.bridges.claude.session.SessionWorker", _Worker):
+            async with lock:
+                await manager.get_or_create("t-1", None, "")
+        assert manager.get_lock("t-1") is lock
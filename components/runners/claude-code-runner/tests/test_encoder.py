@@ -0,0 +1,212 @@
+"""Unit tests for the run endpoint encoders (SSE fast path and msgpack)."""
+
+import math
+import struct
+
+import pytest
+
+from ag_ui.core import (
+    EventType,
+    StateSnapshotEvent,
+    ThinkingTextMessageContentEvent,
+)
+from ag_ui.encoder import EventEncoder
+
+from ambient_runner.encoder import (
+    MSGPACK_MEDIA_TYPE,
+    FastEventEncoder,
+    MsgpackEventEncoder,
+    accepts_msgpack,
+)
+from benchmarks.recorded_stream import synthetic_recording
+from tests.conftest import (
+    make_run_finished,
+    make_run_started,
+    make_text_content,
+    make_text_start,
+    make_tool_args,
+    make_tool_start,
+)
+
+_DELTAS = [
+    "Hello",
+    'quote " and backslash \\',
+    "newline\n tab\t control \x01 \x1f del \x7f",
+    "unicode über 日本語 ✓   \U0001f600",
+    "</script>",
+]
+
+
+def _assert_same(event):
+    assert FastEventEncoder().encode(event) == EventEncoder().encode(event)
+
+
+class TestFastEncoderParity:
+    """Hot-path events encode byte-for-byte like the generic encoder."""
+
+    @pytest.mark.parametrize("delta", _DELTAS)
+    def test_text_content(self, delta):
+        _assert_same(make_text_content(delta=delta))
+
+    @pytest.mark.parametrize("delta", _DELTAS)
+    def test_tool_args(self, delta):
+        _assert_same(make_tool_args(delta=delta))
+
+    @pytest.mark.parametrize("delta", _DELTAS)
+    def test_thinking_content(self, delta):
+        _assert_same(
+            ThinkingTextMessageContentEvent(
+                type=EventType.THINKING_TEXT_MESSAGE_CONTENT, delta=delta
+            )
+        )
+
+    @pytest.mark.parametrize(
+        "snapshot",
+        [
+            {},
+            {"a": None, "b": [1, 2.5, True, None]},
+            {"nested": {"k": "ü\n"}},
+            [1, "x"],
+            "s",
+            0,
+        ],
+    )
+    def test_state_snapshot(self, snapshot):
+        _assert_same(
+            StateSnapshotEvent(type=EventType.STATE_SNAPSHOT, snapshot=snapshot)
+        )
+
+    def test_non_finite_floats_become_null(self):
+        snapshot = {"nan": math.nan, "inf": [math.inf, -math.inf], "ok": 1.5}
+        _assert_same(
+            StateSnapshotEvent(type=EventType.STATE_SNAPSHOT, snapshot=snapshot)
+        )
+        _assert_same(make_text_content().model_copy(update={"extra": math.nan}))
+
+    def test_none_snapshot_falls_back(self):
+        _assert_same(StateSnapshotEvent(type=EventType.STATE_SNAPSHOT, snapshot=None))
+
+    def test_extras_in_order_and_none_dropped(self):
+        event = make_text_content().model_copy(
+            update={"thread_id": "t-1", "skip": None, "run_id": "r-1"}
+        )
+        _assert_same(event)
+        assert (
+            FastEventEncoder()
+            .encode(event)
+            .endswith(',"thread_id":"t-1","run_id":"r-1"}\n\n')
+        )
+
+    @pytest.mark.parametrize("value", [1, 1.0, True, {"a": None}, ["x"]])
+    def test_non_string_extras(self, value):
+        # Values that hash alike (1 / 1.0 / True) must not share a cache entry.
+        _assert_same(make_text_content().model_copy(update={"extra": value}))
+
+    def test_timestamp_and_raw_event_fall_back(self):
+        _assert_same(make_text_content().model_copy(update={"timestamp": 123}))
+        _assert_same(make_tool_args().model_copy(update={"raw_event": {"x": 1}}))
+
+    def test_other_events_use_generic_path(self):
+        for event in (
+            make_run_started(),
+            make_text_start(),
+            make_tool_start(),
+            make_run_finished(),
+        ):
+            _assert_same(event)
+
+    def test_recorded_stream(self):
+        for event in synthetic_recording(turns=3):
+            _assert_same(event)
+
+
+class TestFastEncoderInterface:
+    """Drop-in replacement for EventEncoder."""
+
+    def test_content_type(self):
+        assert (
+            FastEventEncoder(accept="text/event-stream").get_content_type()
+            == "text/event-stream"
+        )
+
+    def test_is_event_encoder(self):
+        assert isinstance(FastEventEncoder(), EventEncoder)
+
+
+def _unframe(data: bytes) -> list:
+    msgpack = pytest.importorskip("msgpack")
+    frames, pos = [], 0
+    while pos < len(data):
+        (length,) = struct.unpack_from(">I", data, pos)
+        frames.append(msgpack.unpackb(data[pos + 4 : pos + 4 + length]))
+        pos += 4 + length
+    return frames
+
+
+class TestMsgpackEncoder:
+    """Length-prefixed msgpack frames."""
+
+    @pytest.fixture(autouse=True)
+    def _require_msgpack(self):
+        pytest.importorskip("msgpack")
+
+    def test_header_frame(self):
+        encoder = MsgpackEventEncoder("t-1", "r-1")
+        assert _unframe(encoder.encode_header()) == [
+            [0, {"threadId": "t-1", "runId": "r-1"}]
+        ]
+
+    def test_event_matches_json_payload_without_redundant_ids(self):
+        event = make_text_content(delta="über").model_copy(
+            update={"thread_id": "t-1", "run_id": "r-1"}
+        )
+        [[seq, payload]] = _unframe(MsgpackEventEncoder("t-1", "r-1").encode(event, 7))
+        assert seq == 7
+        assert payload == {
+            "type": "TEXT_MESSAGE_CONTENT",
+            "messageId": "m-1",
+            "delta": "über",
+        }
+
+    def test_ids_kept_when_they_differ_from_header(self):
+        event = make_text_content().model_copy(update={"thread_id": "other"})
+        [[_, payload]] = _unframe(MsgpackEventEncoder("t-1", "r-1").encode(event, 1))
+        assert payload["thread_id"] == "other"
+
+    def test_declared_id_fields_kept(self):
+        [[_, payload]] = _unframe(
+            MsgpackEventEncoder("t-1", "r-1").encode(make_run_started(), 1)
+        )
+        assert payload == {"type": "RUN_STARTED", "threadId": "t-1", "runId": "r-1"}
+
+    def test_smaller_than_sse(self):
+        events = synthetic_recording(turns=3)
+        binary = MsgpackEventEncoder("thread-1", "run-1")
+        sse = FastEventEncoder()
+        binary_size = sum(len(binary.encode(e, i)) for i, e in enumerate(events, 1))
+        sse_size = sum(
+            len(f"id: {i}\n{sse.encode(e)}".encode()) for i, e in enumerate(events, 1)
+        )
+        assert binary_size < sse_size * 0.7
+
+
+class TestAcceptNegotiation:
+    """Binary transport only when explicitly requested."""
+
+    @pytest.mark.parametrize(
+        "accept", [None, "", "*/*", "text/event-stream", "application/json"]
+    )
+    def test_sse_by_default(self, accept):
+        assert not accepts_msgpack(accept)
+
+    @pytest.mark.parametrize(
+        "accept",
+        [
+            MSGPACK_MEDIA_TYPE,
+            f"text/event-stream, {MSGPACK_MEDIA_TYPE};q=0.9",
+            MSGPACK_MEDIA_TYPE.upper(),
+        ],
+    )
+    def test_msgpack_requested(self, accept):
+        pytest.importorskip("msgpack")
+        assert accepts_msgpack(accept)
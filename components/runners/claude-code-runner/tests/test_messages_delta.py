@@ -0,0 +1,128 @@
+"""Unit tests for incremental (delta) MESSAGES_SNAPSHOT mode in the adapter."""
+
+import pytest
+from ag_ui.core import EventType, RunAgentInput
+from claude_agent_sdk.types import StreamEvent
+
+from ag_ui_claude_sdk import ClaudeAgentAdapter
+from ag_ui_claude_sdk.config import MESSAGES_DELTA_EVENT_NAME
+
+
+def _input(messages, forwarded_props=None) -> RunAgentInput:
+    return RunAgentInput(
+        thread_id="t-1",
+        run_id="r-1",
+        messages=messages,
+        state={},
+        tools=[],
+        context=[],
+        forwarded_props=forwarded_props or {},
+    )
+
+
+def _user(msg_id: str, text: str = "hi") -> dict:
+    return {"id": msg_id, "role": "user", "content": text}
+
+
+def _stream_event(event: dict) -> StreamEvent:
+    return StreamEvent(uuid="u", session_id="s", event=event)
+
+
+async def _reply(text: str):
+    """A streamed assistant reply, as the SDK produces with partial messages."""
+    yield _stream_event({"type": "message_start"})
+    yield _stream_event(
+        {
+            "type": "content_block_delta",
+            "index": 0,
+            "delta": {"type": "text_delta", "text": text},
+        }
+    )
+    yield _stream_event({"type": "message_stop"})
+
+
+async def _run(adapter, input_data, reply="hello"):
+    return [e async for e in adapter.run(input_data, message_stream=_reply(reply))]
+
+
+def _snapshots(events):
+    return [
+        e
+        for e in events
+        if e.type == EventType.MESSAGES_SNAPSHOT
+        or (e.type == EventType.CUSTOM and e.name == MESSAGES_DELTA_EVENT_NAME)
+    ]
+
+
+@pytest.mark.asyncio
+class TestMessagesSnapshotModes:
+    """Full snapshot by default; delta when enabled."""
+
+    async def test_full_mode_is_default(self):
+        adapter = ClaudeAgentAdapter(name="test")
+        [snapshot] = _snapshots(await _run(adapter, _input([_user("u-1")])))
+        assert snapshot.type == EventType.MESSAGES_SNAPSHOT
+        assert [m.role for m in snapshot.messages] == ["user", "assistant"]
+
+    async def test_delta_contains_only_run_messages(self):
+        adapter = ClaudeAgentAdapter(name="test", messages_snapshot_mode="delta")
+        history = [_user(f"u-{i}") for i in range(50)]
+        [delta] = _snapshots(await _run(adapter, _input(history)))
+        assert delta.type == EventType.CUSTOM
+        assert delta.value["anchorMessageId"] == "u-49"
+        assert [m.role for m in delta.value["messages"]] == ["assistant"]
+        assert delta.value["messages"][0].content == "hello"
+
+    async def test_delta_requested_per_run(self):
+        adapter = ClaudeAgentAdapter(name="test")
+        events = await _run(
+            adapter, _input([_user("u-1")], {"messages_snapshot": "delta"})
+        )
+        assert _snapshots(events)[0].type == EventType.CUSTOM
+
+    async def test_full_snapshot_on_demand(self):
+        adapter = ClaudeAgentAdapter(name="test", messages_snapshot_mode="delta")
+        events = await _run(
+            adapter, _input([_user("u-1")], {"messages_snapshot": "full"})
+        )
+        assert _snapshots(events)[0].type == EventType.MESSAGES_SNAPSHOT
+
+    async def test_consecutive_runs_stay_incremental(self):
+        adapter = ClaudeAgentAdapter(name="test", messages_snapshot_mode="delta")
+        [first] = _snapshots(await _run(adapter, _input([_user("u-1")])))
+        reply_id = first.value["messages"][0].id
+
+        history = [
+            _user("u-1"),
+            {"id": reply_id, "role": "assistant", "content": "hello"},
+            _user("u-2"),
+        ]
+        [second] = _snapshots(await _run(adapter, _input(history)))
+        assert second.type == EventType.CUSTOM
+        assert second.value["anchorMessageId"] == "u-2"
+
+    async def test_diverged_history_falls_back_to_full(self):
+        adapter = ClaudeAgentAdapter(name="test", messages_snapshot_mode="delta")
+        await _run(adapter, _input([_user("u-1")]))
+
+        # Client never applied the previous delta: its history lacks the reply.
+        [snapshot] = _snapshots(
+            await _run(adapter, _input([_user("u-1"), _user("u-2")]))
+        )
+        assert snapshot.type == EventType.MESSAGES_SNAPSHOT
+        assert [m.id for m in snapshot.messages][:2] == ["u-1", "u-2"]
+
+    async def test_invalid_mode_rejected(self):
+        with pytest.raises(ValueError, match="messages_snapshot_mode"):
+            ClaudeAgentAdapter(name="test", messages_snapshot_mode="partial")
+
+
+class TestMessagesSnapshotForwardedProp:
+    """The per-run prop is consumed by the adapter, not passed to the SDK."""
+
+    def test_not_applied_as_sdk_option(self):
+        adapter = ClaudeAgentAdapter(name="test")
+        options = adapter.build_options(
+            _input([_user("u-1")], {"messages_snapshot": "delta"})
+        )
+        assert not hasattr(options, "messages_snapshot")
@@ -0,0 +1,215 @@
+"""Unit tests for options fingerprinting and fingerprint-driven worker rebuilds."""
+
+import time
+from unittest.mock import patch
+
+import pytest
+from ag_ui.core import RunAgentInput
+from claude_agent_sdk import ClaudeAgentOptions
+
+from ambient_runner.bridges.claude import ClaudeBridge
+from ambient_runner.bridges.claude.session import SessionManager, options_fingerprint
+from ambient_runner.platform.context import RunnerContext
+
+
+class _FakeWorker:
+    """Records its options and whether it was stopped."""
+
+    instances: list["_FakeWorker"] = []
+
+    def __init__(self, thread_id, options, api_key, **kwargs):
+        self.thread_id = thread_id
+        self.options = options
+        self.session_id = f"sid-{thread_id}"
+        self.last_active = time.monotonic()
+        self.stopped = False
+        self.stopping = False
+        self.alive = True
+        _FakeWorker.instances.append(self)
+
+    async def start(self):
+        pass
+
+    def add_exit_callback(self, callback):
+        pass
+
+    def process_alive(self):
+        return None
+
+    async def stop(self):
+        self.stopping = True
+        self.stopped = True
+
+
+@pytest.fixture(autouse=True)
+def fake_worker():
+    _FakeWorker.instances = []
+    with patch("ambient_runner.bridges.claude.session.SessionWorker", _FakeWorker):
+        yield
+
+
+async def _create(manager: SessionManager, thread_id: str, options, **kwargs):
+    async with manager.get_lock(thread_id):
+        return await manager.get_or_create(thread_id, options, "", **kwargs)
+
+
+def _stderr_handler(line: str) -> None:
+    pass
+
+
+def _bridge() -> ClaudeBridge:
+    bridge = ClaudeBridge()
+    bridge.set_context(RunnerContext(session_id="s-1", workspace_path="/w"))
+    bridge._cwd_path = "/w/repos/a"
+    bridge._allowed_tools = ["Read"]
+    bridge._mcp_servers = {}
+    bridge._system_prompt = "You are helpful"
+    bridge._ensure_adapter()
+    return bridge
+
+
+def _input(state=None, context=None, tools=None) -> RunAgentInput:
+    return RunAgentInput(
+        thread_id="t",
+        run_id="r",
+        messages=[],
+        state=state,
+        tools=tools or [],
+        context=context or [],
+        forwarded_props={},
+    )
+
+
+def _run_fingerprint(bridge: ClaudeBridge, input_data: RunAgentInput) -> str:
+    options = bridge._adapter.build_options(input_data, thread_id="t")
+    return bridge._fingerprint(options, input_data)
+
+
+class TestOptionsFingerprint:
+    def test_equal_options_match(self):
+        a = ClaudeAgentOptions(
+            model="m", allowed_tools=["Read"], stderr=_stderr_handler
+        )
+        b = ClaudeAgentOptions(
+            model="m", allowed_tools=["Read"], stderr=_stderr_handler
+        )
+        assert options_fingerprint(a) == options_fingerprint(b)
+
+    def test_model_change_differs(self):
+        a = ClaudeAgentOptions(model="claude-sonnet")
+        b = ClaudeAgentOptions(model="claude-opus")
+        assert options_fingerprint(a) != options_fingerprint(b)
+
+    def test_dict_key_order_is_irrelevant(self):
+        a = ClaudeAgentOptions(
+            mcp_servers={"x": {"command": "a"}, "y": {"command": "b"}}
+        )
+        b = ClaudeAgentOptions(
+            mcp_servers={"y": {"command": "b"}, "x": {"command": "a"}}
+        )
+        assert options_fingerprint(a) == options_fingerprint(b)
+
+    def test_live_objects_hash_by_type(self):
+        a = ClaudeAgentOptions(
+            mcp_servers={"ag_ui": {"type": "sdk", "instance": object()}}
+        )
+        b = ClaudeAgentOptions(
+            mcp_servers={"ag_ui": {"type": "sdk", "instance": object()}}
+        )
+        assert options_fingerprint(a) == options_fingerprint(b)
+
+    def test_extras_fold_in_and_none_is_ignored(self):
+        options = ClaudeAgentOptions()
+        assert options_fingerprint(options, tools=None) == options_fingerprint(options)
+        assert options_fingerprint(
+            options, tools=[{"name": "a"}]
+        ) != options_fingerprint(options, tools=[{"name": "b"}])
+
+
+@pytest.mark.asyncio
+class TestFingerprintRebuild:
+    async def test_unchanged_options_keep_worker(self):
+        manager = SessionManager(max_workers=0, idle_ttl=0, supervise_interval=0)
+        first = await _create(manager, "t", ClaudeAgentOptions(model="m"))
+        second = await _create(manager, "t", ClaudeAgentOptions(model="m"))
+        assert second is first
+        assert not first.stopped
+        assert manager.get_pool_stats()["reconfigured"] == 0
+
+    async def test_changed_options_restart_with_resume(self):
+        manager = SessionManager(max_workers=0, idle_ttl=0, supervise_interval=0)
+        first = await _create(manager, "t", ClaudeAgentOptions(model="m1"))
+        second = await _create(manager, "t", ClaudeAgentOptions(model="m2"))
+        assert second is not first
+        assert first.stopped
+        assert second.options.model == "m2"
+        assert second.options.resume == "sid-t"
+        assert manager.get_pool_stats()["reconfigured"] == 1
+
+    async def test_other_threads_stay_warm(self):
+        manager = SessionManager(max_workers=0, idle_ttl=0, supervise_interval=0)
+        a = await _create(manager, "a", ClaudeAgentOptions(model="m1"))
+        b = await _create(manager, "b", ClaudeAgentOptions(model="m1"))
+        await _create(manager, "a", ClaudeAgentOptions(model="m2"))
+        assert a.stopped
+        assert not b.stopped
+        assert manager.get_existing("b") is b
+
+    async def test_explicit_fingerprint_wins(self):
+        manager = SessionManager(max_workers=0, idle_ttl=0, supervise_interval=0)
+        options = ClaudeAgentOptions()
+        first = await _create(manager, "t", options, fingerprint="tools-1")
+        second = await _create(manager, "t", options, fingerprint="tools-2")
+        assert first.stopped
+        assert second is not first
+
+
+class TestBridgeFingerprint:
+    def test_state_change_keeps_fingerprint(self):
+        bridge = _bridge()
+        assert _run_fingerprint(bridge, _input(state={"count": 1})) == _run_fingerprint(
+            bridge, _input(state={"count": 2})
+        )
+
+    def test_context_change_keeps_fingerprint(self):
+        bridge = _bridge()
+        first = _input(context=[{"description": "page", "value": "home"}])
+        second = _input(context=[{"description": "page", "value": "settings"}])
+        assert _run_fingerprint(bridge, first) == _run_fingerprint(bridge, second)
+
+    def test_warmup_matches_first_run(self):
+        bridge = _bridge()
+        warmup = bridge._fingerprint(bridge._adapter.build_options(thread_id="t"))
+        first_run = _input(context=[{"description": "page", "value": "home"}])
+        assert _run_fingerprint(bridge, first_run) == warmup
+
+    def test_frontend_tools_change_fingerprint(self):
+        bridge = _bridge()
+        tool = {
+            "name": "pick_color",
+            "description": "Pick",
+            "parameters": {"type": "object"},
+        }
+        assert _run_fingerprint(bridge, _input()) != _run_fingerprint(
+            bridge, _input(tools=[tool])
+        )
+
+    @pytest.mark.asyncio
+    async def test_state_change_keeps_worker(self):
+        bridge = _bridge()
+        manager = SessionManager(max_workers=0, idle_ttl=0, supervise_interval=0)
+        workers = []
+        for count in (1, 2):
+            input_data = _input(state={"count": count})
+            options = bridge._adapter.build_options(input_data, thread_id="t")
+            workers.append(
+                await _create(
+                    manager,
+                    "t",
+                    options,
+                    fingerprint=bridge._fingerprint(options, input_data),
+                )
+            )
+        assert workers[1] is workers[0]
+        assert not workers[0].stopped
+        assert manager.get_pool_stats()["reconfigured"] == 0
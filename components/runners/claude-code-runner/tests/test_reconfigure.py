@@ -0,0 +1,139 @@
+"""Unit tests for incremental bridge reconfiguration after repo/workflow changes."""
+
+from contextlib import contextmanager
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from ambient_runner.bridges.claude import ClaudeBridge
+from ambient_runner.platform.context import RunnerContext
+
+
+class _Workspace:
+    """Mutable stand-in for the workspace-derived inputs."""
+
+    def __init__(self) -> None:
+        self.cwd = "/w/repos/a"
+        self.add_dirs = ["/w/repos/b"]
+        self.mcp_config = {"github": {"command": "gh-mcp"}}
+        self.rubric = ("", {})
+        self.builds = 0
+
+    def build_mcp_servers(self, context, cwd_path, obs=None, on_restart=None):
+        self.builds += 1
+        return dict(self.mcp_config)
+
+
+@contextmanager
+def _patched(ws: _Workspace):
+    with (
+        patch(
+            "ambient_runner.platform.workspace.resolve_workspace_paths",
+            side_effect=lambda ctx: (ws.cwd, list(ws.add_dirs)),
+        ),
+        patch(
+            "ambient_runner.platform.config.load_mcp_config",
+            side_effect=lambda ctx, cwd: ws.mcp_config,
+        ),
+        patch(
+            "ambient_runner.bridges.claude.tools.load_rubric_content",
+            side_effect=lambda cwd: ws.rubric,
+        ),
+        patch(
+            "ambient_runner.bridges.claude.mcp.build_mcp_servers",
+            side_effect=ws.build_mcp_servers,
+        ),
+        patch(
+            "ambient_runner.bridges.claude.mcp.log_auth_status",
+        ),
+        patch(
+            "ambient_runner.bridges.claude.prompts.build_sdk_system_prompt",
+            side_effect=lambda workspace, cwd: {"type": "preset", "append": cwd},
+        ),
+    ):
+        yield
+
+
+def _bridge() -> ClaudeBridge:
+    bridge = ClaudeBridge()
+    bridge.set_context(RunnerContext(session_id="s-1", workspace_path="/w"))
+    return bridge
+
+
+class TestConfigureWorkspace:
+    def test_unchanged_workspace_reports_nothing(self):
+        ws = _Workspace()
+        bridge = _bridge()
+        with _patched(ws):
+            first = bridge._configure_workspace()
+            second = bridge._configure_workspace()
+        assert set(first) == {"cwd", "add_dirs", "mcp_servers", "system_prompt"}
+        assert second == []
+        assert ws.builds == 1
+
+    def test_added_repo_changes_paths_only(self):
+        ws = _Workspace()
+        bridge = _bridge()
+        with _patched(ws):
+            bridge._configure_workspace()
+            servers = bridge._mcp_servers
+            ws.add_dirs.append("/w/repos/c")
+            changed = bridge._configure_workspace()
+        assert changed == ["add_dirs"]
+        assert bridge._mcp_servers is servers
+
+    def test_workflow_change_rebuilds_mcp_and_prompt(self):
+        ws = _Workspace()
+        bridge = _bridge()
+        with _patched(ws):
+            bridge._configure_workspace()
+            key = bridge._mcp_key
+            ws.cwd = "/w/workflows/wf"
+            ws.rubric = ("# Rubric", {"schema": {"quality": {}}})
+            changed = bridge._configure_workspace()
+        assert set(changed) == {"cwd", "mcp_servers", "system_prompt"}
+        assert bridge._mcp_key != key
+        assert ws.builds == 2
+
+    def test_mcp_change_changes_worker_fingerprint(self):
+        ws = _Workspace()
+        bridge = _bridge()
+        with _patched(ws):
+            bridge._configure_workspace()
+            before = bridge._fingerprint(None)
+            ws.rubric = ("# Rubric", {})
+            bridge._configure_workspace()
+        assert bridge._fingerprint(None) != before
+
+
+@pytest.mark.asyncio
+class TestIncrementalReady:
+    async def test_mark_dirty_skips_full_setup(self):
+        ws = _Workspace()
+        bridge = _bridge()
+        with _patched(ws):
+            bridge._configure_workspace()
+        bridge._reconfigure.setup_ms = 5000.0
+        bridge._ready = True
+
+        bridge.mark_dirty()
+        ws.add_dirs.append("/w/repos/c")
+        full_setup = AsyncMock()
+        with _patched(ws), patch.object(bridge, "_setup_platform", full_setup):
+            await bridge._ensure_ready()
+
+        full_setup.assert_not_awaited()
+        assert bridge._ready is True
+        stats = bridge._reconfigure.as_dict()
+        assert stats["count"] == 1
+        assert stats["lastChanged"] == ["add_dirs"]
+        assert stats["savedMs"] > 0
+
+    async def test_first_ready_runs_full_setup(self):
+        bridge = _bridge()
+        full_setup = AsyncMock()
+        with patch.object(bridge, "_setup_platform", full_setup):
+            await bridge._ensure_ready()
+        full_setup.assert_awaited_once()
+        assert bridge._reconfigure.setup_ms is not None
+        assert bridge._reconfigure.count == 0
@@ -0,0 +1,89 @@
+"""Unit tests for RunMessageAccumulator (MESSAGES_SNAPSHOT accumulation)."""
+
+from ag_ui.core import AssistantMessage, EventType, MessagesSnapshotEvent, ToolMessage
+
+from ag_ui_claude_sdk.accumulator import RunMessageAccumulator
+from ag_ui_claude_sdk.utils import build_agui_tool_message
+
+
+def _assistant(msg_id: str, content: str = "hi") -> AssistantMessage:
+    return AssistantMessage(id=msg_id, role="assistant", content=content)
+
+
+def _tool(tool_call_id: str, content: str = "ok") -> ToolMessage:
+    return build_agui_tool_message(tool_call_id, [{"type": "text", "text": content}])
+
+
+class TestUpsert:
+    """Ordered, ID-indexed upsert."""
+
+    def test_appends_in_order(self):
+        acc = RunMessageAccumulator()
+        acc.upsert(_assistant("a"))
+        acc.upsert(_assistant("b"))
+        assert [m.id for m in acc] == ["a", "b"]
+        assert len(acc) == 2
+
+    def test_same_id_replaces_in_place(self):
+        acc = RunMessageAccumulator()
+        acc.upsert(_assistant("a", "fallback"))
+        acc.upsert(_assistant("b"))
+        acc.upsert(_assistant("a", "streamed"))
+        assert [(m.id, m.content) for m in acc.messages()] == [
+            ("a", "streamed"),
+            ("b", "hi"),
+        ]
+
+    def test_dict_messages_and_missing_ids(self):
+        acc = RunMessageAccumulator()
+        acc.upsert({"id": "a", "role": "user", "content": "x"})
+        acc.upsert({"role": "user", "content": "no id"})
+        acc.upsert({"role": "user", "content": "no id either"})
+        acc.upsert({"id": "a", "role": "user", "content": "y"})
+        assert [m["content"] for m in acc] == ["y", "no id", "no id either"]
+
+    def test_empty_is_falsy(self):
+        assert not RunMessageAccumulator()
+
+
+class TestToolNames:
+    """Tool names are attached at insert time, in either order."""
+
+    def test_name_known_before_result(self):
+        acc = RunMessageAccumulator()
+        acc.set_tool_name("tc-1", "Read")
+        acc.upsert(_tool("tc-1"))
+        [msg] = acc.messages()
+        assert msg.name == "Read"
+
+    def test_name_learned_after_result(self):
+        acc = RunMessageAccumulator()
+        acc.upsert(_tool("tc-1"))
+        acc.set_tool_name("tc-1", "Bash")
+        [msg] = acc.messages()
+        assert msg.name == "Bash"
+
+    def test_unknown_tool_left_untouched(self):
+        acc = RunMessageAccumulator()
+        original = _tool("tc-1")
+        acc.upsert(original)
+        assert acc.messages()[0] is original
+
+    def test_snapshot_matches_legacy_dict_enrichment(self):
+        """Same wire format as the old model_dump + dict["name"] pass."""
+        acc = RunMessageAccumulator()
+        acc.set_tool_name("tc-1", "Read")
+        acc.upsert(_assistant("a"))
+        acc.upsert(_tool("tc-1"))
+
+        legacy = _tool("tc-1").model_dump(exclude_none=True)
+        legacy["name"] = "Read"
+        expected = MessagesSnapshotEvent(
+            type=EventType.MESSAGES_SNAPSHOT, messages=[_assistant("a"), legacy]
+        )
+        actual = MessagesSnapshotEvent(
+            type=EventType.MESSAGES_SNAPSHOT, messages=acc.messages()
+        )
+        assert actual.model_dump_json(
+            by_alias=True, exclude_none=True
+        ) == expected.model_dump_json(by_alias=True, exclude_none=True)
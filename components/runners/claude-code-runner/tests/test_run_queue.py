@@ -0,0 +1,171 @@
+"""Unit tests for per-thread run admission and the run endpoint's 429 path."""
+
+import asyncio
+import uuid
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from ambient_runner.endpoints.run import (
+    RUN_QUEUED_EVENT_NAME,
+    RunnerInput,
+    _queued_agent_events,
+    get_run_queue,
+    router,
+)
+from ambient_runner.platform.run_queue import RunQueue, RunQueueFullError
+from tests.conftest import make_run_finished, make_run_started
+
+
+@pytest.mark.asyncio
+class TestRunQueue:
+    async def test_first_run_starts_immediately(self):
+        queue = RunQueue()
+        ticket = queue.admit("t")
+        assert ticket.position == 0
+        assert ticket.estimated_wait == 0.0
+        async with queue.hold(ticket) as waited:
+            assert waited < 0.1
+        assert queue.depth("t") == 0
+
+    async def test_runs_are_served_in_order(self):
+        queue = RunQueue()
+        order: list[int] = []
+
+        async def run(ticket, n):
+            async with queue.hold(ticket):
+                order.append(n)
+                await asyncio.sleep(0)
+
+        tickets = [queue.admit("t") for _ in range(3)]
+        assert [t.position for t in tickets] == [0, 1, 2]
+        await asyncio.gather(
+            *(run(t, n) for n, t in reversed(list(enumerate(tickets))))
+        )
+        assert order == [0, 1, 2]
+        assert queue.stats()["queued"] == 2
+
+    async def test_threads_are_independent(self):
+        queue = RunQueue()
+        queue.admit("a")
+        assert queue.admit("b").position == 0
+
+    async def test_rejects_beyond_max_depth(self):
+        queue = RunQueue(max_depth=1)
+        queue.admit("t")
+        queue.admit("t")
+        with pytest.raises(RunQueueFullError):
+            queue.admit("t")
+        assert queue.stats()["rejected"] == 1
+
+    async def test_zero_depth_is_unbounded(self):
+        queue = RunQueue(max_depth=0)
+        for _ in range(10):
+            queue.admit("t")
+        assert queue.depth("t") == 9
+
+    async def test_cancelled_waiter_leaves_queue(self):
+        queue = RunQueue()
+        first = queue.admit("t")
+        second = queue.admit("t")
+        third = queue.admit("t")
+
+        async def wait(ticket):
+            async with queue.hold(ticket):
+                pass
+
+        waiter = asyncio.create_task(wait(second))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        queue.release(first)
+        assert third._ready.is_set()
+
+    async def test_estimate_uses_run_duration(self):
+        queue = RunQueue()
+        ticket = queue.admit("t")
+        async with queue.hold(ticket):
+            await asyncio.sleep(0.02)
+        queue.admit("t")
+        waiting = queue.admit("t")
+        assert waiting.estimated_wait is not None
+        assert waiting.estimated_wait > 0
+
+
+class _GatedBridge:
+    """Bridge whose runs block until ``release`` is set."""
+
+    context = None
+
+    def __init__(self):
+        self.release = asyncio.Event()
+
+    async def run(self, input_data):
+        yield make_run_started()
+        await self.release.wait()
+        yield make_run_finished()
+
+    def get_error_context(self) -> str:
+        return ""
+
+
+def _payload(run_id: str) -> dict:
+    return {
+        "threadId": "t-1",
+        "runId": run_id,
+        "messages": [{"id": str(uuid.uuid4()), "role": "user", "content": "hi"}],
+    }
+
+
+class TestRunEndpointQueue:
+    def test_over_capacity_returns_429(self, monkeypatch):
+        monkeypatch.setenv("RUN_QUEUE_MAX_DEPTH", "1")
+        app = FastAPI()
+        app.state.bridge = _GatedBridge()
+        app.include_router(router)
+        run_queue = get_run_queue(app)
+        run_queue.admit("t-1")  # the active run
+        run_queue.admit("t-1")  # one waiting run fills the queue
+        with TestClient(app) as client:
+            resp = client.post("/", json=_payload("q-1"))
+        assert resp.status_code == 429
+        assert run_queue.stats()["rejected"] == 1
+
+    def test_idle_thread_reports_position_zero(self):
+        app = FastAPI()
+        bridge = _GatedBridge()
+        bridge.release.set()
+        app.state.bridge = bridge
+        app.include_router(router)
+        with TestClient(app) as client:
+            resp = client.post("/", json=_payload("q-2"))
+        assert resp.headers["x-run-queue-position"] == "0"
+        assert RUN_QUEUED_EVENT_NAME not in resp.text
+        assert get_run_queue(app).depth("t-1") == 0
+
+
+@pytest.mark.asyncio
+class TestQueuedAgentEvents:
+    async def test_queued_run_announces_position_then_runs(self):
+        bridge = _GatedBridge()
+        bridge.release.set()
+        run_queue = RunQueue()
+        active = run_queue.admit("t-1")
+        ticket = run_queue.admit("t-1")
+        input_data = RunnerInput(**_payload("q-3")).to_run_agent_input()
+
+        events = _queued_agent_events(bridge, input_data, run_queue, ticket)
+        first = await events.__anext__()
+        assert first.name == RUN_QUEUED_EVENT_NAME
+        assert first.value["position"] == 1
+
+        pending = asyncio.ensure_future(events.__anext__())
+        await asyncio.sleep(0.01)
+        assert not pending.done()
+        run_queue.release(active)
+        assert (await pending).type == "RUN_STARTED"
+        rest = [event async for event in events]
+        assert rest[-1].type == "RUN_FINISHED"
+        assert run_queue.stats()["lastWaitMs"] is not None
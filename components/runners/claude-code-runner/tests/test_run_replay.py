@@ -0,0 +1,405 @@
+"""Unit tests for the run replay buffer, run registry and run endpoints."""
+
+import asyncio
+import json
+import struct
+import uuid
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from ambient_runner.encoder import MSGPACK_MEDIA_TYPE
+from ambient_runner.endpoints.run import router
+from ambient_runner.platform.event_buffer import EventReplayBuffer, ReplayGapError
+from ambient_runner.platform.runs import RunRegistry
+from tests.conftest import (
+    make_run_finished,
+    make_run_started,
+    make_text_content,
+    make_text_end,
+    make_text_start,
+)
+
+
+# ------------------------------------------------------------------
+# EventReplayBuffer
+# ------------------------------------------------------------------
+
+
+async def _collect(buffer: EventReplayBuffer, after: int = 0) -> list[tuple[int, str]]:
+    return [item async for item in buffer.replay(after)]
+
+
+@pytest.mark.asyncio
+class TestEventReplayBuffer:
+    """Sequence numbering, replay, tailing and eviction."""
+
+    async def test_sequence_numbers_start_at_one(self):
+        buffer = EventReplayBuffer()
+        assert buffer.append("a") == 1
+        assert buffer.append("b") == 2
+        assert buffer.last_seq == 2
+
+    async def test_replay_from_start(self):
+        buffer = EventReplayBuffer()
+        for item in ("a", "b", "c"):
+            buffer.append(item)
+        buffer.close()
+        assert await _collect(buffer) == [(1, "a"), (2, "b"), (3, "c")]
+
+    async def test_replay_after_cursor(self):
+        buffer = EventReplayBuffer()
+        for item in ("a", "b", "c"):
+            buffer.append(item)
+        buffer.close()
+        assert await _collect(buffer, after=2) == [(3, "c")]
+
+    async def test_tails_live_appends(self):
+        buffer = EventReplayBuffer()
+        buffer.append("a")
+        reader = asyncio.create_task(_collect(buffer))
+        await asyncio.sleep(0)
+        buffer.append("b")
+        await asyncio.sleep(0)
+        buffer.append("c")
+        buffer.close()
+        assert await asyncio.wait_for(reader, 1) == [(1, "a"), (2, "b"), (3, "c")]
+
+    async def test_multiple_readers_have_independent_cursors(self):
+        buffer = EventReplayBuffer()
+        buffer.append("a")
+        first = asyncio.create_task(_collect(buffer))
+        second = asyncio.create_task(_collect(buffer, after=1))
+        await asyncio.sleep(0)
+        buffer.append("b")
+        buffer.close()
+        assert await first == [(1, "a"), (2, "b")]
+        assert await second == [(2, "b")]
+
+    async def test_eviction_beyond_capacity(self):
+        buffer = EventReplayBuffer(capacity=2)
+        for item in ("a", "b", "c"):
+            buffer.append(item)
+        buffer.close()
+        assert buffer.first_seq == 2
+        assert buffer.can_resume_from(1)
+        assert not buffer.can_resume_from(0)
+        with pytest.raises(ReplayGapError):
+            await _collect(buffer)
+
+    async def test_append_after_close_raises(self):
+        buffer = EventReplayBuffer()
+        buffer.close()
+        with pytest.raises(RuntimeError):
+            buffer.append("a")
+
+
+# ------------------------------------------------------------------
+# RunRegistry
+# ------------------------------------------------------------------
+
+
+async def _source(items, gate: asyncio.Event | None = None):
+    for i, item in enumerate(items):
+        if gate is not None and i == len(items) - 1:
+            await gate.wait()
+        yield item
+
+
+@pytest.mark.asyncio
+class TestRunRegistry:
+    """Detached runs, fan-out and retention."""
+
+    async def test_run_completes_without_subscribers(self):
+        registry = RunRegistry()
+        handle = registry.start("r-1", "t-1", _source(["a", "b"]))
+        await asyncio.wait_for(handle._task, 1)
+        assert handle.status == "finished"
+        assert await _collect(handle.buffer) == [(1, "a"), (2, "b")]
+
+    async def test_fan_out_to_multiple_subscribers(self):
+        registry = RunRegistry()
+        gate = asyncio.Event()
+        handle = registry.start("r-1", "t-1", _source(["a", "b", "c"], gate))
+
+        async def read():
+            return [entry async for entry in handle.subscribe()]
+
+        readers = [asyncio.create_task(read()) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        assert handle.subscriber_count == 3
+        gate.set()
+        results = await asyncio.wait_for(asyncio.gather(*readers), 1)
+        assert all(r == [(1, "a"), (2, "b"), (3, "c")] for r in results)
+        assert handle.subscriber_count == 0
+
+    async def test_slow_subscriber_does_not_block_producer(self):
+        registry = RunRegistry(buffer_capacity=4)
+        handle = registry.start("r-1", "t-1", _source([str(i) for i in range(100)]))
+        await asyncio.wait_for(handle._task, 1)
+        assert handle.status == "finished"
+        assert handle.buffer.last_seq == 100
+        with pytest.raises(ReplayGapError):
+            [entry async for entry in handle.subscribe()]
+
+    async def test_latest_for_thread(self):
+        registry = RunRegistry()
+        registry.start("r-1", "t-1", _source(["a"]))
+        second = registry.start("r-2", "t-1", _source(["b"]))
+        assert registry.latest_for_thread("t-1") is second
+        assert registry.latest_for_thread("t-2") is None
+
+    async def test_duplicate_run_id_rejected(self):
+        registry = RunRegistry()
+        registry.start("r-1", "t-1", _source(["a"]))
+        with pytest.raises(ValueError):
+            registry.start("r-1", "t-1", _source(["a"]))
+
+    async def test_failed_source_marks_run_failed(self):
+        async def broken():
+            yield "a"
+            raise RuntimeError("boom")
+
+        registry = RunRegistry()
+        handle = registry.start("r-1", "t-1", broken())
+        await asyncio.wait_for(handle._task, 1)
+        assert handle.status == "failed"
+        assert handle.buffer.closed
+
+    async def test_shutdown_cancels_running(self):
+        registry = RunRegistry()
+        handle = registry.start("r-1", "t-1", _source(["a", "b"], asyncio.Event()))
+        await asyncio.sleep(0)
+        await registry.shutdown()
+        assert handle.status == "cancelled"
+        assert handle.buffer.closed
+
+    async def test_finished_runs_evicted_beyond_limit(self):
+        registry = RunRegistry(max_retained_runs=2)
+        for i in range(4):
+            handle = registry.start(f"r-{i}", "t-1", _source(["a"]))
+            await asyncio.wait_for(handle._task, 1)
+        assert [r["runId"] for r in registry.list_runs()] == ["r-2", "r-3"]
+
+
+# ------------------------------------------------------------------
+# Run endpoint
+# ------------------------------------------------------------------
+
+
+class _ScriptedBridge:
+    """Minimal bridge whose run() yields a fixed script of events."""
+
+    def __init__(self, events):
+        self.events = events
+        self.run_calls = 0
+
+    async def run(self, input_data):
+        self.run_calls += 1
+        for event in self.events:
+            yield event
+
+    def get_error_context(self) -> str:
+        return ""
+
+
+def _script():
+    return [
+        make_run_started(),
+        make_text_start(),
+        make_text_content(delta="Hello"),
+        make_text_end(),
+        make_run_finished(),
+    ]
+
+
+def _parse_sse(body: str) -> list[tuple[int, dict]]:
+    frames = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        frames.append((int(lines["id"]), json.loads(lines["data"])))
+    return frames
+
+
+def _payload(run_id: str) -> dict:
+    return {
+        "threadId": "t-1",
+        "runId": run_id,
+        "messages": [{"id": str(uuid.uuid4()), "role": "user", "content": "hi"}],
+    }
+
+
+@pytest.fixture
+def bridge():
+    return _ScriptedBridge(_script())
+
+
+@pytest.fixture
+def client(bridge):
+    app = FastAPI()
+    app.state.bridge = bridge
+    app.include_router(router)
+    with TestClient(app) as c:
+        yield c
+
+
+class TestRunEndpointReplay:
+    """POST / buffers events; GET /runs/{id}/events replays them."""
+
+    def test_frames_carry_sequence_ids(self, client):
+        resp = client.post("/", json=_payload("r-1"))
+        frames = _parse_sse(resp.text)
+        assert [seq for seq, _ in frames] == [1, 2, 3, 4, 5]
+        assert frames[0][1]["type"] == "RUN_STARTED"
+        assert frames[-1][1]["type"] == "RUN_FINISHED"
+
+    def test_resume_after_last_event_id(self, client):
+        client.post("/", json=_payload("r-2"))
+        resp = client.get("/runs/r-2/events", headers={"Last-Event-ID": "3"})
+        assert resp.status_code == 200
+        frames = _parse_sse(resp.text)
+        assert [seq for seq, _ in frames] == [4, 5]
+
+    def test_unknown_run_returns_404(self, client):
+        assert client.get("/runs/nope/events").status_code == 404
+
+    def test_invalid_last_event_id_returns_400(self, client):
+        client.post("/", json=_payload("r-3"))
+        resp = client.get("/runs/r-3/events", headers={"Last-Event-ID": "abc"})
+        assert resp.status_code == 400
+
+    def test_subscribe_by_thread(self, client):
+        client.post("/", json=_payload("r-7"))
+        resp = client.get("/threads/t-1/events")
+        assert resp.status_code == 200
+        assert resp.headers["x-run-id"] == "r-7"
+        assert len(_parse_sse(resp.text)) == 5
+        assert client.get("/threads/other/events").status_code == 404
+
+    def test_list_runs(self, client):
+        client.post("/", json=_payload("r-8"))
+        runs = {r["runId"]: r for r in client.get("/runs").json()["runs"]}
+        assert runs["r-8"]["threadId"] == "t-1"
+        assert runs["r-8"]["lastEventId"] == 5
+
+    def test_reposting_same_run_id_does_not_rerun(self, client, bridge):
+        first = client.post("/", json=_payload("r-4"))
+        second = client.post("/", json=_payload("r-4"))
+        assert bridge.run_calls == 1
+        assert _parse_sse(second.text) == _parse_sse(first.text)
+
+
+class TestRunEndpointEviction:
+    """Evicted resume points are reported as 410 Gone."""
+
+    def test_gap_returns_410(self, monkeypatch):
+        monkeypatch.setenv("AGUI_REPLAY_BUFFER_SIZE", "2")
+        app = FastAPI()
+        app.state.bridge = _ScriptedBridge(_script())
+        app.include_router(router)
+        with TestClient(app) as c:
+            c.post("/", json=_payload("r-5"))
+            assert (
+                c.get("/runs/r-5/events", headers={"Last-Event-ID": "1"}).status_code
+                == 410
+            )
+            assert (
+                c.get("/runs/r-5/events", headers={"Last-Event-ID": "3"}).status_code
+                == 200
+            )
+
+
+class TestRunEndpointBinaryTransport:
+    """Accept: msgpack switches the same endpoints to binary frames."""
+
+    @pytest.fixture(autouse=True)
+    def _require_msgpack(self):
+        pytest.importorskip("msgpack")
+
+    def _frames(self, body: bytes) -> list:
+        import msgpack
+
+        frames, pos = [], 0
+        while pos < len(body):
+            (length,) = struct.unpack_from(">I", body, pos)
+            frames.append(msgpack.unpackb(body[pos + 4 : pos + 4 + length]))
+            pos += 4 + length
+        return frames
+
+    def test_post_streams_binary_frames(self, client):
+        resp = client.post(
+            "/", json=_payload("b-1"), headers={"Accept": MSGPACK_MEDIA_TYPE}
+        )
+        assert resp.headers["content-type"] == MSGPACK_MEDIA_TYPE
+        frames = self._frames(resp.content)
+        assert frames[0] == [0, {"threadId": "t-1", "runId": "b-1"}]
+        assert [seq for seq, _ in frames[1:]] == [1, 2, 3, 4, 5]
+        assert frames[3][1] == {
+            "type": "TEXT_MESSAGE_CONTENT",
+            "messageId": "m-1",
+            "delta": "Hello",
+        }
+
+    def test_binary_and_sse_subscribers_share_a_run(self, client):
+        sse = _parse_sse(client.post("/", json=_payload("b-2")).text)
+        resp = client.get(
+            "/runs/b-2/events",
+            headers={"Accept": MSGPACK_MEDIA_TYPE, "Last-Event-ID": "3"},
+        )
+        frames = self._frames(resp.content)
+        assert [seq for seq, _ in frames[1:]] == [4, 5]
+        assert [p["type"] for _, p in frames[1:]] == [d["type"] for _, d in sse[3:]]
+
+
+class TestRunEndpointCompression:
+    """Opt-in Content-Encoding negotiated per subscriber."""
+
+    def test_identity_unless_enabled(self, client, monkeypatch):
+        monkeypatch.delenv("AGUI_STREAM_COMPRESSION", raising=False)
+        resp = client.post(
+            "/", json=_payload("z-1"), headers={"Accept-Encoding": "gzip"}
+        )
+        assert "content-encoding" not in resp.headers
+
+    def test_gzip_when_enabled(self, client, monkeypatch):
+        monkeypatch.setenv("AGUI_STREAM_COMPRESSION", "gzip")
+        resp = client.post(
+            "/", json=_payload("z-2"), headers={"Accept-Encoding": "gzip"}
+        )
+        assert resp.headers["content-encoding"] == "gzip"
+        assert "Accept-Encoding" in resp.headers["vary"]
+        assert [seq for seq, _ in _parse_sse(resp.text)] == [1, 2, 3, 4, 5]
+
+    def test_replay_compressed(self, client, monkeypatch):
+        monkeypatch.setenv("AGUI_STREAM_COMPRESSION", "gzip")
+        client.post("/", json=_payload("z-3"))
+        resp = client.get(
+            "/runs/z-3/events",
+            headers={"Accept-Encoding": "gzip", "Last-Event-ID": "3"},
+        )
+        assert resp.headers["content-encoding"] == "gzip"
+        assert [seq for seq, _ in _parse_sse(resp.text)] == [4, 5]
+
+
+class TestRunEndpointErrors:
+    """Bridge exceptions still surface as RUN_ERROR frames."""
+
+    def test_bridge_error_becomes_run_error(self):
+        bridge = MagicMock()
+        bridge.get_error_context.return_value = "stderr: boom"
+
+        async def failing_run(_input):
+            yield make_run_started()
+            raise RuntimeError("kaput")
+
+        bridge.run = failing_run
+        app = FastAPI()
+        app.state.bridge = bridge
+        app.include_router(router)
+        with TestClient(app) as c:
+            frames = _parse_sse(c.post("/", json=_payload("r-6")).text)
+        assert frames[-1][1]["type"] == "RUN_ERROR"
+        assert "kaput" in frames[-1][1]["message"]
+        assert "stderr: boom" in frames[-1][1]["message"]
@@ -0,0 +1,183 @@
+"""Unit tests for the durable thread-to-session index and resume after restart."""
+
+import asyncio
+import json
+from unittest.mock import patch
+
+import pytest
+from claude_agent_sdk import ClaudeAgentOptions, SystemMessage
+
+from ambient_runner.bridges.claude import ClaudeBridge
+from ambient_runner.bridges.claude.session import SessionManager
+from ambient_runner.bridges.claude.session_index import SessionIndex, default_index_path
+from ambient_runner.platform.context import RunnerContext
+
+
+# ------------------------------------------------------------------
+# SessionIndex
+# ------------------------------------------------------------------
+
+
+class TestSessionIndex:
+    def test_round_trip(self, tmp_path):
+        path = tmp_path / ".claude" / "index.json"
+        index = SessionIndex(path)
+        index.set("t-1", "sid-1")
+        index.set("t-2", "sid-2")
+        assert SessionIndex(path).load() == {"t-1": "sid-1", "t-2": "sid-2"}
+
+    def test_unchanged_session_is_not_rewritten(self, tmp_path):
+        index = SessionIndex(tmp_path / "index.json")
+        index.set("t-1", "sid-1")
+        index.set("t-1", "sid-1")
+        assert index.writes == 1
+
+    def test_writes_leave_no_temp_files(self, tmp_path):
+        index = SessionIndex(tmp_path / "index.json")
+        for n in range(5):
+            index.set("t-1", f"sid-{n}")
+        assert [p.name for p in tmp_path.iterdir()] == ["index.json"]
+
+    def test_discard(self, tmp_path):
+        index = SessionIndex(tmp_path / "index.json")
+        index.set("t-1", "sid-1")
+        index.discard("t-1")
+        assert SessionIndex(tmp_path / "index.json").load() == {}
+
+    def test_missing_file_is_empty(self, tmp_path):
+        assert SessionIndex(tmp_path / "nope.json").load() == {}
+
+    def test_corrupt_or_foreign_file_is_ignored(self, tmp_path):
+        path = tmp_path / "index.json"
+        path.write_text("{not json")
+        assert SessionIndex(path).load() == {}
+        path.write_text(
+            json.dumps({"version": 99, "threads": {"t": {"sessionId": "s"}}})
+        )
+        assert SessionIndex(path).load() == {}
+
+    def test_unwritable_location_does_not_raise(self, tmp_path):
+        blocker = tmp_path / "file"
+        blocker.write_text("")
+        index = SessionIndex(blocker / "index.json")
+        index.set("t-1", "sid-1")
+        assert index.writes == 0
+
+
+# ------------------------------------------------------------------
+# SessionManager integration
+# ------------------------------------------------------------------
+
+
+class _FakeClient:
+    """ClaudeSDKClient stand-in that reports ``session_id`` on each turn."""
+
+    session_id = "sid-new"
+    connect_error: Exception | None = None
+    instances: list["_FakeClient"] = []
+
+    def __init__(self, options=None):
+        self.options = options
+        _FakeClient.instances.append(self)
+
+    async def connect(self):
+        if self.connect_error is not None:
+            raise self.connect_error
+
+    async def query(self, prompt, session_id=None):
+        pass
+
+    async def receive_response(self):
+        yield SystemMessage(subtype="init", data={"session_id": self.session_id})
+
+    async def disconnect(self):
+        pass
+
+
+@pytest.fixture(autouse=True)
+def fake_client():
+    _FakeClient.instances = []
+    _FakeClient.connect_error = None
+    with patch("claude_agent_sdk.ClaudeSDKClient", _FakeClient):
+        yield
+
+
+def _manager(index: SessionIndex) -> SessionManager:
+    return SessionManager(
+        max_workers=0,
+        idle_ttl=0,
+        supervise_interval=0,
+        restart_backoff=0,
+        session_index=index,
+    )
+
+
+async def _create(manager: SessionManager, thread_id: str = "t-1"):
+    async with manager.get_lock(thread_id):
+        return await manager.get_or_create(thread_id, ClaudeAgentOptions(), "")
+
+
+@pytest.mark.asyncio
+class TestManagerSessionIndex:
+    async def test_captured_session_id_is_persisted(self, tmp_path):
+        path = tmp_path / "index.json"
+        manager = _manager(SessionIndex(path))
+        worker = await _create(manager)
+        _ = [msg async for msg in worker.query("hi")]
+        assert SessionIndex(path).load() == {"t-1": "sid-new"}
+        await manager.shutdown()
+
+    async def test_restarted_manager_resumes_indexed_thread(self, tmp_path):
+        path = tmp_path / "index.json"
+        SessionIndex(path).set("t-1", "sid-old")
+        manager = _manager(SessionIndex(path))
+        assert manager.known_threads() == ["t-1"]
+        worker = await _create(manager)
+        await worker.wait_connected()
+        assert _FakeClient.instances[-1].options.resume == "sid-old"
+        await manager.shutdown()
+
+    async def test_unresumable_session_is_dropped(self, tmp_path):
+        path = tmp_path / "index.json"
+        SessionIndex(path).set("t-1", "sid-gone")
+        manager = _manager(SessionIndex(path))
+        _FakeClient.connect_error = RuntimeError("No conversation found")
+        worker = await _create(manager)
+        assert await worker.wait_connected() is False
+        await asyncio.sleep(0)
+
+        assert SessionIndex(path).load() == {}
+        _FakeClient.connect_error = None
+        respawned = await _create(manager)
+        await respawned.wait_connected()
+        assert _FakeClient.instances[-1].options.resume is None
+        await manager.shutdown()
+
+
+# ------------------------------------------------------------------
+# Location
+# ------------------------------------------------------------------
+
+
+class TestIndexLocation:
+    def test_defaults_to_cli_config_dir(self, tmp_path, monkeypatch):
+        monkeypatch.delenv("CLAUDE_CONFIG_DIR", raising=False)
+        monkeypatch.setenv("HOME", str(tmp_path))
+        assert (
+            default_index_path() == tmp_path / ".claude" / "ambient-session-index.json"
+        )
+
+    def test_follows_claude_config_dir(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("CLAUDE_CONFIG_DIR", str(tmp_path / "cli"))
+        assert default_index_path() == tmp_path / "cli" / "ambient-session-index.json"
+
+    def test_bridge_stores_index_next_to_cli_state(self, tmp_path, monkeypatch):
+        monkeypatch.delenv("CLAUDE_CONFIG_DIR", raising=False)
+        monkeypatch.delenv("SESSION_INDEX_PATH", raising=False)
+        monkeypatch.setenv("HOME", str(tmp_path / "app"))
+        bridge = ClaudeBridge()
+        bridge.set_context(
+            RunnerContext(session_id="s-1", workspace_path=str(tmp_path / "workspace"))
+        )
+        index = bridge._open_session_index()
+        assert index.path == tmp_path / "app" / ".claude" / "ambient-session-index.json"
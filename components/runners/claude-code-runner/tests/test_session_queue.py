@@ -0,0 +1,164 @@
+"""Unit tests for the bounded per-turn output queue in session.py."""
+
+import asyncio
+
+import pytest
+from claude_agent_sdk import AssistantMessage, TextBlock
+from claude_agent_sdk.types import StreamEvent
+
+from ambient_runner.bridges.claude.session import (
+    OVERFLOW_BLOCK,
+    OVERFLOW_COALESCE,
+    QueueStats,
+    SessionManager,
+    TurnQueue,
+)
+
+
+def _delta(text: str, index: int = 0, kind: str = "text_delta") -> StreamEvent:
+    field = {
+        "text_delta": "text",
+        "thinking_delta": "thinking",
+        "input_json_delta": "partial_json",
+    }[kind]
+    return StreamEvent(
+        uuid="u",
+        session_id="s",
+        event={
+            "type": "content_block_delta",
+            "index": index,
+            "delta": {"type": kind, field: text},
+        },
+    )
+
+
+def _assistant() -> AssistantMessage:
+    return AssistantMessage(content=[TextBlock(text="done")], model="m")
+
+
+async def _drain(queue: TurnQueue) -> list:
+    items = []
+    while True:
+        item = await queue.get()
+        if item is None:
+            return items
+        items.append(item)
+
+
+@pytest.mark.asyncio
+class TestTurnQueueBlock:
+    """The "block" policy makes the producer wait for space."""
+
+    async def test_producer_waits_when_full(self):
+        queue = TurnQueue(maxsize=2, overflow=OVERFLOW_BLOCK)
+        await queue.put(_delta("a"))
+        await queue.put(_delta("b"))
+        producer = asyncio.create_task(queue.put(_delta("c")))
+        await asyncio.sleep(0.01)
+        assert not producer.done()
+        assert len(queue) == 2
+
+        await queue.get()
+        await asyncio.wait_for(producer, 1)
+        assert len(queue) == 2
+        assert queue.stats.blocked == 1
+
+    async def test_control_items_bypass_bound(self):
+        queue = TurnQueue(maxsize=1)
+        await queue.put(_delta("a"))
+        queue.put_control(None)
+        assert len(queue) == 2
+
+    async def test_close_releases_blocked_producer(self):
+        queue = TurnQueue(maxsize=1)
+        await queue.put(_delta("a"))
+        producer = asyncio.create_task(queue.put(_delta("b")))
+        await asyncio.sleep(0)
+        queue.close()
+        await asyncio.wait_for(producer, 1)
+        assert len(queue) == 0
+        await queue.put(_delta("c"))
+        assert len(queue) == 0
+
+
+@pytest.mark.asyncio
+class TestTurnQueueCoalesce:
+    """The "coalesce" policy merges deltas instead of blocking."""
+
+    async def test_merges_deltas_when_full(self):
+        queue = TurnQueue(maxsize=2, overflow=OVERFLOW_COALESCE)
+        for text in ("a", "b", "c", "d"):
+            await queue.put(_delta(text))
+        queue.put_control(None)
+        items = await _drain(queue)
+        assert [i.event["delta"]["text"] for i in items] == ["a", "bcd"]
+        assert queue.stats.merged == 2
+        assert queue.stats.high_water_mark == 3  # two items + sentinel
+
+    @pytest.mark.parametrize("kind", ["thinking_delta", "input_json_delta"])
+    async def test_merges_other_delta_kinds(self, kind):
+        queue = TurnQueue(maxsize=1, overflow=OVERFLOW_COALESCE)
+        await queue.put(_delta("x", kind=kind))
+        await queue.put(_delta("y", kind=kind))
+        [item] = list(queue._items)
+        assert item.event["delta"]["type"] == kind
+        assert "xy" in item.event["delta"].values()
+
+    async def test_does_not_merge_across_blocks(self):
+        queue = TurnQueue(maxsize=1, overflow=OVERFLOW_COALESCE)
+        await queue.put(_delta("a", index=0))
+        producer = asyncio.create_task(queue.put(_delta("b", index=1)))
+        await asyncio.sleep(0.01)
+        assert not producer.done()
+        assert (await queue.get()).event["delta"]["text"] == "a"
+        await asyncio.wait_for(producer, 1)
+
+    async def test_structural_messages_wait_instead_of_merging(self):
+        queue = TurnQueue(maxsize=1, overflow=OVERFLOW_COALESCE)
+        await queue.put(_delta("a"))
+        producer = asyncio.create_task(queue.put(_assistant()))
+        await asyncio.sleep(0.01)
+        assert not producer.done()
+        await queue.get()
+        await asyncio.wait_for(producer, 1)
+        assert isinstance(await queue.get(), AssistantMessage)
+
+    async def test_original_event_not_mutated(self):
+        first = _delta("a")
+        queue = TurnQueue(maxsize=1, overflow=OVERFLOW_COALESCE)
+        await queue.put(first)
+        await queue.put(_delta("b"))
+        assert first.event["delta"]["text"] == "a"
+
+
+class TestQueueConfig:
+    """Validation and stats reporting."""
+
+    def test_unknown_policy_rejected(self):
+        with pytest.raises(ValueError, match="overflow policy"):
+            TurnQueue(overflow="drop")
+        with pytest.raises(ValueError, match="overflow policy"):
+            SessionManager(overflow="drop")
+
+    def test_stats_as_dict(self):
+        stats = QueueStats(10, OVERFLOW_BLOCK)
+        assert stats.as_dict() == {
+            "maxsize": 10,
+            "overflow": "block",
+            "depth": 0,
+            "highWaterMark": 0,
+            "merged": 0,
+            "blocked": 0,
+            "blockedSeconds": 0.0,
+        }
+
+    def test_manager_reports_stats_per_thread(self):
+        from ambient_runner.bridges.claude.session import SessionWorker
+
+        manager = SessionManager(queue_maxsize=5, overflow=OVERFLOW_COALESCE)
+        manager._workers["t-1"] = SessionWorker(
+            "t-1", None, "", queue_maxsize=5, overflow=OVERFLOW_COALESCE
+        )
+        stats = manager.get_queue_stats()
+        assert stats["t-1"]["maxsize"] == 5
+        assert stats["t-1"]["overflow"] == "coalesce"
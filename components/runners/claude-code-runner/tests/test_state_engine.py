@@ -0,0 +1,175 @@
+"""Unit tests for JSON-Patch state diffing and the per-thread state engine."""
+
+import copy
+import random
+
+import pytest
+from ag_ui.core import EventType, RunAgentInput
+from claude_agent_sdk import AssistantMessage, ToolUseBlock
+
+from ag_ui_claude_sdk import ClaudeAgentAdapter
+from ag_ui_claude_sdk.state import StateEngine, diff_state
+
+
+def _apply(doc, ops):
+    """Minimal RFC 6902 add/remove/replace, enough to check diff_state."""
+    doc = copy.deepcopy(doc)
+    for op in ops:
+        tokens = [
+            t.replace("~1", "/").replace("~0", "~") for t in op["path"].split("/")[1:]
+        ]
+        if not tokens:
+            doc = copy.deepcopy(op["value"])
+            continue
+        parent = doc
+        for token in tokens[:-1]:
+            parent = parent[int(token) if isinstance(parent, list) else token]
+        last = tokens[-1]
+        if isinstance(parent, list):
+            index = int(last)
+            if op["op"] == "add":
+                parent.insert(index, op["value"])
+            elif op["op"] == "remove":
+                del parent[index]
+            else:
+                parent[index] = op["value"]
+        elif op["op"] == "remove":
+            del parent[last]
+        else:
+            parent[last] = op["value"]
+    return doc
+
+
+def _random_value(rng: random.Random, depth: int = 0):
+    kind = rng.choice(
+        ["int", "str", "bool", "list", "dict"] if depth < 3 else ["int", "str", "bool"]
+    )
+    if kind == "int":
+        return rng.randint(0, 3)
+    if kind == "str":
+        return rng.choice(["a", "b", "x/y", "m~n"])
+    if kind == "bool":
+        return rng.choice([True, False, None])
+    if kind == "list":
+        return [_random_value(rng, depth + 1) for _ in range(rng.randint(0, 4))]
+    return {
+        rng.choice("abcd/~"): _random_value(rng, depth + 1)
+        for _ in range(rng.randint(0, 4))
+    }
+
+
+class TestDiffState:
+    def test_random_documents_round_trip(self):
+        rng = random.Random(11)
+        for _ in range(300):
+            old, new = _random_value(rng), _random_value(rng)
+            assert _apply(old, diff_state(old, new)) == new
+
+    def test_only_changed_members_are_patched(self):
+        body = {"text": "x" * 10_000}
+        old = {"doc": body, "meta": {"rev": 1, "tags": ["a", "b"]}}
+        new = {"doc": body, "meta": {"rev": 2, "tags": ["a"]}, "seen": True}
+        assert diff_state(old, new) == [
+            {"op": "replace", "path": "/meta/rev", "value": 2},
+            {"op": "remove", "path": "/meta/tags/1"},
+            {"op": "add", "path": "/seen", "value": True},
+        ]
+
+    def test_type_change_is_replaced(self):
+        assert diff_state({"a": 1}, {"a": True}) == [
+            {"op": "replace", "path": "/a", "value": True}
+        ]
+        assert diff_state({"a": 1}, {"a": 1}) == []
+
+
+class TestStateEngine:
+    def test_deltas_with_periodic_snapshot(self):
+        engine = StateEngine(snapshot_interval=3)
+        assert engine.reset("t", {"n": 0}).type == EventType.STATE_SNAPSHOT
+        types = [engine.update("t", {"n": n}).type for n in range(1, 7)]
+        assert types == [
+            EventType.STATE_DELTA,
+            EventType.STATE_DELTA,
+            EventType.STATE_SNAPSHOT,
+            EventType.STATE_DELTA,
+            EventType.STATE_DELTA,
+            EventType.STATE_SNAPSHOT,
+        ]
+
+    def test_unchanged_state_emits_nothing(self):
+        engine = StateEngine()
+        engine.reset("t", {"n": 1})
+        assert engine.update("t", {"n": 1}) is None
+
+    def test_threads_are_independent(self):
+        engine = StateEngine()
+        engine.reset("a", {"n": 1})
+        engine.reset("b", {"n": 5})
+        assert engine.update("a", {"n": 2}).delta == [
+            {"op": "replace", "path": "/n", "value": 2}
+        ]
+        assert engine.update("b", {"n": 5}) is None
+
+    def test_unknown_thread_gets_snapshot(self):
+        engine = StateEngine()
+        event = engine.update("t", {"n": 1})
+        assert event.type == EventType.STATE_SNAPSHOT
+        assert event.snapshot == {"n": 1}
+
+    def test_interval_one_always_snapshots(self):
+        engine = StateEngine(snapshot_interval=1)
+        engine.reset("t", {})
+        assert engine.update("t", {"n": 1}).type == EventType.STATE_SNAPSHOT
+
+    def test_negative_interval_is_rejected(self):
+        with pytest.raises(ValueError):
+            StateEngine(snapshot_interval=-1)
+
+
+def _input(state) -> RunAgentInput:
+    return RunAgentInput(
+        thread_id="t-1",
+        run_id="r-1",
+        messages=[{"id": "u-1", "role": "user", "content": "hi"}],
+        state=state,
+        tools=[],
+        context=[],
+        forwarded_props={},
+    )
+
+
+async def _state_tool_use(updates):
+    yield AssistantMessage(
+        content=[
+            ToolUseBlock(
+                id="tc-1",
+                name="mcp__ag_ui__ag_ui_update_state",
+                input={"state_updates": updates},
+            )
+        ],
+        model="claude",
+    )
+
+
+@pytest.mark.asyncio
+class TestAdapterStateDelta:
+    async def test_tool_use_block_emits_delta(self):
+        adapter = ClaudeAgentAdapter(name="test")
+        state = {"doc": {"title": "Old", "body": "..."}, "rev": 1}
+        stream = _state_tool_use({"rev": 2})
+        events = [e async for e in adapter.run(_input(state), message_stream=stream)]
+
+        assert [e.type for e in events].count(EventType.STATE_SNAPSHOT) == 1
+        [delta] = [e for e in events if e.type == EventType.STATE_DELTA]
+        assert delta.delta == [{"op": "replace", "path": "/rev", "value": 2}]
+
+    async def test_interval_one_keeps_snapshots(self):
+        adapter = ClaudeAgentAdapter(name="test", state_snapshot_interval=1)
+        stream = _state_tool_use({"rev": 2})
+        events = [
+            e async for e in adapter.run(_input({"rev": 1}), message_stream=stream)
+        ]
+
+        snapshots = [e for e in events if e.type == EventType.STATE_SNAPSHOT]
+        assert [s.snapshot for s in snapshots] == [{"rev": 1}, {"rev": 2}]
+        assert EventType.STATE_DELTA not in [e.type for e in events]
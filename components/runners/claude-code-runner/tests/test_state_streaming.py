@@ -0,0 +1,192 @@
+"""Unit tests for the incremental tool-args parser and streamed STATE_DELTA."""
+
+import json
+import random
+
+import pytest
+from ag_ui.core import EventType, RunAgentInput
+from claude_agent_sdk.types import StreamEvent
+
+from ag_ui_claude_sdk import ClaudeAgentAdapter
+from ag_ui_claude_sdk.json_stream import JsonStreamError, JsonStreamParser
+
+
+# ------------------------------------------------------------------
+# JsonStreamParser
+# ------------------------------------------------------------------
+
+
+_DOCUMENT = {
+    "state_updates": {
+        "title": 'Dr"a\\ft ☃',
+        "count": -1.5e3,
+        "items": [1, {"a": []}, [], {}],
+        "flags": [True, False, None],
+    }
+}
+
+
+def _feed_in_pieces(parser: JsonStreamParser, text: str, rng: random.Random) -> list:
+    completed, i = [], 0
+    while i < len(text):
+        size = rng.randint(1, 5)
+        completed += parser.feed(text[i : i + size])
+        i += size
+    return completed
+
+
+class TestJsonStreamParser:
+    def test_any_split_yields_the_document(self):
+        text = json.dumps(_DOCUMENT, ensure_ascii=False, indent=1)
+        rng = random.Random(7)
+        for _ in range(50):
+            parser = JsonStreamParser()
+            completed = _feed_in_pieces(parser, text, rng)
+            assert parser.close() == _DOCUMENT
+            assert completed[-1] == ((), _DOCUMENT)
+            for path, value in completed:
+                node = _DOCUMENT
+                for part in path:
+                    node = node[part]
+                assert node == value
+
+    def test_values_are_reported_as_soon_as_complete(self):
+        parser = JsonStreamParser(max_depth=2)
+        assert parser.feed('{"state_updates": {"title": "Dr') == []
+        assert parser.feed('aft", "n": 1') == [(("state_updates", "title"), "Draft")]
+        # A number is only complete once something follows it.
+        assert parser.feed("2") == []
+        completed = parser.feed("}}")
+        assert completed[0] == (("state_updates", "n"), 12)
+        assert parser.done
+
+    def test_max_depth_limits_reports(self):
+        parser = JsonStreamParser(max_depth=1)
+        completed = parser.feed('{"a": {"b": [1, 2]}, "c": 3}')
+        assert [path for path, _ in completed] == [("a",), ("c",), ()]
+
+    def test_root_scalar_completes_on_close(self):
+        parser = JsonStreamParser()
+        assert parser.feed("42") == []
+        assert parser.close() == 42
+
+    @pytest.mark.parametrize(
+        "text",
+        [
+            '{"a" 1}',
+            "[1,]",
+            '{"a": 1,}',
+            "{1: 2}",
+            "[1 2]",
+            "[01]",
+            "nul!",
+            '{"a": 1}}',
+        ],
+    )
+    def test_invalid_json_raises(self, text):
+        parser = JsonStreamParser()
+        with pytest.raises(JsonStreamError):
+            parser.feed(text)
+            parser.close()
+
+
+# ------------------------------------------------------------------
+# Adapter: ag_ui_update_state streamed as STATE_DELTA
+# ------------------------------------------------------------------
+
+
+def _input(state) -> RunAgentInput:
+    return RunAgentInput(
+        thread_id="t-1",
+        run_id="r-1",
+        messages=[{"id": "u-1", "role": "user", "content": "hi"}],
+        state=state,
+        tools=[],
+        context=[],
+        forwarded_props={},
+    )
+
+
+def _stream_event(event: dict) -> StreamEvent:
+    return StreamEvent(uuid="u", session_id="s", event=event)
+
+
+async def _state_tool_call(fragments):
+    yield _stream_event({"type": "message_start"})
+    yield _stream_event(
+        {
+            "type": "content_block_start",
+            "index": 0,
+            "content_block": {
+                "type": "tool_use",
+                "id": "tc-1",
+                "name": "mcp__ag_ui__ag_ui_update_state",
+            },
+        }
+    )
+    for fragment in fragments:
+        yield _stream_event(
+            {
+                "type": "content_block_delta",
+                "index": 0,
+                "delta": {"type": "input_json_delta", "partial_json": fragment},
+            }
+        )
+    yield _stream_event({"type": "content_block_stop", "index": 0})
+    yield _stream_event({"type": "message_stop"})
+
+
+async def _run(fragments, state):
+    adapter = ClaudeAgentAdapter(name="test")
+    stream = _state_tool_call(fragments)
+    return [e async for e in adapter.run(_input(state), message_stream=stream)]
+
+
+@pytest.mark.asyncio
+class TestStreamedStateDelta:
+    async def test_keys_are_patched_while_streaming(self):
+        fragments = [
+            '{"state_updates": {"title": "Dr',
+            'aft", "tags": ["a"',
+            ', "b"], "n": 2}}',
+        ]
+        events = await _run(fragments, {"title": "Old", "keep": True})
+
+        types = [e.type for e in events]
+        deltas = [e for e in events if e.type == EventType.STATE_DELTA]
+        assert [d.delta for d in deltas] == [
+            [{"op": "add", "path": "/title", "value": "Draft"}],
+            [
+                {"op": "add", "path": "/tags", "value": ["a", "b"]},
+                {"op": "add", "path": "/n", "value": 2},
+            ],
+        ]
+        # The first key is patched before the arguments finish streaming.
+        last_args = max(i for i, t in enumerate(types) if t == EventType.TOOL_CALL_ARGS)
+        assert types.index(EventType.STATE_DELTA) < last_args
+        # Only the initial snapshot of the input state; no full re-send.
+        assert types.count(EventType.STATE_SNAPSHOT) == 1
+
+    async def test_pointer_escapes_key(self):
+        events = await _run(['{"state_updates": {"a/b~c": 1}}'], {})
+        [delta] = [e for e in events if e.type == EventType.STATE_DELTA]
+        assert delta.delta == [{"op": "add", "path": "/a~1b~0c", "value": 1}]
+
+    async def test_json_string_payload_is_applied_when_complete(self):
+        payload = json.dumps({"state_updates": json.dumps({"title": "Draft"})})
+        events = await _run([payload[:10], payload[10:]], {"keep": True})
+        types = [e.type for e in events]
+        [delta] = [e for e in events if e.type == EventType.STATE_DELTA]
+        assert delta.delta == [{"op": "add", "path": "/title", "value": "Draft"}]
+        # Applied by the final parse, after the arguments finished streaming.
+        assert types.index(EventType.STATE_DELTA) > types.index(
+            EventType.TOOL_CALL_ARGS
+        )
+
+    async def test_invalid_stream_falls_back_to_full_parse(self):
+        events = await _run(
+            ['{"state_updates": {"title": "Draft"}} junk'], {"keep": True}
+        )
+        types = [e.type for e in events]
+        assert EventType.STATE_DELTA not in types
+        assert types[-1] == EventType.RUN_FINISHED
@@ -0,0 +1,224 @@
+"""Unit tests for mid-turn steering: worker injection, adapter accounting, /steer."""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+from ag_ui.core import EventType, RunAgentInput
+from claude_agent_sdk import SystemMessage
+from claude_agent_sdk.types import StreamEvent
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from ag_ui_claude_sdk import ClaudeAgentAdapter
+from ag_ui_claude_sdk.config import USER_MESSAGE_INJECTED_EVENT_NAME
+from ag_ui_claude_sdk.types import InjectedUserMessage
+from ambient_runner.bridges.claude.session import SessionWorker
+from ambient_runner.endpoints.steer import router
+
+
+class _FakeClient:
+    """ClaudeSDKClient stand-in whose first response waits on ``release``.
+
+    Later responses start after ``followup_delay`` seconds.
+    """
+
+    followup_delay = 0.0
+
+    def __init__(self, options=None):
+        self.prompts: list[str] = []
+        self.responses = 0
+        self.release = asyncio.Event()
+        _FakeClient.last = self
+
+    async def connect(self):
+        pass
+
+    async def query(self, prompt, session_id=None):
+        self.prompts.append(prompt)
+
+    async def receive_response(self):
+        self.responses += 1
+        if self.responses == 1:
+            yield SystemMessage(subtype="init", data={"session_id": "sid-1"})
+            await self.release.wait()
+        else:
+            await asyncio.sleep(self.followup_delay)
+        yield SystemMessage(subtype="status", data={"response": self.responses})
+
+    async def disconnect(self):
+        pass
+
+
+@pytest.fixture(autouse=True)
+def fake_client():
+    _FakeClient.followup_delay = 0.0
+    with patch("claude_agent_sdk.ClaudeSDKClient", _FakeClient):
+        yield
+
+
+async def _worker() -> SessionWorker:
+    worker = SessionWorker("t-1", None, "")
+    await worker.start()
+    await worker.wait_connected()
+    return worker
+
+
+async def _in_turn(worker: SessionWorker):
+    """Start a turn and return (task collecting its output, first message)."""
+    items: list = []
+    started = asyncio.Event()
+
+    async def consume():
+        async for msg in worker.query("first"):
+            items.append(msg)
+            started.set()
+        return items
+
+    task = asyncio.create_task(consume())
+    await started.wait()
+    return task
+
+
+@pytest.mark.asyncio
+class TestWorkerInjection:
+    async def test_injected_message_reaches_cli_and_stream(self):
+        worker = await _worker()
+        turn = await _in_turn(worker)
+
+        assert await worker.inject("use v2", message_id="m-1") is True
+        assert _FakeClient.last.prompts == ["first", "use v2"]
+        _FakeClient.last.release.set()
+        items = await turn
+
+        injected = [i for i in items if isinstance(i, InjectedUserMessage)]
+        assert injected == [InjectedUserMessage(id="m-1", content="use v2")]
+        # The unfolded steering message's own response joins the turn.
+        assert _FakeClient.last.responses == 2
+        assert worker.injected == 1
+        await worker.stop()
+
+    async def test_late_reply_stays_in_its_turn(self):
+        _FakeClient.followup_delay = 0.2
+        worker = await _worker()
+        turn = await _in_turn(worker)
+        assert await worker.inject("use v2") is True
+        _FakeClient.last.release.set()
+        items = await asyncio.wait_for(turn, timeout=2)
+        assert items[-1].data == {"response": 2}
+
+        _FakeClient.followup_delay = 0.0
+        following = [msg async for msg in worker.query("next")]
+        assert [msg.data for msg in following] == [{"response": 3}]
+        await worker.stop()
+
+    async def test_no_turn_in_flight_is_rejected(self):
+        worker = await _worker()
+        assert await worker.inject("late") is False
+        assert _FakeClient.last.prompts == []
+        await worker.stop()
+
+
+def _input() -> RunAgentInput:
+    return RunAgentInput(
+        thread_id="t-1",
+        run_id="r-1",
+        messages=[{"id": "u-1", "role": "user", "content": "hi"}],
+        state={},
+        tools=[],
+        context=[],
+        forwarded_props={},
+    )
+
+
+def _stream_event(event: dict) -> StreamEvent:
+    return StreamEvent(uuid="u", session_id="s", event=event)
+
+
+async def _steered_reply():
+    yield _stream_event({"type": "message_start"})
+    yield _stream_event(
+        {
+            "type": "content_block_delta",
+            "index": 0,
+            "delta": {"type": "text_delta", "text": "working"},
+        }
+    )
+    yield InjectedUserMessage(id="m-1", content="use v2")
+    yield _stream_event({"type": "message_stop"})
+    yield _stream_event({"type": "message_start"})
+    yield _stream_event(
+        {
+            "type": "content_block_delta",
+            "index": 0,
+            "delta": {"type": "text_delta", "text": "ok, v2"},
+        }
+    )
+    yield _stream_event({"type": "message_stop"})
+
+
+@pytest.mark.asyncio
+class TestAdapterAccounting:
+    async def test_injected_message_is_announced_and_recorded_in_order(self):
+        adapter = ClaudeAgentAdapter(name="test")
+        events = [
+            e async for e in adapter.run(_input(), message_stream=_steered_reply())
+        ]
+
+        [announced] = [
+            e
+            for e in events
+            if e.type == EventType.CUSTOM and e.name == USER_MESSAGE_INJECTED_EVENT_NAME
+        ]
+        assert announced.value == {"messageId": "m-1", "content": "use v2"}
+        [snapshot] = [e for e in events if e.type == EventType.MESSAGES_SNAPSHOT]
+        assert [(m.role, m.content) for m in snapshot.messages] == [
+            ("user", "hi"),
+            ("assistant", "working"),
+            ("user", "use v2"),
+            ("assistant", "ok, v2"),
+        ]
+
+
+class _SteerBridge:
+    def __init__(self, delivered: bool):
+        self.delivered = delivered
+        self.calls: list = []
+
+    async def steer(self, thread_id, message, message_id=None):
+        self.calls.append((thread_id, message, message_id))
+        return self.delivered
+
+
+def _client(bridge) -> TestClient:
+    app = FastAPI()
+    app.state.bridge = bridge
+    app.include_router(router)
+    return TestClient(app)
+
+
+class TestSteerEndpoint:
+    def test_delivered(self):
+        bridge = _SteerBridge(delivered=True)
+        resp = _client(bridge).post(
+            "/steer",
+            json={
+                "threadId": "t-1",
+                "message": {"id": "m-1", "role": "user", "content": "v2"},
+            },
+        )
+        assert resp.status_code == 200
+        assert resp.json()["messageId"] == "m-1"
+        assert bridge.calls == [("t-1", "v2", "m-1")]
+
+    def test_no_run_in_flight_is_conflict(self):
+        resp = _client(_SteerBridge(delivered=False)).post(
+            "/steer", json={"threadId": "t-1", "message": {"content": "v2"}}
+        )
+        assert resp.status_code == 409
+
+    def test_empty_message_is_rejected(self):
+        resp = _client(_SteerBridge(delivered=True)).post(
+            "/steer", json={"threadId": "t-1", "message": {"content": " "}}
+        )
+        assert resp.status_code == 400
@@ -0,0 +1,115 @@
+"""Unit tests for flush-aware streaming compression."""
+
+import zlib
+
+import pytest
+
+from ambient_runner.compression import (
+    available_encodings,
+    compress_stream,
+    enabled_encodings,
+    negotiate_encoding,
+)
+from ambient_runner.encoder import FastEventEncoder
+from benchmarks.recorded_stream import synthetic_recording
+
+
+async def _aiter(items):
+    for item in items:
+        yield item
+
+
+async def _compress(chunks, encoding) -> list[bytes]:
+    return [out async for out in compress_stream(_aiter(chunks), encoding)]
+
+
+class TestNegotiation:
+    """Server allow-list intersected with the client's Accept-Encoding."""
+
+    def test_disabled_by_default(self, monkeypatch):
+        monkeypatch.delenv("AGUI_STREAM_COMPRESSION", raising=False)
+        assert enabled_encodings() == ()
+        assert negotiate_encoding("gzip, deflate, br") is None
+
+    def test_env_allow_list(self, monkeypatch):
+        monkeypatch.setenv("AGUI_STREAM_COMPRESSION", " GZIP , bogus")
+        assert enabled_encodings() == ("gzip",)
+        assert negotiate_encoding("gzip") == "gzip"
+
+    def test_no_header_means_identity(self):
+        assert negotiate_encoding(None, enabled=["gzip"]) is None
+        assert negotiate_encoding("", enabled=["gzip"]) is None
+
+    def test_unaccepted_encoding_not_used(self):
+        assert negotiate_encoding("br, deflate", enabled=["gzip"]) is None
+
+    def test_q_zero_refuses(self):
+        assert negotiate_encoding("gzip;q=0", enabled=["gzip"]) is None
+        assert negotiate_encoding("*, gzip;q=0", enabled=["gzip"]) is None
+
+    def test_highest_q_wins(self):
+        assert (
+            negotiate_encoding("zstd;q=0.5, gzip;q=0.9", enabled=["zstd", "gzip"])
+            == "gzip"
+        )
+
+    def test_server_preference_breaks_ties(self):
+        assert negotiate_encoding("gzip, zstd", enabled=["zstd", "gzip"]) == "zstd"
+
+    def test_wildcard(self):
+        assert negotiate_encoding("*", enabled=["gzip"]) == "gzip"
+
+    def test_zstd_only_when_installed(self):
+        assert ("zstd" in available_encodings()) == _has_zstandard()
+
+
+def _has_zstandard() -> bool:
+    try:
+        import zstandard  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+@pytest.mark.asyncio
+class TestCompressStream:
+    """Every chunk is independently decodable as soon as it arrives."""
+
+    async def test_gzip_flushes_each_event(self):
+        chunks = [f'data: {{"delta": "token {i}"}}\n\n' for i in range(20)]
+        compressed = await _compress(chunks, "gzip")
+        assert len(compressed) == len(chunks) + 1  # one per event, plus trailer
+
+        decoder = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        for chunk, out in zip(chunks, compressed):
+            assert decoder.decompress(out).decode() == chunk
+        assert decoder.decompress(compressed[-1]) == b""
+        assert decoder.eof
+
+    async def test_bytes_chunks(self):
+        compressed = await _compress([b"\x00\x01", b"\x02"], "gzip")
+        assert (
+            zlib.decompress(b"".join(compressed), 16 + zlib.MAX_WBITS)
+            == b"\x00\x01\x02"
+        )
+
+    async def test_zstd_flushes_each_event(self):
+        zstandard = pytest.importorskip("zstandard")
+        chunks = [f'data: {{"delta": "token {i}"}}\n\n' for i in range(20)]
+        compressed = await _compress(chunks, "zstd")
+
+        decoder = zstandard.ZstdDecompressor().decompressobj()
+        for chunk, out in zip(chunks, compressed):
+            assert decoder.decompress(out).decode() == chunk
+
+    async def test_unsupported_encoding(self):
+        with pytest.raises(ValueError, match="br"):
+            await _compress(["x"], "br")
+
+    async def test_shrinks_recorded_stream(self):
+        """Cross-event context keeps the ratio worthwhile despite per-event flushes."""
+        encoder = FastEventEncoder()
+        frames = [encoder.encode(e) for e in synthetic_recording(turns=5)]
+        raw = sum(len(f.encode()) for f in frames)
+        compressed = sum(len(c) for c in await _compress(frames, "gzip"))
+        assert compressed < raw / 3
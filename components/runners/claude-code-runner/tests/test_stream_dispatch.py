@@ -0,0 +1,383 @@
+"""Unit tests for the dispatch-table SDK stream translation.
+
+Each test feeds a fixed SDK message sequence through ``_stream_claude_sdk``
+and compares the AG-UI events with the output recorded from the previous
+``if``/``elif`` translation loop.  Events are compared as ``(type, *fields)``
+tuples without ``thread_id``/``run_id``; generated UUIDs read ``#<n>``.
+"""
+
+import itertools
+import uuid
+from typing import Any
+from unittest import mock
+
+import pytest
+from ag_ui.core import RunAgentInput
+from claude_agent_sdk import (
+    AssistantMessage,
+    ResultMessage,
+    SystemMessage,
+    TextBlock,
+    ThinkingBlock,
+    ToolResultBlock,
+    ToolUseBlock,
+    UserMessage,
+)
+from claude_agent_sdk.types import StreamEvent
+
+from ag_ui_claude_sdk import ClaudeAgentAdapter, InjectedUserMessage
+from ag_ui_claude_sdk.adapter import _RunState
+
+STATE_TOOL = "mcp__ag_ui__ag_ui_update_state"
+
+
+def _input(state=None, forwarded_props=None) -> RunAgentInput:
+    return RunAgentInput(
+        thread_id="t-1",
+        run_id="r-1",
+        messages=[{"id": "u-1", "role": "user", "content": "hi"}],
+        state=state,
+        tools=[],
+        context=[],
+        forwarded_props=forwarded_props or {},
+    )
+
+
+def _event(event: dict) -> StreamEvent:
+    return StreamEvent(uuid="u", session_id="s", event=event)
+
+
+def _block(
+    index: int, content_block: dict, delta_type: str, field: str, pieces: list[str]
+) -> list:
+    return [
+        _event(
+            {
+                "type": "content_block_start",
+                "index": index,
+                "content_block": content_block,
+            }
+        ),
+        *(
+            _event(
+                {
+                    "type": "content_block_delta",
+                    "index": index,
+                    "delta": {"type": delta_type, field: piece},
+                }
+            )
+            for piece in pieces
+        ),
+        _event({"type": "content_block_stop", "index": index}),
+    ]
+
+
+def _result() -> ResultMessage:
+    return ResultMessage(
+        subtype="success",
+        duration_ms=10,
+        duration_api_ms=9,
+        is_error=False,
+        num_turns=1,
+        session_id="s",
+        total_cost_usd=0.01,
+        usage={"input_tokens": 3, "output_tokens": 5},
+        result="done",
+    )
+
+
+def _tool_turn() -> list:
+    """Thinking, text, a backend tool and a state update, then a final answer."""
+    return [
+        SystemMessage(subtype="init", data={"subtype": "init", "model": "m"}),
+        _event({"type": "message_start", "message": {"role": "assistant"}}),
+        *_block(
+            0,
+            {"type": "thinking", "thinking": ""},
+            "thinking_delta",
+            "thinking",
+            ["Let me ", "look"],
+        ),
+        *_block(
+            1,
+            {"type": "text", "text": ""},
+            "text_delta",
+            "text",
+            ["Reading ", "the file"],
+        ),
+        *_block(
+            2,
+            {"type": "tool_use", "id": "toolu-1", "name": "Read", "input": {}},
+            "input_json_delta",
+            "partial_json",
+            ['{"file_', 'path": "a.py"}'],
+        ),
+        *_block(
+            3,
+            {"type": "tool_use", "id": "toolu-2", "name": STATE_TOOL, "input": {}},
+            "input_json_delta",
+            "partial_json",
+            ['{"state_updates": ', '{"turn": 1}}'],
+        ),
+        _event({"type": "message_delta", "delta": {"stop_reason": "tool_use"}}),
+        _event({"type": "message_stop"}),
+        AssistantMessage(
+            content=[
+                ThinkingBlock(thinking="Let me look", signature="sig"),
+                TextBlock(text="Reading the file"),
+                ToolUseBlock(id="toolu-1", name="Read", input={"file_path": "a.py"}),
+                ToolUseBlock(
+                    id="toolu-2", name=STATE_TOOL, input={"state_updates": {"turn": 1}}
+                ),
+            ],
+            model="m",
+        ),
+        UserMessage(
+            content=[
+                ToolResultBlock(tool_use_id="toolu-1", content="print(1)"),
+                ToolResultBlock(tool_use_id="toolu-2", content="ok"),
+            ]
+        ),
+        _event({"type": "message_start", "message": {"role": "assistant"}}),
+        *_block(0, {"type": "text", "text": ""}, "text_delta", "text", ["Done."]),
+        _event({"type": "message_stop"}),
+        AssistantMessage(content=[TextBlock(text="Done.")], model="m"),
+        _result(),
+    ]
+
+
+_TOOL_TURN_STREAMED = [
+    ("THINKING_START",),
+    ("THINKING_TEXT_MESSAGE_START",),
+    ("THINKING_TEXT_MESSAGE_CONTENT", "Let me "),
+    ("THINKING_TEXT_MESSAGE_CONTENT", "look"),
+    ("THINKING_TEXT_MESSAGE_END",),
+    ("THINKING_END",),
+    ("TEXT_MESSAGE_START", "#0", "assistant"),
+    ("TEXT_MESSAGE_CONTENT", "#0", "Reading "),
+    ("TEXT_MESSAGE_CONTENT", "#0", "the file"),
+    ("TOOL_CALL_START", "toolu-1", "Read", "#0"),
+    ("TOOL_CALL_ARGS", "toolu-1", '{"file_'),
+    ("TOOL_CALL_ARGS", "toolu-1", 'path": "a.py"}'),
+    ("TOOL_CALL_START", "toolu-2", "ag_ui_update_state", "#0"),
+    ("TOOL_CALL_ARGS", "toolu-2", '{"state_updates": '),
+    ("TOOL_CALL_ARGS", "toolu-2", '{"turn": 1}}'),
+]
+
+_TOOL_TURN_CLOSED = [
+    ("TEXT_MESSAGE_END", "#0"),
+    ("TOOL_CALL_END", "toolu-1"),
+    ("TOOL_CALL_RESULT", "toolu-1-result", "toolu-1", '"print(1)"', "tool"),
+    ("TOOL_CALL_END", "toolu-2"),
+    ("TOOL_CALL_RESULT", "toolu-2-result", "toolu-2", '"ok"', "tool"),
+    ("TEXT_MESSAGE_START", "#3", "assistant"),
+    ("TEXT_MESSAGE_CONTENT", "#3", "Done."),
+    ("TEXT_MESSAGE_END", "#3"),
+]
+
+_USER_MESSAGE = {"id": "u-1", "role": "user", "content": "hi"}
+
+_TOOL_TURN_MESSAGES = [
+    {"id": "#1", "role": "developer", "content": "Let me look"},
+    {
+        "id": "#0",
+        "role": "assistant",
+        "content": "Reading the file",
+        "tool_calls": [
+            {
+                "id": "toolu-1",
+                "type": "function",
+                "function": {"name": "Read", "arguments": '{"file_path": "a.py"}'},
+            }
+        ],
+    },
+    {
+        "id": "toolu-1-result",
+        "role": "tool",
+        "content": '"print(1)"',
+        "tool_call_id": "toolu-1",
+        "name": "Read",
+    },
+    {
+        "id": "toolu-2-result",
+        "role": "tool",
+        "content": '"ok"',
+        "tool_call_id": "toolu-2",
+        "name": "ag_ui_update_state",
+    },
+    {"id": "#3", "role": "assistant", "content": "Done."},
+]
+
+
+async def _translate(
+    messages: list, input_data: RunAgentInput, frontend_tool_names=frozenset()
+) -> list[tuple]:
+    """Translate *messages* with deterministic UUIDs; return event summaries."""
+
+    async def stream():
+        for message in messages:
+            yield message
+
+    adapter = ClaudeAgentAdapter(name="test")
+    adapter._state_engine.reset(input_data.thread_id, input_data.state)
+    counter = itertools.count()
+    with mock.patch.object(uuid, "uuid4", lambda: uuid.UUID(int=next(counter))):
+        return [
+            _summary(event)
+            async for event in adapter._stream_claude_sdk(
+                "prompt",
+                input_data.thread_id,
+                input_data.run_id,
+                input_data,
+                set(frontend_tool_names),
+                stream(),
+                _RunState(input_data.state),
+            )
+        ]
+
+
+def _summary(event: Any) -> tuple:
+    data = event.model_dump(mode="json", exclude_none=True)
+    kind = data.pop("type")
+    data.pop("thread_id", None)
+    data.pop("run_id", None)
+    return (kind, *(_short_ids(value) for value in data.values()))
+
+
+def _short_ids(value: Any) -> Any:
+    if isinstance(value, str):
+        try:
+            return f"#{uuid.UUID(value).int}"
+        except ValueError:
+            return value
+    if isinstance(value, list):
+        return [_short_ids(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _short_ids(v) for k, v in value.items()}
+    return value
+
+
+@pytest.mark.asyncio
+class TestStreamTranslation:
+    @pytest.mark.parametrize(
+        "state, state_delta",
+        [
+            (None, [{"op": "replace", "path": "", "value": {"turn": 1}}]),
+            ({}, [{"op": "add", "path": "/turn", "value": 1}]),
+        ],
+    )
+    async def test_tool_turn(self, state, state_delta):
+        events = await _translate(_tool_turn(), _input(state))
+        assert events == [
+            *_TOOL_TURN_STREAMED,
+            ("STATE_DELTA", state_delta),
+            *_TOOL_TURN_CLOSED,
+            ("MESSAGES_SNAPSHOT", [_USER_MESSAGE, *_TOOL_TURN_MESSAGES]),
+        ]
+
+    async def test_messages_delta_mode(self):
+        events = await _translate(
+            _tool_turn(), _input({}, {"messages_snapshot": "delta"})
+        )
+        assert events[-1] == (
+            "CUSTOM",
+            "ambient:messages_delta",
+            {"anchorMessageId": "u-1", "messages": _TOOL_TURN_MESSAGES},
+        )
+
+    async def test_frontend_tool_halts(self):
+        messages = [
+            _event({"type": "message_start", "message": {"role": "assistant"}}),
+            *_block(
+                0, {"type": "text", "text": ""}, "text_delta", "text", ["Pick one"]
+            ),
+            *_block(
+                1,
+                {
+                    "type": "tool_use",
+                    "id": "toolu-3",
+                    "name": "mcp__ag_ui__pick_color",
+                    "input": {},
+                },
+                "input_json_delta",
+                "partial_json",
+                ['{"value": "x"}'],
+            ),
+            _event({"type": "message_stop"}),
+            # Never reached: the stream halts at the frontend tool call.
+            AssistantMessage(content=[TextBlock(text="ignored")], model="m"),
+            _result(),
+        ]
+        events = await _translate(messages, _input({}), frozenset({"pick_color"}))
+        # Nothing after the frontend tool call; cleanup ends it once more.
+        assert events == [
+            ("TEXT_MESSAGE_START", "#0", "assistant"),
+            ("TEXT_MESSAGE_CONTENT", "#0", "Pick one"),
+            ("TOOL_CALL_START", "toolu-3", "pick_color", "#0"),
+            ("TOOL_CALL_ARGS", "toolu-3", '{"value": "x"}'),
+            ("TOOL_CALL_END", "toolu-3"),
+            ("TEXT_MESSAGE_END", "#0"),
+            ("TOOL_CALL_END", "toolu-3"),
+            (
+                "MESSAGES_SNAPSHOT",
+                [
+                    _USER_MESSAGE,
+                    {
+                        "id": "#0",
+                        "role": "assistant",
+                        "content": "Pick one",
+                        "tool_calls": [
+                            {
+                                "id": "toolu-3",
+                                "type": "function",
+                                "function": {
+                                    "name": "pick_color",
+                                    "arguments": '{"value": "x"}',
+                                },
+                            }
+                        ],
+                    },
+                ],
+            ),
+        ]
+
+    async def test_injected_system_and_unknown_messages(self):
+        messages = [
+            SystemMessage(subtype="notice", data={"message": "Compacting"}),
+            _event({"type": "message_start"}),
+            InjectedUserMessage(id="i-1", content="also check tests"),
+            _event({"type": "ping"}),
+            _event(
+                {"type": "content_block_delta", "delta": {"type": "signature_delta"}}
+            ),
+            _event(
+                {
+                    "type": "content_block_delta",
+                    "delta": {"type": "text_delta", "text": "ok"},
+                }
+            ),
+            object(),
+        ]
+        events = await _translate(messages, _input({}))
+        assert events == [
+            ("TEXT_MESSAGE_START", "#1", "system"),
+            ("TEXT_MESSAGE_CONTENT", "#1", "Compacting"),
+            ("TEXT_MESSAGE_END", "#1"),
+            (
+                "CUSTOM",
+                "ambient:user_message_injected",
+                {"messageId": "i-1", "content": "also check tests"},
+            ),
+            ("TEXT_MESSAGE_START", "#2", "assistant"),
+            ("TEXT_MESSAGE_CONTENT", "#2", "ok"),
+            ("TEXT_MESSAGE_END", "#2"),
+            (
+                "MESSAGES_SNAPSHOT",
+                [
+                    _USER_MESSAGE,
+                    {"id": "#0", "role": "system", "content": "Compacting"},
+                    {"id": "#2", "role": "assistant", "content": "ok"},
+                    {"id": "i-1", "role": "user", "content": "also check tests"},
+                ],
+            ),
+        ]
@@ -0,0 +1,113 @@
+"""Unit tests for reuse of the ag_ui MCP server across runs."""
+
+from ag_ui.core import RunAgentInput
+
+from ag_ui_claude_sdk import ClaudeAgentAdapter
+from ag_ui_claude_sdk.config import AG_UI_MCP_SERVER_NAME
+from ag_ui_claude_sdk.tool_cache import ToolServerCache, tools_key
+
+
+def _tool(name: str, required=("city",)) -> dict:
+    return {
+        "name": name,
+        "description": f"{name} tool",
+        "parameters": {
+            "type": "object",
+            "properties": {"city": {"type": "string"}},
+            "required": list(required),
+        },
+    }
+
+
+class TestToolsKey:
+    def test_independent_of_order(self):
+        a, b = _tool("a"), _tool("b")
+        reordered = {
+            "parameters": a["parameters"],
+            "name": "a",
+            "description": "a tool",
+        }
+        assert tools_key([a, b], False) == tools_key([b, reordered], False)
+
+    def test_definitions_and_state_tool_change_key(self):
+        base = tools_key([_tool("a")], False)
+        assert tools_key([_tool("a", required=())], False) != base
+        assert tools_key([_tool("a")], True) != base
+
+
+class TestToolServerCache:
+    def test_same_tools_reuse_server(self):
+        cache = ToolServerCache()
+        first = cache.get([_tool("a")], True)
+        second = cache.get([_tool("a")], True)
+
+        assert second is first
+        assert [t.name for t in first.tools] == ["a", "ag_ui_update_state"]
+        assert cache.as_dict() == {
+            "size": 1,
+            "maxSize": 32,
+            "hits": 1,
+            "misses": 1,
+            "hitRatio": 0.5,
+        }
+
+    def test_least_recently_used_is_evicted(self):
+        cache = ToolServerCache(maxsize=2)
+        a = cache.get([_tool("a")], False)
+        cache.get([_tool("b")], False)
+        cache.get([_tool("a")], False)
+        cache.get([_tool("c")], False)  # evicts b
+
+        assert len(cache) == 2
+        assert cache.get([_tool("a")], False) is a
+        cache.get([_tool("b")], False)
+        assert cache.misses == 4
+
+    def test_zero_size_disables(self):
+        cache = ToolServerCache(maxsize=0)
+        assert cache.get([_tool("a")], False) is not cache.get([_tool("a")], False)
+        assert len(cache) == 0
+        assert cache.hit_ratio() == 0.0
+
+    def test_nothing_to_serve(self):
+        assert ToolServerCache().get([], False) is None
+
+
+def _input(tools, state=None) -> RunAgentInput:
+    return RunAgentInput(
+        thread_id="t-1",
+        run_id="r-1",
+        messages=[{"id": "u-1", "role": "user", "content": "hi"}],
+        state=state,
+        tools=tools,
+        context=[],
+        forwarded_props={},
+    )
+
+
+class TestAdapterBuildOptions:
+    def test_runs_with_same_tools_share_server(self):
+        cache = ToolServerCache()
+        first = ClaudeAgentAdapter(name="a", tool_cache=cache).build_options(
+            _input([_tool("a")])
+        )
+        # A rebuilt adapter (e.g. after a workspace change) keeps the cache.
+        second = ClaudeAgentAdapter(name="b", tool_cache=cache).build_options(
+            _input([_tool("a")])
+        )
+
+        assert (
+            second.mcp_servers[AG_UI_MCP_SERVER_NAME]
+            is first.mcp_servers[AG_UI_MCP_SERVER_NAME]
+        )
+        assert "mcp__ag_ui__a" in second.allowed_tools
+        assert cache.hits == 1
+
+    def test_changed_tools_get_new_server(self):
+        adapter = ClaudeAgentAdapter(name="a")
+        first = adapter.build_options(_input([_tool("a")]))
+        second = adapter.build_options(_input([_tool("a")], state={"n": 1}))
+        assert (
+            second.mcp_servers[AG_UI_MCP_SERVER_NAME]
+            is not first.mcp_servers[AG_UI_MCP_SERVER_NAME]
+        )
@@ -0,0 +1,146 @@
+"""Unit tests for warm-swap session restarts and the restart_session tool."""
+
+import asyncio
+from unittest.mock import MagicMock, patch
+
+import pytest
+from claude_agent_sdk import ClaudeAgentOptions, SystemMessage
+
+from ambient_runner.bridges.claude.session import (
+    SessionManager,
+    WorkerDeadError,
+    current_thread_id,
+)
+from ambient_runner.bridges.claude.tools import create_restart_session_tool
+
+
+class _FakeClient:
+    """ClaudeSDKClient stand-in whose ``connect`` can be held or failed."""
+
+    gate: asyncio.Event | None = None
+    connect_error: Exception | None = None
+    instances: list["_FakeClient"] = []
+
+    def __init__(self, options=None):
+        self.options = options
+        self.disconnected = False
+        self.query_thread: str | None = None
+        _FakeClient.instances.append(self)
+
+    async def connect(self):
+        if self.gate is not None:
+            await self.gate.wait()
+        if self.connect_error is not None:
+            raise self.connect_error
+
+    async def query(self, prompt, session_id=None):
+        self.query_thread = current_thread_id()
+
+    async def receive_response(self):
+        yield SystemMessage(subtype="init", data={"session_id": "sid-1"})
+
+    async def disconnect(self):
+        self.disconnected = True
+
+
+@pytest.fixture(autouse=True)
+def fake_client():
+    _FakeClient.instances = []
+    _FakeClient.gate = None
+    _FakeClient.connect_error = None
+    with patch("claude_agent_sdk.ClaudeSDKClient", _FakeClient):
+        yield
+
+
+def _manager() -> SessionManager:
+    return SessionManager(max_workers=0, idle_ttl=0, supervise_interval=0)
+
+
+async def _create(manager: SessionManager, thread_id: str = "t-1"):
+    async with manager.get_lock(thread_id):
+        worker = await manager.get_or_create(thread_id, ClaudeAgentOptions(), "")
+    await worker.wait_connected()
+    return worker
+
+
+async def _turn(worker) -> None:
+    _ = [msg async for msg in worker.query("hi")]
+
+
+@pytest.mark.asyncio
+class TestRestart:
+    async def test_swaps_in_resumed_worker(self):
+        manager = _manager()
+        old = await _create(manager)
+        await _turn(old)
+
+        new = await manager.restart("t-1", ClaudeAgentOptions(), "")
+        assert new is not old
+        assert manager.get_existing("t-1") is new
+        assert _FakeClient.instances[-1].options.resume == "sid-1"
+        stats = manager.get_pool_stats()
+        assert stats["swapped"] == 1
+        assert stats["lastSwapMs"] is not None
+
+        await manager.shutdown()
+        assert _FakeClient.instances[0].disconnected
+
+    async def test_old_worker_serves_while_replacement_connects(self):
+        manager = _manager()
+        old = await _create(manager)
+        _FakeClient.gate = asyncio.Event()
+        restart = asyncio.create_task(manager.restart("t-1", ClaudeAgentOptions(), ""))
+        await asyncio.sleep(0.01)
+
+        async with manager.get_lock("t-1"):
+            assert manager.get_existing("t-1") is old
+            await _turn(old)
+        _FakeClient.gate.set()
+        new = await restart
+
+        # The first replacement missed a turn, so it was discarded and retried.
+        assert len(_FakeClient.instances) == 3
+        assert _FakeClient.instances[1].disconnected
+        assert manager.get_existing("t-1") is new
+        assert manager.get_pool_stats()["swapped"] == 1
+        await manager.shutdown()
+
+    async def test_failed_replacement_keeps_old_worker(self):
+        manager = _manager()
+        old = await _create(manager)
+        _FakeClient.connect_error = RuntimeError("boom")
+        with pytest.raises(WorkerDeadError):
+            await manager.restart("t-1", ClaudeAgentOptions(), "")
+        assert manager.get_existing("t-1") is old
+        assert manager.get_pool_stats()["swapped"] == 0
+        await manager.shutdown()
+
+    async def test_without_worker_creates_one(self):
+        manager = _manager()
+        worker = await manager.restart("t-1", ClaudeAgentOptions(), "")
+        assert manager.get_existing("t-1") is worker
+        assert manager.get_pool_stats()["swapped"] == 0
+        await manager.shutdown()
+
+    async def test_worker_task_exposes_its_thread(self):
+        manager = _manager()
+        worker = await _create(manager, "t-9")
+        await _turn(worker)
+        assert _FakeClient.instances[-1].query_thread == "t-9"
+        assert current_thread_id() is None
+        await manager.shutdown()
+
+
+@pytest.mark.asyncio
+class TestRestartTool:
+    async def test_tool_invokes_callback(self):
+        on_restart = MagicMock()
+        tool = create_restart_session_tool(on_restart, lambda *a: (lambda fn: fn))
+        result = await tool({})
+        on_restart.assert_called_once_with()
+        assert "restart" in result["content"][0]["text"]
+
+    async def test_tool_without_callback_only_logs(self):
+        tool = create_restart_session_tool(None, lambda *a: (lambda fn: fn))
+        result = await tool({})
+        assert result["content"]
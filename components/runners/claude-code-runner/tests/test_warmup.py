@@ -0,0 +1,223 @@
+"""Unit tests for bridge warm-up and time-to-first-token reporting."""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+from ag_ui.core import EventType, RunAgentInput, TextMessageContentEvent
+from fastapi.testclient import TestClient
+
+from ambient_runner import create_ambient_app
+from ambient_runner.bridge import FrameworkCapabilities, PlatformBridge
+from ambient_runner.bridges.claude import ClaudeBridge
+from ambient_runner.bridges.claude.bridge import LatencyStats
+from ambient_runner.bridges.claude.session import (
+    QueueStats,
+    SessionManager,
+    SessionWorker,
+)
+from ambient_runner.platform.context import RunnerContext
+
+
+class _FakeClient:
+    """Stands in for ClaudeSDKClient; ``connect`` can be gated or fail."""
+
+    connect_error: Exception | None = None
+
+    def __init__(self, options=None):
+        self.options = options
+
+    async def connect(self):
+        if self.connect_error is not None:
+            raise self.connect_error
+
+    async def disconnect(self):
+        pass
+
+
+# ------------------------------------------------------------------
+# SessionWorker connection readiness
+# ------------------------------------------------------------------
+
+
+@pytest.mark.asyncio
+class TestWorkerWaitConnected:
+    async def test_connected_after_connect(self):
+        with patch("claude_agent_sdk.ClaudeSDKClient", _FakeClient):
+            worker = SessionWorker("t-1", None, "")
+            await worker.start()
+            assert await worker.wait_connected() is True
+            assert worker.connected
+            await worker.stop()
+        assert not worker.connected
+
+    async def test_false_when_connect_fails(self):
+        class _Failing(_FakeClient):
+            connect_error = RuntimeError("no cli")
+
+        with patch("claude_agent_sdk.ClaudeSDKClient", _Failing):
+            worker = SessionWorker("t-1", None, "")
+            await worker.start()
+            assert await worker.wait_connected() is False
+
+    async def test_false_when_not_started(self):
+        assert await SessionWorker("t-1", None, "").wait_connected() is False
+
+
+# ------------------------------------------------------------------
+# ClaudeBridge.warmup and TTFT
+# ------------------------------------------------------------------
+
+
+class _StubAdapter:
+    def build_options(self, input_data=None, thread_id=None):
+        return None
+
+    async def run(self, input_data, *, message_stream):
+        yield TextMessageContentEvent(
+            type=EventType.TEXT_MESSAGE_CONTENT, message_id="m-1", delta="hi"
+        )
+
+
+class _StubWorker:
+    def __init__(self, *args, **kwargs):
+        self.session_id = None
+        self.connected = False
+        self.alive = True
+        self.queue_stats = QueueStats(maxsize=10, overflow="block")
+
+    async def start(self):
+        pass
+
+    def add_exit_callback(self, callback):
+        pass
+
+    async def wait_connected(self):
+        self.connected = True
+        return True
+
+    async def query(self, prompt, session_id=None):
+        return
+        yield
+
+
+def _bridge() -> ClaudeBridge:
+    bridge = ClaudeBridge()
+    bridge.set_context(RunnerContext(session_id="s-1", workspace_path="/w"))
+    bridge._ready = True
+    bridge._adapter = _StubAdapter()
+    bridge._session_manager = SessionManager()
+    return bridge
+
+
+def _input(thread_id: str) -> RunAgentInput:
+    return RunAgentInput(
+        thread_id=thread_id,
+        run_id="r-1",
+        messages=[{"id": "u-1", "role": "user", "content": "hi"}],
+        state={},
+        tools=[],
+        context=[],
+        forwarded_props={},
+    )
+
+
+async def _consume(bridge: ClaudeBridge, input_data: RunAgentInput) -> list:
+    return [e async for e in bridge.run(input_data)]
+
+
+@pytest.mark.asyncio
+@patch("ambient_runner.bridges.claude.session.SessionWorker", _StubWorker)
+class TestClaudeBridgeWarmup:
+    async def test_warmup_connects_default_thread(self):
+        bridge = _bridge()
+        await bridge.warmup()
+        worker = bridge.session_manager.get_existing("s-1")
+        assert worker is not None and worker.connected
+        latency = bridge.get_diagnostics()["latency"]
+        assert latency["warmup"] == "done"
+        assert latency["warmupMs"] is not None
+
+    async def test_first_run_after_warmup_is_warm(self):
+        bridge = _bridge()
+        await bridge.warmup()
+        await _consume(bridge, _input("s-1"))
+        latency = bridge.get_diagnostics()["latency"]
+        assert latency["firstRunWarm"] is True
+        assert latency["firstRunTtftMs"] is not None
+        assert latency["warmRuns"] == 1 and latency["coldRuns"] == 0
+
+    async def test_first_run_without_warmup_is_cold(self):
+        bridge = _bridge()
+        await _consume(bridge, _input("s-1"))
+        latency = bridge.get_diagnostics()["latency"]
+        assert latency["warmup"] == "pending"
+        assert latency["firstRunWarm"] is False
+        assert latency["coldRuns"] == 1
+
+    async def test_failed_warmup_is_reported(self):
+        bridge = ClaudeBridge()
+        bridge.set_context(RunnerContext(session_id="s-1", workspace_path="/w"))
+        bridge._session_manager = SessionManager()
+        with patch.object(
+            bridge, "_setup_platform", side_effect=RuntimeError("no auth")
+        ):
+            with pytest.raises(RuntimeError):
+                await bridge.warmup()
+        assert bridge.get_diagnostics()["latency"]["warmup"] == "failed"
+
+
+class TestLatencyStats:
+    def test_averages_split_by_warmth(self):
+        stats = LatencyStats()
+        stats.record_ttft(1000.0, warm=False)
+        stats.record_ttft(200.0, warm=True)
+        stats.record_ttft(300.0, warm=True)
+        d = stats.as_dict()
+        assert d["firstRunTtftMs"] == 1000.0 and d["firstRunWarm"] is False
+        assert d["lastTtftMs"] == 300.0
+        assert (d["coldRuns"], d["coldTtftAvgMs"]) == (1, 1000.0)
+        assert (d["warmRuns"], d["warmTtftAvgMs"]) == (2, 250.0)
+
+
+# ------------------------------------------------------------------
+# Lifespan
+# ------------------------------------------------------------------
+
+
+class _RecordingBridge(PlatformBridge):
+    def __init__(self) -> None:
+        self.warmed = asyncio.Event()
+
+    def capabilities(self):
+        return FrameworkCapabilities(framework="test")
+
+    async def run(self, input_data):
+        yield  # pragma: no cover
+
+    async def interrupt(self, thread_id=None):
+        pass
+
+    async def warmup(self):
+        self.warmed.set()
+
+
+class TestLifespanWarmup:
+    def _start(self, bridge) -> None:
+        app = create_ambient_app(bridge, enable_repos=False, enable_workflows=False)
+        with TestClient(app) as client:
+            client.get("/health")
+
+    def test_lifespan_starts_warmup(self, monkeypatch):
+        monkeypatch.delenv("RUNNER_WARMUP", raising=False)
+        monkeypatch.delenv("INITIAL_PROMPT", raising=False)
+        bridge = _RecordingBridge()
+        self._start(bridge)
+        assert bridge.warmed.is_set()
+
+    def test_warmup_can_be_disabled(self, monkeypatch):
+        monkeypatch.setenv("RUNNER_WARMUP", "false")
+        monkeypatch.delenv("INITIAL_PROMPT", raising=False)
+        bridge = _RecordingBridge()
+        self._start(bridge)
+        assert not bridge.warmed.is_set()
@@ -0,0 +1,207 @@
+"""Unit tests for SessionManager LRU/TTL eviction and transparent resume."""
+
+import asyncio
+import time
+from unittest.mock import patch
+
+import pytest
+from claude_agent_sdk import ClaudeAgentOptions
+
+from ambient_runner.bridges.claude.session import (
+    PoolStats,
+    SessionManager,
+    SessionWorker,
+)
+
+
+class _FakeWorker:
+    """Records its options; ``stop`` can be gated to observe the lock."""
+
+    instances: list["_FakeWorker"] = []
+
+    def __init__(self, thread_id, options, api_key, **kwargs):
+        self.thread_id = thread_id
+        self.options = options
+        self.on_connected = kwargs.get("on_connected")
+        self.session_id = f"sid-{thread_id}"
+        self.last_active = time.monotonic()
+        self.stopped = False
+        self.stopping = False
+        self.alive = True
+        self.stop_gate: asyncio.Event | None = None
+        _FakeWorker.instances.append(self)
+
+    async def start(self):
+        pass
+
+    def add_exit_callback(self, callback):
+        pass
+
+    def process_alive(self):
+        return None
+
+    async def stop(self):
+        self.stopping = True
+        if self.stop_gate is not None:
+            await self.stop_gate.wait()
+        self.stopped = True
+
+
+@pytest.fixture(autouse=True)
+def fake_worker():
+    _FakeWorker.instances = []
+    with patch("ambient_runner.bridges.claude.session.SessionWorker", _FakeWorker):
+        yield
+
+
+async def _create(manager: SessionManager, thread_id: str, options=None):
+    async with manager.get_lock(thread_id):
+        return await manager.get_or_create(
+            thread_id, options or ClaudeAgentOptions(), ""
+        )
+
+
+async def _settle() -> None:
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+class TestCapacityEviction:
+    async def test_evicts_least_recently_active(self):
+        manager = SessionManager(max_workers=2, idle_ttl=0)
+        a = await _create(manager, "a")
+        b = await _create(manager, "b")
+        a.last_active, b.last_active = 200.0, 100.0
+
+        await _create(manager, "c")
+        await _settle()
+        assert manager.get_existing("b") is None
+        assert b.stopped and not a.stopped
+        assert manager.get_pool_stats()["evictedCapacity"] == 1
+        assert manager.get_pool_stats()["live"] == 2
+
+    async def test_busy_workers_are_not_evicted(self):
+        manager = SessionManager(max_workers=1, idle_ttl=0)
+        await _create(manager, "a")
+        async with manager.get_lock("a"):  # turn in flight
+            await _create(manager, "b")
+        assert manager.get_existing("a") is not None
+        assert manager.get_pool_stats()["live"] == 2
+        assert manager.get_pool_stats()["evicted"] == 0
+
+    async def test_unbounded_when_zero(self):
+        manager = SessionManager(max_workers=0, idle_ttl=0)
+        for tid in "abcde":
+            await _create(manager, tid)
+        assert manager.get_pool_stats()["live"] == 5
+
+
+@pytest.mark.asyncio
+class TestIdleEviction:
+    async def test_evicts_only_expired_idle_workers(self):
+        manager = SessionManager(max_workers=0, idle_ttl=60)
+        old = await _create(manager, "old")
+        busy = await _create(manager, "busy")
+        await _create(manager, "fresh")
+        old.last_active = busy.last_active = time.monotonic() - 120
+
+        async with manager.get_lock("busy"):
+            assert await manager.evict_idle() == 1
+        assert manager.get_existing("old") is None
+        assert manager.get_existing("busy") is not None
+        assert manager.get_existing("fresh") is not None
+        assert manager.get_pool_stats()["evictedIdle"] == 1
+        await manager.shutdown()
+
+    async def test_reaper_runs_in_background(self):
+        manager = SessionManager(max_workers=0, idle_ttl=0.04)
+        await _create(manager, "a")
+        await asyncio.sleep(0.15)
+        assert manager.get_existing("a") is None
+        await manager.shutdown()
+
+
+@pytest.mark.asyncio
+class TestTransparentResume:
+    async def test_recreated_worker_resumes_session(self):
+        manager = SessionManager(max_workers=1, idle_ttl=0)
+        await _create(manager, "a")
+        await _create(manager, "b")  # evicts "a"
+        await _settle()
+
+        resumed = await _create(manager, "a")
+        assert resumed.options.resume == "sid-a"
+        assert resumed.on_connected is not None
+        assert manager.get_session_id("a") == "sid-a"
+
+    async def test_explicit_resume_option_wins(self):
+        manager = SessionManager(max_workers=1, idle_ttl=0)
+        await _create(manager, "a")
+        await _create(manager, "b")
+        await _settle()
+        worker = await _create(manager, "a", ClaudeAgentOptions(resume="other"))
+        assert worker.options.resume == "other"
+
+    async def test_new_thread_does_not_resume(self):
+        manager = SessionManager()
+        worker = await _create(manager, "a")
+        assert worker.options.resume is None
+        assert worker.on_connected is None
+
+    async def test_request_waits_for_evicted_worker_to_stop(self):
+        manager = SessionManager(max_workers=1, idle_ttl=0)
+        a = await _create(manager, "a")
+        a.stop_gate = asyncio.Event()
+        await _create(manager, "b")  # evicts "a"; stop is pending
+
+        recreate = asyncio.create_task(_create(manager, "a"))
+        await _settle()
+        assert not recreate.done()
+
+        a.stop_gate.set()
+        worker = await recreate
+        assert a.stopped
+        assert worker.options.resume == "sid-a"
+
+    async def test_shutdown_waits_for_pending_evictions(self):
+        manager = SessionManager(max_workers=1, idle_ttl=0)
+        a = await _create(manager, "a")
+        await _create(manager, "b")
+        await manager.shutdown()
+        assert a.stopped
+        assert all(w.stopped for w in _FakeWorker.instances)
+
+    async def test_worker_reports_connect_time(self):
+        class _Client:
+            def __init__(self, options=None):
+                pass
+
+            async def connect(self):
+                pass
+
+            async def disconnect(self):
+                pass
+
+        seen = []
+        with patch("claude_agent_sdk.ClaudeSDKClient", _Client):
+            worker = SessionWorker("a", None, "", on_connected=seen.append)
+            await worker.start()
+            await worker.wait_connected()
+            await worker.stop()
+        assert len(seen) == 1 and seen[0] >= 0
+
+
+class TestPoolStats:
+    def test_resume_latency(self):
+        stats = PoolStats(max_workers=4, idle_ttl=60)
+        stats.record_resume(0.2)
+        stats.record_resume(0.4)
+        d = stats.as_dict(live=3)
+        assert d["live"] == 3 and d["resumed"] == 2
+        assert d["lastResumeMs"] == 400.0
+        assert d["avgResumeMs"] == 300.0
+
+    def test_empty(self):
+        d = PoolStats(max_workers=0, idle_ttl=0).as_dict(live=0)
+        assert d["evicted"] == 0 and d["avgResumeMs"] is None
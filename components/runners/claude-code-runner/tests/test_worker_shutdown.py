@@ -0,0 +1,102 @@
+"""Unit tests for parallel, deadline-bounded SessionManager shutdown."""
+
+import asyncio
+import time
+from unittest.mock import patch
+
+import pytest
+from claude_agent_sdk import ClaudeAgentOptions
+
+from ambient_runner.bridges.claude.session import SessionManager
+
+
+class _FakeWorker:
+    """Stops after ``stop_delay`` seconds; records kills."""
+
+    stop_delay = 0.0
+    instances: list["_FakeWorker"] = []
+
+    def __init__(self, thread_id, options, api_key, **kwargs):
+        self.thread_id = thread_id
+        self.options = options
+        self.session_id = f"sid-{thread_id}"
+        self.last_active = time.monotonic()
+        self.stopped = False
+        self.killed = False
+        self.stopping = False
+        self.alive = True
+        _FakeWorker.instances.append(self)
+
+    async def start(self):
+        pass
+
+    def add_exit_callback(self, callback):
+        pass
+
+    def process_alive(self):
+        return None
+
+    async def stop(self):
+        self.stopping = True
+        await asyncio.sleep(self.stop_delay)
+        self.stopped = True
+
+    def kill(self):
+        self.killed = True
+
+
+@pytest.fixture(autouse=True)
+def fake_worker():
+    _FakeWorker.instances = []
+    _FakeWorker.stop_delay = 0.0
+    with patch("ambient_runner.bridges.claude.session.SessionWorker", _FakeWorker):
+        yield
+
+
+async def _create(manager: SessionManager, thread_id: str):
+    async with manager.get_lock(thread_id):
+        return await manager.get_or_create(thread_id, ClaudeAgentOptions(), "")
+
+
+def _manager(**kwargs) -> SessionManager:
+    return SessionManager(max_workers=0, idle_ttl=0, supervise_interval=0, **kwargs)
+
+
+@pytest.mark.asyncio
+class TestShutdown:
+    async def test_workers_stop_concurrently(self):
+        _FakeWorker.stop_delay = 0.1
+        manager = _manager()
+        for tid in ("a", "b", "c", "d"):
+            await _create(manager, tid)
+
+        started = time.monotonic()
+        await manager.shutdown()
+        assert time.monotonic() - started < 0.3
+        assert all(w.stopped and not w.killed for w in _FakeWorker.instances)
+        assert manager.get_existing("a") is None
+
+    async def test_stragglers_are_killed_at_deadline(self):
+        manager = _manager(shutdown_timeout=0.05)
+        fast = await _create(manager, "fast")
+        slow = await _create(manager, "slow")
+        slow.stop = lambda: asyncio.sleep(10)
+
+        started = time.monotonic()
+        await manager.shutdown()
+        assert time.monotonic() - started < 3
+        assert fast.stopped and not fast.killed
+        assert slow.killed
+
+    async def test_explicit_timeout_overrides_default(self):
+        _FakeWorker.stop_delay = 10
+        manager = _manager(shutdown_timeout=60)
+        worker = await _create(manager, "a")
+        await manager.shutdown(timeout=0.02)
+        assert worker.killed
+
+    async def test_session_ids_kept_for_resume(self):
+        manager = _manager()
+        await _create(manager, "a")
+        await manager.shutdown()
+        assert manager.get_session_id("a") == "sid-a"
@@ -0,0 +1,180 @@
+"""Unit tests for SessionWorker crash detection and supervised respawn."""
+
+import asyncio
+import time
+from contextlib import suppress
+from unittest.mock import patch
+
+import pytest
+from claude_agent_sdk import ClaudeAgentOptions, SystemMessage
+
+from ambient_runner.bridges.claude.session import (
+    SessionManager,
+    WorkerDeadError,
+    WorkerRespawningError,
+)
+
+
+class _Process:
+    def __init__(self) -> None:
+        self.returncode = None
+
+
+class _Transport:
+    def __init__(self) -> None:
+        self._process = _Process()
+
+
+class _FakeClient:
+    """ClaudeSDKClient stand-in: reports a session, then blocks until released."""
+
+    connect_error: Exception | None = None
+    connect_delay = 0.0
+    instances: list["_FakeClient"] = []
+
+    def __init__(self, options=None):
+        self.options = options
+        self._transport = _Transport()
+        self.release = asyncio.Event()
+        _FakeClient.instances.append(self)
+
+    async def connect(self):
+        await asyncio.sleep(self.connect_delay)
+        if self.connect_error is not None:
+            raise self.connect_error
+
+    async def query(self, prompt, session_id=None):
+        pass
+
+    async def receive_response(self):
+        yield SystemMessage(subtype="init", data={"session_id": "sid-1"})
+        await self.release.wait()
+
+    async def disconnect(self):
+        pass
+
+
+@pytest.fixture(autouse=True)
+def fake_client():
+    _FakeClient.instances = []
+    _FakeClient.connect_error = None
+    _FakeClient.connect_delay = 0.0
+    with patch("claude_agent_sdk.ClaudeSDKClient", _FakeClient):
+        yield
+
+
+def _manager(**kwargs) -> SessionManager:
+    kwargs.setdefault("restart_backoff", 0.05)
+    return SessionManager(max_workers=0, idle_ttl=0, supervise_interval=0, **kwargs)
+
+
+async def _create(manager: SessionManager, thread_id: str = "t-1"):
+    async with manager.get_lock(thread_id):
+        return await manager.get_or_create(thread_id, ClaudeAgentOptions(), "")
+
+
+async def _first_message(stream):
+    return await stream.__anext__()
+
+
+async def _crash(worker) -> None:
+    """Kill *worker* as the supervisor would and let the manager react."""
+    worker.fail(WorkerDeadError("boom"))
+    with suppress(BaseException):
+        await worker._task
+    await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+class TestCrashDetection:
+    async def test_dead_cli_fails_in_flight_turn(self):
+        manager = _manager()
+        worker = await _create(manager)
+        stream = worker.query("hi")
+        await _first_message(stream)  # init received, turn now blocked
+
+        _FakeClient.instances[0]._transport._process.returncode = -9  # OOM-killed
+        assert manager.check_workers() == 1
+        with pytest.raises(WorkerDeadError):
+            await asyncio.wait_for(_first_message(stream), timeout=1)
+        await asyncio.sleep(0)
+        assert manager.get_existing("t-1") is None
+        assert manager.get_pool_stats()["crashes"] == 1
+
+    async def test_queued_turns_fail_when_worker_exits(self):
+        _FakeClient.connect_error = RuntimeError("cli not found")
+        _FakeClient.connect_delay = 0.05
+        manager = _manager()
+        worker = await _create(manager)
+        stream = worker.query("hi")
+        with pytest.raises(Exception, match="cli not found"):
+            await asyncio.wait_for(_first_message(stream), timeout=1)
+
+    async def test_query_on_dead_worker_fails_fast(self):
+        _FakeClient.connect_error = RuntimeError("cli not found")
+        manager = _manager()
+        worker = await _create(manager)
+        await worker.wait_connected()
+        with pytest.raises(WorkerDeadError):
+            await asyncio.wait_for(_first_message(worker.query("hi")), timeout=1)
+
+    async def test_intentional_stop_is_not_a_crash(self):
+        manager = _manager()
+        await _create(manager)
+        await manager.destroy("t-1")
+        assert manager.get_pool_stats()["crashes"] == 0
+        assert manager.get_pool_stats()["restarting"] == {}
+
+
+@pytest.mark.asyncio
+class TestRespawn:
+    async def test_respawn_resumes_after_backoff(self):
+        manager = _manager(restart_backoff=0.1)
+        worker = await _create(manager)
+        await _first_message(worker.query("hi"))  # captures sid-1
+        await _crash(worker)
+        assert "t-1" in manager.get_pool_stats()["restarting"]
+
+        started = time.monotonic()
+        await manager.wait_respawn("t-1")
+        respawned = await _create(manager)
+        assert time.monotonic() - started >= 0.05
+        assert respawned is not worker
+        await respawned.wait_connected()
+        assert _FakeClient.instances[-1].options.resume == "sid-1"
+        stats = manager.get_pool_stats()
+        assert stats["restarts"] == 1 and stats["restarting"] == {}
+        await manager.shutdown()
+
+    async def test_respawn_during_backoff_fails_without_waiting(self):
+        manager = _manager(restart_backoff=10)
+        worker = await _create(manager)
+        await _crash(worker)
+
+        started = time.monotonic()
+        with pytest.raises(WorkerRespawningError) as exc_info:
+            await _create(manager)
+        assert time.monotonic() - started < 1
+        assert 9 < exc_info.value.retry_after <= 10
+        assert "t-1" in manager.get_pool_stats()["restarting"]
+
+    async def test_backoff_grows_with_consecutive_crashes(self):
+        manager = _manager(restart_backoff=10, restart_backoff_max=25)
+        delays = []
+        for _ in range(3):
+            worker = await _create(manager)
+            await _crash(worker)
+            delays.append(
+                manager.get_pool_stats()["restarting"]["t-1"]["respawnInSeconds"]
+            )
+            manager._respawn_at["t-1"] = time.monotonic()  # skip the wait
+        assert [round(d) for d in delays] == [10, 20, 25]
+
+    async def test_supervisor_loop_detects_dead_process(self):
+        manager = SessionManager(max_workers=0, idle_ttl=0, supervise_interval=0.02)
+        worker = await _create(manager)
+        await worker.wait_connected()
+        _FakeClient.instances[0]._transport._process.returncode = 1
+        await asyncio.sleep(0.1)
+        assert manager.get_existing("t-1") is None
+        await manager.shutdown()